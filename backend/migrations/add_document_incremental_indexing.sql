@@ -0,0 +1,16 @@
+-- Incremental document re-indexing
+-- Documents get a stable external key and chunks a content hash, so re-indexing
+-- a document only embeds new or changed chunks (see api/vector.py index_document).
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS external_id VARCHAR(255);
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_external_id
+ON documents(external_id) WHERE external_id IS NOT NULL;
+
+ALTER TABLE document_embeddings ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+-- Chunks indexed by the structure-aware chunker already carry their hash;
+-- older chunks stay NULL and are re-embedded once on their next re-index
+UPDATE document_embeddings
+SET content_hash = embed_metadata->>'content_hash'
+WHERE content_hash IS NULL AND embed_metadata->>'content_hash' IS NOT NULL;
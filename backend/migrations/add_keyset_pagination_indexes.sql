@@ -0,0 +1,25 @@
+-- Keyset Pagination Indexes for Convergio
+-- Composite indexes matching the (created_at, id) cursors used by list endpoints.
+-- A backward scan serves ORDER BY created_at DESC, id DESC, so one index
+-- covers both page directions and page N costs the same as page 1.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_engagements_created_at_id
+ON engagements(created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_activities_created_at_id
+ON activities(created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_activities_engagement_created_at_id
+ON activities(engagement_id, created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_project_created_at_id
+ON projects(created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_created_at_id
+ON documents(created_at, id);
+
+-- Keep pg_class.reltuples fresh for the approximate total_count
+ANALYZE engagements;
+ANALYZE activities;
+ANALYZE projects;
+ANALYZE documents;
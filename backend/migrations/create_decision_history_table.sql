@@ -0,0 +1,22 @@
+-- Persisted decision plans for similar-decision retrieval
+-- Features: domain, decision type, agents and query embedding (see agents/services/decision_memory.py)
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+CREATE TABLE IF NOT EXISTS decision_history (
+    decision_id UUID PRIMARY KEY,
+    business_domain VARCHAR(100) NOT NULL,
+    decision_type VARCHAR(50) NOT NULL,
+    agents JSONB NOT NULL DEFAULT '[]',
+    features vector(440) NOT NULL,
+    summary JSONB NOT NULL DEFAULT '{}',
+    outcome_score FLOAT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Approximate nearest neighbour search on cosine distance
+CREATE INDEX IF NOT EXISTS idx_decision_history_features
+    ON decision_history USING hnsw (features vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX IF NOT EXISTS idx_decision_history_created_at ON decision_history(created_at DESC);
@@ -0,0 +1,32 @@
+-- Append-only telemetry event history
+-- Written in batches by the telemetry event store (see agents/services/observability/event_store.py)
+
+CREATE TABLE IF NOT EXISTS telemetry_events (
+    id UUID PRIMARY KEY,
+    timestamp TIMESTAMP NOT NULL,
+    event_type VARCHAR(64) NOT NULL,
+    conversation_id VARCHAR(255),
+    user_id VARCHAR(255),
+    agent_name VARCHAR(255),
+    turn_number INTEGER,
+    status VARCHAR(16),  -- "ok"/"error" on result events, NULL otherwise
+    data JSONB NOT NULL DEFAULT '{}',
+    metadata JSONB NOT NULL DEFAULT '{}'
+);
+
+-- Rows arrive in timestamp order, so a BRIN index covers time-range scans at a tiny size
+CREATE INDEX IF NOT EXISTS idx_telemetry_events_timestamp_brin
+    ON telemetry_events USING brin (timestamp) WITH (pages_per_range = 32);
+
+-- Filtered, newest-first lookups
+CREATE INDEX IF NOT EXISTS idx_telemetry_events_conversation ON telemetry_events(conversation_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_telemetry_events_agent ON telemetry_events(agent_name, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_telemetry_events_type ON telemetry_events(event_type, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_telemetry_events_user ON telemetry_events(user_id, timestamp DESC);
+
+-- Tables created before the status column existed
+ALTER TABLE telemetry_events ADD COLUMN IF NOT EXISTS status VARCHAR(16);
+
+-- Failures only: the common "what went wrong" query stays small
+CREATE INDEX IF NOT EXISTS idx_telemetry_events_errors
+    ON telemetry_events(conversation_id, timestamp DESC) WHERE status = 'error';
@@ -0,0 +1,12 @@
+-- Daily usage aggregates for billing
+-- Written by compaction of the Redis usage counters (see services/usage_metering.py)
+
+CREATE TABLE IF NOT EXISTS usage_aggregates (
+    tenant_id VARCHAR(100) NOT NULL,
+    metric VARCHAR(50) NOT NULL,
+    period_date DATE NOT NULL,
+    quantity BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (tenant_id, metric, period_date)
+);
+
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tokenizer Vocabulary Setup
+Downloads the BPE vocabularies TokenCounter loads into data/tokenizers and
+verifies them against the pinned SHA-256; already valid files are kept.
+Run once per checkout (dev, CI) and in the image build.
+"""
+
+import argparse
+import hashlib
+import sys
+import tempfile
+import urllib.request
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.core.token_counter import DEFAULT_VOCAB_DIR, _ENCODINGS  # noqa: E402
+
+BASE_URL = "https://openaipublic.blob.core.windows.net/encodings"
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fetch(encoding: str, vocab_dir: Path) -> Path:
+    """Download ``encoding`` into ``vocab_dir`` unless a verified copy is there"""
+    expected = _ENCODINGS[encoding]["sha256"]
+    target = vocab_dir / f"{encoding}.tiktoken"
+    if target.exists() and _sha256(target) == expected:
+        print(f"✅ {target} already present")
+        return target
+
+    vocab_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=vocab_dir, delete=False) as tmp:
+        tmp_path = Path(tmp.name)
+        try:
+            with urllib.request.urlopen(f"{BASE_URL}/{encoding}.tiktoken", timeout=60) as response:
+                for block in iter(lambda: response.read(1 << 20), b""):
+                    tmp.write(block)
+        except OSError as e:
+            tmp_path.unlink()
+            raise SystemExit(f"❌ {encoding}: download failed ({e})")
+
+    actual = _sha256(tmp_path)
+    if actual != expected:
+        tmp_path.unlink()
+        raise SystemExit(f"❌ {encoding}: checksum mismatch (expected {expected}, got {actual})")
+    tmp_path.replace(target)
+    print(f"✅ {target} downloaded and verified")
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dir", type=Path, default=DEFAULT_VOCAB_DIR, help="vocabulary directory")
+    parser.add_argument("encodings", nargs="*", default=sorted(_ENCODINGS), help="encodings to fetch")
+    args = parser.parse_args()
+    for encoding in args.encodings:
+        fetch(encoding, args.dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -41,6 +41,7 @@ except ImportError:
     REDIS_INSTRUMENTATION_AVAILABLE = False
 
 from ..utils.config import get_settings
+from .tail_sampling import TailSamplingConfig, TailSamplingSpanProcessor
 
 logger = structlog.get_logger()
 
@@ -52,6 +53,7 @@ class OTELManager:
         self.settings = get_settings()
         self.tracer = None
         self.meter = None
+        self.tail_sampler: Optional[TailSamplingSpanProcessor] = None
         self.initialized = False
         
         # Metrics collectors
@@ -116,19 +118,22 @@ class OTELManager:
     ):
         """Setup tracing with OTLP exporter"""
         
+        sampling = TailSamplingConfig.from_settings(self.settings)
+        
         # Create tracer provider
-        provider = TracerProvider(resource=resource)
+        provider = TracerProvider(resource=resource, sampler=sampling.sampler())
         
-        # Add OTLP exporter if endpoint provided
+        # Add OTLP exporter if endpoint provided, exporting only sampled traces
         if otlp_endpoint:
             otlp_exporter = OTLPSpanExporter(
                 endpoint=otlp_endpoint,
                 insecure=True  # Use insecure for local development
             )
-            provider.add_span_processor(
-                BatchSpanProcessor(otlp_exporter)
-            )
-            logger.info(f"📡 OTLP trace exporter configured: {otlp_endpoint}")
+            self.tail_sampler = TailSamplingSpanProcessor(BatchSpanProcessor(otlp_exporter), sampling)
+            provider.add_span_processor(self.tail_sampler)
+            logger.info(f"📡 OTLP trace exporter configured: {otlp_endpoint}",
+                        healthy_ratio=sampling.healthy_ratio,
+                        low_overhead=sampling.low_overhead)
         
         # Add console exporter for debugging
         if enable_console:
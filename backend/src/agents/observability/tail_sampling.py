@@ -0,0 +1,266 @@
+"""
+Tail-based Trace Sampling for the OTEL pipeline
+Spans are buffered per trace until the local root ends, then the whole trace is
+exported or dropped: traces with errors, budget events or high latency are
+always kept, healthy traces at a configurable ratio
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import structlog
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.sampling import (
+    ALWAYS_ON,
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+)
+from opentelemetry.trace import Link, SpanKind, StatusCode
+from opentelemetry.util.types import Attributes
+
+logger = structlog.get_logger()
+
+# Span events that always keep their trace (see ConvergioTelemetry.record_budget_status)
+KEEP_EVENT_PREFIXES = ("budget.",)
+# Boolean span attributes that always keep their trace
+KEEP_ATTRIBUTES = ("performance.degraded", "security.critical")
+# Attributes still set on spans of unselected traces in low-overhead mode
+ESSENTIAL_ATTRIBUTES = frozenset({
+    "conversation.id", "conversation_id", "agent.name", "agent", "tool.name", "workflow.id",
+})
+
+_TRACE_ID_MASK = (1 << 64) - 1
+
+
+def ratio_selected(trace_id: int, ratio: float) -> bool:
+    """Deterministic per-trace coin flip, the same for every span of the trace"""
+    return (trace_id & _TRACE_ID_MASK) < int(ratio * (_TRACE_ID_MASK + 1))
+
+
+@dataclass
+class TailSamplingConfig:
+    """Sampling policy; defaults mirror the Settings fields"""
+    healthy_ratio: float = 0.1
+    latency_threshold_ms: float = 2000.0
+    decision_wait_seconds: float = 30.0
+    max_pending_traces: int = 10_000
+    max_spans_per_trace: int = 512
+    low_overhead: bool = False
+
+    @classmethod
+    def from_settings(cls, settings=None) -> "TailSamplingConfig":
+        if settings is None:
+            try:
+                from ..utils.config import get_settings
+                settings = get_settings()
+            except Exception:
+                return cls()
+        return cls(
+            healthy_ratio=getattr(settings, "tracing_sample_rate", cls.healthy_ratio),
+            latency_threshold_ms=getattr(settings, "tracing_latency_threshold_ms", cls.latency_threshold_ms),
+            low_overhead=getattr(settings, "tracing_low_overhead", cls.low_overhead),
+        )
+
+    def sampler(self) -> Sampler:
+        """Head sampler for the TracerProvider"""
+        if self.low_overhead:
+            return LowOverheadSampler(self.healthy_ratio)
+        return ParentBased(ALWAYS_ON)
+
+
+class LowOverheadSampler(Sampler):
+    """
+    Records every span but keeps full attributes only on traces the healthy
+    ratio selects up front.
+
+    Spans of other traces still carry their name, status, events and timing,
+    so the tail processor can keep them on error or latency; only the
+    essential identifiers are attached, which skips attribute validation and
+    export encoding for the traces that are most likely dropped.
+    """
+
+    def __init__(self, healthy_ratio: float):
+        self.healthy_ratio = healthy_ratio
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state=None,
+    ) -> SamplingResult:
+        parent = trace.get_current_span(parent_context).get_span_context()
+        if parent.is_valid and not parent.trace_flags.sampled:
+            # Respect the upstream decision, as ParentBased does
+            return SamplingResult(Decision.DROP, None, parent.trace_state)
+
+        if attributes and not ratio_selected(trace_id, self.healthy_ratio):
+            attributes = {key: value for key, value in attributes.items() if key in ESSENTIAL_ATTRIBUTES}
+        return SamplingResult(
+            Decision.RECORD_AND_SAMPLE, attributes, parent.trace_state if parent.is_valid else None
+        )
+
+    def get_description(self) -> str:
+        return f"LowOverheadSampler{{{self.healthy_ratio}}}"
+
+
+class _PendingTrace:
+    __slots__ = ("spans", "created", "keep_reason")
+
+    def __init__(self, created: float):
+        self.spans: List[ReadableSpan] = []
+        self.created = created
+        self.keep_reason: Optional[str] = None
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """
+    Buffers ended spans per trace and forwards kept traces to ``delegate``
+    (normally a BatchSpanProcessor).
+
+    A trace is decided when its local root span ends, when it has waited
+    ``decision_wait_seconds``, when it outgrows ``max_spans_per_trace`` or
+    when it is the oldest of ``max_pending_traces``. Spans ending after the
+    decision follow it; an interesting late span is exported on its own.
+    """
+
+    def __init__(self, delegate: SpanProcessor, config: Optional[TailSamplingConfig] = None, clock=time.monotonic):
+        self.delegate = delegate
+        self.config = config or TailSamplingConfig()
+        self.clock = clock
+        self._pending: "OrderedDict[int, _PendingTrace]" = OrderedDict()
+        self._decided: "OrderedDict[int, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = clock()
+        self.stats = {
+            "traces_kept": 0,
+            "traces_dropped": 0,
+            "spans_exported": 0,
+            "spans_dropped": 0,
+            "kept_by": {},
+        }
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self.delegate.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        trace_id = span.context.trace_id
+        reason = self._keep_reason(span)
+        ready: List[List[ReadableSpan]] = []
+
+        with self._lock:
+            decided = self._decided.get(trace_id)
+            if decided is not None:
+                if decided or reason:
+                    ready.append([span])
+                else:
+                    self.stats["spans_dropped"] += 1
+            else:
+                now = self.clock()
+                pending = self._pending.get(trace_id)
+                if pending is None:
+                    pending = self._pending[trace_id] = _PendingTrace(now)
+                pending.spans.append(span)
+                pending.keep_reason = pending.keep_reason or reason
+
+                if span.parent is None or span.parent.is_remote or len(pending.spans) >= self.config.max_spans_per_trace:
+                    ready.append(self._decide(trace_id))
+                ready.extend(self._expire(now))
+
+        for spans in ready:
+            for ended in spans:
+                self.delegate.on_end(ended)
+
+    def _keep_reason(self, span: ReadableSpan) -> Optional[str]:
+        if span.status.status_code is StatusCode.ERROR:
+            return "error"
+        if span.end_time and span.start_time:
+            if (span.end_time - span.start_time) / 1e6 >= self.config.latency_threshold_ms:
+                return "latency"
+        for event in span.events:
+            if event.name.startswith(KEEP_EVENT_PREFIXES):
+                return "budget"
+        attributes = span.attributes or {}
+        for key in KEEP_ATTRIBUTES:
+            if attributes.get(key):
+                return key
+        return None
+
+    def _decide(self, trace_id: int) -> List[ReadableSpan]:
+        """Settle a pending trace; returns the spans to export. Caller holds the lock."""
+        pending = self._pending.pop(trace_id)
+        reason = pending.keep_reason
+        if reason is None and ratio_selected(trace_id, self.config.healthy_ratio):
+            reason = "ratio"
+
+        self._decided[trace_id] = reason is not None
+        if len(self._decided) > self.config.max_pending_traces:
+            self._decided.popitem(last=False)
+
+        if reason is None:
+            self.stats["traces_dropped"] += 1
+            self.stats["spans_dropped"] += len(pending.spans)
+            return []
+        self.stats["traces_kept"] += 1
+        self.stats["spans_exported"] += len(pending.spans)
+        self.stats["kept_by"][reason] = self.stats["kept_by"].get(reason, 0) + 1
+        return pending.spans
+
+    def _expire(self, now: float) -> List[List[ReadableSpan]]:
+        ready = []
+        while len(self._pending) > self.config.max_pending_traces:
+            ready.append(self._decide(next(iter(self._pending))))
+
+        if now - self._last_sweep >= 1.0:
+            self._last_sweep = now
+            # Insertion order is creation order, so the overdue traces come first
+            for trace_id, pending in list(self._pending.items()):
+                if now - pending.created < self.config.decision_wait_seconds:
+                    break
+                ready.append(self._decide(trace_id))
+        return ready
+
+    def _decide_all(self):
+        with self._lock:
+            ready = [self._decide(trace_id) for trace_id in list(self._pending)]
+        for spans in ready:
+            for ended in spans:
+                self.delegate.on_end(ended)
+
+    def shutdown(self) -> None:
+        self._decide_all()
+        self.delegate.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        # Incomplete traces stay buffered; flushing them would decide on partial evidence
+        return self.delegate.force_flush(timeout_millis)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending_spans = sum(len(pending.spans) for pending in self._pending.values())
+            return {
+                **self.stats,
+                "kept_by": dict(self.stats["kept_by"]),
+                "pending_traces": len(self._pending),
+                "pending_spans": pending_spans,
+                "healthy_ratio": self.config.healthy_ratio,
+                "low_overhead": self.config.low_overhead,
+            }
+
+
+__all__ = [
+    "LowOverheadSampler",
+    "TailSamplingConfig",
+    "TailSamplingSpanProcessor",
+    "ratio_selected",
+]
@@ -36,9 +36,17 @@ class RealAgentOrchestrator:
         self.agents_directory: str = os.path.join(backend_dir, "src", "agents", "definitions")
         
         self._initialized = False
+        # Background startup and a first request may both trigger initialization
+        self._init_lock = asyncio.Lock()
     
     async def initialize(self) -> None:
         """Initialize the REAL agent system."""
+        async with self._init_lock:
+            if self._initialized:
+                return
+            await self._initialize()
+    
+    async def _initialize(self) -> None:
         try:
             logger.info("🚀 Initializing REAL Agent System with UnifiedOrchestrator")
             
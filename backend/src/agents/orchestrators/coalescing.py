@@ -0,0 +1,266 @@
+"""
+Request Coalescing
+Single-flight execution of identical concurrent orchestration requests, with
+shared streams and a short-lived result cache governed by per-route rules
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class CoalescePolicy:
+    """Eligibility rules for one route"""
+    # "user": duplicates are shared only within a user and conversation;
+    # "global": shared across users (only for responses without per-user context)
+    scope: str = "user"
+    cache_ttl_seconds: float = 0.0  # 0 = share in-flight work only
+    context_keys: Tuple[str, ...] = ()  # Context entries that change the answer
+
+
+ROUTE_POLICIES: Dict[str, CoalescePolicy] = {
+    "agents.orchestrate": CoalescePolicy(
+        scope="user",
+        context_keys=("target_agent", "multi_agent_preferred", "rag_limit", "rag_threshold",
+                      "include_history", "include_knowledge")
+    ),
+    "agents.stream": CoalescePolicy(scope="user", context_keys=("target_agent",)),
+    "dashboard": CoalescePolicy(
+        scope="global",
+        cache_ttl_seconds=30.0,
+        context_keys=("target_agent", "multi_agent_preferred")
+    ),
+}
+
+# Context flags that always make a request unique
+_UNSHAREABLE_CONTEXT = ("test_mode", "workflow_execution", "input_data")
+
+
+def _normalize_message(message: str) -> str:
+    return re.sub(r"\s+", " ", message).strip().casefold()
+
+
+class _SharedStream:
+    """Fan-out of one producer stream; late subscribers replay earlier chunks"""
+
+    def __init__(self, source: AsyncIterator[Any]):
+        self.chunks: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self._changed = asyncio.Condition()
+        self._task = asyncio.create_task(self._pump(source))
+
+    async def _pump(self, source: AsyncIterator[Any]):
+        try:
+            async for chunk in source:
+                async with self._changed:
+                    self.chunks.append(chunk)
+                    self._changed.notify_all()
+        except BaseException as e:
+            self.error = e
+        finally:
+            async with self._changed:
+                self.done = True
+                self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        index = 0
+        self.subscribers += 1
+        try:
+            while True:
+                async with self._changed:
+                    await self._changed.wait_for(lambda: index < len(self.chunks) or self.done)
+                    pending = self.chunks[index:]
+                    finished = self.done
+                for chunk in pending:
+                    yield chunk
+                index += len(pending)
+                if finished and index >= len(self.chunks):
+                    break
+        finally:
+            self.subscribers -= 1
+            # Nobody is listening any more: stop paying for the producer
+            if self.subscribers == 0 and not self.done:
+                self._task.cancel()
+        if self.error is not None and not isinstance(self.error, asyncio.CancelledError):
+            raise self.error
+
+
+@dataclass
+class _CacheEntry:
+    expires_at: float
+    result: Dict[str, Any] = field(default_factory=dict)
+
+
+class RequestCoalescer:
+    """
+    Single-flight layer for orchestration requests.
+
+    Requests are only coalesced when their route has a policy in
+    ``ROUTE_POLICIES``. Concurrent duplicates await the one in-flight
+    execution (or subscribe to its stream) and receive their own copy of the
+    result. Routes with a cache TTL also serve successful results for that
+    long afterwards. Errors are shared with the waiters of that execution but
+    never cached.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, CoalescePolicy]] = None,
+        max_cache_entries: int = 512
+    ):
+        self.policies = ROUTE_POLICIES if policies is None else policies
+        self.max_cache_entries = max_cache_entries
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._streams: Dict[str, _SharedStream] = {}
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self.stats = {
+            "executions": 0,
+            "coalesced": 0,
+            "cache_hits": 0,
+            "streams": 0,
+            "stream_subscribers": 0
+        }
+
+    def key_for(
+        self,
+        route: Optional[str],
+        message: str,
+        target_agent: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+        conversation_id: Optional[str] = None
+    ) -> Optional[str]:
+        """Coalescing key, or None if the request is not eligible"""
+        policy = self.policies.get(route or "")
+        if policy is None:
+            return None
+        context = context or {}
+        if any(context.get(flag) for flag in _UNSHAREABLE_CONTEXT):
+            return None
+
+        identity: Dict[str, Any] = {
+            "route": route,
+            "message": _normalize_message(message),
+            "agent": (target_agent or "").lower().replace("-", "_"),
+            "context": {key: context.get(key) for key in policy.context_keys if key in context}
+        }
+        if policy.scope == "user":
+            if user_id is None and conversation_id is None:
+                # Anonymous callers cannot be told apart
+                return None
+            identity["user"] = user_id
+            identity["conversation"] = conversation_id
+        elif conversation_id:
+            # Conversation history makes the answer user-specific
+            return None
+
+        digest = hashlib.sha256(
+            json.dumps(identity, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f"{route}:{digest}"
+
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry.result
+
+    def _store(self, key: str, route: str, result: Dict[str, Any]):
+        ttl = self.policies[route].cache_ttl_seconds
+        if ttl <= 0 or result.get("error") or result.get("blocked"):
+            return
+        self._cache[key] = _CacheEntry(time.monotonic() + ttl, copy.deepcopy(result))
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+
+    async def run(
+        self,
+        key: Optional[str],
+        factory: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Execute ``factory`` once for all concurrent callers with ``key``"""
+        if key is None:
+            return await factory()
+
+        cached = self._cached(key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return {**copy.deepcopy(cached), "coalesced": "cache"}
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            # Shielded so one caller's cancellation does not cancel the shared run
+            result = await asyncio.shield(task)
+            return {**copy.deepcopy(result), "coalesced": "in_flight"}
+
+        self.stats["executions"] += 1
+        task = asyncio.ensure_future(factory())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self._store(key, key.split(":", 1)[0], task.result())
+
+    async def stream(
+        self,
+        key: Optional[str],
+        factory: Callable[[], AsyncIterator[Any]]
+    ) -> AsyncIterator[Any]:
+        """Yield the chunks of one shared producer stream for all callers with ``key``"""
+        if key is None:
+            async for chunk in factory():
+                yield chunk
+            return
+
+        shared = self._streams.get(key)
+        if shared is None or shared.done:
+            shared = _SharedStream(factory())
+            self._streams[key] = shared
+            # Subscribers keep their own reference; the registry only tracks live producers
+            shared._task.add_done_callback(lambda _: self._release_stream(key, shared))
+            self.stats["streams"] += 1
+        else:
+            self.stats["coalesced"] += 1
+        self.stats["stream_subscribers"] += 1
+
+        async for chunk in shared.subscribe():
+            yield chunk
+
+    def _release_stream(self, key: str, shared: _SharedStream):
+        if self._streams.get(key) is shared:
+            del self._streams[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Coalescing counters and current occupancy"""
+        return {
+            **self.stats,
+            "in_flight": len(self._inflight),
+            "active_streams": len(self._streams),
+            "cached": len(self._cache)
+        }
+
+
+__all__ = ["CoalescePolicy", "ROUTE_POLICIES", "RequestCoalescer"]
@@ -0,0 +1,151 @@
+"""
+Warm Instance Pool
+Checkout/checkin pool of reset-able AutoGen teams and agents so concurrent
+requests never share conversation state
+"""
+
+import asyncio
+import inspect
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Union
+
+import structlog
+
+logger = structlog.get_logger()
+
+Factory = Callable[[], Union[Any, Awaitable[Any]]]
+Resetter = Callable[[Any], Awaitable[None]]
+
+
+class PoolTimeoutError(Exception):
+    """No pooled instance became available within the acquire timeout"""
+
+
+class InstancePool:
+    """
+    Bounded pool of pre-built instances with checkout/checkin semantics.
+
+    At most ``max_size`` instances exist and are checked out at once; further
+    callers queue for up to ``acquire_timeout`` seconds. Instances are reset
+    on checkin and discarded (then rebuilt on demand) if the reset fails or
+    the run raised, so a checked-out instance always starts clean.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Factory,
+        max_size: int = 4,
+        acquire_timeout: Optional[float] = 30.0,
+        reset: Optional[Resetter] = None
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.name = name
+        self.factory = factory
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.reset = reset
+        self._idle: Deque[Any] = deque()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+        self.stats: Dict[str, Any] = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "discarded": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0
+        }
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_size)
+        return self._slots
+
+    async def _build(self) -> Any:
+        instance = self.factory()
+        if inspect.isawaitable(instance):
+            instance = await instance
+        self._created += 1
+        return instance
+
+    async def warm(self, count: int) -> int:
+        """Pre-build up to ``count`` idle instances; returns how many were added"""
+        added = 0
+        while added < count and self._created < self.max_size:
+            self._idle.append(await self._build())
+            added += 1
+        return added
+
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[Any]:
+        """Borrow an instance for the duration of the block"""
+        slots = self._semaphore()
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            if self.acquire_timeout is None:
+                await slots.acquire()
+            else:
+                await asyncio.wait_for(slots.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise PoolTimeoutError(
+                f"No {self.name} instance available within {self.acquire_timeout}s"
+            )
+        finally:
+            self._waiting -= 1
+
+        wait_ms = (time.perf_counter() - started) * 1000.0
+        self.stats["checkouts"] += 1
+        self.stats["total_wait_ms"] += wait_ms
+        self.stats["max_wait_ms"] = max(self.stats["max_wait_ms"], wait_ms)
+
+        instance = None
+        healthy = False
+        try:
+            instance = self._idle.popleft() if self._idle else await self._build()
+            self._in_use += 1
+            yield instance
+            healthy = True
+        finally:
+            if instance is not None:
+                self._in_use -= 1
+                await self._checkin(instance, healthy)
+            slots.release()
+
+    async def _checkin(self, instance: Any, healthy: bool):
+        if healthy and self.reset is not None:
+            try:
+                await self.reset(instance)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to reset pooled {self.name} instance: {e}")
+                healthy = False
+
+        if healthy:
+            self._idle.append(instance)
+        else:
+            # Rebuilt lazily on a later checkout
+            self._created -= 1
+            self.stats["discarded"] += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool occupancy and wait-time metrics"""
+        checkouts = self.stats["checkouts"]
+        return {
+            **self.stats,
+            "name": self.name,
+            "max_size": self.max_size,
+            "created": self._created,
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "waiting": self._waiting,
+            "avg_wait_ms": self.stats["total_wait_ms"] / checkouts if checkouts else 0.0
+        }
+
+
+__all__ = ["InstancePool", "PoolTimeoutError"]
@@ -4,6 +4,7 @@ Consolidates all orchestration strategies into a single, efficient implementatio
 """
 
 import asyncio
+import time
 from typing import Dict, List, Any, Optional, AsyncGenerator, Tuple
 from datetime import datetime
 import structlog
@@ -12,8 +13,11 @@ from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.teams import RoundRobinGroupChat
 from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
 from autogen_agentchat.messages import TextMessage
+from autogen_core import CancellationToken
 
 from .base import BaseGroupChatOrchestrator
+from .pool import InstancePool, PoolTimeoutError
+from .coalescing import RequestCoalescer
 # Inline resilience components (moved from removed resilience.py)
 from enum import Enum
 from typing import Callable
@@ -152,6 +156,14 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
         
         # Health monitoring
         self.health_monitor = HealthMonitor(check_interval=30)
+        
+        # Per-request instances: a warm pool of teams and one pool per agent
+        self._tools: List[Any] = []
+        self.team_pool: Optional[InstancePool] = None
+        self.agent_pools: Dict[str, InstancePool] = {}
+        
+        # Opt-in single-flight for identical concurrent requests (see coalescing.ROUTE_POLICIES)
+        self.coalescer = RequestCoalescer()
     
     async def initialize(
         self,
@@ -189,6 +201,7 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
             all_tools.extend(get_vector_tools())
             
             logger.info(f"🔧 Prepared {len(all_tools)} tools for agents")
+            self._tools = all_tools
             
             # Create AutoGen AssistantAgent instances WITH TOOLS
             self.agents = self.agent_loader.create_autogen_agents(
@@ -216,6 +229,19 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
                     termination_condition=termination,
                     max_turns=self.max_rounds,
                 )
+                
+                # Requests run on pooled teams with their own participants;
+                # the shared group_chat above is kept for legacy callers
+                settings = get_settings()
+                self.team_pool = InstancePool(
+                    "team",
+                    self._build_team,
+                    max_size=settings.AGENT_TEAM_POOL_SIZE,
+                    acquire_timeout=settings.AGENT_POOL_ACQUIRE_TIMEOUT,
+                    reset=self._reset_team,
+                )
+                warmed = await self.team_pool.warm(settings.AGENT_TEAM_POOL_WARM)
+                logger.info(f"🏊 Team pool ready ({warmed} warm, max {settings.AGENT_TEAM_POOL_SIZE})")
             
             # Initialize RAG processor if enabled
             if kwargs.get("enable_rag", True):  # Enabled by default now
@@ -254,6 +280,63 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
             # Circuit breaker tracks failures automatically
             return False
     
+    def _build_agent(self, agent_key: str) -> AssistantAgent:
+        """Build a fresh agent instance for the pool, configured like the registered agent"""
+        if self.agent_loader and agent_key in self.agent_loader.agent_metadata:
+            return self.agent_loader.create_autogen_agent(agent_key, self.model_client, self._tools)
+        
+        registered = self.agents.get(agent_key)
+        if registered is None:
+            raise KeyError(f"Unknown agent '{agent_key}'")
+        # Registered without a loader definition (e.g. the dev/test fallback): copy its setup
+        system_messages = registered._system_messages
+        return AssistantAgent(
+            agent_key,
+            model_client=self.model_client,
+            description=registered.description,
+            system_message=system_messages[0].content if system_messages else None,
+            tools=list(registered._tools) or None,
+        )
+    
+    def _build_team(self) -> RoundRobinGroupChat:
+        """Build a team with its own participant instances"""
+        termination = MaxMessageTermination(self.max_rounds) | TextMentionTermination("TERMINATE")
+        return RoundRobinGroupChat(
+            participants=[self._build_agent(key) for key in self.agents],
+            termination_condition=termination,
+            max_turns=self.max_rounds,
+        )
+    
+    @staticmethod
+    async def _reset_team(team: RoundRobinGroupChat):
+        await team.reset()
+    
+    @staticmethod
+    async def _reset_agent(agent: AssistantAgent):
+        await agent.on_reset(CancellationToken())
+    
+    def _agent_pool(self, agent_key: str) -> InstancePool:
+        """Pool of instances for one agent, created on first use"""
+        pool = self.agent_pools.get(agent_key)
+        if pool is None:
+            settings = get_settings()
+            pool = InstancePool(
+                f"agent:{agent_key}",
+                lambda: self._build_agent(agent_key),
+                max_size=settings.AGENT_INSTANCE_POOL_SIZE,
+                acquire_timeout=settings.AGENT_POOL_ACQUIRE_TIMEOUT,
+                reset=self._reset_agent,
+            )
+            self.agent_pools[agent_key] = pool
+        return pool
+    
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Wait-time and occupancy metrics for the team and agent pools"""
+        return {
+            "team": self.team_pool.get_metrics() if self.team_pool else None,
+            "agents": {key: pool.get_metrics() for key, pool in self.agent_pools.items()},
+        }
+    
     def get_agent_metadata(self, agent_key: str):
         """Get original metadata for an agent"""
         if not self.agent_loader:
@@ -281,74 +364,123 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
         1. Single agent for focused queries (most efficient)
         2. Multi-agent GroupChat for complex queries
         3. Falls back gracefully on failures
+        
+        Callers opt into request coalescing with ``context["coalesce_route"]``;
+        identical concurrent requests on an eligible route share one execution.
         """
         
         # Check circuit breaker state
         if self.circuit_breaker.state == CircuitState.OPEN:
             return self._circuit_breaker_response()
         
+        key = None
+        if context and context.get("coalesce_route"):
+            key = self.coalescer.key_for(
+                context["coalesce_route"], message, context.get("target_agent"),
+                context, user_id, conversation_id
+            )
+        return await self.coalescer.run(
+            key, lambda: self._orchestrate(message, context, user_id, conversation_id)
+        )
+    
+    async def _orchestrate(
+        self,
+        message: str,
+        context: Optional[Dict[str, Any]],
+        user_id: Optional[str],
+        conversation_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Run one orchestration request end to end"""
         start_time = datetime.now()
         
         try:
-            # Safety check if enabled (non-blocking in test/dev or when explicitly in test mode)
-            if self.safety_guardian:
-                safety_result = await self.safety_guardian.validate_prompt(message, user_id)
-                is_test_env = get_settings().ENVIRONMENT in ("test", "development")
-                is_test_mode = bool((context or {}).get("test_mode"))
-                if not safety_result.execution_authorized and not (is_test_env or is_test_mode):
-                    return {
-                        "response": f"Security validation failed: {', '.join(safety_result.violations)}",
-                        "agents_used": ["safety_guardian"],
-                        "turn_count": 0,
-                        "duration_seconds": 0,
-                        "blocked": True
-                    }
-            
             # Check if a specific agent is requested
             target_agent = context.get("target_agent") if context else None
+            stage_timings: Dict[str, float] = {}
+            stages_started = time.perf_counter()
             
-            # Add RAG context if available
-            enhanced_message = message
+            # Safety validation and RAG retrieval are independent, so run
+            # them concurrently; routing is CPU-only and runs meanwhile
+            safety_task = None
+            if self.safety_guardian:
+                safety_task = asyncio.create_task(self._timed_stage(
+                    stage_timings, "safety", self.safety_guardian.validate_prompt(message, user_id), stages_started
+                ))
+            rag_task = None
             if self.rag_processor and context:
-                try:
-                    # Use AdvancedRAGProcessor to build memory context
-                    rag_context_message = await self.rag_processor.build_memory_context(
-                        user_id=user_id,
-                        agent_id=target_agent if target_agent else None,
-                        query=message,
-                        limit=context.get("rag_limit", 5),
-                        similarity_threshold=context.get("rag_threshold", 0.3),
-                        include_conversation_history=context.get("include_history", True),
-                        include_knowledge_base=context.get("include_knowledge", True)
-                    )
-                    
-                    if rag_context_message and rag_context_message.content:
-                        enhanced_message = f"{message}\n\n{rag_context_message.content}"
-                        logger.info("✅ RAG context added to message", 
-                                       original_length=len(message), 
-                                       enhanced_length=len(enhanced_message))
-                except Exception as e:
-                    logger.warning(f"⚠️ RAG context generation failed: {e}")
-                    # Continue with original message if RAG fails
+                rag_task = asyncio.create_task(self._timed_stage(
+                    stage_timings, "rag", self._build_rag_context(message, context, user_id, target_agent), stages_started
+                ))
             
-            # Determine routing strategy
-            # If Ali is targeted explicitly or caller prefers multi-agent, use GroupChat
-            multi_agent_preferred = bool((context or {}).get("multi_agent_preferred"))
-            ali_targeted = False
-            if target_agent:
-                ta = target_agent.lower().replace('-', '_')
-                ali_targeted = ta in ("ali_chief_of_staff", "ali", "ali-chief-of-staff")
+            try:
+                # Let both stages issue their I/O before routing takes the loop
+                await asyncio.sleep(0)
+                
+                routing_started = time.perf_counter()
+                # Determine routing strategy
+                # If Ali is targeted explicitly or caller prefers multi-agent, use GroupChat
+                multi_agent_preferred = bool((context or {}).get("multi_agent_preferred"))
+                ali_targeted = False
+                if target_agent:
+                    ta = target_agent.lower().replace('-', '_')
+                    ali_targeted = ta in ("ali_chief_of_staff", "ali", "ali-chief-of-staff")
 
-            if (ali_targeted or multi_agent_preferred) and getattr(self, 'group_chat', None):
-                should_use_single = False
-            else:
-                # Default behavior: single agent for efficiency, unless router signals multi-agent
-                should_use_single = self.router.should_use_single_agent(message)
+                selected_agent = None
+                if (ali_targeted or multi_agent_preferred) and getattr(self, 'group_chat', None):
+                    should_use_single = False
+                else:
+                    # Default behavior: single agent for efficiency, unless router signals multi-agent
+                    should_use_single = self.router.should_use_single_agent(message)
+                    if should_use_single and not target_agent and self.agents:
+                        selected_agent = self.router.select_best_agent(
+                            message,
+                            list(self.agents.values()),
+                            context
+                        )
+                stage_timings["routing"] = (time.perf_counter() - routing_started) * 1000.0
+                
+                # Safety check if enabled (non-blocking in test/dev or when explicitly in test mode)
+                if safety_task:
+                    safety_result = await safety_task
+                    is_test_env = get_settings().ENVIRONMENT in ("test", "development")
+                    is_test_mode = bool((context or {}).get("test_mode"))
+                    if not safety_result.execution_authorized and not (is_test_env or is_test_mode):
+                        return {
+                            "response": f"Security validation failed: {', '.join(safety_result.violations)}",
+                            "agents_used": ["safety_guardian"],
+                            "turn_count": 0,
+                            "duration_seconds": 0,
+                            "blocked": True
+                        }
+                
+                # Add RAG context if it arrives within its latency budget
+                enhanced_message = message
+                rag_skipped = None
+                if rag_task:
+                    budget_ms = (context or {}).get("rag_budget_ms", get_settings().RAG_LATENCY_BUDGET_MS)
+                    remaining = budget_ms / 1000.0 - (time.perf_counter() - stages_started)
+                    done, _ = await asyncio.wait({rag_task}, timeout=max(remaining, 0.0))
+                    if rag_task in done:
+                        rag_context = rag_task.result()
+                        if rag_context:
+                            enhanced_message = f"{message}\n\n{rag_context}"
+                            logger.info("✅ RAG context added to message", 
+                                           original_length=len(message), 
+                                           enhanced_length=len(enhanced_message))
+                    else:
+                        rag_skipped = "timeout"
+                        logger.warning(f"⏱️ RAG context skipped: exceeded {budget_ms}ms budget")
+            finally:
+                # A blocked prompt, an error or a missed budget abandons in-flight work
+                for task in (safety_task, rag_task):
+                    if task and not task.done():
+                        task.cancel()
             
             if should_use_single:
                 # Route to single best agent
                 result = await self._execute_single_agent(
-                    enhanced_message, context, user_id, conversation_id
+                    enhanced_message, context, user_id, conversation_id,
+                    selected_agent=selected_agent
                 )
             else:
                 # Use multi-agent GroupChat
@@ -356,6 +488,10 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
                     enhanced_message, context, user_id, conversation_id
                 )
             
+            result["stage_timings_ms"] = {name: round(ms, 2) for name, ms in stage_timings.items()}
+            if rag_skipped:
+                result["rag_skipped"] = rag_skipped
+            
             # Update metrics and track REAL costs
             duration = (datetime.now() - start_time).total_seconds()
             self.update_metrics(
@@ -391,6 +527,42 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
                 "error": str(e)
             }
 
+    @staticmethod
+    async def _timed_stage(timings: Dict[str, float], name: str, awaitable, started: float) -> Any:
+        """Await a pre-processing stage and record its duration since ``started`` (its scheduling)"""
+        try:
+            return await awaitable
+        finally:
+            timings[name] = (time.perf_counter() - started) * 1000.0
+    
+    async def _build_rag_context(
+        self,
+        message: str,
+        context: Dict[str, Any],
+        user_id: Optional[str],
+        target_agent: Optional[str]
+    ) -> Optional[str]:
+        """Memory context for the prompt; None if RAG fails"""
+        try:
+            # Use AdvancedRAGProcessor to build memory context
+            rag_context_message = await self.rag_processor.build_memory_context(
+                user_id=user_id,
+                agent_id=target_agent if target_agent else None,
+                query=message,
+                limit=context.get("rag_limit", 5),
+                similarity_threshold=context.get("rag_threshold", 0.3),
+                include_conversation_history=context.get("include_history", True),
+                include_knowledge_base=context.get("include_knowledge", True)
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ RAG context generation failed: {e}")
+            # Continue with original message if RAG fails
+            return None
+        
+        if rag_context_message and rag_context_message.content:
+            return rag_context_message.content
+        return None
+    
     # Backward-compatibility alias used in some older call sites/tests
     async def process_query(
         self,
@@ -413,7 +585,8 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
         message: str,
         context: Optional[Dict[str, Any]],
         user_id: str,
-        conversation_id: str
+        conversation_id: str,
+        selected_agent: Optional[AssistantAgent] = None
     ) -> Dict[str, Any]:
         """Execute with a single agent for efficiency"""
         
@@ -438,7 +611,10 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
                 logger.warning(f"⚠️ Requested agent not found: {target_agent_name}, available: {list(self.agents.keys())}")
                 # Fall through to normal selection
         
-        if not best_agent:
+        if not best_agent and selected_agent is not None:
+            # Already chosen by orchestrate() while safety/RAG were in flight
+            best_agent = selected_agent
+        elif not best_agent:
             # Select best agent normally
             best_agent = self.router.select_best_agent(
                 message,
@@ -470,8 +646,9 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
             from autogen_agentchat.messages import TextMessage
             task_message = TextMessage(content=message, source="user")
             
-            # Run the agent - tools should now work since they're passed at creation
-            result = await best_agent.run(task=task_message)
+            # Run a pooled instance so concurrent requests never share its history
+            async with self._agent_pool(best_agent.name).checkout() as agent:
+                result = await agent.run(task=task_message)
             
             # Extract response from result
             if hasattr(result, 'messages'):
@@ -495,6 +672,9 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
             else:
                 final_response = str(result)
                 
+        except PoolTimeoutError as e:
+            logger.warning(f"⏳ {e}")
+            return self._pool_busy_response([best_agent.name])
         except Exception as e:
             logger.error(f"Agent execution failed: {e}", exc_info=True)
             final_response = f"AGENT EXECUTION ERROR: {str(e)}"
@@ -519,7 +699,7 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
         
         logger.info("🤝 Multi-agent execution via GroupChat")
         
-        if not self.group_chat:
+        if not self.team_pool:
             # Fallback to single agent if no group chat
             return await self._execute_single_agent(
                 message, context, user_id, conversation_id
@@ -527,8 +707,13 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
         
         # Run group chat
         task_message = TextMessage(content=message, source="user")
-        # Run team with the task; termination is configured at construction time
-        result = await self.group_chat.run(task=task_message)
+        # Run a pooled team with the task; termination is configured at construction time
+        try:
+            async with self.team_pool.checkout() as team:
+                result = await team.run(task=task_message)
+        except PoolTimeoutError as e:
+            logger.warning(f"⏳ {e}")
+            return self._pool_busy_response([])
         
         # Extract results
         messages = result.messages if hasattr(result, 'messages') else []
@@ -575,16 +760,22 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
         
         logger.info(f"🔄 Streaming via {best_agent.name}")
         
-        # Stream agent response
-        async for chunk in best_agent.run_stream(task=message):
-            if hasattr(chunk, 'content') and isinstance(chunk.content, str):
-                # Send to websocket
-                await websocket.send_json({
-                    "type": "chunk",
-                    "content": chunk.content,
-                    "agent": best_agent.name
-                })
-                yield chunk.content
+        # Identical concurrent streams on an opted-in route share one agent run
+        key = None
+        if context and context.get("coalesce_route"):
+            key = self.coalescer.key_for(
+                context["coalesce_route"], message, best_agent.name, context,
+                kwargs.get("user_id"), kwargs.get("conversation_id")
+            )
+        
+        async for content in self.coalescer.stream(key, lambda: self._stream_agent(best_agent.name, message)):
+            # Send to websocket
+            await websocket.send_json({
+                "type": "chunk",
+                "content": content,
+                "agent": best_agent.name
+            })
+            yield content
         
         # Send completion signal
         await websocket.send_json({
@@ -592,6 +783,13 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
             "agent": best_agent.name
         })
     
+    async def _stream_agent(self, agent_name: str, message: str) -> AsyncGenerator[str, None]:
+        """Text chunks of one pooled agent run"""
+        async with self._agent_pool(agent_name).checkout() as agent:
+            async for chunk in agent.run_stream(task=message):
+                if hasattr(chunk, 'content') and isinstance(chunk.content, str):
+                    yield chunk.content
+    
     def _check_termination(self, messages: List[Any]) -> bool:
         """Check if conversation should terminate"""
         if not messages:
@@ -616,7 +814,11 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
     
     def get_health_status(self) -> Dict[str, Any]:
         """Get health monitoring status"""
-        return self.health_monitor.get_health_status()
+        return {
+            **self.health_monitor.get_health_status(),
+            "pools": self.get_pool_metrics(),
+            "coalescing": self.coalescer.get_stats()
+        }
     
     async def shutdown(self):
         """Shutdown orchestrator and cleanup resources"""
@@ -634,6 +836,17 @@ class UnifiedOrchestrator(BaseGroupChatOrchestrator):
             "circuit_status": self.circuit_breaker.get_status()
         }
     
+    def _pool_busy_response(self, agents: List[str]) -> Dict[str, Any]:
+        """Response when no pooled instance frees up within the acquire timeout"""
+        return {
+            "response": "All agents are busy right now. Please try again in a moment.",
+            "agents_used": agents,
+            "turn_count": 0,
+            "duration_seconds": 0,
+            "error": "pool_timeout",
+            "pool_metrics": self.get_pool_metrics()
+        }
+    
     # ===================== SWARM ORCHESTRATION =====================
     async def orchestrate_swarm(
         self,
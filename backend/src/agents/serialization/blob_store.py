@@ -0,0 +1,156 @@
+"""
+Content-Addressed Blob Store for serialized components
+Stores each distinct component payload once, compressed, keyed by its SHA-256
+"""
+
+import hashlib
+import zlib
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+# One-byte codec tag in front of every stored blob, so blobs written with
+# zstd stay readable (and vice versa) whatever is installed later
+_ZLIB = b"z"
+_ZSTD = b"s"
+
+
+def content_hash(data: bytes) -> str:
+    """Address of a payload"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def compress(data: bytes, level: int = 6) -> bytes:
+    if ZSTD_AVAILABLE:
+        return _ZSTD + zstandard.ZstdCompressor(level=level).compress(data)
+    return _ZLIB + zlib.compress(data, level)
+
+
+def decompress(blob: bytes) -> bytes:
+    codec, body = blob[:1], blob[1:]
+    if codec == _ZLIB:
+        return zlib.decompress(body)
+    if codec == _ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Blob is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(body)
+    raise ValueError(f"Unknown blob codec {codec!r}")
+
+
+class ComponentBlobStore:
+    """
+    Deduplicated, compressed payload storage.
+
+    ``put`` writes a payload only if its hash is not stored yet and otherwise
+    just extends the blob's TTL, so a blob lives as long as the most recent
+    snapshot or component referencing it. Without Redis blobs are kept in
+    memory.
+    """
+
+    def __init__(self, redis_client=None, key_prefix: str = "component_blob:", ttl_seconds: int = 86400 * 90):
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        self._local: Dict[str, bytes] = {}
+        self.stats = {"writes": 0, "dedup_hits": 0, "bytes_in": 0, "bytes_stored": 0}
+
+    def _key(self, digest: str) -> str:
+        return f"{self.key_prefix}{digest}"
+
+    async def put_many(self, payloads: Iterable[bytes]) -> List[Tuple[str, int, bool]]:
+        """Store payloads; returns (hash, stored size, newly written) per payload"""
+        entries: List[Tuple[str, bytes]] = []
+        seen: Dict[str, bytes] = {}
+        for data in payloads:
+            digest = content_hash(data)
+            if digest not in seen:
+                seen[digest] = compress(data)
+            entries.append((digest, seen[digest]))
+            self.stats["bytes_in"] += len(data)
+
+        if self.redis:
+            pipe = self.redis.pipeline(transaction=False)
+            for digest, blob in seen.items():
+                pipe.set(self._key(digest), blob, ex=self.ttl_seconds, nx=True)
+            written = dict(zip(seen, await pipe.execute()))
+            # Existing blobs were not overwritten; keep them alive as long as this reference
+            existing = [digest for digest, was_written in written.items() if not was_written]
+            if existing:
+                pipe = self.redis.pipeline(transaction=False)
+                for digest in existing:
+                    pipe.expire(self._key(digest), self.ttl_seconds)
+                await pipe.execute()
+        else:
+            written = {}
+            for digest, blob in seen.items():
+                written[digest] = digest not in self._local
+                self._local.setdefault(digest, blob)
+
+        results = []
+        for digest, blob in entries:
+            is_new = bool(written.get(digest))
+            # Only the first occurrence of a new blob counts as a write
+            written[digest] = False
+            if is_new:
+                self.stats["writes"] += 1
+                self.stats["bytes_stored"] += len(blob)
+            else:
+                self.stats["dedup_hits"] += 1
+            results.append((digest, len(blob), is_new))
+        return results
+
+    async def put(self, data: bytes) -> Tuple[str, int, bool]:
+        return (await self.put_many([data]))[0]
+
+    async def touch_many(self, digests: Iterable[str]) -> List[str]:
+        """Extend the TTL of referenced blobs; returns the hashes that no longer exist"""
+        unique = list(dict.fromkeys(digests))
+        if not unique:
+            return []
+        if self.redis:
+            pipe = self.redis.pipeline(transaction=False)
+            for digest in unique:
+                pipe.expire(self._key(digest), self.ttl_seconds)
+            alive = await pipe.execute()
+        else:
+            alive = [digest in self._local for digest in unique]
+        return [digest for digest, ok in zip(unique, alive) if not ok]
+
+    async def get(self, digest: str) -> Optional[bytes]:
+        """Decompressed payload, verified against its hash; None if missing"""
+        async for _, data in self.iter_many([digest]):
+            return data
+        return None
+
+    async def iter_many(self, digests: List[str], batch_size: int = 16) -> AsyncIterator[Tuple[str, Optional[bytes]]]:
+        """Yield (hash, payload) in order, fetching ``batch_size`` blobs per round trip"""
+        for start in range(0, len(digests), batch_size):
+            batch = digests[start:start + batch_size]
+            if self.redis:
+                blobs = await self.redis.mget([self._key(digest) for digest in batch])
+            else:
+                blobs = [self._local.get(digest) for digest in batch]
+
+            for digest, blob in zip(batch, blobs):
+                if blob is None:
+                    yield digest, None
+                    continue
+                data = decompress(blob)
+                if content_hash(data) != digest:
+                    raise ValueError(f"Blob {digest} is corrupt")
+                yield digest, data
+
+    def get_stats(self) -> Dict[str, object]:
+        return {**self.stats, "codec": "zstd" if ZSTD_AVAILABLE else "zlib"}
+
+
+__all__ = ["ComponentBlobStore", "ZSTD_AVAILABLE", "compress", "content_hash", "decompress"]
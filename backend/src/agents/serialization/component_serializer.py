@@ -3,19 +3,25 @@ Component Serialization System for AutoGen Agents
 Save and restore agent states, configurations, and conversation contexts
 """
 
+import os
 import json
 import pickle
 import base64
+import hashlib
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import structlog
 from uuid import uuid4
 import asyncio
 
+import redis.asyncio as redis
+
+from ...core.config import get_settings
 from ...core.redis import get_redis_client
 from ..services.agent_loader import agent_loader
+from .blob_store import ComponentBlobStore
 
 logger = structlog.get_logger()
 
@@ -31,6 +37,12 @@ class SerializedComponent:
     version: str
     metadata: Dict[str, Any]
     checksum: str
+    content_hash: Optional[str] = None  # Blob address; serialized_data is loaded lazily when empty
+    stored_size_bytes: int = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self.metadata.get("serialization_size", len(self.serialized_data))
 
 @dataclass
 class SerializationSnapshot:
@@ -42,13 +54,43 @@ class SerializationSnapshot:
     system_metadata: Dict[str, Any]
     total_size_bytes: int
 
+
+def _canonical_json(data: Dict[str, Any]) -> str:
+    # Stable key order and no whitespace, so unchanged content hashes the same
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _component_record(component: SerializedComponent) -> Dict[str, Any]:
+    """Storage form of a component: everything but the payload"""
+    record = asdict(component)
+    record['created_at'] = component.created_at.isoformat()
+    if component.content_hash:
+        record.pop('serialized_data')
+    return record
+
+
+def _component_from_record(record: Dict[str, Any]) -> SerializedComponent:
+    record = dict(record)
+    record['created_at'] = datetime.fromisoformat(record['created_at'])
+    record.setdefault('serialized_data', "")
+    return SerializedComponent(**record)
+
+
 class ComponentSerializer:
-    """Manages serialization and deserialization of AutoGen components"""
+    """
+    Manages serialization and deserialization of AutoGen components.
+
+    Component payloads live in a content-addressed, compressed blob store;
+    components and snapshots only keep the blob hash. A snapshot is a
+    manifest of component records, so unchanged components cost one
+    reference instead of a copy.
+    """
     
     def __init__(self):
         self.serialized_components: Dict[str, SerializedComponent] = {}
         self.snapshots: Dict[str, SerializationSnapshot] = {}
         self.redis_client = None
+        self.blob_store = ComponentBlobStore()
         self.serialization_dir = Path("data/serialization")
         
     async def initialize(self):
@@ -58,6 +100,14 @@ class ComponentSerializer:
         # Initialize Redis connection
         self.redis_client = get_redis_client()
         
+        # Compressed blobs are binary, so they need a client that does not decode responses
+        if self.redis_client:
+            try:
+                blob_client = redis.from_url(get_settings().REDIS_URL, decode_responses=False)
+                self.blob_store = ComponentBlobStore(blob_client)
+            except Exception as e:
+                logger.warning(f"⚠️ Blob store falling back to memory: {e}")
+        
         # Create serialization directory
         self.serialization_dir.mkdir(parents=True, exist_ok=True)
         
@@ -76,10 +126,7 @@ class ComponentSerializer:
                 for key in keys:
                     component_data = await self.redis_client.get(key)
                     if component_data:
-                        component_dict = json.loads(component_data)
-                        # Convert datetime string back to datetime
-                        component_dict['created_at'] = datetime.fromisoformat(component_dict['created_at'])
-                        component = SerializedComponent(**component_dict)
+                        component = _component_from_record(json.loads(component_data))
                         self.serialized_components[component.component_id] = component
             
             # Load snapshots
@@ -91,13 +138,10 @@ class ComponentSerializer:
                     # Convert datetime and component data
                     snapshot_dict['created_at'] = datetime.fromisoformat(snapshot_dict['created_at'])
                     
-                    # Reconstruct components
-                    components = []
-                    for comp_data in snapshot_dict['components']:
-                        comp_data['created_at'] = datetime.fromisoformat(comp_data['created_at'])
-                        components.append(SerializedComponent(**comp_data))
-                    
-                    snapshot_dict['components'] = components
+                    # Manifest entries reference payload blobs; legacy snapshots embed them
+                    snapshot_dict['components'] = [
+                        _component_from_record(comp_data) for comp_data in snapshot_dict['components']
+                    ]
                     snapshot = SerializationSnapshot(**snapshot_dict)
                     self.snapshots[snapshot.snapshot_id] = snapshot
                     
@@ -119,11 +163,11 @@ class ComponentSerializer:
             if not agent_config:
                 raise ValueError(f"Agent {agent_name} not found")
             
-            # Prepare serialization data
+            # Prepare serialization data (serialized_at comes from created_at,
+            # so an unchanged agent produces an identical payload)
             serialization_data = {
                 "agent_name": agent_name,
                 "agent_config": agent_config,
-                "serialized_at": datetime.utcnow().isoformat(),
                 "include_state": include_state
             }
             
@@ -153,10 +197,9 @@ class ComponentSerializer:
                     serialization_data["state_error"] = str(e)
             
             # Serialize to JSON
-            serialized_json = json.dumps(serialization_data, indent=2, default=str)
+            serialized_json = _canonical_json(serialization_data)
             
             # Calculate checksum
-            import hashlib
             checksum = hashlib.md5(serialized_json.encode()).hexdigest()
             
             # Create serialized component
@@ -202,7 +245,6 @@ class ComponentSerializer:
                 "agent_name": agent_name,
                 "messages": messages,
                 "message_count": len(messages),
-                "serialized_at": datetime.utcnow().isoformat(),
                 "conversation_metadata": {
                     "first_message_time": messages[0].get("timestamp") if messages else None,
                     "last_message_time": messages[-1].get("timestamp") if messages else None
@@ -210,10 +252,9 @@ class ComponentSerializer:
             }
             
             # Serialize to JSON
-            serialized_json = json.dumps(conversation_data, indent=2, default=str)
+            serialized_json = _canonical_json(conversation_data)
             
             # Calculate checksum
-            import hashlib
             checksum = hashlib.md5(serialized_json.encode()).hexdigest()
             
             # Create serialized component
@@ -257,7 +298,6 @@ class ComponentSerializer:
             serialization_data = {
                 "workflow_id": workflow_id,
                 "workflow_data": workflow_data,
-                "serialized_at": datetime.utcnow().isoformat(),
                 "workflow_type": workflow_data.get("type", "unknown")
             }
             
@@ -266,7 +306,6 @@ class ComponentSerializer:
             serialized_base64 = base64.b64encode(serialized_pickle).decode()
             
             # Calculate checksum
-            import hashlib
             checksum = hashlib.md5(serialized_pickle).hexdigest()
             
             # Create serialized component
@@ -308,26 +347,7 @@ class ComponentSerializer:
             if not component:
                 raise ValueError(f"Component {component_id} not found")
             
-            # Deserialize based on format
-            if component.serialization_format == "json":
-                deserialized_data = json.loads(component.serialized_data)
-            
-            elif component.serialization_format == "pickle_base64":
-                serialized_bytes = base64.b64decode(component.serialized_data.encode())
-                deserialized_data = pickle.loads(serialized_bytes)
-            
-            else:
-                raise ValueError(f"Unsupported serialization format: {component.serialization_format}")
-            
-            # Verify checksum
-            import hashlib
-            if component.serialization_format == "json":
-                current_checksum = hashlib.md5(component.serialized_data.encode()).hexdigest()
-            else:
-                current_checksum = hashlib.md5(base64.b64decode(component.serialized_data.encode())).hexdigest()
-            
-            if current_checksum != component.checksum:
-                logger.warning(f"⚠️ Checksum mismatch for component {component_id}")
+            deserialized_data = self._decode_payload(component, await self._component_payload(component))
             
             logger.info(f"💾 Deserialized component {component_id} ({component.component_type})")
             return deserialized_data
@@ -336,6 +356,88 @@ class ComponentSerializer:
             logger.error(f"❌ Failed to deserialize component {component_id}: {e}")
             raise
 
+    @staticmethod
+    def _payload_bytes(component: SerializedComponent) -> bytes:
+        """Raw payload of an in-memory component (pickles are stored unencoded)"""
+        if component.serialization_format == "pickle_base64":
+            return base64.b64decode(component.serialized_data.encode())
+        return component.serialized_data.encode()
+
+    async def _component_payload(self, component: SerializedComponent) -> bytes:
+        if component.serialized_data:
+            return self._payload_bytes(component)
+        if not component.content_hash:
+            raise ValueError(f"Component {component.component_id} has no payload")
+        payload = await self.blob_store.get(component.content_hash)
+        if payload is None:
+            raise ValueError(f"Payload blob for component {component.component_id} has expired")
+        return payload
+
+    def _decode_payload(self, component: SerializedComponent, payload: bytes) -> Dict[str, Any]:
+        """Deserialize a raw payload and verify its checksum"""
+        if component.serialization_format == "json":
+            deserialized_data = json.loads(payload.decode())
+        elif component.serialization_format == "pickle_base64":
+            deserialized_data = pickle.loads(payload)
+        else:
+            raise ValueError(f"Unsupported serialization format: {component.serialization_format}")
+        
+        if hashlib.md5(payload).hexdigest() != component.checksum:
+            logger.warning(f"⚠️ Checksum mismatch for component {component.component_id}")
+        
+        deserialized_data.setdefault("serialized_at", component.created_at.isoformat())
+        return deserialized_data
+
+    async def _store_payloads(self, components: List[SerializedComponent]) -> int:
+        """
+        Write payloads of components not yet in the blob store and extend the
+        TTL of blobs already referenced, so they outlive the new reference.
+        Returns new bytes stored.
+        """
+        referenced = [comp.content_hash for comp in components if comp.content_hash]
+        if referenced:
+            expired = await self.blob_store.touch_many(referenced)
+            if expired:
+                logger.warning(f"⚠️ {len(expired)} referenced payload blobs have already expired")
+        
+        pending = [comp for comp in components if not comp.content_hash and comp.serialized_data]
+        if not pending:
+            return 0
+        
+        stored = await self.blob_store.put_many(self._payload_bytes(comp) for comp in pending)
+        new_bytes = 0
+        for component, (digest, size, is_new) in zip(pending, stored):
+            component.content_hash = digest
+            component.stored_size_bytes = size
+            new_bytes += size if is_new else 0
+        return new_bytes
+
+    async def _iter_snapshot_components(
+        self,
+        components: List[SerializedComponent],
+        batch_size: int = 16
+    ) -> AsyncIterator[Tuple[SerializedComponent, Union[Dict[str, Any], Exception]]]:
+        """Yield each component with its decoded data, fetching blobs a batch at a time"""
+        for start in range(0, len(components), batch_size):
+            batch = components[start:start + batch_size]
+            lazy = [comp.content_hash for comp in batch if not comp.serialized_data and comp.content_hash]
+            payloads: Dict[str, Optional[bytes]] = {}
+            if lazy:
+                async for digest, payload in self.blob_store.iter_many(lazy, batch_size):
+                    payloads[digest] = payload
+            
+            for component in batch:
+                try:
+                    if component.serialized_data:
+                        payload = self._payload_bytes(component)
+                    else:
+                        payload = payloads.get(component.content_hash)
+                        if payload is None:
+                            raise ValueError("payload blob has expired")
+                    yield component, self._decode_payload(component, payload)
+                except Exception as e:
+                    yield component, e
+
     async def create_system_snapshot(
         self,
         snapshot_name: str,
@@ -359,7 +461,7 @@ class ComponentSerializer:
                             include_state=True
                         )
                         snapshot_components.append(component)
-                        total_size += len(component.serialized_data)
+                        total_size += component.size_bytes
                     except Exception as e:
                         logger.warning(f"⚠️ Could not serialize agent {agent_name} for snapshot: {e}")
             
@@ -370,7 +472,7 @@ class ComponentSerializer:
                     if comp.component_type == "conversation"
                 ]
                 snapshot_components.extend(conversation_components)
-                total_size += sum(len(comp.serialized_data) for comp in conversation_components)
+                total_size += sum(comp.size_bytes for comp in conversation_components)
             
             # Include workflows if requested
             if include_workflows:
@@ -379,7 +481,11 @@ class ComponentSerializer:
                     if comp.component_type == "workflow"
                 ]
                 snapshot_components.extend(workflow_components)
-                total_size += sum(len(comp.serialized_data) for comp in workflow_components)
+                total_size += sum(comp.size_bytes for comp in workflow_components)
+            
+            # Components created before the blob store existed are addressed now;
+            # everything else is already stored, referenced and kept alive
+            new_bytes = await self._store_payloads(snapshot_components)
             
             # Create snapshot
             snapshot = SerializationSnapshot(
@@ -392,7 +498,9 @@ class ComponentSerializer:
                     "include_conversations": include_conversations,
                     "include_workflows": include_workflows,
                     "total_components": len(snapshot_components),
-                    "snapshot_version": "1.0"
+                    "unique_payloads": len({comp.content_hash for comp in snapshot_components}),
+                    "new_bytes_stored": new_bytes,
+                    "snapshot_version": "2.0"
                 },
                 total_size_bytes=total_size
             )
@@ -430,20 +538,18 @@ class ComponentSerializer:
                 "restoration_summary": {}
             }
             
-            for component in snapshot.components:
+            wanted = [
+                component for component in snapshot.components
+                if (component.component_type == "agent" and restore_agents) or
+                   (component.component_type == "conversation" and restore_conversations) or
+                   (component.component_type == "workflow" and restore_workflows)
+            ]
+            
+            # Components are fetched and restored a batch at a time, never all at once
+            async for component, restored_data in self._iter_snapshot_components(wanted):
                 try:
-                    # Check if we should restore this component type
-                    should_restore = (
-                        (component.component_type == "agent" and restore_agents) or
-                        (component.component_type == "conversation" and restore_conversations) or
-                        (component.component_type == "workflow" and restore_workflows)
-                    )
-                    
-                    if not should_restore:
-                        continue
-                    
-                    # Deserialize component
-                    restored_data = await self.deserialize_component(component.component_id)
+                    if isinstance(restored_data, Exception):
+                        raise restored_data
                     
                     # Perform component-specific restoration
                     restoration_result = await self._restore_component(component, restored_data)
@@ -542,37 +648,36 @@ class ComponentSerializer:
             }
 
     async def _save_component_to_storage(self, component: SerializedComponent):
-        """Save component to Redis storage"""
+        """Save component payload to the blob store and its record to Redis"""
         
         try:
+            await self._store_payloads([component])
             if self.redis_client:
-                component_dict = asdict(component)
-                component_dict['created_at'] = component.created_at.isoformat()
-                
                 await self.redis_client.setex(
                     f"serialized_component:{component.component_id}",
                     86400 * 30,  # 30 days TTL
-                    json.dumps(component_dict, default=str)
+                    json.dumps(_component_record(component), default=str)
                 )
+                # The payload now lives in Redis; load it back on demand
+                if self.blob_store.redis:
+                    component.serialized_data = ""
         except Exception as e:
             logger.warning(f"⚠️ Could not save component to storage: {e}")
 
     async def _save_snapshot_to_storage(self, snapshot: SerializationSnapshot):
-        """Save snapshot to Redis storage"""
+        """Save snapshot manifest to Redis storage"""
         
         try:
             if self.redis_client:
-                snapshot_dict = asdict(snapshot)
-                snapshot_dict['created_at'] = snapshot.created_at.isoformat()
-                
-                # Convert components to dictionaries
-                snapshot_dict['components'] = [
-                    {
-                        **asdict(comp),
-                        'created_at': comp.created_at.isoformat()
-                    }
-                    for comp in snapshot.components
-                ]
+                snapshot_dict = {
+                    "snapshot_id": snapshot.snapshot_id,
+                    "snapshot_name": snapshot.snapshot_name,
+                    "created_at": snapshot.created_at.isoformat(),
+                    "system_metadata": snapshot.system_metadata,
+                    "total_size_bytes": snapshot.total_size_bytes,
+                    # Records reference payload blobs by hash instead of embedding them
+                    "components": [_component_record(comp) for comp in snapshot.components]
+                }
                 
                 await self.redis_client.setex(
                     f"serialization_snapshot:{snapshot.snapshot_id}",
@@ -595,7 +700,8 @@ class ComponentSerializer:
                 "component_type": component.component_type,
                 "name": component.name,
                 "created_at": component.created_at.isoformat(),
-                "size_bytes": len(component.serialized_data),
+                "size_bytes": component.size_bytes,
+                "stored_size_bytes": component.stored_size_bytes,
                 "format": component.serialization_format,
                 "version": component.version,
                 "metadata": component.metadata
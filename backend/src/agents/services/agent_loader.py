@@ -5,14 +5,15 @@ Auto-discovery system for MyConvergio agents from MD files with file watching
 
 import os
 import re
+import json
 import yaml
 import asyncio
-import threading
 import time
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from dataclasses import dataclass, asdict
 from datetime import datetime
 
 import structlog
@@ -23,6 +24,12 @@ from watchdog.events import FileSystemEventHandler, FileModifiedEvent
 
 logger = structlog.get_logger()
 
+# libyaml's loader is several times faster when available
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Bump when parsing rules change so cached metadata is rebuilt
+METADATA_CACHE_VERSION = 1
+
 @dataclass
 class AgentMetadata:
     """Agent metadata extracted from MD file."""
@@ -40,11 +47,16 @@ class AgentMetadata:
     version: str = "1.0.0"
 
 class AgentFileWatcher(FileSystemEventHandler):
-    """File watcher for agent definition files"""
+    """
+    File watcher for agent definition files.
+
+    Watchdog calls this from its observer thread; events are only handed to
+    the loader's event loop, where one debounce task batches them.
+    """
     
-    def __init__(self, loader: 'DynamicAgentLoader'):
+    def __init__(self, loader: 'DynamicAgentLoader', loop: asyncio.AbstractEventLoop):
         self.loader = loader
-        self.debounce_timers: Dict[str, threading.Timer] = {}
+        self.loop = loop
         
     def on_modified(self, event):
         if event.is_directory:
@@ -52,58 +64,25 @@ class AgentFileWatcher(FileSystemEventHandler):
             
         file_path = Path(event.src_path)
         if file_path.suffix == '.md':
-            # Debounce file changes (wait 1 second before reloading)
-            if str(file_path) in self.debounce_timers:
-                self.debounce_timers[str(file_path)].cancel()
-            
-            timer = threading.Timer(1.0, self._reload_agent, args=[file_path])
-            self.debounce_timers[str(file_path)] = timer
-            timer.start()
-    
-    def _reload_agent(self, file_path: Path):
-        """Reload a single agent file"""
-        try:
-            logger.info(f"🔄 Hot-reloading agent: {file_path.name}")
-            
-            # Store previous version for rollback
-            agent_key = file_path.stem.replace('-', '_')
-            previous_metadata = self.loader.agent_metadata.get(agent_key)
-            
-            # Parse the updated file
-            new_metadata = self.loader._parse_agent_file(file_path)
-            
-            if new_metadata:
-                # Validate the new agent definition
-                if self.loader._validate_agent(new_metadata):
-                    # Update the agent
-                    self.loader.agent_metadata[new_metadata.key] = new_metadata
-                    self.loader._build_agent_registry()
-                    
-                    # Trigger reload callbacks
-                    for callback in self.loader.reload_callbacks:
-                        try:
-                            callback(new_metadata.key, new_metadata)
-                        except Exception as e:
-                            logger.error(f"Reload callback failed: {e}")
-                    
-                    logger.info(f"✅ Successfully reloaded agent: {new_metadata.name}")
-                else:
-                    # Rollback to previous version
-                    if previous_metadata:
-                        self.loader.agent_metadata[agent_key] = previous_metadata
-                    logger.warning(f"⚠️ Agent validation failed, rolled back: {file_path.name}")
-            else:
-                logger.error(f"❌ Failed to parse agent file: {file_path.name}")
-                
-        except Exception as e:
-            logger.error(f"Error during hot-reload: {e}")
+            self.loop.call_soon_threadsafe(self.loader._schedule_reload, file_path)
 
 
 class DynamicAgentLoader:
     """Dynamic agent loader with hot-reload support"""
     
-    def __init__(self, agents_directory: str, enable_hot_reload: bool = True):
+    def __init__(
+        self,
+        agents_directory: str,
+        enable_hot_reload: bool = True,
+        cache_path: Optional[str] = None,
+        reload_debounce: float = 1.0,
+        parse_workers: int = 8
+    ):
         self.agents_directory = Path(agents_directory)
+        # Parsed metadata keyed by file hash survives restarts
+        self.cache_path = Path(cache_path) if cache_path else self.agents_directory / ".cache" / "agent_metadata.json"
+        self.reload_debounce = reload_debounce
+        self.parse_workers = parse_workers
         self.agent_metadata: Dict[str, AgentMetadata] = {}
         self.agent_registry: Dict[str, str] = {}  # name -> description mapping
         self.agent_backups: Dict[str, List[AgentMetadata]] = {}  # Version history
@@ -111,6 +90,11 @@ class DynamicAgentLoader:
         self.enable_hot_reload = enable_hot_reload
         self.file_observer: Optional[Observer] = None
         self.watcher: Optional[AgentFileWatcher] = None
+        self._system_messages: Dict[str, Tuple[Tuple[AgentMetadata, ...], str]] = {}
+        self._pending_reloads: Dict[Path, float] = {}
+        self._reload_wakeup: Optional[asyncio.Event] = None
+        self._reload_task: Optional[asyncio.Task] = None
+        self.load_stats: Dict[str, Any] = {}
         
     def scan_and_load_agents(self) -> Dict[str, AgentMetadata]:
         """Scan directory and load all agent definitions."""
@@ -128,18 +112,14 @@ class DynamicAgentLoader:
             excluded=list(excluded_files),
         )
 
+        started = time.perf_counter()
         agents: Dict[str, AgentMetadata] = {}
-        for md_file in valid_agent_files:
-            try:
-                agent_metadata = self._parse_agent_file(md_file)
-                if agent_metadata:
-                    agents[agent_metadata.key] = agent_metadata
-                    logger.debug(
-                        "Loaded agent", name=agent_metadata.name, tier=agent_metadata.tier
-                    )
-            except Exception as e:
-                logger.error("Failed to parse agent file", file=md_file.name, error=str(e))
-                continue
+        for agent_metadata in self._load_files(valid_agent_files, use_cache=True).values():
+            agents[agent_metadata.key] = agent_metadata
+            logger.debug(
+                "Loaded agent", name=agent_metadata.name, tier=agent_metadata.tier
+            )
+        self.load_stats["duration_ms"] = round((time.perf_counter() - started) * 1000.0, 2)
 
         self.agent_metadata = agents
         self._build_agent_registry()
@@ -149,15 +129,105 @@ class DynamicAgentLoader:
             total_agents=len(agents),
             strategic_tier=len([a for a in agents.values() if a.tier == "Strategic"]),
             tech_tier=len([a for a in agents.values() if a.tier == "Technology"]),
+            parsed=self.load_stats.get("parsed", 0),
+            cached=self.load_stats.get("cached", 0),
+            duration_ms=self.load_stats["duration_ms"],
         )
 
         return agents
     
+    def _load_files(self, files: List[Path], use_cache: bool) -> Dict[Path, AgentMetadata]:
+        """
+        Metadata for the given files, parsing only files whose hash is not cached.
+
+        Reads, hashes and parses run on a thread pool; the cache file is
+        rewritten only when something was parsed.
+        """
+        cache = self._read_cache() if use_cache else {}
+        
+        def read(md_file: Path) -> Tuple[Path, Optional[bytes]]:
+            try:
+                return md_file, md_file.read_bytes()
+            except OSError as e:
+                logger.error("Failed to read agent file", file=md_file.name, error=str(e))
+                return md_file, None
+        
+        workers = max(1, min(self.parse_workers, len(files)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            raw_files = list(pool.map(read, files))
+            
+            results: Dict[Path, Optional[AgentMetadata]] = {}
+            to_parse = []
+            for md_file, raw in raw_files:
+                if raw is None:
+                    continue
+                file_hash = hashlib.md5(raw).hexdigest()
+                cached = cache.get(md_file.name)
+                if cached and cached.get("file_hash") == file_hash:
+                    results[md_file] = self._metadata_from_cache(cached)
+                else:
+                    to_parse.append((md_file, raw, file_hash))
+            
+            parsed = pool.map(lambda item: self._parse_agent_content(*item), to_parse)
+            for (md_file, _, _), metadata in zip(to_parse, parsed):
+                results[md_file] = metadata
+        
+        self.load_stats.update(
+            files=len(files), parsed=len(to_parse), cached=len(files) - len(to_parse)
+        )
+        if to_parse:
+            self._write_cache({
+                md_file.name: metadata for md_file, metadata in results.items() if metadata
+            }, base=cache)
+        
+        return {md_file: results[md_file] for md_file, _ in raw_files if results.get(md_file)}
+    
+    def _read_cache(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != METADATA_CACHE_VERSION:
+                return {}
+            return data.get("entries", {})
+        except (OSError, ValueError):
+            return {}
+    
+    def _write_cache(self, metadata_by_file: Dict[str, AgentMetadata], base: Dict[str, Dict[str, Any]]):
+        """Persist parsed metadata; failures (e.g. read-only deploys) only cost a re-parse"""
+        entries = dict(base)
+        for file_name, metadata in metadata_by_file.items():
+            entry = asdict(metadata)
+            entry["last_modified"] = metadata.last_modified.isoformat() if metadata.last_modified else None
+            entries[file_name] = entry
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": METADATA_CACHE_VERSION, "entries": entries}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning("Could not write agent metadata cache", path=str(self.cache_path), error=str(e))
+    
+    @staticmethod
+    def _metadata_from_cache(entry: Dict[str, Any]) -> AgentMetadata:
+        entry = dict(entry)
+        if entry.get("last_modified"):
+            entry["last_modified"] = datetime.fromisoformat(entry["last_modified"])
+        return AgentMetadata(**entry)
+    
     def _parse_agent_file(self, md_file: Path) -> Optional[AgentMetadata]:
         """Parse individual agent MD file."""
         try:
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            raw = md_file.read_bytes()
+        except Exception as e:
+            logger.error("Failed to parse agent file", file=md_file.name, error=str(e))
+            return None
+        return self._parse_agent_content(md_file, raw, hashlib.md5(raw).hexdigest())
+    
+    def _parse_agent_content(self, md_file: Path, raw: bytes, file_hash: str) -> Optional[AgentMetadata]:
+        """Parse the content of an agent MD file."""
+        try:
+            content = raw.decode('utf-8')
             
             # Extract YAML front matter
             yaml_match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
@@ -168,7 +238,7 @@ class DynamicAgentLoader:
             # Parse YAML
             yaml_content = yaml_match.group(1)
             try:
-                metadata = yaml.safe_load(yaml_content)
+                metadata = yaml.load(yaml_content, Loader=_YamlLoader)
             except yaml.YAMLError as e:
                 logger.error("Invalid YAML in front matter", file=md_file.name, error=str(e))
                 return None
@@ -196,8 +266,6 @@ class DynamicAgentLoader:
             class_name = ''.join(word.capitalize() for word in name.replace('-', '_').split('_'))
             key = name.replace('-', '_')
             
-            # Calculate file hash for change detection
-            file_hash = self._calculate_file_hash(md_file)
             last_modified = datetime.fromtimestamp(md_file.stat().st_mtime)
             
             return AgentMetadata(
@@ -294,38 +362,56 @@ class DynamicAgentLoader:
         """Create AutoGen AssistantAgent instances from loaded metadata."""
         agents = {}
         
-        for key, metadata in self.agent_metadata.items():
+        for key in self.agent_metadata:
             try:
-                # Build system message
-                system_message = self._build_system_message(metadata)
-
-                # If this is Ali, enrich the system prompt with a knowledge base of all agents
-                if metadata.key == "ali_chief_of_staff":
-                    try:
-                        kb = self.generate_ali_knowledge_base()
-                        system_message = f"{system_message}\n\n---\nALI KNOWLEDGE BASE:\n{kb}"
-                    except Exception as e:
-                        logger.warning("Failed to build Ali knowledge base", error=str(e))
-                
-                # Create AutoGen agent WITH TOOLS from the start
-                agent = AssistantAgent(
-                    # Use the stable loader key as the agent name so routers and orchestrators can match reliably
-                    name=metadata.key,
-                    model_client=model_client,
-                    system_message=system_message,
-                    tools=tools or []  # Pass tools directly to constructor
-                )
-                
-                agents[key] = agent
-                logger.debug("Created AutoGen agent with tools", name=metadata.name, class_name=metadata.class_name, tools_count=len(tools or []))
-                
+                agents[key] = self.create_autogen_agent(key, model_client, tools)
             except Exception as e:
-                logger.error("Failed to create AutoGen agent", name=metadata.name, error=str(e))
+                logger.error("Failed to create AutoGen agent", name=self.agent_metadata[key].name, error=str(e))
                 continue
         
         logger.info("AutoGen agents created with tools", total=len(agents), tools_count=len(tools or []))
         return agents
     
+    def create_autogen_agent(self, key: str, model_client: OpenAIChatCompletionClient, tools: List[Any] = None) -> AssistantAgent:
+        """Create one fresh AssistantAgent; used to build pooled per-request instances."""
+        metadata = self.agent_metadata[key]
+        
+        # Create AutoGen agent WITH TOOLS from the start
+        agent = AssistantAgent(
+            # Use the stable loader key as the agent name so routers and orchestrators can match reliably
+            name=metadata.key,
+            model_client=model_client,
+            system_message=self._get_system_message(metadata),
+            tools=tools or []  # Pass tools directly to constructor
+        )
+        logger.debug("Created AutoGen agent with tools", name=metadata.name, class_name=metadata.class_name, tools_count=len(tools or []))
+        return agent
+    
+    def _get_system_message(self, metadata: AgentMetadata) -> str:
+        """System message for an agent, built once per loaded definition."""
+        # Ali's prompt embeds the whole roster, so it is rebuilt when any agent reloads
+        if metadata.key == "ali_chief_of_staff":
+            version = tuple(self.agent_metadata.values())
+        else:
+            version = (metadata,)
+        cached = self._system_messages.get(metadata.key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        # Build system message
+        system_message = self._build_system_message(metadata)
+
+        # If this is Ali, enrich the system prompt with a knowledge base of all agents
+        if metadata.key == "ali_chief_of_staff":
+            try:
+                kb = self.generate_ali_knowledge_base()
+                system_message = f"{system_message}\n\n---\nALI KNOWLEDGE BASE:\n{kb}"
+            except Exception as e:
+                logger.warning("Failed to build Ali knowledge base", error=str(e))
+        
+        self._system_messages[metadata.key] = (version, system_message)
+        return system_message
+    
     def _build_system_message(self, metadata: AgentMetadata) -> str:
         """Build comprehensive system message for agent."""
         return f"""You are {metadata.class_name}, an expert agent in the MyConvergio ecosystem.
@@ -411,15 +497,23 @@ ROUTING INTELLIGENCE:
             return False
         return True
     
-    def start_watching(self):
-        """Start file watcher for hot-reload"""
+    def start_watching(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Start file watcher for hot-reload on the given (or running) event loop"""
         if not self.enable_hot_reload:
             return
         
         if self.file_observer:
             self.stop_watching()
         
-        self.watcher = AgentFileWatcher(self)
+        try:
+            loop = loop or asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("Hot-reload needs a running event loop; not watching agent definitions")
+            return
+        
+        self._reload_wakeup = asyncio.Event()
+        self._reload_task = loop.create_task(self._debounce_loop())
+        self.watcher = AgentFileWatcher(self, loop)
         self.file_observer = Observer()
         self.file_observer.schedule(
             self.watcher,
@@ -436,6 +530,77 @@ ROUTING INTELLIGENCE:
             self.file_observer.join()
             self.file_observer = None
             logger.info("🛑 Hot-reload stopped")
+        if self._reload_task:
+            self._reload_task.cancel()
+            self._reload_task = None
+        self._pending_reloads.clear()
+    
+    def _schedule_reload(self, file_path: Path):
+        """Debounce a modified file: every event pushes its reload back"""
+        self._pending_reloads[file_path] = time.monotonic() + self.reload_debounce
+        if self._reload_wakeup:
+            self._reload_wakeup.set()
+    
+    async def _debounce_loop(self):
+        """Single task that reloads files once they have been quiet for the debounce period"""
+        while True:
+            try:
+                self._reload_wakeup.clear()
+                now = time.monotonic()
+                due = [path for path, deadline in self._pending_reloads.items() if deadline <= now]
+                if due:
+                    for path in due:
+                        del self._pending_reloads[path]
+                    # Parsing runs off the event loop; a bulk edit is one batch
+                    existing = [path for path in due if path.exists()]
+                    loaded = await asyncio.to_thread(self._load_files, existing, True)
+                    self._apply_reload(existing, loaded)
+                    continue
+                
+                timeout = min(self._pending_reloads.values()) - now if self._pending_reloads else None
+                try:
+                    await asyncio.wait_for(self._reload_wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error during hot-reload: {e}")
+    
+    def _apply_reload(self, file_paths: List[Path], loaded: Dict[Path, AgentMetadata]):
+        """Swap in re-parsed agents that changed and pass validation"""
+        logger.info(f"🔄 Hot-reloading {len(file_paths)} agent file(s)", files=[p.name for p in file_paths])
+        
+        reloaded = []
+        for file_path in file_paths:
+            new_metadata = loaded.get(file_path)
+            if not new_metadata:
+                logger.error(f"❌ Failed to parse agent file: {file_path.name}")
+                continue
+            
+            previous_metadata = self.agent_metadata.get(new_metadata.key)
+            if previous_metadata and previous_metadata.file_hash == new_metadata.file_hash:
+                continue
+            
+            if self._validate_agent(new_metadata):
+                self.agent_metadata[new_metadata.key] = new_metadata
+                reloaded.append(new_metadata)
+            else:
+                # Keep serving the previous version
+                logger.warning(f"⚠️ Agent validation failed, rolled back: {file_path.name}")
+        
+        if not reloaded:
+            return
+        self._build_agent_registry()
+        
+        # Trigger reload callbacks
+        for metadata in reloaded:
+            for callback in self.reload_callbacks:
+                try:
+                    callback(metadata.key, metadata)
+                except Exception as e:
+                    logger.error(f"Reload callback failed: {e}")
+            logger.info(f"✅ Successfully reloaded agent: {metadata.name}")
     
     def register_reload_callback(self, callback: Callable):
         """Register callback for agent reload events"""
@@ -13,8 +13,20 @@ import json
 import uuid
 from enum import Enum
 
+from .event_bus import Event, EventType, event_bus
+
 logger = structlog.get_logger()
 
+# Change events that make each monitored signal stale
+SIGNAL_EVENTS: Dict[EventType, Tuple[str, ...]] = {
+    EventType.PROJECT_CHANGED: ("business",),
+    EventType.TALENT_CHANGED: ("business", "team"),
+    EventType.COST_RECORDED: ("financial",),
+    EventType.SYSTEM_HEALTH_CHANGED: ("health",),
+    EventType.SYSTEM_ERROR: ("health",),
+    EventType.SYSTEM_ALERT: ("health",),
+}
+
 class InsightType(Enum):
     """Types of proactive insights Ali can generate"""
     RESOURCE_OPTIMIZATION = "resource_optimization"
@@ -110,210 +122,245 @@ class AliProactiveEngine:
         self.metrics = {
             "insights_generated_today": 0,
             "autonomous_actions_taken": 0,
+            "duplicate_insights_suppressed": 0,
             "success_rate": 0.0,
             "average_confidence": 0.0,
             "system_health_score": 100.0
         }
         
-        # Monitoring intervals (in seconds)
-        self.business_monitoring_interval = 300  # 5 minutes
-        self.system_monitoring_interval = 60    # 1 minute
-        self.performance_monitoring_interval = 180  # 3 minutes
+        # Quiet period (in seconds) after a change event before a signal is
+        # recomputed, so a burst of writes costs a single refresh
+        self.debounce_seconds = {
+            "business": 5.0,
+            "team": 5.0,
+            "financial": 10.0,
+            "health": 2.0,
+            "patterns": 30.0,
+        }
+        
+        # Safety-net sweep for changes that never produced an event
+        self.reconciliation_interval = 1800  # 30 minutes
+        
+        # Identical insights (type + title) are not re-raised while still fresh
+        self.duplicate_window = timedelta(hours=1)
+        
+        self._refreshers = {
+            "business": self._refresh_business_metrics,
+            "team": self._refresh_team_performance,
+            "financial": self._refresh_financial_metrics,
+            "health": self._refresh_system_health,
+            "patterns": self._refresh_patterns,
+        }
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        self._dirty: set = set()
+        self._action_tasks: set = set()
+        self._stop_event: Optional[asyncio.Event] = None
+        self.refresh_stats = {
+            signal: {"events": 0, "refreshes": 0, "errors": 0, "last_refresh": None}
+            for signal in self._refreshers
+        }
         
         logger.info("🧠 Ali Proactive Intelligence Engine initialized")
     
     async def start_continuous_monitoring(self):
-        """Start Ali's continuous proactive monitoring"""
+        """
+        Start Ali's proactive monitoring.
+        
+        Signals are recomputed when the event bus reports a change to their
+        inputs; everything is also reconciled once at start-up and then every
+        ``reconciliation_interval`` seconds.
+        """
         if self.monitoring_active:
             logger.warning("⚠️ Monitoring already active")
             return
         
         self.monitoring_active = True
+        self._stop_event = asyncio.Event()
+        for event_type in SIGNAL_EVENTS:
+            event_bus.subscribe(event_type, self._on_change_event)
+        await event_bus.start()
         logger.info("🔍 Ali proactive monitoring activated - becoming super intelligent")
         
-        # Start all monitoring tasks in parallel using asyncio.gather
-        monitoring_tasks = [
-            self._monitor_business_metrics(),
-            self._monitor_system_health(),
-            self._monitor_team_performance(),
-            self._monitor_financial_metrics(),
-            self._detect_patterns_and_trends(),
-            self._execute_autonomous_actions(),
-            self._cleanup_expired_insights()
-        ]
-        
         try:
-            await asyncio.gather(*monitoring_tasks, return_exceptions=True)
+            while self.monitoring_active:
+                await self._reconcile()
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=self.reconciliation_interval)
+                except asyncio.TimeoutError:
+                    continue
         except Exception as e:
             logger.error("Monitoring system error", error=str(e))
-            self.monitoring_active = False
+            await self.stop_monitoring()
     
     async def stop_monitoring(self):
         """Stop proactive monitoring"""
         self.monitoring_active = False
+        for event_type in SIGNAL_EVENTS:
+            event_bus.unsubscribe(event_type, self._on_change_event)
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        self._refresh_tasks.clear()
+        self._dirty.clear()
+        if self._stop_event:
+            self._stop_event.set()
         logger.info("🛑 Ali proactive monitoring stopped")
     
-    async def _monitor_business_metrics(self):
-        """Monitor business KPIs and generate strategic insights"""
-        while self.monitoring_active:
-            try:
-                # Import tools here to avoid circular imports
-                from ..tools.database_tools import DatabaseTools
-                
-                # Get current business data
-                projects_data = await DatabaseTools.get_projects_overview()
-                talents_data = await DatabaseTools.get_talents_summary()
-                
-                # Generate business insights
-                insights = await self._analyze_business_patterns(projects_data, talents_data)
-                
-                # Process each insight
-                for insight in insights:
-                    await self._process_proactive_insight(insight)
-                
-                logger.debug("📊 Business metrics monitoring cycle completed")
-                
-            except Exception as e:
-                logger.error("Business monitoring error", error=str(e))
-            
-            await asyncio.sleep(self.business_monitoring_interval)
+    def _on_change_event(self, event: Event):
+        """Event bus handler: mark the signals fed by this event as stale"""
+        for signal in SIGNAL_EVENTS.get(event.type, ()):
+            self.notify_change(signal)
     
-    async def _monitor_system_health(self):
-        """Monitor technical system health and performance"""
-        while self.monitoring_active:
-            try:
-                from ..tools.database_tools import DatabaseTools
-                
-                # Get system health data
-                health_data = await DatabaseTools.get_system_health()
-                
-                # Analyze system health
-                anomalies = await self._detect_system_anomalies(health_data)
-                
-                # Process anomalies
-                for anomaly in anomalies:
-                    await self._handle_system_anomaly(anomaly)
-                    self.anomalies_detected.append(anomaly)
-                
-                # Update health score
-                self._update_system_health_score(health_data)
-                
-                logger.debug("🔧 System health monitoring cycle completed")
-                
-            except Exception as e:
-                logger.error("System health monitoring error", error=str(e))
-            
-            await asyncio.sleep(self.system_monitoring_interval)
+    def notify_change(self, signal: str):
+        """
+        Schedule a debounced refresh of ``signal``.
+        
+        Changes arriving while a refresh is running are not lost: the signal
+        is marked dirty and refreshed again once the current pass finishes.
+        """
+        if signal not in self._refreshers:
+            raise ValueError(f"Unknown signal: {signal}")
+        
+        self.refresh_stats[signal]["events"] += 1
+        self._dirty.add(signal)
+        task = self._refresh_tasks.get(signal)
+        if task is None or task.done():
+            self._refresh_tasks[signal] = asyncio.create_task(self._debounced_refresh(signal))
     
-    async def _monitor_team_performance(self):
-        """Monitor team productivity and collaboration patterns"""
-        while self.monitoring_active:
-            try:
-                from ..tools.database_tools import DatabaseTools
-                
-                # Get team data
-                department_data = await DatabaseTools.get_department_overview()
-                
-                # Analyze team performance patterns
-                team_insights = await self._analyze_team_patterns(department_data)
-                
-                # Process team insights
-                for insight in team_insights:
-                    await self._process_proactive_insight(insight)
-                
-                logger.debug("👥 Team performance monitoring cycle completed")
-                
-            except Exception as e:
-                logger.error("Team performance monitoring error", error=str(e))
+    async def _debounced_refresh(self, signal: str):
+        """Wait for the signal to go quiet, then recompute it until no longer dirty"""
+        try:
+            while signal in self._dirty:
+                await asyncio.sleep(self.debounce_seconds[signal])
+                self._dirty.discard(signal)
+                await self._run_refresher(signal)
+        finally:
+            if self._refresh_tasks.get(signal) is asyncio.current_task():
+                del self._refresh_tasks[signal]
+    
+    async def _run_refresher(self, signal: str):
+        stats = self.refresh_stats[signal]
+        try:
+            await self._refreshers[signal]()
+            stats["refreshes"] += 1
+            stats["last_refresh"] = datetime.now().isoformat()
+        except Exception as e:
+            stats["errors"] += 1
+            logger.error("Proactive refresh error", signal=signal, error=str(e))
+    
+    async def _reconcile(self):
+        """Recompute every signal and drop expired state"""
+        for signal in self._refreshers:
+            self._dirty.discard(signal)
+            await self._run_refresher(signal)
+        self._cleanup_expired()
+        logger.debug("🔄 Proactive reconciliation sweep completed")
+    
+    async def _refresh_business_metrics(self):
+        """Recompute business KPIs and generate strategic insights"""
+        # Import tools here to avoid circular imports
+        from ..tools.database_tools import DatabaseTools
+        
+        # Get current business data
+        projects_data = await DatabaseTools.get_projects_overview()
+        talents_data = await DatabaseTools.get_talents_summary()
+        
+        # Generate business insights
+        insights = await self._analyze_business_patterns(projects_data, talents_data)
+        
+        # Process each insight
+        for insight in insights:
+            await self._process_proactive_insight(insight)
+        
+        logger.debug("📊 Business metrics refreshed")
+    
+    async def _refresh_system_health(self):
+        """Recompute technical system health and performance"""
+        from ..tools.database_tools import DatabaseTools
+        
+        # Get system health data
+        health_data = await DatabaseTools.get_system_health()
+        
+        # Analyze system health
+        anomalies = await self._detect_system_anomalies(health_data)
+        
+        # Process anomalies
+        for anomaly in anomalies:
+            await self._handle_system_anomaly(anomaly)
+            self.anomalies_detected.append(anomaly)
+        
+        # Update health score
+        self._update_system_health_score(health_data)
+        
+        logger.debug("🔧 System health refreshed")
+    
+    async def _refresh_team_performance(self):
+        """Recompute team productivity and collaboration patterns"""
+        from ..tools.database_tools import DatabaseTools
+        
+        # Get team data
+        department_data = await DatabaseTools.get_department_overview()
+        
+        # Analyze team performance patterns
+        team_insights = await self._analyze_team_patterns(department_data)
+        
+        # Process team insights
+        for insight in team_insights:
+            await self._process_proactive_insight(insight)
+        
+        logger.debug("👥 Team performance refreshed")
+    
+    async def _refresh_financial_metrics(self):
+        """Recompute financial KPIs and cost optimization opportunities"""
+        # Simulate financial monitoring (in real implementation, 
+        # this would connect to financial data sources)
+        financial_insights = await self._analyze_financial_patterns()
+        
+        for insight in financial_insights:
+            await self._process_proactive_insight(insight)
+        
+        logger.debug("💰 Financial metrics refreshed")
+    
+    async def _refresh_patterns(self):
+        """Pattern detection over the insights generated so far"""
+        # Analyze historical insights for patterns
+        patterns = await self._identify_recurring_patterns()
+        
+        # Generate meta-insights about patterns
+        for pattern in patterns:
+            meta_insight = await self._create_pattern_insight(pattern)
+            if meta_insight:
+                await self._process_proactive_insight(meta_insight)
+        
+        logger.debug("🔍 Pattern detection completed")
+    
+    def _cleanup_expired(self):
+        """Clean up expired insights and actions"""
+        try:
+            now = datetime.now()
             
-            await asyncio.sleep(self.performance_monitoring_interval)
-    
-    async def _monitor_financial_metrics(self):
-        """Monitor financial KPIs and cost optimization opportunities"""
-        while self.monitoring_active:
-            try:
-                # Simulate financial monitoring (in real implementation, 
-                # this would connect to financial data sources)
-                financial_insights = await self._analyze_financial_patterns()
-                
-                for insight in financial_insights:
-                    await self._process_proactive_insight(insight)
-                
-                logger.debug("💰 Financial metrics monitoring cycle completed")
-                
-            except Exception as e:
-                logger.error("Financial monitoring error", error=str(e))
+            # Remove expired insights
+            self.insights_generated = [
+                insight for insight in self.insights_generated
+                if insight.expires_at is None or insight.expires_at > now
+            ]
             
-            await asyncio.sleep(self.business_monitoring_interval)
-    
-    async def _detect_patterns_and_trends(self):
-        """Advanced pattern detection and trend analysis"""
-        while self.monitoring_active:
-            try:
-                # Analyze historical insights for patterns
-                patterns = await self._identify_recurring_patterns()
-                
-                # Generate meta-insights about patterns
-                for pattern in patterns:
-                    meta_insight = await self._create_pattern_insight(pattern)
-                    if meta_insight:
-                        await self._process_proactive_insight(meta_insight)
-                
-                logger.debug("🔍 Pattern detection cycle completed")
-                
-            except Exception as e:
-                logger.error("Pattern detection error", error=str(e))
+            # Archive completed actions older than 24 hours
+            cutoff = now - timedelta(hours=24)
+            completed_actions = [
+                a for a in self.autonomous_actions
+                if a.status == ActionStatus.COMPLETED and 
+                   a.completed_at and a.completed_at < cutoff
+            ]
             
-            await asyncio.sleep(600)  # Every 10 minutes
-    
-    async def _execute_autonomous_actions(self):
-        """Execute pending autonomous actions"""
-        while self.monitoring_active:
-            try:
-                # Find actions ready for execution
-                pending_actions = [a for a in self.autonomous_actions 
-                                 if a.status == ActionStatus.PENDING]
-                
-                for action in pending_actions:
-                    await self._execute_single_action(action)
-                
-                logger.debug("🤖 Autonomous action execution cycle completed")
-                
-            except Exception as e:
-                logger.error("Autonomous action execution error", error=str(e))
+            for action in completed_actions:
+                self.intervention_history.append(asdict(action))
+                self.autonomous_actions.remove(action)
             
-            await asyncio.sleep(30)  # Check every 30 seconds
-    
-    async def _cleanup_expired_insights(self):
-        """Clean up expired insights and actions"""
-        while self.monitoring_active:
-            try:
-                now = datetime.now()
-                
-                # Remove expired insights
-                self.insights_generated = [
-                    insight for insight in self.insights_generated
-                    if insight.expires_at is None or insight.expires_at > now
-                ]
-                
-                # Archive completed actions older than 24 hours
-                cutoff = now - timedelta(hours=24)
-                completed_actions = [
-                    a for a in self.autonomous_actions
-                    if a.status == ActionStatus.COMPLETED and 
-                       a.completed_at and a.completed_at < cutoff
-                ]
-                
-                for action in completed_actions:
-                    self.intervention_history.append(asdict(action))
-                    self.autonomous_actions.remove(action)
-                
-                logger.debug("🧹 Cleanup cycle completed")
-                
-            except Exception as e:
-                logger.error("Cleanup error", error=str(e))
+            logger.debug("🧹 Cleanup completed")
             
-            await asyncio.sleep(3600)  # Every hour
+        except Exception as e:
+            logger.error("Cleanup error", error=str(e))
+    
     
     async def _analyze_business_patterns(self, projects_data: Dict, talents_data: Dict) -> List[ProactiveInsight]:
         """Analyze business data and generate intelligent insights"""
@@ -603,6 +650,10 @@ class AliProactiveEngine:
     
     async def _process_proactive_insight(self, insight: ProactiveInsight):
         """Process and potentially act on proactive insights"""
+        if self._is_duplicate(insight):
+            self.metrics["duplicate_insights_suppressed"] += 1
+            return
+        
         self.insights_generated.append(insight)
         self.metrics["insights_generated_today"] += 1
         
@@ -621,6 +672,22 @@ class AliProactiveEngine:
         
         # Always queue for human visibility
         await self._queue_for_human_review(insight)
+        
+        # New insights feed pattern detection (but pattern insights don't re-trigger it)
+        if self.monitoring_active and "pattern_analysis" not in insight.data_sources:
+            self.notify_change("patterns")
+    
+    def _is_duplicate(self, insight: ProactiveInsight) -> bool:
+        """Whether an unexpired insight with the same type and title was raised recently"""
+        now = datetime.now()
+        since = now - self.duplicate_window
+        return any(
+            existing.insight_type == insight.insight_type
+            and existing.title == insight.title
+            and existing.generated_at >= since
+            and (existing.expires_at is None or existing.expires_at > now)
+            for existing in reversed(self.insights_generated)
+        )
     
     async def _create_autonomous_action(self, insight: ProactiveInsight):
         """Create autonomous action based on insight"""
@@ -643,6 +710,11 @@ class AliProactiveEngine:
         logger.info("🤖 Ali created autonomous action", 
                    action_id=action.id, 
                    action_type=action.action_type)
+        
+        # Execute right away instead of waiting for a polling cycle
+        task = asyncio.create_task(self._execute_single_action(action))
+        self._action_tasks.add(task)
+        task.add_done_callback(self._action_tasks.discard)
     
     async def _execute_single_action(self, action: AutonomousAction):
         """Execute a single autonomous action"""
@@ -650,9 +722,6 @@ class AliProactiveEngine:
             action.status = ActionStatus.IN_PROGRESS
             logger.info("⚙️ Ali executing autonomous action", action_id=action.id)
             
-            # Simulate action execution
-            await asyncio.sleep(1)  # Simulate processing time
-            
             # In real implementation, this would coordinate with actual agents
             result = {
                 "status": "completed",
@@ -862,6 +931,8 @@ class AliProactiveEngine:
                 # System status
                 "anomalies_detected": len(self.anomalies_detected),
                 "intervention_history_count": len(self.intervention_history),
+                "duplicate_insights_suppressed": self.metrics["duplicate_insights_suppressed"],
+                "refresh_stats": self.refresh_stats,
                 
                 "timestamp": datetime.now().isoformat()
             }
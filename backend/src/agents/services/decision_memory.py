@@ -0,0 +1,267 @@
+"""
+Decision Memory - persisted decision plans with similarity search
+Compact feature vectors (domain, decision type, agents, query embedding) in a
+pgvector HNSW index, with an in-process index when no database is available
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+# Feature vector layout: [domain | decision type | agents | query]
+DOMAIN_BUCKETS = 16
+TYPE_BUCKETS = 8
+AGENT_BUCKETS = 32
+QUERY_DIM = 384  # all-MiniLM-L6-v2, the local embedding model
+FEATURE_DIM = DOMAIN_BUCKETS + TYPE_BUCKETS + AGENT_BUCKETS + QUERY_DIM
+
+# Block weights: the cosine similarity of two vectors is then the weighted
+# mean of the per-block similarities
+BLOCK_WEIGHTS = {"domain": 0.3, "type": 0.2, "agents": 0.2, "query": 0.3}
+
+
+def _bucket(value: str, buckets: int) -> int:
+    return int(hashlib.md5(value.encode()).hexdigest()[:8], 16) % buckets
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def build_feature_vector(
+    business_domain: str,
+    decision_type: Optional[str],
+    agents: Sequence[str],
+    query_embedding: Sequence[float]
+) -> List[float]:
+    """Compact, unit-length feature vector of a decision"""
+    blocks = {
+        "domain": np.zeros(DOMAIN_BUCKETS, dtype=np.float32),
+        "type": np.zeros(TYPE_BUCKETS, dtype=np.float32),
+        "agents": np.zeros(AGENT_BUCKETS, dtype=np.float32),
+        "query": np.zeros(QUERY_DIM, dtype=np.float32),
+    }
+    if business_domain:
+        blocks["domain"][_bucket(business_domain.lower(), DOMAIN_BUCKETS)] = 1.0
+    if decision_type:
+        blocks["type"][_bucket(decision_type, TYPE_BUCKETS)] = 1.0
+    for agent in set(agents):
+        blocks["agents"][_bucket(agent, AGENT_BUCKETS)] = 1.0
+    # An empty or mismatched embedding leaves the query block empty
+    if len(query_embedding) == QUERY_DIM:
+        blocks["query"] = np.asarray(query_embedding, dtype=np.float32)
+
+    parts = [_unit(blocks[name]) * np.sqrt(weight) for name, weight in BLOCK_WEIGHTS.items()]
+    return _unit(np.concatenate(parts)).tolist()
+
+
+@dataclass
+class DecisionRecord:
+    """A decision plan as stored for similarity search"""
+    decision_id: str
+    business_domain: str
+    decision_type: str
+    agents: List[str]
+    features: List[float]
+    summary: Dict[str, Any]
+    outcome_score: Optional[float] = None
+    created_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class SimilarDecision:
+    """A past decision ranked for the current context"""
+    record: DecisionRecord
+    similarity: float
+    score: float  # similarity weighted by outcome
+
+
+class InMemoryDecisionStore:
+    """
+    Exact cosine search over a contiguous matrix of feature vectors.
+
+    Used without a database; a matrix-vector product over 20k decisions
+    takes about a millisecond. The matrix grows by doubling, and the oldest
+    tenth is evicted once ``max_records`` is reached.
+    """
+
+    def __init__(self, max_records: int = 20_000):
+        self.max_records = max_records
+        self._records: List[DecisionRecord] = []
+        self._matrix = np.zeros((0, FEATURE_DIM), dtype=np.float32)
+        self._positions: Dict[str, int] = {}
+
+    async def add(self, record: DecisionRecord):
+        size = len(self._records)
+        if size >= self.max_records:
+            drop = max(1, self.max_records // 10)
+            self._records = self._records[drop:]
+            self._matrix[:size - drop] = self._matrix[drop:size]
+            self._positions = {r.decision_id: i for i, r in enumerate(self._records)}
+            size -= drop
+        if size >= len(self._matrix):
+            grown = np.zeros((min(max(1024, 2 * len(self._matrix)), self.max_records), FEATURE_DIM), dtype=np.float32)
+            grown[:size] = self._matrix[:size]
+            self._matrix = grown
+
+        self._matrix[size] = np.asarray(record.features, dtype=np.float32)
+        self._positions[record.decision_id] = size
+        self._records.append(record)
+
+    async def search(self, features: Sequence[float], limit: int) -> List[Tuple[DecisionRecord, float]]:
+        size = len(self._records)
+        if not size or limit <= 0:
+            return []
+        scores = self._matrix[:size] @ np.asarray(features, dtype=np.float32)
+        limit = min(limit, size)
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(self._records[i], float(scores[i])) for i in top]
+
+    async def record_outcome(self, decision_id: str, outcome_score: float) -> bool:
+        position = self._positions.get(decision_id)
+        if position is None:
+            return False
+        self._records[position].outcome_score = outcome_score
+        return True
+
+    async def count(self) -> int:
+        return len(self._records)
+
+
+class PgDecisionStore:
+    """
+    Decision history in PostgreSQL with an HNSW index on the feature vector.
+
+    See migrations/create_decision_history_table.sql.
+    """
+
+    def __init__(self, session_factory, ef_search: int = 40):
+        self.session_factory = session_factory
+        self.ef_search = ef_search
+
+    @staticmethod
+    def _vector_literal(features: Sequence[float]) -> str:
+        return "[" + ",".join(f"{value:.6f}" for value in features) + "]"
+
+    async def add(self, record: DecisionRecord):
+        from sqlalchemy import text
+
+        async with self.session_factory() as session:
+            await session.execute(
+                text("""
+                    INSERT INTO decision_history
+                        (decision_id, business_domain, decision_type, agents, features, summary, outcome_score, created_at)
+                    VALUES
+                        (:decision_id, :business_domain, :decision_type, CAST(:agents AS jsonb),
+                         CAST(:features AS vector), CAST(:summary AS jsonb), :outcome_score, :created_at)
+                    ON CONFLICT (decision_id) DO NOTHING
+                """),
+                {
+                    "decision_id": record.decision_id,
+                    "business_domain": record.business_domain,
+                    "decision_type": record.decision_type,
+                    "agents": json.dumps(record.agents),
+                    "features": self._vector_literal(record.features),
+                    "summary": json.dumps(record.summary, default=str),
+                    "outcome_score": record.outcome_score,
+                    "created_at": record.created_at,
+                }
+            )
+            await session.commit()
+
+    async def search(self, features: Sequence[float], limit: int) -> List[Tuple[DecisionRecord, float]]:
+        from sqlalchemy import text
+
+        async with self.session_factory() as session:
+            # Recall/latency trade-off of the HNSW scan for this transaction only
+            await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(max(self.ef_search, limit))}"))
+            result = await session.execute(
+                text("""
+                    SELECT decision_id, business_domain, decision_type, agents, summary,
+                           outcome_score, created_at,
+                           1 - (features <=> CAST(:query AS vector)) AS similarity
+                    FROM decision_history
+                    ORDER BY features <=> CAST(:query AS vector)
+                    LIMIT :limit
+                """),
+                {"query": self._vector_literal(features), "limit": limit}
+            )
+            rows = result.mappings().all()
+
+        return [
+            (
+                DecisionRecord(
+                    decision_id=str(row["decision_id"]),
+                    business_domain=row["business_domain"],
+                    decision_type=row["decision_type"],
+                    agents=row["agents"] or [],
+                    features=[],
+                    summary=row["summary"] or {},
+                    outcome_score=row["outcome_score"],
+                    created_at=row["created_at"],
+                ),
+                float(row["similarity"]),
+            )
+            for row in rows
+        ]
+
+    async def record_outcome(self, decision_id: str, outcome_score: float) -> bool:
+        from sqlalchemy import text
+
+        async with self.session_factory() as session:
+            result = await session.execute(
+                text("UPDATE decision_history SET outcome_score = :score WHERE decision_id = :decision_id"),
+                {"score": outcome_score, "decision_id": decision_id}
+            )
+            await session.commit()
+            return result.rowcount > 0
+
+    async def count(self) -> int:
+        from sqlalchemy import text
+
+        async with self.session_factory() as session:
+            result = await session.execute(text("SELECT COUNT(*) FROM decision_history"))
+            return int(result.scalar() or 0)
+
+
+def rank_similar(
+    candidates: List[Tuple[DecisionRecord, float]],
+    top_k: int,
+    min_similarity: float = 0.5,
+    outcome_weight: float = 0.5
+) -> List[SimilarDecision]:
+    """
+    Re-rank nearest neighbours by outcome.
+
+    Decisions without a recorded outcome count as neutral (0.5); a failed
+    decision keeps ``1 - outcome_weight`` of its similarity.
+    """
+    ranked = []
+    for record, similarity in candidates:
+        if similarity < min_similarity:
+            continue
+        outcome = 0.5 if record.outcome_score is None else record.outcome_score
+        score = similarity * (1.0 - outcome_weight + outcome_weight * outcome)
+        ranked.append(SimilarDecision(record=record, similarity=similarity, score=score))
+    ranked.sort(key=lambda item: item.score, reverse=True)
+    return ranked[:top_k]
+
+
+__all__ = [
+    "DecisionRecord",
+    "FEATURE_DIM",
+    "InMemoryDecisionStore",
+    "PgDecisionStore",
+    "SimilarDecision",
+    "build_feature_vector",
+    "rank_similar",
+]
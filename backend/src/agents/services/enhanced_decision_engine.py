@@ -17,6 +17,15 @@ from sklearn.tree import DecisionTreeClassifier
 from sklearn.preprocessing import LabelEncoder
 import pickle
 
+from .decision_memory import (
+    DecisionRecord,
+    InMemoryDecisionStore,
+    PgDecisionStore,
+    SimilarDecision,
+    build_feature_vector,
+    rank_similar,
+)
+
 logger = structlog.get_logger()
 
 class DecisionType(Enum):
@@ -120,6 +129,13 @@ class AutonomousDecisionEngine:
         self.max_agents_per_task = 5
         self.max_parallel_executions = 3
         
+        # Similar-decision retrieval over the full persisted history
+        self.decision_memory = None
+        self.similarity_budget_ms = 50
+        self.embedding_timeout_ms = 200
+        self.similar_top_k = 5
+        self.memory_stats = {"lookups": 0, "budget_exceeded": 0, "errors": 0, "saved": 0}
+        
         logger.info("🧠 Enhanced Autonomous Decision Engine initialized")
         
         # Initialize with some sample agent performance data
@@ -166,6 +182,11 @@ class AutonomousDecisionEngine:
             # Step 2: Decision Type Classification
             decision_type = await self._classify_decision_type(context, situation_analysis)
             
+            query_embedding = await self._query_embedding(context.user_query)
+            situation_analysis["historical_patterns"] = await self._find_similar_historical_decisions(
+                context, decision_type, query_embedding
+            )
+            
             # Step 3: Generate Multiple Decision Options
             decision_options = await self._generate_decision_options(context, decision_type)
             
@@ -188,6 +209,7 @@ class AutonomousDecisionEngine:
             
             # Store decision for tracking
             self.decision_history.append(decision_plan)
+            await self._remember_decision(decision_plan, context, query_embedding)
             
             logger.info("✅ Ali generated autonomous decision plan",
                        decision_id=decision_plan.decision_id,
@@ -209,8 +231,7 @@ class AutonomousDecisionEngine:
             "domain_requirements": self._analyze_domain_requirements(context.business_domain),
             "resource_availability": self._assess_resource_availability(context),
             "urgency_factor": self._calculate_urgency_factor(context.urgency_level),
-            "constraint_analysis": self._analyze_constraints(context),
-            "historical_patterns": self._find_similar_historical_decisions(context)
+            "constraint_analysis": self._analyze_constraints(context)
         }
         
         logger.debug("Situation analysis completed", 
@@ -306,42 +327,94 @@ class AutonomousDecisionEngine:
             "primary_constraint": max(constraints.items(), key=lambda x: x[1])[0] if any(constraints.values()) else None
         }
     
-    def _find_similar_historical_decisions(self, context: DecisionContext) -> List[DecisionPlan]:
-        """Find similar historical decisions for pattern matching"""
-        similar_decisions = []
-        
-        for decision in self.decision_history[-20:]:  # Last 20 decisions
-            similarity_score = self._calculate_decision_similarity(decision, context)
-            if similarity_score > 0.6:  # 60% similarity threshold
-                similar_decisions.append(decision)
-        
-        return sorted(similar_decisions, 
-                     key=lambda d: self._calculate_decision_similarity(d, context), 
-                     reverse=True)[:5]  # Top 5 similar decisions
+    def _get_decision_memory(self):
+        """Decision store: PostgreSQL when the database is up, in-process otherwise"""
+        if self.decision_memory is None:
+            try:
+                from ...core.database import get_async_session_factory
+                self.decision_memory = PgDecisionStore(get_async_session_factory())
+            except (ImportError, RuntimeError):
+                logger.info("Database unavailable, keeping decision memory in process")
+                self.decision_memory = InMemoryDecisionStore()
+        return self.decision_memory
     
-    def _calculate_decision_similarity(self, decision: DecisionPlan, context: DecisionContext) -> float:
-        """Calculate similarity between historical decision and current context"""
-        # Simple similarity calculation based on multiple factors
-        factors = []
-        
-        # Domain similarity (simplified)
-        domain_similarity = 1.0 if context.business_domain in decision.reasoning else 0.0
-        factors.append(domain_similarity * 0.3)
-        
-        # Agent overlap
-        context_agents = set(context.available_agents)
-        decision_agents = set()
-        for agent_list in decision.agent_assignments.values():
-            decision_agents.update(agent_list)
+    async def _query_embedding(self, query: str) -> List[float]:
+        """Query embedding for the feature vector; empty if the model is unavailable or slow"""
+        try:
+            from ...core.embedding_service import get_embedding_service
+            return await asyncio.wait_for(
+                get_embedding_service().embed(query), timeout=self.embedding_timeout_ms / 1000
+            )
+        except Exception as e:
+            logger.debug("Query embedding unavailable for decision memory", error=str(e))
+            return []
+    
+    def _decision_features(self, context: DecisionContext, decision_type: DecisionType,
+                           agents: List[str], query_embedding: List[float]) -> List[float]:
+        return build_feature_vector(context.business_domain, decision_type.value, agents, query_embedding)
+    
+    async def _find_similar_historical_decisions(
+        self,
+        context: DecisionContext,
+        decision_type: DecisionType,
+        query_embedding: List[float]
+    ) -> List[SimilarDecision]:
+        """Outcome-weighted similar decisions from the full history, within the latency budget"""
+        self.memory_stats["lookups"] += 1
+        features = self._decision_features(context, decision_type, context.available_agents, query_embedding)
         
-        agent_overlap = len(context_agents.intersection(decision_agents)) / max(len(context_agents), 1)
-        factors.append(agent_overlap * 0.4)
+        try:
+            # Over-fetch so outcome re-ranking can promote slightly less similar successes
+            candidates = await asyncio.wait_for(
+                self._get_decision_memory().search(features, self.similar_top_k * 4),
+                timeout=self.similarity_budget_ms / 1000
+            )
+        except asyncio.TimeoutError:
+            self.memory_stats["budget_exceeded"] += 1
+            logger.warning("Similar decision lookup exceeded budget", budget_ms=self.similarity_budget_ms)
+            return []
+        except Exception as e:
+            self.memory_stats["errors"] += 1
+            logger.warning("Similar decision lookup failed", error=str(e))
+            return []
         
-        # Decision type consistency (simplified)
-        type_consistency = 0.8  # Assume 80% consistency for now
-        factors.append(type_consistency * 0.3)
+        return rank_similar(candidates, self.similar_top_k)
+    
+    async def _remember_decision(self, decision_plan: DecisionPlan, context: DecisionContext,
+                                 query_embedding: List[float]):
+        """Persist the decision plan for future similarity lookups (best effort)"""
+        agents = sorted({agent for group in decision_plan.agent_assignments.values() for agent in group})
+        record = DecisionRecord(
+            decision_id=decision_plan.decision_id,
+            business_domain=context.business_domain,
+            decision_type=decision_plan.decision_type.value,
+            agents=agents,
+            features=self._decision_features(context, decision_plan.decision_type, agents, query_embedding),
+            summary={
+                "query": context.user_query[:500],
+                "strategy": decision_plan.selected_strategy,
+                "confidence": decision_plan.confidence_score,
+                "risk_level": decision_plan.risk_level.value,
+                "reasoning": decision_plan.reasoning,
+            },
+            created_at=decision_plan.created_at
+        )
         
-        return sum(factors)
+        try:
+            await self._get_decision_memory().add(record)
+            self.memory_stats["saved"] += 1
+        except Exception as e:
+            self.memory_stats["errors"] += 1
+            logger.warning("Failed to persist decision plan", decision_id=decision_plan.decision_id, error=str(e))
+    
+    async def _record_decision_outcome(self, outcome: DecisionOutcome):
+        """Attach the execution outcome to the stored decision (best effort)"""
+        score = outcome.quality_achieved if outcome.execution_status == "completed" else 0.0
+        try:
+            await self._get_decision_memory().record_outcome(outcome.decision_id, score)
+        except Exception as e:
+            self.memory_stats["errors"] += 1
+            logger.warning("Failed to record decision outcome", decision_id=outcome.decision_id, error=str(e))
     
     async def _classify_decision_type(self, context: DecisionContext, analysis: Dict[str, Any]) -> DecisionType:
         """Classify the type of decision needed"""
@@ -1078,6 +1151,7 @@ class AutonomousDecisionEngine:
             
             # Update agent performance cache
             await self._update_agent_performance(outcome)
+            await self._record_decision_outcome(outcome)
             
             logger.info("✅ Ali completed decision execution",
                        decision_id=decision_plan.decision_id,
@@ -1092,7 +1166,7 @@ class AutonomousDecisionEngine:
                         error=str(e))
             
             # Return failure outcome
-            return DecisionOutcome(
+            outcome = DecisionOutcome(
                 decision_id=decision_plan.decision_id,
                 execution_status="failed",
                 actual_duration=datetime.now() - execution_start,
@@ -1104,6 +1178,8 @@ class AutonomousDecisionEngine:
                 improvement_suggestions=["Review execution logic", "Add better error handling"],
                 completed_at=datetime.now()
             )
+            await self._record_decision_outcome(outcome)
+            return outcome
     
     async def _update_agent_performance(self, outcome: DecisionOutcome):
         """Update agent performance cache based on execution outcomes"""
@@ -1193,6 +1269,11 @@ class AutonomousDecisionEngine:
                                         if (datetime.now() - o.completed_at).days < 1])
             },
             
+            "decision_memory": {
+                **self.memory_stats,
+                "store": type(self.decision_memory).__name__ if self.decision_memory else None
+            },
+            
             "timestamp": datetime.now().isoformat()
         }
     
@@ -47,6 +47,12 @@ class EventType(str, Enum):
     SYSTEM_ERROR = "system.error"
     SYSTEM_ALERT = "system.alert"
     
+    # Data change events, published by write paths
+    PROJECT_CHANGED = "project.changed"
+    TALENT_CHANGED = "talent.changed"
+    COST_RECORDED = "cost.recorded"
+    SYSTEM_HEALTH_CHANGED = "system.health_changed"
+    
     # Insight events
     INSIGHT_GENERATED = "insight.generated"
     PATTERN_DETECTED = "pattern.detected"
@@ -160,6 +166,7 @@ class EventBus:
             "events_processed": 0,
             "patterns_detected": 0,
             "insights_generated": 0,
+            "dropped_events": 0,
             "errors": 0
         }
     
@@ -174,7 +181,10 @@ class EventBus:
         """Stop the event bus processor"""
         self.running = False
         if self._processor_task:
+            # Wakes the processor, which waits on the queue without a timeout
+            self.event_queue.put_nowait(None)
             await self._processor_task
+            self._processor_task = None
             logger.info("🛑 Event bus stopped")
     
     async def publish(self, event: Event):
@@ -182,6 +192,19 @@ class EventBus:
         await self.event_queue.put(event)
         logger.debug(f"📢 Event published: {event.type}", event_id=event.id)
     
+    def publish_nowait(self, event: Event) -> bool:
+        """
+        Publish from a write path without awaiting.
+        
+        Events are dropped while the bus is not running, so producers never
+        fill a queue nobody drains.
+        """
+        if not self.running:
+            self.metrics["dropped_events"] += 1
+            return False
+        self.event_queue.put_nowait(event)
+        return True
+    
     def subscribe(self, event_type: EventType, handler: Callable):
         """Subscribe to specific event type"""
         self.subscribers[event_type].append(handler)
@@ -205,11 +228,10 @@ class EventBus:
         """Main event processing loop"""
         while self.running:
             try:
-                # Get next event with timeout
-                event = await asyncio.wait_for(
-                    self.event_queue.get(),
-                    timeout=1.0
-                )
+                # Idle until the next event (or the stop sentinel)
+                event = await self.event_queue.get()
+                if event is None:
+                    continue
                 
                 # Add to history
                 self.event_history.append(event)
@@ -221,8 +243,6 @@ class EventBus:
                 # Check patterns
                 await self._check_patterns(event)
                 
-            except asyncio.TimeoutError:
-                continue
             except Exception as e:
                 logger.error(f"❌ Error processing event: {e}")
                 self.metrics["errors"] += 1
@@ -328,6 +348,11 @@ class EventBus:
 event_bus = EventBus()
 
 
+def publish_change(event_type: EventType, source: str, **data) -> bool:
+    """Announce a data change (project, talent, cost, health) to subscribers"""
+    return event_bus.publish_nowait(Event(type=event_type, priority=EventPriority.LOW, source=source, data=data))
+
+
 # Pre-defined patterns
 def register_default_patterns():
     """Register default event patterns"""
@@ -14,9 +14,9 @@ import numpy as np
 
 import structlog
 import redis.asyncio as redis
-from sentence_transformers import SentenceTransformer
 
 from src.agents.utils.config import get_settings
+from src.core.embedding_service import get_embedding_service
 
 logger = structlog.get_logger()
 
@@ -94,8 +94,9 @@ class PerAgentFilter:
 class SemanticDeduplicator:
     """Advanced deduplication using semantic similarity"""
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+    def __init__(self):
+        # Shares the process-wide model and worker pool instead of loading its own
+        self.embedding_service = get_embedding_service()
         self.similarity_threshold = 0.85
         
     async def deduplicate(self, contexts: List[Any]) -> List[Any]:
@@ -106,8 +107,8 @@ class SemanticDeduplicator:
         # Extract content for embedding
         contents = [c.content for c in contexts]
         
-        # Generate embeddings
-        embeddings = self.model.encode(contents, convert_to_numpy=True)
+        # Generate embeddings off the event loop, batched with concurrent requests
+        embeddings = np.asarray(await self.embedding_service.embed_many(contents))
         
         # Calculate similarity matrix
         unique_indices = []
@@ -2,60 +2,39 @@
 Token Optimization Module
 Implements AutoGen best practices for reducing token usage and costs
 """
-import hashlib
-import json
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Any
 import structlog
 
+from ....core.semantic_cache import SemanticResponseCache, get_semantic_cache
+
 logger = structlog.get_logger()
 
 class TokenOptimizer:
     """Optimizes token usage across agent conversations"""
     
-    def __init__(self):
-        self.response_cache: Dict[str, str] = {}
-        self.cache_ttl = timedelta(minutes=15)
-        self.cache_timestamps: Dict[str, datetime] = {}
+    def __init__(self, response_cache: Optional[SemanticResponseCache] = None):
+        # Shared across processes; paraphrased questions hit the same entry
+        self.response_cache = response_cache or get_semantic_cache()
     
-    def get_cached_response(self, message: str, agent_id: str) -> Optional[str]:
-        """Check if we have a cached response for this message"""
-        cache_key = self._get_cache_key(message, agent_id)
-        
-        if cache_key in self.response_cache:
-            # Check if cache is still valid
-            if cache_key in self.cache_timestamps:
-                if datetime.now() - self.cache_timestamps[cache_key] < self.cache_ttl:
-                    logger.info("🎯 Cache hit", agent=agent_id, message_preview=message[:50])
-                    return self.response_cache[cache_key]
-        
-        return None
+    async def get_cached_response(self, message: str, agent_id: str) -> Optional[str]:
+        """Check if we have a cached response for this message or a close paraphrase"""
+        return await self.response_cache.get(message, agent_id)
     
-    def cache_response(self, message: str, agent_id: str, response: str):
-        """Cache a response for future use"""
-        cache_key = self._get_cache_key(message, agent_id)
-        self.response_cache[cache_key] = response
-        self.cache_timestamps[cache_key] = datetime.now()
+    async def cache_response(self, message: str, agent_id: str, response: str, tags: Iterable[str] = ()):
+        """Cache a response for future use
         
-        # Clean old cache entries
-        self._clean_cache()
+        Args:
+            tags: Data the response depends on (e.g. "finance:q3"); see invalidate_cached_responses
+        """
+        await self.response_cache.put(message, agent_id, response, tags)
     
-    def _get_cache_key(self, message: str, agent_id: str) -> str:
-        """Generate a cache key for message + agent combination"""
-        content = f"{agent_id}:{message.lower().strip()}"
-        return hashlib.md5(content.encode()).hexdigest()
+    async def invalidate_cached_responses(self, tag: str):
+        """Drop cached responses that depend on data which has changed"""
+        await self.response_cache.invalidate(tag)
     
-    def _clean_cache(self):
-        """Remove expired cache entries"""
-        now = datetime.now()
-        expired_keys = [
-            key for key, timestamp in self.cache_timestamps.items()
-            if now - timestamp > self.cache_ttl
-        ]
-        
-        for key in expired_keys:
-            del self.response_cache[key]
-            del self.cache_timestamps[key]
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Per-agent hit rates of the response cache"""
+        return self.response_cache.get_stats()
     
     @staticmethod
     def compress_message_history(messages: List[Dict], max_messages: int = 10) -> List[Dict]:
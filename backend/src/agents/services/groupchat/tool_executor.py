@@ -3,9 +3,15 @@ Tool Executor for GroupChat
 Ensures tool calls from agents are properly executed
 """
 
+import asyncio
 import json
+import re
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
 import structlog
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from autogen_agentchat.messages import TextMessage
 from ...tools.smart_tool_selector import SmartToolSelector
 from ...tools.web_search_tool import WebSearchTool, WebSearchArgs
@@ -18,6 +24,116 @@ except Exception:
 logger = structlog.get_logger()
 
 
+@dataclass(frozen=True)
+class ToolPolicy:
+    """Per-tool execution limits"""
+    max_concurrency: int = 4
+    timeout_seconds: float = 30.0
+    cache_ttl_seconds: float = 0.0  # 0 disables memoization
+
+
+TOOL_POLICIES: Dict[str, ToolPolicy] = {
+    "web_search": ToolPolicy(max_concurrency=3, timeout_seconds=20.0, cache_ttl_seconds=300.0),
+    "query_talents": ToolPolicy(max_concurrency=5, timeout_seconds=10.0, cache_ttl_seconds=60.0),
+    "vector_search": ToolPolicy(max_concurrency=5, timeout_seconds=10.0, cache_ttl_seconds=300.0),
+    "business_intelligence": ToolPolicy(max_concurrency=2, timeout_seconds=30.0, cache_ttl_seconds=120.0),
+}
+DEFAULT_TOOL_POLICY = ToolPolicy()
+
+# Per-tool concurrency limits shared by every conversation. A semaphore is
+# bound to the loop it is first used on, so each event loop gets its own set
+_tool_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _tool_semaphore(tool_name: str) -> asyncio.Semaphore:
+    semaphores = _tool_semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = semaphores.get(tool_name)
+    if semaphore is None:
+        policy = TOOL_POLICIES.get(tool_name, DEFAULT_TOOL_POLICY)
+        semaphore = asyncio.Semaphore(policy.max_concurrency)
+        semaphores[tool_name] = semaphore
+    return semaphore
+
+
+def _normalize_args(value: Any) -> Any:
+    """Canonical form of tool arguments for memo keys"""
+    if isinstance(value, dict):
+        return {k: _normalize_args(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_args(v) for v in value]
+    if isinstance(value, str):
+        return re.sub(r"\s+", " ", value).strip()
+    return value
+
+
+def tool_cache_key(tool_name: str, args: Dict[str, Any]) -> str:
+    """Memo key: tool name plus normalized, order-independent arguments"""
+    return f"{tool_name}:{json.dumps(_normalize_args(args), sort_keys=True, default=str, separators=(',', ':'))}"
+
+
+class ConversationToolCache:
+    """
+    Memoized tool results scoped to a conversation.
+
+    Entries expire after the tool's TTL; the number of conversations and of
+    entries per conversation are LRU-bounded.
+    """
+
+    def __init__(
+        self,
+        max_conversations: int = 256,
+        max_entries: int = 128,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_conversations = max_conversations
+        self.max_entries = max_entries
+        self.clock = clock
+        self._conversations: "OrderedDict[str, OrderedDict[str, Tuple[float, str]]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, conversation_id: str, key: str) -> Optional[str]:
+        entries = self._conversations.get(conversation_id)
+        entry = entries.get(key) if entries is not None else None
+        if entry is None or entry[0] < self.clock():
+            if entry is not None:
+                del entries[key]
+            self.stats["misses"] += 1
+            return None
+        self._conversations.move_to_end(conversation_id)
+        entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def set(self, conversation_id: str, key: str, result: str, ttl_seconds: float) -> None:
+        if ttl_seconds <= 0:
+            return
+        entries = self._conversations.setdefault(conversation_id, OrderedDict())
+        self._conversations.move_to_end(conversation_id)
+        entries[key] = (self.clock() + ttl_seconds, result)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        while len(self._conversations) > self.max_conversations:
+            self._conversations.popitem(last=False)
+
+    def clear(self, conversation_id: Optional[str] = None) -> None:
+        if conversation_id is None:
+            self._conversations.clear()
+        else:
+            self._conversations.pop(conversation_id, None)
+
+
+# Shared across executors: a new executor is created for every run of a conversation
+_tool_cache = ConversationToolCache()
+
+
+def get_tool_cache() -> ConversationToolCache:
+    """Get the process-wide conversation tool cache"""
+    return _tool_cache
+
+
 class GroupChatToolExecutor:
     """Executes tool calls emitted by agents in GroupChat"""
 
@@ -30,6 +146,8 @@ class GroupChatToolExecutor:
         self.selector = SmartToolSelector()
         self.web_search = WebSearchTool()
         self.tool_call_count = 0
+        self.cache_hits = 0
+        self.timeouts = 0
         self.tool_results: List[Dict[str, Any]] = []
         self.execution_plan = execution_plan
         self.conversation_id = conversation_id or ""
@@ -94,133 +212,172 @@ class GroupChatToolExecutor:
             logger.error(f"Failed to inject web search: {e}")
             return None
     
-    async def execute_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> List[str]:
+    async def execute_tool_calls(self, tool_calls: List[Any]) -> List[str]:
         """
-        Execute a list of tool calls and return results.
+        Execute a list of tool calls concurrently and return results in order.
         
         Args:
             tool_calls: List of tool call dictionaries with structure:
                 {"function": {"name": "tool_name", "arguments": "{json}"}}
+                (AutoGen FunctionCall objects with name/arguments also work)
         
         Returns:
             List of tool execution results as strings
         """
-        results = []
+        parsed = [self._parse_tool_call(tool_call) for tool_call in tool_calls]
         
-        for tool_call in tool_calls:
-            try:
-                self.tool_call_count += 1
-                
-                function = tool_call.get("function", {})
-                tool_name = function.get("name")
-                raw_args = function.get("arguments", "{}")
-                
-                logger.info(f"🔧 Executing tool: {tool_name}", args=raw_args[:100])
-                telemetry = get_telemetry()
-                telemetry_context = None
-                if telemetry and self.conversation_id:
-                    telemetry_context = TelemetryContext(conversation_id=self.conversation_id, user_id=self.user_id)
-                    with telemetry.trace_tool_call(tool_name or "unknown", telemetry_context):
-                        pass
-                
-                # Parse arguments
-                try:
-                    args = json.loads(raw_args) if isinstance(raw_args, str) else raw_args
-                except:
-                    args = {}
-                
-                # Execute based on tool name
-                if tool_name == "web_search":
-                    if telemetry and telemetry_context:
-                        telemetry.record_tool_invoked("web_search", telemetry_context)
-                    result = await self._execute_web_search(args)
-                elif tool_name == "query_talents":
-                    if telemetry and telemetry_context:
-                        telemetry.record_tool_invoked("query_talents", telemetry_context)
-                    result = await self._execute_talents_query(args)
-                elif tool_name == "vector_search":
-                    if telemetry and telemetry_context:
-                        telemetry.record_tool_invoked("vector_search", telemetry_context)
-                    result = await self._execute_vector_search(args)
-                elif tool_name == "business_intelligence":
-                    if telemetry and telemetry_context:
-                        telemetry.record_tool_invoked("business_intelligence", telemetry_context)
-                    result = await self._execute_business_intelligence(args)
-                else:
-                    result = f"Tool '{tool_name}' not recognized"
-                
-                results.append(result)
-                self.tool_results.append({
-                    "tool": tool_name,
-                    "args": args,
-                    "result": result
-                })
-                
-            except Exception as e:
-                logger.error(f"Tool execution failed: {e}")
-                results.append(f"Error executing tool: {str(e)}")
+        # Identical calls in the same batch share one execution
+        inflight: Dict[str, asyncio.Task] = {}
+        tasks = []
+        for tool_name, args in parsed:
+            key = tool_cache_key(tool_name or "unknown", args)
+            task = inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._execute_tool_call(tool_name, args, key))
+                inflight[key] = task
+            tasks.append(task)
+        
+        results = list(await asyncio.gather(*tasks))
+        
+        for (tool_name, args), result in zip(parsed, results):
+            self.tool_call_count += 1
+            self.tool_results.append({
+                "tool": tool_name,
+                "args": args,
+                "result": result
+            })
         
         return results
     
-    async def _execute_web_search(self, args: Dict[str, Any]) -> str:
-        """Execute web search tool"""
+    @staticmethod
+    def _parse_tool_call(tool_call: Any) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Tool name and parsed arguments from a dict or FunctionCall"""
+        if isinstance(tool_call, dict):
+            function = tool_call.get("function", {})
+            tool_name = function.get("name")
+            raw_args = function.get("arguments", "{}")
+        else:
+            tool_name = getattr(tool_call, "name", None)
+            raw_args = getattr(tool_call, "arguments", "{}")
+        
+        # Parse arguments
         try:
-            search_args = WebSearchArgs(
-                query=args.get("query", ""),
-                max_results=args.get("max_results", 5),
-                search_type=args.get("search_type", "general")
-            )
-            result = await self.web_search.run(search_args)
-            logger.info("✅ Web search completed successfully")
+            args = json.loads(raw_args) if isinstance(raw_args, str) else raw_args
+        except (TypeError, ValueError):
+            args = {}
+        return tool_name, args if isinstance(args, dict) else {}
+    
+    async def _execute_tool_call(self, tool_name: Optional[str], args: Dict[str, Any], key: str) -> str:
+        """Run one tool call under its concurrency limit, timeout and memo cache"""
+        try:
+            logger.info(f"🔧 Executing tool: {tool_name}", args=json.dumps(args, default=str)[:100])
+            telemetry = get_telemetry()
+            telemetry_context = None
+            if telemetry and self.conversation_id:
+                telemetry_context = TelemetryContext(conversation_id=self.conversation_id, user_id=self.user_id)
+                with telemetry.trace_tool_call(tool_name or "unknown", telemetry_context):
+                    pass
+            
+            handler = self._tool_handlers.get(tool_name)
+            if handler is None:
+                return f"Tool '{tool_name}' not recognized"
+            
+            if telemetry and telemetry_context:
+                telemetry.record_tool_invoked(tool_name, telemetry_context)
+            
+            policy = TOOL_POLICIES.get(tool_name, DEFAULT_TOOL_POLICY)
+            cache = get_tool_cache()
+            if self.conversation_id and policy.cache_ttl_seconds > 0:
+                cached = cache.get(self.conversation_id, key)
+                if cached is not None:
+                    self.cache_hits += 1
+                    logger.info(f"♻️ Tool result reused: {tool_name}")
+                    return cached
+            
+            async with _tool_semaphore(tool_name):
+                try:
+                    result = await asyncio.wait_for(handler(args), timeout=policy.timeout_seconds)
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    logger.warning(f"⏱️ Tool {tool_name} timed out after {policy.timeout_seconds}s")
+                    return f"Tool '{tool_name}' timed out after {policy.timeout_seconds:g}s"
+                except Exception as e:
+                    logger.error(f"{self._tool_labels[tool_name]} failed: {e}")
+                    return f"{self._tool_labels[tool_name]} error: {str(e)}"
+            
+            # Only successful results are memoized
+            if self.conversation_id:
+                cache.set(self.conversation_id, key, result, policy.cache_ttl_seconds)
             return result
+            
         except Exception as e:
-            logger.error(f"Web search failed: {e}")
-            return f"Web search error: {str(e)}"
+            logger.error(f"Tool execution failed: {e}")
+            return f"Error executing tool: {str(e)}"
+    
+    @property
+    def _tool_handlers(self) -> Dict[str, Any]:
+        return {
+            "web_search": self._execute_web_search,
+            "query_talents": self._execute_talents_query,
+            "vector_search": self._execute_vector_search,
+            "business_intelligence": self._execute_business_intelligence,
+        }
+    
+    _tool_labels = {
+        "web_search": "Web search",
+        "query_talents": "Talents query",
+        "vector_search": "Vector search",
+        "business_intelligence": "Business intelligence",
+    }
+    
+    # Tool handlers raise on failure; _execute_tool_call formats the error
+    # and keeps it out of the memo cache
+    
+    async def _execute_web_search(self, args: Dict[str, Any]) -> str:
+        """Execute web search tool"""
+        search_args = WebSearchArgs(
+            query=args.get("query", ""),
+            max_results=args.get("max_results", 5),
+            search_type=args.get("search_type", "general")
+        )
+        result = await self.web_search.run(search_args)
+        logger.info("✅ Web search completed successfully")
+        return result
     
     async def _execute_talents_query(self, args: Dict[str, Any]) -> str:
         """Execute talents query tool"""
-        try:
-            from ..tools.convergio_tools import TalentsQueryTool, TalentsQueryArgs
-            tool = TalentsQueryTool()
-            query_args = TalentsQueryArgs(
-                query_type=args.get("query_type", "count")
-            )
-            result = await tool.run(query_args)
-            return result
-        except Exception as e:
-            return f"Talents query error: {str(e)}"
+        from ..tools.convergio_tools import TalentsQueryTool, TalentsQueryArgs
+        tool = TalentsQueryTool()
+        query_args = TalentsQueryArgs(
+            query_type=args.get("query_type", "count")
+        )
+        return await tool.run(query_args)
     
     async def _execute_vector_search(self, args: Dict[str, Any]) -> str:
         """Execute vector search tool"""
-        try:
-            from ..tools.convergio_tools import VectorSearchTool, VectorSearchArgs
-            tool = VectorSearchTool()
-            search_args = VectorSearchArgs(
-                query=args.get("query", ""),
-                top_k=args.get("top_k", 5)
-            )
-            result = await tool.run(search_args)
-            return result
-        except Exception as e:
-            return f"Vector search error: {str(e)}"
+        from ..tools.convergio_tools import VectorSearchTool, VectorSearchArgs
+        tool = VectorSearchTool()
+        search_args = VectorSearchArgs(
+            query=args.get("query", ""),
+            top_k=args.get("top_k", 5)
+        )
+        return await tool.run(search_args)
     
     async def _execute_business_intelligence(self, args: Dict[str, Any]) -> str:
         """Execute business intelligence tool"""
-        try:
-            from ..tools.convergio_tools import BusinessIntelligenceTool, BusinessIntelligenceArgs
-            tool = BusinessIntelligenceTool()
-            bi_args = BusinessIntelligenceArgs(
-                focus_area=args.get("focus_area", "overview")
-            )
-            result = await tool.run(bi_args)
-            return result
-        except Exception as e:
-            return f"Business intelligence error: {str(e)}"
+        from ..tools.convergio_tools import BusinessIntelligenceTool, BusinessIntelligenceArgs
+        tool = BusinessIntelligenceTool()
+        bi_args = BusinessIntelligenceArgs(
+            focus_area=args.get("focus_area", "overview")
+        )
+        return await tool.run(bi_args)
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get tool execution metrics"""
         return {
             "total_calls": self.tool_call_count,
+            "cache_hits": self.cache_hits,
+            "timeouts": self.timeouts,
             "results": self.tool_results,
             "unique_tools": list(set(r["tool"] for r in self.tool_results))
         }
\ No newline at end of file
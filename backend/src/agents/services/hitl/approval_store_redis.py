@@ -14,8 +14,12 @@ import structlog
 
 import redis.asyncio as redis
 
+from .deadline_scheduler import DeadlineScheduler
+
 logger = structlog.get_logger()
 
+APPROVAL_TIMEOUT = "approval_timeout"
+
 
 class ApprovalStatus(Enum):
     """Approval status states"""
@@ -96,11 +100,18 @@ class RedisApprovalStore:
     def __init__(self, redis_client: Optional[redis.Redis] = None):
         self.redis = redis_client
         self.key_prefix = "approval:"
-        self.index_prefix = "approval_index:"
+        # Sorted sets scored by created_at; a new prefix because the legacy
+        # approval_index:* keys are plain sets
+        self.index_prefix = "approval_zindex:"
+        self.legacy_index_prefix = "approval_index:"
+        self.index_ttl = 604800
         self.audit_prefix = "audit:"
         self.risk_thresholds = self._init_risk_thresholds()
         self.pause_callbacks = {}
         self.resume_callbacks = {}
+        # Approval expiries fire from a Redis deadline set, not a sweep
+        self.deadlines = DeadlineScheduler(redis_client)
+        self.deadlines.register_handler(APPROVAL_TIMEOUT, self.expire_approval)
         
     def _init_risk_thresholds(self) -> Dict[RiskLevel, RiskThreshold]:
         """Initialize default risk thresholds"""
@@ -147,8 +158,66 @@ class RedisApprovalStore:
                 encoding="utf-8",
                 decode_responses=True
             )
+        self.deadlines.redis = self.redis
+        await self.migrate_legacy_index()
         logger.info("✅ Redis Approval Store initialized")
     
+    async def migrate_legacy_index(self) -> int:
+        """
+        Move approvals indexed only in the legacy approval_index:* sets into
+        the sorted-set indexes (once; a marker key records completion).
+        
+        Each approval is re-indexed from its stored payload, so a stale
+        legacy status set cannot put it under the wrong status. Returns the
+        number of approvals migrated.
+        """
+        marker = f"{self.index_prefix}legacy_migrated"
+        if not self.redis or await self.redis.exists(marker):
+            return 0
+        
+        migrated = 0
+        seen = set()
+        cursor = 0
+        while True:
+            cursor, keys = await self.redis.scan(cursor, match=f"{self.legacy_index_prefix}*", count=500)
+            for key in keys:
+                approval_ids = [i for i in await self.redis.smembers(key) if i not in seen]
+                seen.update(approval_ids)
+                for start in range(0, len(approval_ids), 500):
+                    # Payloads that already expired are simply dropped
+                    for approval in await self.get_approvals(approval_ids[start:start + 500]):
+                        if approval:
+                            await self._index_approval(approval)
+                            migrated += 1
+                await self.redis.delete(key)
+            if cursor == 0:
+                break
+        
+        await self.redis.set(marker, datetime.utcnow().isoformat())
+        if migrated:
+            logger.info("📦 Migrated legacy approval index", approvals=migrated)
+        return migrated
+    
+    async def start_deadline_worker(self):
+        """Schedule deadlines for pending approvals that predate the scheduler, then run it"""
+        if self.redis:
+            start = 0
+            while True:
+                approval_ids = await self.redis.zrange(
+                    self._index_key("status", ApprovalStatus.PENDING.value), start, start + 499
+                )
+                if not approval_ids:
+                    break
+                for approval in await self.get_approvals(approval_ids):
+                    if approval and approval.expires_at:
+                        await self.deadlines.schedule(APPROVAL_TIMEOUT, approval.approval_id, approval.expires_at)
+                start += len(approval_ids)
+        await self.deadlines.start()
+    
+    async def stop_deadline_worker(self):
+        """Stop firing deadlines from this process"""
+        await self.deadlines.stop()
+    
     async def assess_risk(
         self,
         action_type: str,
@@ -236,6 +305,7 @@ class RedisApprovalStore:
         
         # Create indexes for querying
         await self._index_approval(approval)
+        await self.deadlines.schedule(APPROVAL_TIMEOUT, approval_id, expires_at)
         
         # Trigger pause if needed
         if threshold.auto_pause:
@@ -271,23 +341,26 @@ class RedisApprovalStore:
             # Set with expiration (7 days)
             await self.redis.setex(key, 604800, data)
     
+    def _index_key(self, kind: str, value: str) -> str:
+        return f"{self.index_prefix}{kind}:{value}"
+    
+    def _index_keys(self, approval: ApprovalRequest) -> List[str]:
+        """Every index an approval belongs to"""
+        return [
+            self._index_key("conversation", approval.conversation_id),
+            self._index_key("user", approval.user_id),
+            self._index_key("status", approval.status.value),
+        ]
+    
     async def _index_approval(self, approval: ApprovalRequest):
-        """Create indexes for efficient querying"""
+        """Add the approval to its time-ordered indexes in one round trip"""
         if self.redis:
-            # Index by conversation
-            conv_key = f"{self.index_prefix}conversation:{approval.conversation_id}"
-            await self.redis.sadd(conv_key, approval.approval_id)
-            await self.redis.expire(conv_key, 604800)
-            
-            # Index by user
-            user_key = f"{self.index_prefix}user:{approval.user_id}"
-            await self.redis.sadd(user_key, approval.approval_id)
-            await self.redis.expire(user_key, 604800)
-            
-            # Index by status
-            status_key = f"{self.index_prefix}status:{approval.status.value}"
-            await self.redis.sadd(status_key, approval.approval_id)
-            await self.redis.expire(status_key, 604800)
+            score = approval.created_at.timestamp()
+            pipe = self.redis.pipeline(transaction=False)
+            for key in self._index_keys(approval):
+                pipe.zadd(key, {approval.approval_id: score})
+                pipe.expire(key, self.index_ttl)
+            await pipe.execute()
     
     async def get_approval(self, approval_id: str) -> Optional[ApprovalRequest]:
         """Get approval by ID"""
@@ -301,52 +374,92 @@ class RedisApprovalStore:
         
         return None
     
+    async def get_approvals(self, approval_ids: List[str]) -> List[Optional[ApprovalRequest]]:
+        """Fetch several approvals with a single MGET, preserving order"""
+        if not self.redis or not approval_ids:
+            return [None] * len(approval_ids)
+        
+        payloads = await self.redis.mget([f"{self.key_prefix}{approval_id}" for approval_id in approval_ids])
+        return [
+            ApprovalRequest.from_dict(json.loads(payload)) if payload else None
+            for payload in payloads
+        ]
+    
     async def list_approvals(
         self,
         status: Optional[ApprovalStatus] = None,
         user_id: Optional[str] = None,
         conversation_id: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        offset: int = 0
     ) -> List[ApprovalRequest]:
-        """List approvals with filters"""
-        
-        approval_ids = set()
-        
-        if self.redis:
-            # Get approval IDs based on filters
-            if status:
-                status_key = f"{self.index_prefix}status:{status.value}"
-                ids = await self.redis.smembers(status_key)
-                approval_ids.update(ids) if approval_ids else approval_ids.update(ids)
-            
-            if user_id:
-                user_key = f"{self.index_prefix}user:{user_id}"
-                ids = await self.redis.smembers(user_key)
-                approval_ids = approval_ids.intersection(ids) if approval_ids else set(ids)
-            
-            if conversation_id:
-                conv_key = f"{self.index_prefix}conversation:{conversation_id}"
-                ids = await self.redis.smembers(conv_key)
-                approval_ids = approval_ids.intersection(ids) if approval_ids else set(ids)
-            
-            # If no filters, get all pending
-            if not approval_ids and not any([status, user_id, conversation_id]):
-                status_key = f"{self.index_prefix}status:{ApprovalStatus.PENDING.value}"
-                approval_ids = await self.redis.smembers(status_key)
+        """List approvals with filters, newest first"""
+        
+        if not self.redis or limit <= 0:
+            return []
+        
+        index_keys = []
+        if status:
+            index_keys.append(self._index_key("status", status.value))
+        if user_id:
+            index_keys.append(self._index_key("user", user_id))
+        if conversation_id:
+            index_keys.append(self._index_key("conversation", conversation_id))
+        
+        # If no filters, get all pending
+        if not index_keys:
+            index_keys.append(self._index_key("status", ApprovalStatus.PENDING.value))
+        
+        approvals: List[ApprovalRequest] = []
+        start = offset
+        while len(approvals) < limit:
+            window = limit - len(approvals)
+            approval_ids = await self._range_ids(index_keys, start, start + window - 1)
+            if not approval_ids:
+                break
             
-            # Retrieve approvals
-            approvals = []
-            for approval_id in list(approval_ids)[:limit]:
-                approval = await self.get_approval(approval_id)
-                if approval:
-                    approvals.append(approval)
+            fetched = await self.get_approvals(approval_ids)
+            stale = [approval_id for approval_id, approval in zip(approval_ids, fetched) if approval is None]
+            approvals.extend(approval for approval in fetched if approval is not None)
             
-            # Sort by created_at descending
-            approvals.sort(key=lambda a: a.created_at, reverse=True)
-            
-            return approvals
-        
-        return []
+            if len(approval_ids) < window:
+                break
+            if stale:
+                # Approval payload expired before its index entries; prune
+                # them and re-read the same window
+                await self._prune_index_entries(index_keys, stale)
+                start += window - len(stale)
+            else:
+                start += window
+        
+        return approvals
+    
+    async def count_approvals(self, status: ApprovalStatus) -> int:
+        """Number of approvals in a status index"""
+        if not self.redis:
+            return 0
+        return await self.redis.zcard(self._index_key("status", status.value))
+    
+    async def _range_ids(self, index_keys: List[str], start: int, end: int) -> List[str]:
+        """Newest-first page of IDs from one index or the intersection of several"""
+        if len(index_keys) == 1:
+            return await self.redis.zrange(index_keys[0], start, end, desc=True)
+        
+        # Intersect server-side into a throwaway key; scores are all created_at
+        temp_key = f"{self.index_prefix}tmp:{uuid.uuid4()}"
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.zinterstore(temp_key, index_keys, aggregate="MAX")
+        pipe.zrange(temp_key, start, end, desc=True)
+        pipe.delete(temp_key)
+        _, approval_ids, _ = await pipe.execute()
+        return approval_ids
+    
+    async def _prune_index_entries(self, index_keys: List[str], approval_ids: List[str]):
+        """Drop IDs whose approval payload no longer exists"""
+        pipe = self.redis.pipeline(transaction=False)
+        for key in index_keys:
+            pipe.zrem(key, *approval_ids)
+        await pipe.execute()
     
     async def approve(
         self,
@@ -381,6 +494,7 @@ class RedisApprovalStore:
         # Update in Redis
         await self._store_approval(approval)
         await self._update_indexes(approval)
+        await self.deadlines.cancel(APPROVAL_TIMEOUT, approval_id)
         
         # Resume conversation if paused
         await self._resume_conversation(approval.conversation_id, approval_id)
@@ -430,6 +544,7 @@ class RedisApprovalStore:
         # Update in Redis
         await self._store_approval(approval)
         await self._update_indexes(approval)
+        await self.deadlines.cancel(APPROVAL_TIMEOUT, approval_id)
         
         # Resume conversation (will handle denial)
         await self._resume_conversation(approval.conversation_id, approval_id)
@@ -447,18 +562,17 @@ class RedisApprovalStore:
         return approval
     
     async def _update_indexes(self, approval: ApprovalRequest):
-        """Update status index when approval changes"""
+        """Move the approval to its new status index"""
         if self.redis:
-            # Remove from old status index
+            pipe = self.redis.pipeline(transaction=True)
             for status in ApprovalStatus:
                 if status != approval.status:
-                    old_key = f"{self.index_prefix}status:{status.value}"
-                    await self.redis.srem(old_key, approval.approval_id)
+                    pipe.zrem(self._index_key("status", status.value), approval.approval_id)
             
-            # Add to new status index
-            new_key = f"{self.index_prefix}status:{approval.status.value}"
-            await self.redis.sadd(new_key, approval.approval_id)
-            await self.redis.expire(new_key, 604800)
+            new_key = self._index_key("status", approval.status.value)
+            pipe.zadd(new_key, {approval.approval_id: approval.created_at.timestamp()})
+            pipe.expire(new_key, self.index_ttl)
+            await pipe.execute()
     
     async def _pause_conversation(self, conversation_id: str, approval_id: str):
         """Pause conversation pending approval"""
@@ -496,32 +610,41 @@ class RedisApprovalStore:
         """Register callback for conversation resume"""
         self.resume_callbacks[conversation_id] = callback
     
-    async def check_timeouts(self):
-        """Check for expired approvals and timeout them"""
+    async def check_timeouts(self) -> int:
+        """Time out approvals whose deadline has passed; returns how many were due"""
+        return await self.deadlines.process_due([APPROVAL_TIMEOUT])
+    
+    async def expire_approval(self, approval_id: str) -> Optional[ApprovalRequest]:
+        """Time out a single pending approval (deadline handler)"""
         
-        if self.redis:
-            # Get all pending approvals
-            pending_approvals = await self.list_approvals(status=ApprovalStatus.PENDING)
-            
-            now = datetime.utcnow()
-            for approval in pending_approvals:
-                if approval.expires_at and now > approval.expires_at:
-                    # Timeout the approval
-                    approval.status = ApprovalStatus.TIMEOUT
-                    approval.updated_at = now
-                    approval.audit_trail.append({
-                        "timestamp": now.isoformat(),
-                        "action": "timeout",
-                        "details": "Approval request expired"
-                    })
-                    
-                    await self._store_approval(approval)
-                    await self._update_indexes(approval)
-                    
-                    # Resume conversation with timeout status
-                    await self._resume_conversation(approval.conversation_id, approval.approval_id)
-                    
-                    logger.warning(f"⏰ Approval timeout: {approval.approval_id}")
+        approval = await self.get_approval(approval_id)
+        if not approval or approval.status != ApprovalStatus.PENDING:
+            return None
+        
+        now = datetime.utcnow()
+        if approval.expires_at and now < approval.expires_at:
+            # Expiry was extended after the deadline was scheduled
+            await self.deadlines.schedule(APPROVAL_TIMEOUT, approval_id, approval.expires_at)
+            return None
+        
+        # Timeout the approval
+        approval.status = ApprovalStatus.TIMEOUT
+        approval.updated_at = now
+        approval.audit_trail.append({
+            "timestamp": now.isoformat(),
+            "action": "timeout",
+            "details": "Approval request expired"
+        })
+        
+        await self._store_approval(approval)
+        await self._update_indexes(approval)
+        
+        # Resume conversation with timeout status
+        await self._resume_conversation(approval.conversation_id, approval.approval_id)
+        
+        logger.warning(f"⏰ Approval timeout: {approval.approval_id}")
+        
+        return approval
     
     async def _log_audit(
         self,
@@ -557,32 +680,43 @@ class RedisApprovalStore:
         
         return []
     
-    async def cleanup_old_approvals(self, days: int = 30):
+    async def cleanup_old_approvals(self, days: int = 30, batch_size: int = 500):
         """Clean up old completed approvals"""
         
         if self.redis:
             cutoff = datetime.utcnow() - timedelta(days=days)
             
-            # Get all non-pending approvals
+            # Only approvals created before the cutoff can have been updated
+            # before it, so read just that score range of each index
             for status in [ApprovalStatus.APPROVED, ApprovalStatus.DENIED, ApprovalStatus.TIMEOUT]:
-                approvals = await self.list_approvals(status=status)
-                
-                for approval in approvals:
-                    if approval.updated_at < cutoff:
-                        # Delete approval and indexes
-                        await self.redis.delete(f"{self.key_prefix}{approval.approval_id}")
-                        
-                        # Clean indexes
-                        conv_key = f"{self.index_prefix}conversation:{approval.conversation_id}"
-                        await self.redis.srem(conv_key, approval.approval_id)
-                        
-                        user_key = f"{self.index_prefix}user:{approval.user_id}"
-                        await self.redis.srem(user_key, approval.approval_id)
-                        
-                        status_key = f"{self.index_prefix}status:{approval.status.value}"
-                        await self.redis.srem(status_key, approval.approval_id)
-                        
-                        logger.info(f"🗑️ Cleaned old approval: {approval.approval_id}")
+                status_key = self._index_key("status", status.value)
+                start = 0
+                while True:
+                    approval_ids = await self.redis.zrangebyscore(
+                        status_key, "-inf", cutoff.timestamp(), start=start, num=batch_size
+                    )
+                    if not approval_ids:
+                        break
+                    
+                    pipe = self.redis.pipeline(transaction=False)
+                    kept = 0
+                    for approval_id, approval in zip(approval_ids, await self.get_approvals(approval_ids)):
+                        if approval is None:
+                            # Payload already expired; drop the dangling entry
+                            pipe.zrem(status_key, approval_id)
+                        elif approval.updated_at < cutoff:
+                            # Delete approval and indexes
+                            pipe.delete(f"{self.key_prefix}{approval_id}")
+                            for key in self._index_keys(approval):
+                                pipe.zrem(key, approval_id)
+                            logger.info(f"🗑️ Cleaned old approval: {approval_id}")
+                        else:
+                            kept += 1
+                    await pipe.execute()
+                    
+                    if len(approval_ids) < batch_size:
+                        break
+                    start += kept
 
 
 # Backward compatibility wrapper
@@ -623,5 +757,6 @@ __all__ = [
     "ApprovalRequest",
     "ApprovalStatus",
     "RiskLevel",
-    "RiskThreshold"
+    "RiskThreshold",
+    "APPROVAL_TIMEOUT"
 ]
\ No newline at end of file
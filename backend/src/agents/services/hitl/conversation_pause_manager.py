@@ -3,8 +3,8 @@ Conversation Pause Manager - Handles pause/resume for HITL approvals
 Integrates with orchestrator to control conversation flow during approvals
 """
 
-import asyncio
-from datetime import datetime
+import json
+from datetime import datetime, timedelta
 from typing import Dict, Optional, Any, Callable, List
 from dataclasses import dataclass, field
 from enum import Enum
@@ -18,6 +18,8 @@ from .approval_store_redis import (
 
 logger = structlog.get_logger()
 
+PAUSE_TIMEOUT = "pause_timeout"
+
 
 class ConversationState(Enum):
     """Conversation states for pause management"""
@@ -40,6 +42,10 @@ class PausedConversation:
     resume_callback: Optional[Callable] = None
     timeout_seconds: int = 3600
     
+    @property
+    def expires_at(self) -> datetime:
+        return self.paused_at + timedelta(seconds=self.timeout_seconds)
+    
     def is_expired(self) -> bool:
         """Check if pause has expired"""
         elapsed = (datetime.utcnow() - self.paused_at).total_seconds()
@@ -64,6 +70,9 @@ class ConversationPauseManager:
             "on_cancel": []
         }
         self.key_prefix = "conversation:pause:"
+        # Pause expiries share the approval store's deadline scheduler
+        self.deadlines = approval_store.deadlines
+        self.deadlines.register_handler(PAUSE_TIMEOUT, self._handle_pause_timeout)
         
     async def initialize(self):
         """Initialize manager and restore paused conversations from Redis"""
@@ -77,34 +86,46 @@ class ConversationPauseManager:
                 
                 for key in keys:
                     conversation_id = key.replace(self.key_prefix, "")
-                    data = await self.redis.get(key)
+                    paused = await self._load_paused(conversation_id)
                     
-                    if data:
-                        import json
-                        pause_data = json.loads(data)
-                        
-                        # Restore paused conversation
-                        paused = PausedConversation(
-                            conversation_id=conversation_id,
-                            approval_id=pause_data["approval_id"],
-                            paused_at=datetime.fromisoformat(pause_data["paused_at"]),
-                            pause_reason=pause_data["pause_reason"],
-                            context_snapshot=pause_data["context_snapshot"],
-                            pending_message=pause_data.get("pending_message"),
-                            timeout_seconds=pause_data.get("timeout_seconds", 3600)
-                        )
-                        
+                    if paused:
                         self.paused_conversations[conversation_id] = paused
+                        # Idempotent: same conversation, same deadline
+                        await self.deadlines.schedule(PAUSE_TIMEOUT, conversation_id, paused.expires_at)
                         logger.info(f"Restored paused conversation: {conversation_id}")
                 
                 if cursor == 0:
                     break
         
-        # Start timeout monitor
-        asyncio.create_task(self._monitor_timeouts())
+        # Pause timeouts fire from the shared deadline scheduler
+        await self.deadlines.start()
         
         logger.info("✅ Conversation Pause Manager initialized")
     
+    async def _load_paused(self, conversation_id: str) -> Optional[PausedConversation]:
+        """Rebuild a paused conversation from its Redis record"""
+        if not self.redis:
+            return None
+        
+        data = await self.redis.get(f"{self.key_prefix}{conversation_id}")
+        if not data:
+            return None
+        
+        try:
+            pause_data = json.loads(data)
+            return PausedConversation(
+                conversation_id=conversation_id,
+                approval_id=pause_data["approval_id"],
+                paused_at=datetime.fromisoformat(pause_data["paused_at"]),
+                pause_reason=pause_data["pause_reason"],
+                context_snapshot=pause_data["context_snapshot"],
+                pending_message=pause_data.get("pending_message"),
+                timeout_seconds=pause_data.get("timeout_seconds", 3600)
+            )
+        except (ValueError, KeyError, TypeError):
+            # The approval store writes a bare approval ID under the same prefix
+            return None
+    
     async def pause_conversation(
         self,
         conversation_id: str,
@@ -139,7 +160,6 @@ class ConversationPauseManager:
         
         # Persist to Redis
         if self.redis:
-            import json
             key = f"{self.key_prefix}{conversation_id}"
             data = {
                 "approval_id": approval_id,
@@ -150,12 +170,15 @@ class ConversationPauseManager:
                 "timeout_seconds": timeout_seconds
             }
             
+            # Outlive the deadline so whichever worker fires it can load the record
             await self.redis.setex(
                 key,
-                timeout_seconds,
+                timeout_seconds + 300,
                 json.dumps(data)
             )
         
+        await self.deadlines.schedule(PAUSE_TIMEOUT, conversation_id, paused.expires_at)
+        
         # Register callbacks with approval store
         self.approval_store.register_resume_callback(
             conversation_id,
@@ -207,6 +230,7 @@ class ConversationPauseManager:
         
         # Remove from paused conversations
         del self.paused_conversations[conversation_id]
+        await self.deadlines.cancel(PAUSE_TIMEOUT, conversation_id)
         
         # Clean up Redis
         if self.redis:
@@ -238,6 +262,7 @@ class ConversationPauseManager:
         
         # Remove from paused conversations
         del self.paused_conversations[conversation_id]
+        await self.deadlines.cancel(PAUSE_TIMEOUT, conversation_id)
         
         # Clean up Redis
         if self.redis:
@@ -251,40 +276,38 @@ class ConversationPauseManager:
         
         return True
     
-    async def _monitor_timeouts(self):
-        """Monitor for expired pauses"""
-        while True:
-            try:
-                expired = []
-                
-                for conv_id, paused in self.paused_conversations.items():
-                    if paused.is_expired():
-                        expired.append(conv_id)
-                
-                for conv_id in expired:
-                    paused = self.paused_conversations[conv_id]
-                    
-                    # Get approval and timeout it
-                    approval = await self.approval_store.get_approval(paused.approval_id)
-                    if approval and approval.status == ApprovalStatus.PENDING:
-                        # Timeout the approval
-                        approval.status = ApprovalStatus.TIMEOUT
-                        approval.updated_at = datetime.utcnow()
-                        
-                        # Resume with timeout status
-                        await self.resume_conversation(conv_id, approval)
-                        
-                        # Notify callbacks
-                        await self._notify_callbacks("on_timeout", conv_id, paused)
-                        
-                        logger.warning(f"⏰ Conversation pause timeout: {conv_id}")
-                
-                # Check every 30 seconds
-                await asyncio.sleep(30)
-                
-            except Exception as e:
-                logger.error(f"Error in timeout monitor: {e}")
-                await asyncio.sleep(60)
+    async def _handle_pause_timeout(self, conversation_id: str):
+        """Deadline handler: time out the approval and resume the conversation"""
+        paused = self.paused_conversations.get(conversation_id)
+        if paused is None:
+            # Paused by another worker
+            paused = await self._load_paused(conversation_id)
+            if paused is None:
+                return
+            self.paused_conversations[conversation_id] = paused
+        
+        # Get approval and timeout it; the store's resume callback may
+        # already resume the conversation
+        approval = await self.approval_store.expire_approval(paused.approval_id)
+        if approval is None:
+            approval = await self.approval_store.get_approval(paused.approval_id)
+            if approval and approval.status != ApprovalStatus.PENDING:
+                # Already decided; the decision path resumes the conversation
+                return
+            if approval is None:
+                await self.cancel_pause(conversation_id, reason="Approval no longer exists")
+                return
+            approval.status = ApprovalStatus.TIMEOUT
+            approval.updated_at = datetime.utcnow()
+        
+        # Resume with timeout status
+        if conversation_id in self.paused_conversations:
+            await self.resume_conversation(conversation_id, approval)
+        
+        # Notify callbacks
+        await self._notify_callbacks("on_timeout", conversation_id, paused)
+        
+        logger.warning(f"⏰ Conversation pause timeout: {conversation_id}")
     
     def register_callback(
         self,
@@ -318,9 +341,7 @@ class ConversationPauseManager:
                 "pause_reason": paused.pause_reason,
                 "elapsed_seconds": (datetime.utcnow() - paused.paused_at).total_seconds(),
                 "timeout_seconds": paused.timeout_seconds,
-                "will_timeout_at": (
-                    paused.paused_at + timedelta(seconds=paused.timeout_seconds)
-                ).isoformat()
+                "will_timeout_at": paused.expires_at.isoformat()
             }
             for conv_id, paused in self.paused_conversations.items()
         ]
@@ -357,7 +378,7 @@ class ConversationPauseManager:
                 context=context,
                 pending_message=context.get("pending_message"),
                 resume_callback=context.get("resume_callback"),
-                timeout_seconds=approval.risk_thresholds[approval.risk_level].timeout_minutes * 60
+                timeout_seconds=self.approval_store.risk_thresholds[approval.risk_level].timeout_minutes * 60
             )
             
             return {
@@ -418,5 +439,6 @@ __all__ = [
     "ConversationPauseManager",
     "PausedConversation",
     "ConversationState",
+    "PAUSE_TIMEOUT",
     "OrchestrationIntegration"
 ]
\ No newline at end of file
@@ -0,0 +1,256 @@
+"""
+Deadline Scheduler - Redis sorted-set backed expiry scheduling for HITL
+Approval timeouts and conversation pause timeouts fire at their deadline
+instead of on a polling sweep, and survive restarts
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+import structlog
+
+import redis.asyncio as redis
+
+logger = structlog.get_logger()
+
+DeadlineHandler = Callable[[str], Awaitable[None]]
+
+
+def _to_timestamp(due_at: Union[datetime, float, int]) -> float:
+    if isinstance(due_at, datetime):
+        # Naive datetimes in this package are UTC (datetime.utcnow())
+        if due_at.tzinfo is None:
+            return (due_at - datetime(1970, 1, 1)).total_seconds()
+        return due_at.timestamp()
+    return float(due_at)
+
+
+class DeadlineScheduler:
+    """
+    Shared deadline scheduler for HITL expiries.
+
+    Each kind of deadline ("approval_timeout", "pause_timeout", ...) lives in
+    its own Redis sorted set scored by due time. A worker reads only the due
+    range and claims each item with a lease: SET NX on a per-item lease key
+    (so when several workers run the loop exactly one of them wins), then the
+    item is re-scored to ``now + lease_seconds``. The item is removed only
+    after its handler succeeds, so a worker that dies mid-claim leaves it to
+    fire again once the lease runs out. Handlers must finish within the
+    lease or the item may fire twice. Between batches the loop
+    sleeps until the earliest deadline (capped by ``max_sleep`` so deadlines
+    scheduled by other processes are noticed). Without Redis, deadlines are
+    kept in memory for the current process only.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        key_prefix: str = "hitl:deadlines:",
+        max_sleep: float = 1.0,
+        batch_size: int = 100,
+        retry_delay: float = 5.0,
+        lease_seconds: int = 60
+    ):
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self.max_sleep = max_sleep
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        self.handlers: Dict[str, DeadlineHandler] = {}
+        self._local: Dict[str, Dict[str, float]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            "scheduled": 0,
+            "fired": 0,
+            "failed": 0,
+            "total_lateness_ms": 0.0,
+            "max_lateness_ms": 0.0
+        }
+
+    def _key(self, kind: str) -> str:
+        return f"{self.key_prefix}{kind}"
+
+    def _lease_key(self, kind: str, item_id: str) -> str:
+        return f"{self._key(kind)}:lease:{item_id}"
+
+    def register_handler(self, kind: str, handler: DeadlineHandler):
+        """Register the coroutine called with the item ID when a deadline is due"""
+        self.handlers[kind] = handler
+
+    async def schedule(self, kind: str, item_id: str, due_at: Union[datetime, float]):
+        """Schedule (or move) a deadline"""
+        score = _to_timestamp(due_at)
+        if self.redis:
+            await self.redis.zadd(self._key(kind), {item_id: score})
+        else:
+            self._local.setdefault(kind, {})[item_id] = score
+        self.stats["scheduled"] += 1
+
+        # Wake the loop in case this is now the earliest deadline
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def cancel(self, kind: str, item_id: str) -> bool:
+        """Remove a pending deadline; False if it was not scheduled"""
+        if self.redis:
+            return bool(await self.redis.zrem(self._key(kind), item_id))
+        return self._local.get(kind, {}).pop(item_id, None) is not None
+
+    async def claim_due(self, kind: str, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Lease due items of one kind; call ``complete`` once an item is handled"""
+        now = time.time() if now is None else now
+        lease_until = now + self.lease_seconds
+
+        if not self.redis:
+            pending = self._local.get(kind, {})
+            due = sorted(
+                ((item_id, score) for item_id, score in pending.items() if score <= now),
+                key=lambda item: item[1]
+            )[:self.batch_size]
+            for item_id, _ in due:
+                pending[item_id] = lease_until
+            return due
+
+        key = self._key(kind)
+        candidates = await self.redis.zrangebyscore(
+            key, "-inf", now, start=0, num=self.batch_size, withscores=True
+        )
+        if not candidates:
+            return []
+        candidates = [
+            (item_id.decode() if isinstance(item_id, bytes) else item_id, score)
+            for item_id, score in candidates
+        ]
+
+        # SET NX succeeds only for the worker that takes the lease
+        pipe = self.redis.pipeline(transaction=False)
+        for item_id, _ in candidates:
+            pipe.set(self._lease_key(kind, item_id), "1", ex=self.lease_seconds, nx=True)
+        leased = [item for item, won in zip(candidates, await pipe.execute()) if won]
+        if not leased:
+            return []
+
+        # Push the deadline past the lease; XX skips items completed meanwhile
+        pipe = self.redis.pipeline(transaction=False)
+        for item_id, _ in leased:
+            pipe.zadd(key, {item_id: lease_until}, xx=True, ch=True)
+        rescored = await pipe.execute()
+
+        stale = [item_id for (item_id, _), changed in zip(leased, rescored) if not changed]
+        if stale:
+            await self.redis.delete(*(self._lease_key(kind, item_id) for item_id in stale))
+        return [item for item, changed in zip(leased, rescored) if changed]
+
+    async def complete(self, kind: str, item_id: str):
+        """Drop a handled deadline and release its lease"""
+        if not self.redis:
+            self._local.get(kind, {}).pop(item_id, None)
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zrem(self._key(kind), item_id)
+        pipe.delete(self._lease_key(kind, item_id))
+        await pipe.execute()
+
+    async def process_due(self, kinds: Optional[List[str]] = None) -> int:
+        """Fire every due deadline for the given kinds; returns items handled"""
+        handled = 0
+        for kind in kinds or list(self.handlers):
+            handler = self.handlers.get(kind)
+            if handler is None:
+                continue
+
+            now = time.time()
+            for item_id, due_at in await self.claim_due(kind, now):
+                lateness_ms = max(0.0, (now - due_at) * 1000.0)
+                self.stats["total_lateness_ms"] += lateness_ms
+                self.stats["max_lateness_ms"] = max(self.stats["max_lateness_ms"], lateness_ms)
+                try:
+                    await handler(item_id)
+                except Exception as e:
+                    # Retry sooner than the lease would
+                    self.stats["failed"] += 1
+                    logger.error(f"Deadline handler failed for {kind}:{item_id}: {e}")
+                    await self.schedule(kind, item_id, time.time() + self.retry_delay)
+                    if self.redis:
+                        await self.redis.delete(self._lease_key(kind, item_id))
+                else:
+                    self.stats["fired"] += 1
+                    await self.complete(kind, item_id)
+                handled += 1
+        return handled
+
+    async def next_deadline(self) -> Optional[float]:
+        """Earliest scheduled deadline across registered kinds"""
+        kinds = list(self.handlers)
+        if not kinds:
+            return None
+
+        if not self.redis:
+            scores = [min(items.values()) for kind in kinds if (items := self._local.get(kind))]
+            return min(scores) if scores else None
+
+        pipe = self.redis.pipeline(transaction=False)
+        for kind in kinds:
+            pipe.zrange(self._key(kind), 0, 0, withscores=True)
+        heads = await pipe.execute()
+        scores = [head[0][1] for head in heads if head]
+        return min(scores) if scores else None
+
+    async def start(self):
+        """Start the scheduler loop on the running event loop (idempotent)"""
+        if self._task and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("⏰ Deadline scheduler started", kinds=list(self.handlers))
+
+    async def stop(self):
+        """Stop the scheduler loop; scheduled deadlines stay in Redis"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                handled = await self.process_due()
+                if handled >= self.batch_size:
+                    # More may already be due
+                    continue
+
+                # Clear before reading the head so a concurrent schedule() still wakes us
+                self._wakeup.clear()
+                next_due = await self.next_deadline()
+                delay = self.max_sleep if next_due is None else next_due - time.time()
+                delay = min(max(delay, 0.0), self.max_sleep)
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in deadline scheduler: {e}")
+                await asyncio.sleep(self.max_sleep)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Firing counts and lateness"""
+        fired = self.stats["fired"] + self.stats["failed"]
+        return {
+            **self.stats,
+            "avg_lateness_ms": self.stats["total_lateness_ms"] / fired if fired else 0.0,
+            "running": bool(self._task and not self._task.done())
+        }
+
+
+__all__ = ["DeadlineScheduler"]
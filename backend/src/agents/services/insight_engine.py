@@ -1,28 +1,41 @@
 """
 Insight Engine - Intelligent pattern recognition and recommendations
 Ali's proactive intelligence system
+
+Rules declare the context keys they read. Context changes arrive through
+``update_context``, event bus events (changed keys under ``data["context"]``)
+and telemetry performance events, and only the rules depending on a changed
+key are evaluated.
 """
 
-from typing import Dict, List, Any, Optional, Callable, Set, Tuple
+from typing import Dict, List, Any, Iterable, Optional, Callable, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
-import json
+import bisect
+import heapq
+import itertools
+import time
 import uuid
-from collections import defaultdict
+from collections import ChainMap, defaultdict, deque
 import asyncio
-import re
 
 import structlog
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
 
-from ..event_bus import Event, EventType, EventPriority, event_bus
-from ..telemetry import TelemetryService
-from ...models.project import Task, Project, TaskStatus
+from .event_bus import Event, EventType, EventPriority, event_bus
+from .observability.telemetry import ConvergioTelemetry, ObservabilityEvent
 
 logger = structlog.get_logger()
 
+# Event types whose payload carries context changes
+CONTEXT_EVENT_TYPES = (
+    EventType.SYSTEM_PERFORMANCE,
+    EventType.TASK_CREATED,
+    EventType.TASK_UPDATED,
+    EventType.TASK_COMPLETED,
+    EventType.TASK_BLOCKED,
+)
+
 
 class InsightType(str, Enum):
     PERFORMANCE = "performance"
@@ -88,6 +101,8 @@ class Rule:
     enabled: bool = True
     cooldown: timedelta = timedelta(minutes=30)
     last_triggered: Optional[datetime] = None
+    # Context keys the condition reads; a rule without inputs runs on every change
+    inputs: Tuple[str, ...] = ()
     
     def can_trigger(self) -> bool:
         """Check if rule can be triggered based on cooldown"""
@@ -116,19 +131,31 @@ class Rule:
 class InsightEngine:
     """Main insight engine for proactive intelligence"""
     
-    def __init__(self, telemetry: Optional[TelemetryService] = None):
+    def __init__(self, telemetry: Optional[ConvergioTelemetry] = None):
         self.telemetry = telemetry
         self.rules: Dict[str, Rule] = {}
         self.insights: deque = deque(maxlen=1000)
         self.insight_subscribers: List[Callable] = []
         self.context_cache: Dict[str, Any] = {}
         self.running = False
-        self._analyzer_task = None
+        self._evaluation_task = None
+        self._telemetry_hooked = False
+        
+        # Rule index: (-priority, registration order, rule id) entries kept
+        # sorted per input key, so evaluation never re-sorts the rule set
+        self._rule_sequence = itertools.count()
+        self._rule_entries: Dict[str, Tuple[int, int, str]] = {}
+        self._rules_by_input: Dict[str, List[Tuple[int, int, str]]] = defaultdict(list)
+        self._unkeyed_rules: List[Tuple[int, int, str]] = []
+        self._pending_keys: Set[str] = set()
+        self.rule_stats: Dict[str, Dict[str, Any]] = {}
         
         # Metrics
         self.metrics = {
             "insights_generated": 0,
             "rules_triggered": 0,
+            "rules_evaluated": 0,
+            "evaluation_passes": 0,
             "actions_taken": 0,
             "errors": 0
         }
@@ -140,25 +167,85 @@ class InsightEngine:
         """Start the insight engine"""
         if not self.running:
             self.running = True
-            self._analyzer_task = asyncio.create_task(self._analyze_loop())
             
-            # Subscribe to event patterns
+            # Subscribe to event patterns and context changes
             self._subscribe_to_patterns()
+            for event_type in CONTEXT_EVENT_TYPES:
+                event_bus.subscribe(event_type, self._on_context_event)
+            if self.telemetry and not self._telemetry_hooked:
+                self.telemetry.add_event_handler(
+                    ObservabilityEvent.PERFORMANCE_DEGRADATION, self._on_performance_event
+                )
+                self._telemetry_hooked = True
+            
+            # Context gathered before start has not been evaluated yet
+            self._pending_keys.update(self.context_cache)
+            self._schedule_evaluation()
             
             logger.info("🧠 Insight engine started")
     
     async def stop(self):
         """Stop the insight engine"""
         self.running = False
-        if self._analyzer_task:
-            await self._analyzer_task
+        for event_type in CONTEXT_EVENT_TYPES:
+            event_bus.unsubscribe(event_type, self._on_context_event)
+        if self._evaluation_task:
+            await self._evaluation_task
+            self._evaluation_task = None
             logger.info("🛑 Insight engine stopped")
     
     def register_rule(self, rule: Rule):
-        """Register a new rule"""
+        """
+        Register a new rule (replacing one with the same id).
+        
+        The rule's priority and inputs are indexed here; re-register the rule
+        to change them.
+        """
+        if rule.id in self.rules:
+            self.unregister_rule(rule.id)
+        
+        entry = (-rule.priority, next(self._rule_sequence), rule.id)
         self.rules[rule.id] = rule
+        self._rule_entries[rule.id] = entry
+        self.rule_stats[rule.id] = {"evaluations": 0, "triggered": 0, "total_ms": 0.0, "max_ms": 0.0}
+        for key in rule.inputs:
+            bisect.insort(self._rules_by_input[key], entry)
+        if not rule.inputs:
+            bisect.insort(self._unkeyed_rules, entry)
         logger.info(f"📋 Rule registered: {rule.name}")
     
+    def unregister_rule(self, rule_id: str):
+        """Remove a rule from the engine and its index"""
+        rule = self.rules.pop(rule_id, None)
+        if rule is None:
+            return
+        entry = self._rule_entries.pop(rule_id)
+        self.rule_stats.pop(rule_id, None)
+        for entries in [self._rules_by_input[key] for key in rule.inputs] or [self._unkeyed_rules]:
+            del entries[bisect.bisect_left(entries, entry)]
+        for key in rule.inputs:
+            if not self._rules_by_input[key]:
+                del self._rules_by_input[key]
+    
+    def update_context(self, changes: Dict[str, Any]) -> Set[str]:
+        """
+        Merge ``changes`` into the rule context.
+        
+        Only keys whose value actually changed are recorded; the rules that
+        read them are evaluated shortly after, in one pass per burst of
+        changes. Returns the changed keys.
+        """
+        changed = {
+            key for key, value in changes.items()
+            if key not in self.context_cache or self.context_cache[key] != value
+        }
+        for key in changed:
+            self.context_cache[key] = changes[key]
+        if changed:
+            self._pending_keys.update(changed)
+            self._schedule_evaluation()
+        return changed
+    
     def subscribe_to_insights(self, handler: Callable):
         """Subscribe to insight generation events"""
         self.insight_subscribers.append(handler)
@@ -190,57 +277,81 @@ class InsightEngine:
                    insight_type=insight.type,
                    severity=insight.severity)
     
-    async def _analyze_loop(self):
-        """Main analysis loop"""
-        while self.running:
+    def _on_context_event(self, event: Event):
+        """Event bus handler: apply the context changes an event carries"""
+        changes = event.data.get("context")
+        if changes is None and event.type == EventType.SYSTEM_PERFORMANCE:
+            # Bare performance samples update the telemetry snapshot
+            changes = {"telemetry": {**self.context_cache.get("telemetry", {}), **event.data}}
+        if changes:
+            self.update_context(changes)
+    
+    def _on_performance_event(self, event: ObservabilityEvent, context: Any, attributes: Dict[str, Any]):
+        """Telemetry handler: record the degraded metric in the telemetry snapshot"""
+        issue = attributes.get("performance.issue")
+        if issue:
+            telemetry = {**self.context_cache.get("telemetry", {}), issue: attributes.get("metric.value")}
+            self.update_context({"telemetry": telemetry})
+    
+    def _schedule_evaluation(self):
+        """Start an evaluation pass unless one is already pending or running"""
+        if not self.running:
+            return
+        if self._evaluation_task and not self._evaluation_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop yet: the keys stay pending until the next change
+            return
+        self._evaluation_task = loop.create_task(self._evaluate_pending())
+    
+    async def _evaluate_pending(self):
+        """Evaluate rules for changed keys until no changes are pending"""
+        while self._pending_keys and self.running:
+            keys, self._pending_keys = self._pending_keys, set()
             try:
-                # Gather context
-                context = await self._gather_context()
-                
-                # Run rules
-                await self._run_rules(context)
-                
-                # Wait before next analysis
-                await asyncio.sleep(30)  # Run every 30 seconds
-                
+                await self._run_rules(keys)
             except Exception as e:
-                logger.error(f"❌ Error in analysis loop: {e}")
+                logger.error(f"❌ Error evaluating insight rules: {e}")
                 self.metrics["errors"] += 1
-                await asyncio.sleep(60)
     
-    async def _gather_context(self) -> Dict[str, Any]:
-        """Gather current system context"""
-        context = {
-            "timestamp": datetime.utcnow(),
-            "event_metrics": event_bus.get_metrics()
-        }
-        
-        # Add telemetry data if available
-        if self.telemetry:
-            context["telemetry"] = await self.telemetry.get_recent_metrics()
-        
-        # Add cached context
-        context.update(self.context_cache)
-        
-        return context
+    def _rules_for(self, keys: Iterable[str]) -> List[Rule]:
+        """Rules reading any of ``keys`` (plus rules without inputs), by priority"""
+        indexed = [self._rules_by_input[key] for key in keys if key in self._rules_by_input]
+        selected = []
+        seen = set()
+        for _, _, rule_id in heapq.merge(self._unkeyed_rules, *indexed):
+            if rule_id not in seen:
+                seen.add(rule_id)
+                selected.append(self.rules[rule_id])
+        return selected
     
-    async def _run_rules(self, context: Dict[str, Any]):
-        """Run all enabled rules against context"""
-        # Sort rules by priority
-        sorted_rules = sorted(
-            self.rules.values(),
-            key=lambda r: r.priority,
-            reverse=True
-        )
+    async def _run_rules(self, changed_keys: Iterable[str]):
+        """Run the enabled rules that depend on ``changed_keys``"""
+        context = ChainMap({"timestamp": datetime.utcnow()}, self.context_cache)
+        self.metrics["evaluation_passes"] += 1
         
-        for rule in sorted_rules:
+        for rule in self._rules_for(changed_keys):
+            stats = self.rule_stats[rule.id]
+            started = time.perf_counter()
             try:
                 insight = rule.trigger(context)
-                if insight:
-                    await self.generate_insight(insight)
-                    self.metrics["rules_triggered"] += 1
             except Exception as e:
                 logger.error(f"❌ Error running rule {rule.name}: {e}")
+                self.metrics["errors"] += 1
+                insight = None
+            
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stats["evaluations"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            self.metrics["rules_evaluated"] += 1
+            
+            if insight:
+                stats["triggered"] += 1
+                self.metrics["rules_triggered"] += 1
+                await self.generate_insight(insight)
     
     def _subscribe_to_patterns(self):
         """Subscribe to relevant event patterns"""
@@ -319,7 +430,8 @@ class InsightEngine:
             type=InsightType.PERFORMANCE,
             condition=perf_condition,
             action=perf_action,
-            priority=8
+            priority=8,
+            inputs=("telemetry",)
         ))
         
         # Task bottleneck rule
@@ -351,7 +463,8 @@ class InsightEngine:
             type=InsightType.BOTTLENECK,
             condition=bottleneck_condition,
             action=bottleneck_action,
-            priority=7
+            priority=7,
+            inputs=("blocked_tasks",)
         ))
         
         # Opportunity detection rule
@@ -387,7 +500,8 @@ class InsightEngine:
             type=InsightType.OPPORTUNITY,
             condition=opportunity_condition,
             action=opportunity_action,
-            priority=5
+            priority=5,
+            inputs=("manual_tasks", "total_tasks")
         ))
     
     def _map_severity_to_priority(self, severity: InsightSeverity) -> EventPriority:
@@ -419,13 +533,27 @@ class InsightEngine:
         
         return insights[-limit:]
     
+    def get_rule_stats(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Per-rule evaluation counts and timings, most expensive first"""
+        stats = [
+            {
+                "rule_id": rule_id,
+                **rule_stats,
+                "avg_ms": rule_stats["total_ms"] / rule_stats["evaluations"] if rule_stats["evaluations"] else 0.0,
+            }
+            for rule_id, rule_stats in self.rule_stats.items()
+        ]
+        stats.sort(key=lambda item: item["total_ms"], reverse=True)
+        return stats[:limit] if limit else stats
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get insight engine metrics"""
         return {
             **self.metrics,
             "active_rules": len([r for r in self.rules.values() if r.enabled]),
             "total_rules": len(self.rules),
-            "insights_in_memory": len(self.insights)
+            "insights_in_memory": len(self.insights),
+            "slowest_rules": self.get_rule_stats(limit=5)
         }
 
 
@@ -433,7 +561,7 @@ class InsightEngine:
 insight_engine = InsightEngine()
 
 
-async def initialize_insight_engine(telemetry: Optional[TelemetryService] = None):
+async def initialize_insight_engine(telemetry: Optional[ConvergioTelemetry] = None):
     """Initialize and start the insight engine"""
     global insight_engine
     insight_engine = InsightEngine(telemetry)
@@ -0,0 +1,354 @@
+"""
+Telemetry Event Store - append-only, queryable history of observability events
+Events are buffered without blocking the caller, flushed in batches to the
+telemetry_events table, and kept in an indexed in-process store without a database
+"""
+
+import asyncio
+import bisect
+import json
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Filters answered from an index rather than a scan
+INDEXED_FIELDS = ("conversation_id", "agent_name", "event_type", "user_id", "status")
+
+# Outcome recorded on result events ("tool.result", ...); None for everything else
+EVENT_STATUSES = ("ok", "error")
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def format_event(event: Dict[str, Any], include_metadata: bool = True) -> Dict[str, Any]:
+    """Event as returned by the telemetry API"""
+    formatted = {
+        "id": event["id"],
+        "timestamp": event["timestamp"].isoformat(),
+        "event_type": event["event_type"],
+        "conversation_id": event["conversation_id"],
+        "user_id": event["user_id"],
+        "agent_name": event["agent_name"],
+        "turn_number": event["turn_number"],
+        "status": event.get("status"),
+        "data": event["data"],
+    }
+    if include_metadata:
+        formatted["metadata"] = event["metadata"]
+    return formatted
+
+
+def _matches(event: Dict[str, Any], filters: Dict[str, Any], start: Optional[datetime], end: Optional[datetime]) -> bool:
+    if start is not None and event["timestamp"] < start:
+        return False
+    if end is not None and event["timestamp"] > end:
+        return False
+    return all(event.get(field) == value for field, value in filters.items())
+
+
+class InMemoryEventIndex:
+    """
+    Recent events in arrival order with per-field posting lists.
+
+    Events arrive in timestamp order, so a query walks the shortest posting
+    list of its filters backwards from the newest event and stops at the
+    start of the time range. The oldest tenth is evicted at capacity.
+    """
+
+    def __init__(self, capacity: int = 200_000):
+        self.capacity = capacity
+        self._events: List[Dict[str, Any]] = []
+        self._times: List[datetime] = []
+        self._base = 0  # sequence number of self._events[0]
+        self._postings: Dict[Tuple[str, Any], List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def add(self, event: Dict[str, Any]):
+        seq = self._base + len(self._events)
+        self._events.append(event)
+        self._times.append(event["timestamp"])
+        for field in INDEXED_FIELDS:
+            if event.get(field) is not None:
+                self._postings.setdefault((field, event[field]), []).append(seq)
+        if len(self._events) > self.capacity:
+            self._evict(max(1, self.capacity // 10))
+
+    def _evict(self, count: int):
+        self._events = self._events[count:]
+        self._times = self._times[count:]
+        self._base += count
+        for key in list(self._postings):
+            postings = self._postings[key]
+            keep = bisect.bisect_left(postings, self._base)
+            if keep == len(postings):
+                del self._postings[key]
+            elif keep:
+                self._postings[key] = postings[keep:]
+
+    def query(self, filters: Dict[str, Any], start: Optional[datetime], end: Optional[datetime], limit: int) -> List[Dict[str, Any]]:
+        """Newest-first events matching all filters"""
+        indexed = [(field, value) for field, value in filters.items() if field in INDEXED_FIELDS]
+        if indexed:
+            postings = [self._postings.get(key, []) for key in indexed]
+            seqs = min(postings, key=len)
+            last = len(seqs)
+            if end is not None:
+                # Posting lists are in time order too
+                end_seq = self._base + bisect.bisect_right(self._times, end)
+                last = bisect.bisect_left(seqs, end_seq)
+            candidates = (seqs[i] for i in range(last - 1, -1, -1))
+        else:
+            last = bisect.bisect_right(self._times, end) if end is not None else len(self._events)
+            candidates = (self._base + i for i in range(last - 1, -1, -1))
+
+        results = []
+        for seq in candidates:
+            event = self._events[seq - self._base]
+            if start is not None and event["timestamp"] < start:
+                break
+            if _matches(event, filters, None, None):
+                results.append(event)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+class TelemetryEventStore:
+    """
+    Non-blocking recorder and query interface for telemetry events.
+
+    ``record`` only appends to a bounded deque (dropping the oldest event
+    when full), so it never waits on I/O. A background task drains the
+    buffer: into the telemetry_events table when the database is available
+    (see migrations/create_telemetry_events_table.sql), otherwise into an
+    in-process index.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        buffer_size: int = 50_000,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        memory_capacity: int = 200_000
+    ):
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+        self.memory = InMemoryEventIndex(memory_capacity)
+        self._flush_task: Optional[asyncio.Task] = None
+        self.stats = {"recorded": 0, "dropped": 0, "flushed": 0, "flush_errors": 0}
+
+    def _get_session_factory(self):
+        if self._session_factory is None:
+            try:
+                from ....core.database import get_async_session_factory
+                self._session_factory = get_async_session_factory()
+            except (ImportError, RuntimeError, ValueError):
+                return None
+        return self._session_factory
+
+    def record(
+        self,
+        event_type: str,
+        conversation_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        data: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        turn_number: Optional[int] = None,
+        status: Optional[str] = None
+    ) -> str:
+        """
+        Buffer an event; safe to call from any thread, never blocks.
+        ``status`` ("ok"/"error") marks the outcome of result events so
+        failures can be queried without scanning ``data``.
+        """
+        event_id = uuid.uuid4().hex
+        if len(self._buffer) == self._buffer.maxlen:
+            self.stats["dropped"] += 1
+        self._buffer.append({
+            "id": event_id,
+            "timestamp": datetime.utcnow(),
+            "event_type": event_type,
+            "conversation_id": conversation_id,
+            "user_id": user_id,
+            "agent_name": agent_name,
+            "turn_number": turn_number,
+            "status": status,
+            "data": data or {},
+            "metadata": metadata or {},
+        })
+        self.stats["recorded"] += 1
+        self._ensure_started()
+        return event_id
+
+    def _ensure_started(self):
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # no loop yet; the buffer is drained once one records or queries
+            self._flush_task = loop.create_task(self._flush_loop())
+
+    def _take(self, limit: int) -> List[Dict[str, Any]]:
+        batch = []
+        while self._buffer and len(batch) < limit:
+            batch.append(self._buffer.popleft())
+        return batch
+
+    async def flush(self) -> int:
+        """Drain the buffer; returns the number of events written"""
+        written = 0
+        while self._buffer:
+            batch = self._take(self.batch_size)
+            session_factory = self._get_session_factory()
+            if session_factory is None:
+                for event in batch:
+                    self.memory.add(event)
+            else:
+                try:
+                    await self._write_batch(session_factory, batch)
+                except Exception as e:
+                    # Telemetry is best effort: keep the batch queryable in process
+                    self.stats["flush_errors"] += 1
+                    logger.warning("Telemetry event flush failed", error=str(e), events=len(batch))
+                    for event in batch:
+                        self.memory.add(event)
+            written += len(batch)
+        self.stats["flushed"] += written
+        return written
+
+    async def _write_batch(self, session_factory, batch: List[Dict[str, Any]]):
+        from sqlalchemy import text
+
+        async with session_factory() as session:
+            await session.execute(
+                text("""
+                    INSERT INTO telemetry_events
+                        (id, timestamp, event_type, conversation_id, user_id, agent_name, turn_number, status,
+                         data, metadata)
+                    VALUES
+                        (:id, :timestamp, :event_type, :conversation_id, :user_id, :agent_name, :turn_number, :status,
+                         CAST(:data AS jsonb), CAST(:metadata AS jsonb))
+                """),
+                [
+                    {
+                        **event,
+                        "data": json.dumps(event["data"], default=str),
+                        "metadata": json.dumps(event["metadata"], default=str),
+                    }
+                    for event in batch
+                ]
+            )
+            await session.commit()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("Telemetry flush loop error", error=str(e))
+
+    async def query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 100,
+        include_metadata: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Newest-first events filtered by conversation_id, user_id, agent_name,
+        event_type, status and a start_time/end_time range
+        """
+        filters = dict(filters or {})
+        start = _naive_utc(filters.pop("start_time", None))
+        end = _naive_utc(filters.pop("end_time", None))
+        filters = {field: value for field, value in filters.items() if field in INDEXED_FIELDS and value is not None}
+
+        session_factory = self._get_session_factory()
+        if session_factory is None:
+            await self.flush()
+            events = self.memory.query(filters, start, end, limit)
+        else:
+            # Events still in the buffer are not persisted yet
+            pending = [event for event in reversed(self._buffer) if _matches(event, filters, start, end)][:limit]
+            events = pending + await self._query_table(session_factory, filters, start, end, limit)
+            if len(self.memory):
+                # Batches that failed to flush
+                events += self.memory.query(filters, start, end, limit)
+            events.sort(key=lambda event: event["timestamp"], reverse=True)
+
+        return [format_event(event, include_metadata) for event in events[:limit]]
+
+    async def _query_table(self, session_factory, filters, start, end, limit) -> List[Dict[str, Any]]:
+        from sqlalchemy import text
+
+        clauses = [f"{field} = :{field}" for field in filters]
+        params: Dict[str, Any] = {**filters, "limit": limit}
+        if start is not None:
+            clauses.append("timestamp >= :start")
+            params["start"] = start
+        if end is not None:
+            clauses.append("timestamp <= :end")
+            params["end"] = end
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        async with session_factory() as session:
+            result = await session.execute(
+                text(f"""
+                    SELECT id, timestamp, event_type, conversation_id, user_id, agent_name, turn_number, status,
+                           data, metadata
+                    FROM telemetry_events {where}
+                    ORDER BY timestamp DESC
+                    LIMIT :limit
+                """),
+                params
+            )
+            rows = result.mappings().all()
+        return [{**row, "id": getattr(row["id"], "hex", row["id"])} for row in rows]
+
+    async def count(self) -> int:
+        """Number of stored events (planner estimate for the table)"""
+        session_factory = self._get_session_factory()
+        if session_factory is None:
+            return len(self.memory) + len(self._buffer)
+
+        from sqlalchemy import text
+
+        async with session_factory() as session:
+            result = await session.execute(
+                text("SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE relname = 'telemetry_events'")
+            )
+            return int(result.scalar() or 0) + len(self._buffer) + len(self.memory)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "buffered": len(self._buffer), "in_memory": len(self.memory)}
+
+
+# Singleton instance
+_event_store: Optional[TelemetryEventStore] = None
+
+
+def get_event_store() -> TelemetryEventStore:
+    """Get or create the process-wide telemetry event store"""
+    global _event_store
+
+    if _event_store is None:
+        _event_store = TelemetryEventStore()
+    return _event_store
+
+
+__all__ = ["EVENT_STATUSES", "InMemoryEventIndex", "TelemetryEventStore", "format_event", "get_event_store"]
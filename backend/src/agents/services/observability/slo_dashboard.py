@@ -5,9 +5,9 @@ Provides real-time monitoring and alerting for key metrics
 
 import asyncio
 import time
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
 import json
 from ...utils.config import get_settings
@@ -27,23 +27,87 @@ class SLOTarget:
     measurement_window: int  # seconds
     error_budget: float = 0.05  # 5% default error budget
     
-@dataclass
-class SLOMeasurement:
-    """SLO measurement data"""
-    timestamp: datetime
-    value: float
-    status: SLOStatus
-    metadata: Dict[str, Any] = field(default_factory=dict)
+@dataclass(frozen=True)
+class BurnRateRule:
+    """Multi-window burn-rate alert: both windows must burn faster than the threshold"""
+    name: str
+    long_window: int  # seconds
+    short_window: int  # seconds
+    threshold: float  # multiple of the error budget consumption rate
+    severity: str
+
+# Fast burn pages, slow burn opens a ticket (budget spent in ~2 days / ~5 days over 30 days)
+BURN_RATE_RULES = [
+    BurnRateRule("fast_burn", long_window=3600, short_window=300, threshold=14.4, severity="high"),
+    BurnRateRule("slow_burn", long_window=21600, short_window=1800, threshold=6.0, severity="medium"),
+]
+
+class RollingWindow:
+    """
+    Ring buffer of fixed time buckets holding count, sum, good and bad.
+
+    Recording touches one bucket; a query sums the buckets of the window, so
+    both costs are independent of the measurement rate.
+    """
+    
+    def __init__(self, bucket_seconds: int, retention_seconds: int):
+        self.bucket_seconds = bucket_seconds
+        self.size = -(-retention_seconds // bucket_seconds) + 1
+        self.epochs = [-1] * self.size
+        self.count = [0] * self.size
+        self.sum = [0.0] * self.size
+        self.good = [0] * self.size
+        self.bad = [0] * self.size
+    
+    def record(self, now: float, value: float, good: bool):
+        epoch = int(now // self.bucket_seconds)
+        slot = epoch % self.size
+        if self.epochs[slot] != epoch:
+            self.epochs[slot] = epoch
+            self.count[slot] = 0
+            self.sum[slot] = 0.0
+            self.good[slot] = 0
+            self.bad[slot] = 0
+        self.count[slot] += 1
+        self.sum[slot] += value
+        if good:
+            self.good[slot] += 1
+        else:
+            self.bad[slot] += 1
+    
+    def totals(self, now: float, window_seconds: int) -> Dict[str, float]:
+        """Count, sum, good and bad over the last ``window_seconds`` (bucket-aligned)"""
+        current = int(now // self.bucket_seconds)
+        buckets = min(self.size, max(1, -(-window_seconds // self.bucket_seconds)))
+        totals = {"count": 0, "sum": 0.0, "good": 0, "bad": 0}
+        for epoch in range(current - buckets + 1, current + 1):
+            slot = epoch % self.size
+            if self.epochs[slot] == epoch:
+                totals["count"] += self.count[slot]
+                totals["sum"] += self.sum[slot]
+                totals["good"] += self.good[slot]
+                totals["bad"] += self.bad[slot]
+        return totals
 
 class SLODashboard:
     """SLO Dashboard for monitoring service level objectives"""
     
-    def __init__(self):
+    def __init__(self, bucket_seconds: int = 30, burn_rate_rules: Optional[List[BurnRateRule]] = None,
+                 min_alert_samples: int = 10, clock=time.time):
         self.settings = get_settings()
         self.slo_targets: Dict[str, SLOTarget] = {}
-        self.measurements: Dict[str, List[SLOMeasurement]] = {}
+        self.windows: Dict[str, RollingWindow] = {}
+        self.last_recorded: Dict[str, float] = {}
         self.alerts: List[Dict[str, Any]] = []
         
+        self.bucket_seconds = bucket_seconds
+        self.burn_rate_rules = burn_rate_rules if burn_rate_rules is not None else BURN_RATE_RULES
+        self.min_alert_samples = min_alert_samples
+        self.clock = clock
+        # Alerts still firing, by (slo_key, rule); evaluated once per bucket and SLO
+        self._active_alerts: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._last_evaluated: Dict[str, int] = {}
+        
         # Initialize default SLOs
         self._initialize_default_slos()
     
@@ -93,32 +157,25 @@ class SLODashboard:
     
     def add_slo_target(self, key: str, slo: SLOTarget):
         """Add a new SLO target"""
+        retention = max([slo.measurement_window] + [rule.long_window for rule in self.burn_rate_rules])
         self.slo_targets[key] = slo
-        self.measurements[key] = []
+        self.windows[key] = RollingWindow(self.bucket_seconds, retention)
     
     def record_measurement(self, slo_key: str, value: float, metadata: Optional[Dict[str, Any]] = None):
-        """Record a new SLO measurement"""
+        """Record a new SLO measurement; a measurement below target spends error budget"""
         if slo_key not in self.slo_targets:
             raise ValueError(f"SLO target '{slo_key}' not found")
         
         target = self.slo_targets[slo_key]
-        status = self._calculate_status(value, target)
-        
-        measurement = SLOMeasurement(
-            timestamp=datetime.now(),
-            value=value,
-            status=status,
-            metadata=metadata or {}
-        )
+        now = self.clock()
+        self.windows[slo_key].record(now, value, value >= target.target_percentage)
+        self.last_recorded[slo_key] = now
         
-        self.measurements[slo_key].append(measurement)
-        
-        # Clean old measurements
-        self._cleanup_old_measurements(slo_key)
-        
-        # Check for alerts
-        if status in [SLOStatus.WARNING, SLOStatus.CRITICAL]:
-            self._create_alert(slo_key, measurement, target)
+        # Burn rates only change meaningfully per bucket
+        epoch = int(now // self.bucket_seconds)
+        if self._last_evaluated.get(slo_key) != epoch:
+            self._last_evaluated[slo_key] = epoch
+            self._evaluate_burn_rates(slo_key, now)
     
     def _calculate_status(self, value: float, target: SLOTarget) -> SLOStatus:
         """Calculate SLO status based on value and target"""
@@ -131,31 +188,61 @@ class SLODashboard:
         else:
             return SLOStatus.CRITICAL
     
-    def _cleanup_old_measurements(self, slo_key: str):
-        """Remove old measurements outside the measurement window"""
-        target = self.slo_targets[slo_key]
-        cutoff_time = datetime.now() - timedelta(seconds=target.measurement_window)
-        
-        self.measurements[slo_key] = [
-            m for m in self.measurements[slo_key]
-            if m.timestamp > cutoff_time
-        ]
+    def _burn_rate(self, slo_key: str, window_seconds: int, now: float) -> Tuple[float, int]:
+        """Error budget consumption rate over the window (1.0 spends it exactly on time)"""
+        totals = self.windows[slo_key].totals(now, window_seconds)
+        if not totals["count"]:
+            return 0.0, 0
+        error_rate = totals["bad"] / totals["count"]
+        return error_rate / max(self.slo_targets[slo_key].error_budget, 1e-9), totals["count"]
+    
+    def _evaluate_burn_rates(self, slo_key: str, now: float):
+        """Open, refresh or resolve the multi-window burn-rate alerts of an SLO"""
+        for rule in self.burn_rate_rules:
+            long_rate, long_count = self._burn_rate(slo_key, rule.long_window, now)
+            short_rate, _ = self._burn_rate(slo_key, rule.short_window, now)
+            firing = (long_count >= self.min_alert_samples and
+                      long_rate >= rule.threshold and short_rate >= rule.threshold)
+            
+            active = self._active_alerts.get((slo_key, rule.name))
+            if firing and active:
+                active['last_seen'] = datetime.fromtimestamp(now).isoformat()
+                active['burn_rate'] = round(long_rate, 2)
+                active['occurrences'] += 1
+            elif firing:
+                self._create_alert(slo_key, rule, long_rate, short_rate, now)
+            elif active:
+                active['resolved_at'] = datetime.fromtimestamp(now).isoformat()
+                del self._active_alerts[(slo_key, rule.name)]
     
-    def _create_alert(self, slo_key: str, measurement: SLOMeasurement, target: SLOTarget):
-        """Create an alert for SLO violation"""
+    def _create_alert(self, slo_key: str, rule: BurnRateRule, long_rate: float, short_rate: float, now: float):
+        """Create an alert for an SLO burning its error budget too fast"""
+        target = self.slo_targets[slo_key]
+        totals = self.windows[slo_key].totals(now, rule.short_window)
+        value = totals["sum"] / totals["count"] if totals["count"] else None
+        status = SLOStatus.CRITICAL if rule.severity == 'high' else SLOStatus.WARNING
+        timestamp = datetime.fromtimestamp(now).isoformat()
         alert = {
-            'id': f"{slo_key}_{int(time.time())}",
+            'id': f"{slo_key}_{rule.name}_{int(now)}",
             'slo_key': slo_key,
             'slo_name': target.name,
-            'timestamp': measurement.timestamp.isoformat(),
-            'value': measurement.value,
+            'rule': rule.name,
+            'timestamp': timestamp,
+            'last_seen': timestamp,
+            'value': value,
             'target': target.target_percentage,
-            'status': measurement.status.value,
-            'severity': 'high' if measurement.status == SLOStatus.CRITICAL else 'medium',
-            'message': f"SLO '{target.name}' is {measurement.status.value}: {measurement.value}% (target: {target.target_percentage}%)"
+            'status': status.value,
+            'severity': rule.severity,
+            'burn_rate': round(long_rate, 2),
+            'windows': {f"{rule.long_window}s": round(long_rate, 2), f"{rule.short_window}s": round(short_rate, 2)},
+            'occurrences': 1,
+            'resolved_at': None,
+            'message': (f"SLO '{target.name}' is burning its error budget {long_rate:.1f}x too fast "
+                        f"over {rule.long_window // 60}m and {short_rate:.1f}x over {rule.short_window // 60}m")
         }
         
         self.alerts.append(alert)
+        self._active_alerts[(slo_key, rule.name)] = alert
         
         # Keep only last 100 alerts
         if len(self.alerts) > 100:
@@ -167,41 +254,33 @@ class SLODashboard:
             raise ValueError(f"SLO target '{slo_key}' not found")
         
         target = self.slo_targets[slo_key]
-        measurements = self.measurements[slo_key]
-        
-        if not measurements:
-            return {
-                'slo_key': slo_key,
-                'slo_name': target.name,
-                'current_value': None,
-                'status': SLOStatus.GOOD.value,
-                'target': target.target_percentage,
-                'measurement_count': 0,
-                'last_updated': None
-            }
+        now = self.clock()
+        last_recorded = self.last_recorded.get(slo_key)
+        totals = self.windows[slo_key].totals(now, target.measurement_window)
         
-        # Calculate current value (average of recent measurements)
-        recent_measurements = [
-            m for m in measurements
-            if m.timestamp > datetime.now() - timedelta(seconds=target.measurement_window)
-        ]
-        
-        if not recent_measurements:
+        if not totals["count"]:
             current_value = None
             status = SLOStatus.GOOD.value
         else:
-            current_value = sum(m.value for m in recent_measurements) / len(recent_measurements)
+            # Average of the measurements in the window
+            current_value = totals["sum"] / totals["count"]
             status = self._calculate_status(current_value, target).value
         
+        burn_rates = {}
+        for rule in self.burn_rate_rules:
+            for window in (rule.short_window, rule.long_window):
+                burn_rates[f"{window}s"] = round(self._burn_rate(slo_key, window, now)[0], 2)
+        
         return {
             'slo_key': slo_key,
             'slo_name': target.name,
             'current_value': current_value,
             'status': status,
             'target': target.target_percentage,
-            'measurement_count': len(recent_measurements),
-            'last_updated': measurements[-1].timestamp.isoformat() if measurements else None,
-            'error_budget_remaining': target.error_budget * 100
+            'measurement_count': totals["count"],
+            'last_updated': datetime.fromtimestamp(last_recorded).isoformat() if last_recorded else None,
+            'error_budget_remaining': target.error_budget * 100,
+            'burn_rates': burn_rates
         }
     
     def get_all_slo_status(self) -> Dict[str, Any]:
@@ -229,7 +308,7 @@ class SLODashboard:
             'overall_health': overall_health,
             'overall_status': self._calculate_status(overall_health, SLOTarget("Overall", 95.0, 300)).value,
             'slo_count': len(self.slo_targets),
-            'active_alerts': len([a for a in self.alerts if a['severity'] == 'high']),
+            'active_alerts': len([a for a in self._active_alerts.values() if a['severity'] == 'high']),
             'slo_statuses': slo_statuses,
             'last_updated': datetime.now().isoformat()
         }
@@ -250,8 +329,10 @@ class SLODashboard:
         """Clear alerts, optionally by specific IDs"""
         if alert_ids:
             self.alerts = [a for a in self.alerts if a['id'] not in alert_ids]
+            self._active_alerts = {k: a for k, a in self._active_alerts.items() if a['id'] not in alert_ids}
         else:
             self.alerts = []
+            self._active_alerts = {}
     
     def export_metrics(self) -> Dict[str, Any]:
         """Export current SLO metrics for external monitoring"""
@@ -259,7 +340,7 @@ class SLODashboard:
             'slo_dashboard': {
                 'overall_health': self.get_all_slo_status()['overall_health'],
                 'slo_count': len(self.slo_targets),
-                'active_alerts': len(self.alerts),
+                'active_alerts': len(self._active_alerts),
                 'last_updated': datetime.now().isoformat()
             },
             'individual_slos': {
@@ -30,6 +30,9 @@ except Exception:
 from opentelemetry.propagate import inject, extract
 from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
 
+from ...observability.tail_sampling import TailSamplingConfig, TailSamplingSpanProcessor
+from .event_store import TelemetryEventStore, get_event_store
+
 logger = structlog.get_logger()
 
 
@@ -83,9 +86,19 @@ class TelemetryContext:
 class ConvergioTelemetry:
     """Comprehensive telemetry system for Convergio AutoGen"""
     
-    def __init__(self, service_name: str = "convergio-autogen", endpoint: Optional[str] = None):
+    def __init__(
+        self,
+        service_name: str = "convergio-autogen",
+        endpoint: Optional[str] = None,
+        event_store: Optional[TelemetryEventStore] = None,
+        sampling: Optional[TailSamplingConfig] = None
+    ):
         self.service_name = service_name
         self.endpoint = endpoint or "localhost:4317"
+        self.sampling = sampling or TailSamplingConfig.from_settings()
+        
+        # Queryable history of emitted events
+        self.event_store = event_store or get_event_store()
         
         # Initialize OpenTelemetry
         self._init_tracing()
@@ -112,7 +125,7 @@ class ConvergioTelemetry:
         })
         
         # Create tracer provider
-        self.tracer_provider = TracerProvider(resource=resource)
+        self.tracer_provider = TracerProvider(resource=resource, sampler=self.sampling.sampler())
         trace.set_tracer_provider(self.tracer_provider)
         
         # Configure OTLP exporter
@@ -121,9 +134,9 @@ class ConvergioTelemetry:
             insecure=True
         )
         
-        # Add span processor
-        span_processor = BatchSpanProcessor(otlp_exporter)
-        self.tracer_provider.add_span_processor(span_processor)
+        # Add span processor; only sampled traces reach the exporter
+        self.tail_sampler = TailSamplingSpanProcessor(BatchSpanProcessor(otlp_exporter), self.sampling)
+        self.tracer_provider.add_span_processor(self.tail_sampler)
         
         # Get tracer
         self.tracer = trace.get_tracer(self.service_name)
@@ -380,6 +393,8 @@ class ConvergioTelemetry:
             kind=trace.SpanKind.CLIENT,
             attributes=attributes
         ) as span:
+            # Lets the event store answer queries for failed tool calls
+            result_attributes = {**attributes, "tool.success": True}
             try:
                 self.tool_call_counter.add(1, attributes)
                 self._emit_event(ObservabilityEvent.TOOL_CALL, context, attributes)
@@ -391,10 +406,11 @@ class ConvergioTelemetry:
             except Exception as e:
                 span.record_exception(e)
                 span.set_status(Status(StatusCode.ERROR, str(e)))
+                result_attributes.update({"tool.success": False, "error.type": type(e).__name__, "error": str(e)})
                 raise
                 
             finally:
-                self._emit_event(ObservabilityEvent.TOOL_RESULT, context, attributes)
+                self._emit_event(ObservabilityEvent.TOOL_RESULT, context, result_attributes)
     
     @contextmanager
     def trace_workflow(self, workflow_id: str, context: TelemetryContext):
@@ -681,7 +697,19 @@ class ConvergioTelemetry:
         context: Optional[TelemetryContext],
         attributes: Dict[str, Any]
     ):
-        """Emit observability event to handlers"""
+        """Record observability event and emit it to handlers"""
+        success = attributes.get("tool.success")
+        self.event_store.record(
+            event.value,
+            conversation_id=context.conversation_id if context else None,
+            user_id=context.user_id if context else None,
+            agent_name=(context.agent_name if context else None) or attributes.get("agent.name"),
+            data=attributes,
+            metadata={"workflow_id": context.workflow_id, "session_id": context.session_id} if context else {},
+            turn_number=attributes.get("turn.number"),
+            status=None if success is None else ("ok" if success else "error")
+        )
+        
         handlers = self.event_handlers.get(event, [])
         for handler in handlers:
             try:
@@ -721,7 +749,8 @@ class ConvergioTelemetry:
             },
             "memory": {
                 "usage_bytes": self.memory_usage_gauge._value
-            }
+            },
+            "sampling": self.tail_sampler.get_stats()
         }
     
     async def get_events(
@@ -742,12 +771,7 @@ class ConvergioTelemetry:
             Lista di eventi formattati
         """
         try:
-            # Use real database/storage for telemetry data
-            from .telemetry_api import TelemetryAPIService
-            
-            # Usa il servizio stub per ora
-            stub_service = TelemetryAPIService()
-            return await stub_service.get_events(filters, limit, include_metadata)
+            return await self.event_store.query(filters, limit, include_metadata)
             
         except Exception as e:
             logger.error(f"Error retrieving telemetry events: {str(e)}")
@@ -775,26 +799,12 @@ class ConvergioTelemetry:
             }
     
     async def _get_total_events_count(self) -> int:
-        """Get total telemetry events count from storage."""
+        """Get total telemetry events count from the event store."""
         try:
-            # Try to get from Redis cache first
-            from ...core.redis import get_redis_client
-            redis_client = await get_redis_client()
-            cached_count = await redis_client.get("telemetry:events:count")
-            
-            if cached_count:
-                return int(cached_count)
-            
-            # Fallback to calculating from active spans and metrics
-            active_events = len(self.active_spans)
-            
-            # Cache the result for 5 minutes
-            await redis_client.setex("telemetry:events:count", 300, active_events)
-            return active_events
-            
+            return await self.event_store.count()
         except Exception as e:
             logger.warning(f"Failed to get events count: {e}")
-            return len(self.active_spans)
+            return self.event_store.stats["recorded"]
     
     async def _get_total_conversations_count(self) -> int:
         """Get total conversations count."""
@@ -3,7 +3,6 @@
 Advanced agent coordination with self-organizing patterns and intelligent task distribution
 """
 
-import asyncio
 import json
 import time
 from typing import Dict, List, Any, Optional, Set, Tuple
@@ -12,6 +11,8 @@ from enum import Enum
 import structlog
 from datetime import datetime, timedelta
 
+from .swarm_execution import AgentExecutor, SwarmExecutionEngine
+
 logger = structlog.get_logger()
 
 class SwarmRole(Enum):
@@ -60,16 +61,23 @@ class SwarmTask:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     coordination_pattern: Optional[str] = None
+    quorum: Optional[int] = None  # Successful agents needed before a round stops early
 
 class SwarmCoordinator:
     """Advanced swarm intelligence coordination system"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        executor: Optional[AgentExecutor] = None,
+        max_concurrency: int = 8,
+        agent_timeout: float = 60.0
+    ):
         self.agents: Dict[str, SwarmAgent] = {}
         self.active_tasks: Dict[str, SwarmTask] = {}
         self.coordination_patterns: Dict[str, Dict[str, Any]] = {}
         self.performance_metrics: Dict[str, Dict[str, float]] = {}
         self.task_counter = 0
+        self.engine = SwarmExecutionEngine(executor, max_concurrency, agent_timeout)
         self.setup_coordination_patterns()
         
         logger.info("🤖 Swarm Coordinator initialized")
@@ -436,6 +444,34 @@ class SwarmCoordinator:
         else:
             return await self._execute_sequential(task)  # Fallback
 
+    def _agent_result(self, run: Dict[str, Any], **extra: Any) -> Dict[str, Any]:
+        """Shape an engine run into a pattern result and track response time"""
+        agent = self.agents[run['agent_key']]
+        if run['success']:
+            agent.avg_response_time = agent.avg_response_time * 0.8 + run['execution_time'] * 0.2
+        result = {
+            'agent': agent.name,
+            'role': agent.role.value,
+            'output': run['output'],
+            'execution_time': run['execution_time'],
+            'success': run['success'],
+            **extra
+        }
+        for key in ('error', 'cancelled'):
+            if key in run:
+                result[key] = run[key]
+        return result
+
+    def _agent_prompt(self, agent: SwarmAgent, task: SwarmTask, context: str = "") -> str:
+        expertise = ', '.join(agent.expertise_areas) or 'general'
+        prompt = (
+            f"You are {agent.name}, acting as {agent.role.value} in a team of agents "
+            f"(your expertise: {expertise}).\n\nTask: {task.description}"
+        )
+        if context:
+            prompt += f"\n\n{context}"
+        return prompt
+
     async def _execute_sequential(self, task: SwarmTask) -> Dict[str, Any]:
         """Execute task with agents working in sequence"""
         results = []
@@ -443,21 +479,14 @@ class SwarmCoordinator:
         
         for agent_key in task.assigned_agents:
             agent = self.agents[agent_key]
-            
-            # Simulate agent processing (in real implementation, call actual agent)
-            result = {
-                'agent': agent.name,
-                'input': previous_output,
-                'output': f"{agent.name} processed: {previous_output[:100]}...",
-                'execution_time': 2.5,
-                'success': True
-            }
-            
+            context = "" if not results else f"Build on the previous agent's output:\n{previous_output}"
+            runs = await self.engine.run_round(
+                [agent_key], lambda key: self._agent_prompt(agent, task, context)
+            )
+            result = self._agent_result(runs[0], input=previous_output)
             results.append(result)
-            previous_output = result['output']
-            
-            # Small delay to simulate processing
-            await asyncio.sleep(0.1)
+            if result['success']:
+                previous_output = result['output']
             
         return {
             'pattern': 'sequential',
@@ -467,20 +496,18 @@ class SwarmCoordinator:
 
     async def _execute_parallel(self, task: SwarmTask) -> Dict[str, Any]:
         """Execute task with agents working in parallel"""
-        # Simulate parallel execution
-        tasks_to_execute = []
-        
-        for agent_key in task.assigned_agents:
-            agent = self.agents[agent_key]
-            tasks_to_execute.append(self._simulate_agent_execution(agent, task))
-        
-        # Execute all tasks in parallel
-        results = await asyncio.gather(*tasks_to_execute)
+        runs = await self.engine.run_round(
+            task.assigned_agents,
+            lambda key: self._agent_prompt(self.agents[key], task),
+            quorum=task.quorum
+        )
+        results = [self._agent_result(run) for run in runs]
+        succeeded = sum(1 for result in results if result['success'])
         
         return {
             'pattern': 'parallel',
             'results': results,
-            'final_output': f"Parallel execution completed with {len(results)} agents"
+            'final_output': f"Parallel execution completed with {succeeded}/{len(results)} agents"
         }
 
     async def _execute_hierarchical(self, task: SwarmTask) -> Dict[str, Any]:
@@ -493,18 +520,21 @@ class SwarmCoordinator:
             # Fallback to sequential if no coordinator
             return await self._execute_sequential(task)
             
-        # Coordinator delegates subtasks to other agents
-        subordinates = [self.agents[key] for key in task.assigned_agents 
+        # Coordinator delegates subtasks to other agents, which work concurrently
+        subordinates = [key for key in task.assigned_agents 
                        if self.agents[key] != coordinator]
+        runs = await self.engine.run_round(
+            subordinates,
+            lambda key: self._agent_prompt(
+                self.agents[key], task, f"{coordinator.name} delegated this to you; report back concisely."
+            ),
+            quorum=task.quorum
+        )
         
         coordination_result = {
             'coordinator': coordinator.name,
-            'subordinate_results': []
+            'subordinate_results': [self._agent_result(run) for run in runs]
         }
-        
-        for agent in subordinates:
-            result = await self._simulate_agent_execution(agent, task)
-            coordination_result['subordinate_results'].append(result)
             
         return {
             'pattern': 'hierarchical',
@@ -514,26 +544,36 @@ class SwarmCoordinator:
 
     async def _execute_swarm_pattern(self, task: SwarmTask) -> Dict[str, Any]:
         """Execute task with self-organizing swarm intelligence"""
-        # Simulate emergent swarm behavior
         swarm_state = {
             'iteration': 0,
             'convergence': 0.0,
             'agent_interactions': []
         }
         
-        # Multiple iterations with agent interactions
+        # Agents run concurrently within an iteration; each iteration sees
+        # the previous iteration's contributions
+        previous: List[Dict[str, Any]] = []
         for iteration in range(3):
             swarm_state['iteration'] = iteration
-            iteration_results = []
+            interaction_factor = iteration * 0.1
+            shared = "\n".join(
+                f"- {result['agent']}: {result['output']}" for result in previous if result['success']
+            )
+            context = f"Other agents contributed so far:\n{shared}\nRefine or challenge these." if shared else ""
             
-            # Each agent contributes and influences others
-            for agent_key in task.assigned_agents:
-                agent = self.agents[agent_key]
-                result = await self._simulate_swarm_agent_execution(agent, task, swarm_state)
-                iteration_results.append(result)
+            runs = await self.engine.run_round(
+                task.assigned_agents,
+                lambda key: self._agent_prompt(self.agents[key], task, context),
+                quorum=task.quorum
+            )
+            iteration_results = [
+                self._agent_result(run, iteration=iteration, swarm_influence=interaction_factor)
+                for run in runs
+            ]
                 
             swarm_state['agent_interactions'].extend(iteration_results)
-            swarm_state['convergence'] += 0.33  # Simulate convergence
+            swarm_state['convergence'] += 0.33
+            previous = iteration_results
             
         return {
             'pattern': 'swarm',
@@ -541,34 +581,6 @@ class SwarmCoordinator:
             'final_output': f"Swarm intelligence convergence: {swarm_state['convergence']:.2f}"
         }
 
-    async def _simulate_agent_execution(self, agent: SwarmAgent, task: SwarmTask) -> Dict[str, Any]:
-        """Simulate individual agent execution (placeholder for real agent calls)"""
-        # In real implementation, this would call the actual agent
-        await asyncio.sleep(0.1)  # Simulate processing time
-        
-        return {
-            'agent': agent.name,
-            'role': agent.role.value,
-            'output': f"{agent.name} contributed expertise in {', '.join(agent.expertise_areas[:2])}",
-            'execution_time': 2.0 + (len(agent.tools) * 0.1),
-            'success': True
-        }
-
-    async def _simulate_swarm_agent_execution(self, agent: SwarmAgent, task: SwarmTask, swarm_state: Dict) -> Dict[str, Any]:
-        """Simulate agent execution in swarm context with interactions"""
-        await asyncio.sleep(0.05)
-        
-        # Agents influence each other in swarm pattern
-        interaction_factor = swarm_state['iteration'] * 0.1
-        
-        return {
-            'agent': agent.name,
-            'iteration': swarm_state['iteration'],
-            'output': f"{agent.name} swarm contribution with {interaction_factor:.2f} interaction factor",
-            'swarm_influence': interaction_factor,
-            'success': True
-        }
-
     async def _update_agent_metrics(self, task: SwarmTask, success: bool):
         """Update agent performance metrics based on task outcome"""
         for agent_key in task.assigned_agents:
@@ -609,6 +621,7 @@ class SwarmCoordinator:
                 'completed_tasks': len(completed_tasks),
                 'agent_utilization': agent_utilization,
                 'coordination_patterns': list(self.coordination_patterns.keys()),
+                'execution': self.engine.get_stats(),
                 'system_status': 'operational'
             }
             
@@ -0,0 +1,181 @@
+"""
+Swarm Execution Engine
+Runs swarm members concurrently behind a pluggable agent executor with
+per-agent timeouts and early termination once a quorum has answered
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+# (agent_key, prompt) -> agent output text
+AgentExecutor = Callable[[str, str], Awaitable[str]]
+
+
+class AssistantAgentExecutor:
+    """
+    Executor that answers with a real AutoGen AssistantAgent.
+
+    A fresh agent is built for every call so concurrent swarm members never
+    share conversation history. On timeout or early termination the run's
+    cancellation token is cancelled so the model call is abandoned.
+    """
+
+    def __init__(self, agent_factory: Optional[Callable[[str], Any]] = None):
+        self._agent_factory = agent_factory
+        self._model_client = None
+
+    def _build_agent(self, agent_key: str):
+        if self._agent_factory is not None:
+            return self._agent_factory(agent_key)
+
+        from .agent_loader import agent_loader
+        from ...core.ai_clients import get_autogen_client
+
+        if not agent_loader.agent_metadata:
+            agent_loader.scan_and_load_agents()
+        if self._model_client is None:
+            self._model_client = get_autogen_client()
+        return agent_loader.create_autogen_agent(agent_key, self._model_client)
+
+    async def __call__(self, agent_key: str, prompt: str) -> str:
+        from autogen_agentchat.messages import TextMessage
+        from autogen_core import CancellationToken
+
+        agent = self._build_agent(agent_key)
+        token = CancellationToken()
+        try:
+            response = await agent.on_messages(
+                [TextMessage(content=prompt, source="user")], token
+            )
+        except asyncio.CancelledError:
+            token.cancel()
+            raise
+        content = getattr(response.chat_message, "content", "")
+        return content if isinstance(content, str) else str(content)
+
+
+class SwarmExecutionEngine:
+    """
+    Concurrent fan-out of one swarm round.
+
+    At most ``max_concurrency`` agents run at once across all rounds of this
+    engine. Each agent gets ``agent_timeout`` seconds; a timeout or error is
+    reported as a failed result instead of failing the round. With a quorum
+    the round returns as soon as that many agents succeeded and the rest are
+    cancelled, so a round takes as long as its slowest needed member.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[AgentExecutor] = None,
+        max_concurrency: int = 8,
+        agent_timeout: float = 60.0
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.executor: AgentExecutor = executor or AssistantAgentExecutor()
+        self.max_concurrency = max_concurrency
+        self.agent_timeout = agent_timeout
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.stats = {
+            "rounds": 0,
+            "agent_runs": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+            "early_terminations": 0
+        }
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._slots
+
+    async def _run_agent(self, agent_key: str, prompt: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result: Dict[str, Any] = {"agent_key": agent_key, "success": False, "output": None}
+        async with self._semaphore():
+            try:
+                result["output"] = await asyncio.wait_for(
+                    self.executor(agent_key, prompt), timeout=self.agent_timeout
+                )
+                result["success"] = True
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                result["error"] = f"timed out after {self.agent_timeout:g}s"
+            except Exception as e:
+                self.stats["failures"] += 1
+                result["error"] = str(e)
+                logger.warning("Swarm agent failed", agent_key=agent_key, error=str(e))
+        result["execution_time"] = time.perf_counter() - started
+        self.stats["agent_runs"] += 1
+        return result
+
+    async def run_round(
+        self,
+        agent_keys: List[str],
+        prompt_for: Callable[[str], str],
+        quorum: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run every agent on its prompt concurrently.
+
+        Returns one result per finished agent in ``agent_keys`` order; agents
+        cancelled after the quorum was reached are returned with
+        ``cancelled=True``.
+        """
+        self.stats["rounds"] += 1
+        if not agent_keys:
+            return []
+
+        tasks = {
+            asyncio.create_task(self._run_agent(key, prompt_for(key))): key
+            for key in agent_keys
+        }
+        needed = len(tasks) if quorum is None else max(1, min(quorum, len(tasks)))
+        finished: Dict[str, Dict[str, Any]] = {}
+        succeeded = 0
+        pending = set(tasks)
+
+        try:
+            while pending and succeeded < needed:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    finished[tasks[task]] = result
+                    succeeded += result["success"]
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if pending:
+            self.stats["early_terminations"] += 1
+            self.stats["cancelled"] += len(pending)
+            for task in pending:
+                finished[tasks[task]] = {
+                    "agent_key": tasks[task],
+                    "success": False,
+                    "output": None,
+                    "cancelled": True,
+                    "execution_time": 0.0
+                }
+
+        return [finished[key] for key in agent_keys if key in finished]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Execution counters and limits"""
+        return {
+            **self.stats,
+            "max_concurrency": self.max_concurrency,
+            "agent_timeout": self.agent_timeout
+        }
+
+
+__all__ = ["AgentExecutor", "AssistantAgentExecutor", "SwarmExecutionEngine"]
@@ -14,6 +14,7 @@ from autogen_agentchat.messages import AgentMessage, TextMessage, ToolCallMessag
 from cost_tracker import CostTracker
 from ..utils.tracing import start_span
 from ..utils.config import get_settings
+from ...core.token_counter import StreamTokenCounter, TokenCounter, get_token_counter
 
 logger = structlog.get_logger()
 
@@ -188,9 +189,9 @@ class PerTurnTokenTracker:
             else:
                 timeline = self.timelines[conversation_id]
             
-            # Estimate tokens if not provided
+            # Count tokens if not provided
             if prompt_tokens is None or completion_tokens is None:
-                prompt_tokens, completion_tokens = self._estimate_tokens(message)
+                prompt_tokens, completion_tokens = self._estimate_tokens(message, model)
             
             total_tokens = prompt_tokens + completion_tokens
             
@@ -315,12 +316,24 @@ class PerTurnTokenTracker:
             timeline.peak_turn_tokens = turn_usage.total_tokens
             timeline.peak_turn_number = turn_usage.turn_number
     
-    def _estimate_tokens(self, message: AgentMessage) -> Tuple[int, int]:
-        """Estimate token counts from message"""
+    def _message_tokens(self, message: AgentMessage, counter: TokenCounter) -> int:
+        """Tokens of the message content as the model sees it"""
+        content = getattr(message, 'content', "")
+        if isinstance(content, str):
+            return counter.count(content)
+        
+        # Tool calls and results: count names, arguments and outputs, not their reprs
+        tokens = 0
+        for item in content if isinstance(content, list) else [content]:
+            fields = [getattr(item, attr) for attr in ("name", "arguments", "content")
+                      if isinstance(getattr(item, attr, None), str)]
+            tokens += sum(counter.count(value) for value in fields) if fields else counter.count(str(item))
+        return tokens
+    
+    def _estimate_tokens(self, message: AgentMessage, model: str = "gpt-4") -> Tuple[int, int]:
+        """Estimate prompt/completion token counts from message"""
         
-        # Rough estimation: 1 token ≈ 4 characters
-        content = str(message.content) if hasattr(message, 'content') else ""
-        content_tokens = len(content) // 4
+        content_tokens = self._message_tokens(message, get_token_counter(model))
         
         # Estimate based on message type
         if isinstance(message, ToolCallMessage):
@@ -338,6 +351,10 @@ class PerTurnTokenTracker:
         
         return max(1, prompt_tokens), max(1, completion_tokens)
     
+    def stream_counter(self, model: str = "gpt-4") -> StreamTokenCounter:
+        """Incremental completion token count for a streamed turn; pass ``.total`` to track_turn"""
+        return get_token_counter(model).stream()
+    
     def _calculate_cost(
         self,
         prompt_tokens: int,
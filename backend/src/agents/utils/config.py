@@ -183,6 +183,8 @@ class Settings(BaseSettings):
     prometheus_endpoint: str = Field(env="PROMETHEUS_ENDPOINT")
     metrics_enabled: bool = Field(default=True, env="METRICS_ENABLED")
     tracing_sample_rate: float = Field(default=0.1, env="TRACING_SAMPLE_RATE")
+    tracing_latency_threshold_ms: float = Field(default=2000.0, env="TRACING_LATENCY_THRESHOLD_MS")
+    tracing_low_overhead: bool = Field(default=False, env="TRACING_LOW_OVERHEAD")
     
     # Rate Limiting
     rate_limit_window_ms: int = Field(default=900000, env="RATE_LIMIT_WINDOW_MS")
@@ -416,6 +416,8 @@ async def orchestrate_agents(
         user_api_key = get_user_api_key(req, "openai")
         if user_api_key:
             context["user_api_key"] = user_api_key
+        # Identical concurrent requests from the same user share one run
+        context.setdefault("coalesce_route", "agents.orchestrate")
         
         # Execute orchestration
         result = await orchestrator.orchestrate(
@@ -5,8 +5,6 @@ Real-time analytics with performance metrics and KPIs
 
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
-import io
-import csv
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -18,6 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..core.database import get_db_session, get_read_db_session
 from ..core.redis import cache_get, cache_set
 from ..core.pagination import CursorPaginator, PaginationParams, PaginatedResponse
+from ..services.export_service import ExportService
 from ..models.user import User
 
 logger = structlog.get_logger()
@@ -240,7 +239,8 @@ async def get_paginated_activities(
             {},
             pagination,
             order_field="created_at",
-            order_desc=True
+            order_desc=True,
+            key_fields=["created_at", "id"]
         )
         
         # Execute query
@@ -266,14 +266,16 @@ async def get_paginated_activities(
 
 @router.post("/export")
 async def export_analytics_data(
-    format: str = Query("json", description="Export format: json, csv, xlsx"),
+    format: str = Query("json", description="Export format: json, csv, ndjson, xlsx"),
     time_range: str = Query("30d", description="Time range for export"),
+    dataset: str = Query("summary", description="Dataset: summary, activities"),
     db: AsyncSession = Depends(get_db_session)
 ):
     """
     📤 Export analytics data
     
-    Exports comprehensive analytics data in specified format
+    Exports comprehensive analytics data in specified format.
+    Row datasets (``activities``) are streamed from a server-side cursor.
     """
     
     try:
@@ -281,6 +283,9 @@ async def export_analytics_data(
         days = {"7d": 7, "30d": 30, "90d": 90}.get(time_range, 30)
         start_date = datetime.utcnow() - timedelta(days=days)
         
+        if dataset == "activities":
+            return _generate_activities_export(format, start_date)
+        
         # Gather export data
         export_data = {
             "export_timestamp": datetime.utcnow().isoformat(),
@@ -294,10 +299,16 @@ async def export_analytics_data(
         # Generate export based on format
         if format == "csv":
             return await _generate_csv_export(export_data)
+        elif format == "ndjson":
+            return ExportService.export_to_ndjson(
+                _iter_export_rows(export_data), "analytics_export.ndjson"
+            )
         elif format == "xlsx":
             return await _generate_xlsx_export(export_data)
         else:
             return export_data
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("❌ Failed to export analytics data", error=str(e))
         raise HTTPException(
@@ -450,65 +461,59 @@ def _flatten_for_csv(data: Dict[str, Any], prefix: str = "") -> List[List[str]]:
     return rows
 
 
-async def _generate_csv_export(export_data: Dict[str, Any]) -> StreamingResponse:
-    """Generate a simple two-column CSV (key,value) from export_data."""
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(["key", "value"])  # header
+def _iter_export_rows(export_data: Dict[str, Any]):
+    """Yield key/value rows for every leaf of export_data."""
     for section, content in export_data.items():
         if isinstance(content, dict):
-            for row in _flatten_for_csv(content, section):
-                writer.writerow(row)
+            for key, value in _flatten_for_csv(content, section):
+                yield {"key": key, "value": value}
         else:
-            writer.writerow([section, str(content)])
-    buffer.seek(0)
-    headers = {
-        "Content-Disposition": "attachment; filename=analytics_export.csv"
-    }
-    return StreamingResponse(buffer, media_type="text/csv", headers=headers)
+            yield {"key": section, "value": str(content)}
 
 
-async def _generate_xlsx_export(export_data: Dict[str, Any]):
-    """Generate a simple XLSX with one sheet per top-level section if openpyxl is available."""
-    try:
-        import openpyxl  # type: ignore
-    except Exception:
-        # Fallback when openpyxl is not installed
-        return {
-            "status": "not_implemented",
-            "message": "XLSX export requires openpyxl; not installed",
-        }
-    from openpyxl import Workbook  # type: ignore
-    from openpyxl.utils import get_column_letter  # type: ignore
-    wb = Workbook()
-    # Remove default sheet
-    default_ws = wb.active
-    wb.remove(default_ws)
-    # Create one sheet per top-level section
+async def _generate_csv_export(export_data: Dict[str, Any]) -> StreamingResponse:
+    """Generate a simple two-column CSV (key,value) from export_data."""
+    return ExportService.export_to_csv(
+        _iter_export_rows(export_data),
+        "analytics_export.csv",
+        fieldnames=["key", "value"],
+    )
+
+
+async def _generate_xlsx_export(export_data: Dict[str, Any]) -> StreamingResponse:
+    """Generate a write-only XLSX with one sheet per top-level section."""
+    sheets: Dict[str, Any] = {}
+    fieldnames: Dict[str, List[str]] = {}
     for section, content in export_data.items():
-        ws = wb.create_sheet(title=str(section)[:31] or "Sheet")
+        title = str(section)[:31] or "Sheet"
         if isinstance(content, dict):
-            rows = _flatten_for_csv(content)
-            ws.append(["key", "value"])  # header
-            for key, value in rows:
-                ws.append([key, value])
-            # Autosize columns (simple)
-            for col_idx in range(1, 3):
-                max_len = 0
-                for cell in ws[get_column_letter(col_idx)]:
-                    max_len = max(max_len, len(str(cell.value)) if cell.value else 0)
-                ws.column_dimensions[get_column_letter(col_idx)].width = min(max_len + 2, 80)
+            sheets[title] = [
+                {"key": key, "value": value} for key, value in _flatten_for_csv(content)
+            ]
+            fieldnames[title] = ["key", "value"]
         else:
-            ws.append(["value"])
-            ws.append([str(content)])
-    # Save to bytes
-    out = io.BytesIO()
-    wb.save(out)
-    out.seek(0)
-    headers = {
-        "Content-Disposition": "attachment; filename=analytics_export.xlsx"
-    }
-    return StreamingResponse(out, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers=headers)
+            sheets[title] = [{"value": str(content)}]
+            fieldnames[title] = ["value"]
+    return ExportService.export_sheets_to_excel(sheets, "analytics_export.xlsx", fieldnames)
+
+
+_ACTIVITIES_EXPORT_QUERY = """
+    SELECT id, engagement_id, title, description, created_at, updated_at
+    FROM activities
+    WHERE created_at >= :start_date
+    ORDER BY created_at, id
+"""
+
+
+def _generate_activities_export(format: str, start_date: datetime) -> StreamingResponse:
+    """Stream the activities table straight from a server-side cursor."""
+    rows = ExportService.stream_query_rows(_ACTIVITIES_EXPORT_QUERY, {"start_date": start_date})
+    fieldnames = ["id", "engagement_id", "title", "description", "created_at", "updated_at"]
+    if format == "csv":
+        return ExportService.export_to_csv(rows, "activities_export.csv", fieldnames=fieldnames)
+    if format == "xlsx":
+        return ExportService.export_to_excel(rows, "activities_export.xlsx", fieldnames=fieldnames)
+    return ExportService.export_to_ndjson(rows, "activities_export.ndjson")
 
 
 # end of file
\ No newline at end of file
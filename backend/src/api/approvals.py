@@ -33,10 +33,25 @@ async def get_approval_store() -> RedisApprovalStore:
         redis_client = await get_redis_client()
         _approval_store = RedisApprovalStore(redis_client)
         await _approval_store.initialize(settings.redis_url)
+        await _approval_store.start_deadline_worker()
     
     return _approval_store
 
 
+async def start_approval_deadlines() -> bool:
+    """Create the store at startup so pending deadlines fire without waiting for a request"""
+    if not get_settings().hitl_enabled:
+        return False
+    await get_approval_store()
+    return True
+
+
+async def stop_approval_deadlines():
+    """Stop firing approval and pause deadlines from this process"""
+    if _approval_store is not None:
+        await _approval_store.stop_deadline_worker()
+
+
 # Request/Response models
 class ApprovalCreateRequest(BaseModel):
     """Request model for creating approval"""
@@ -125,9 +140,10 @@ async def list_approvals(
     status: Optional[str] = Query(None, description="Filter by status"),
     user_id: Optional[str] = Query(None, description="Filter by user"),
     conversation_id: Optional[str] = Query(None, description="Filter by conversation"),
-    limit: int = Query(100, description="Maximum number of results")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of results"),
+    offset: int = Query(0, ge=0, description="Number of newest approvals to skip")
 ):
-    """List approvals with optional filters"""
+    """List approvals with optional filters, newest first"""
     try:
         store = await get_approval_store()
         
@@ -143,7 +159,8 @@ async def list_approvals(
             status=status_enum,
             user_id=user_id,
             conversation_id=conversation_id,
-            limit=limit
+            limit=limit,
+            offset=offset
         )
         
         return [
@@ -316,11 +333,12 @@ async def check_approval_timeouts():
     try:
         store = await get_approval_store()
         
-        await store.check_timeouts()
+        expired = await store.check_timeouts()
         
         return {
             "status": "success",
-            "message": "Timeout check completed"
+            "message": "Timeout check completed",
+            "expired": expired
         }
         
     except Exception as e:
@@ -352,11 +370,12 @@ async def get_approval_stats():
     try:
         store = await get_approval_store()
         
-        # Get counts by status
+        # Get counts by status straight from the indexes
         pending = await store.list_approvals(status=ApprovalStatus.PENDING)
-        approved = await store.list_approvals(status=ApprovalStatus.APPROVED, limit=1000)
-        denied = await store.list_approvals(status=ApprovalStatus.DENIED, limit=1000)
-        timeout = await store.list_approvals(status=ApprovalStatus.TIMEOUT, limit=1000)
+        total_pending = await store.count_approvals(ApprovalStatus.PENDING)
+        approved = await store.count_approvals(ApprovalStatus.APPROVED)
+        denied = await store.count_approvals(ApprovalStatus.DENIED)
+        timeout = await store.count_approvals(ApprovalStatus.TIMEOUT)
         
         # Calculate risk distribution for pending
         risk_distribution = {
@@ -370,12 +389,12 @@ async def get_approval_stats():
             risk_distribution[approval.risk_level.value] += 1
         
         return {
-            "total_pending": len(pending),
-            "total_approved": len(approved),
-            "total_denied": len(denied),
-            "total_timeout": len(timeout),
+            "total_pending": total_pending,
+            "total_approved": approved,
+            "total_denied": denied,
+            "total_timeout": timeout,
             "risk_distribution": risk_distribution,
-            "approval_rate": len(approved) / (len(approved) + len(denied)) if (len(approved) + len(denied)) > 0 else 0
+            "approval_rate": approved / (approved + denied) if (approved + denied) > 0 else 0
         }
         
     except Exception as e:
@@ -244,7 +244,7 @@ async def get_component_details(component_id: str):
             "serialization_format": component.serialization_format,
             "checksum": component.checksum,
             "metadata": component.metadata,
-            "size_bytes": len(component.serialized_data)
+            "size_bytes": component.size_bytes
         }
         
     except HTTPException:
@@ -9,16 +9,31 @@ from typing import Dict, Any
 
 import structlog
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.database import get_db_session, check_database_health
 from ..core.redis import get_redis_client
 from ..core.config import get_settings
 from ..core.monitoring import health_checker, HealthStatus
+from ..core.startup import get_startup_report
+from ..agents.services.event_bus import EventType, publish_change
 
 logger = structlog.get_logger()
 router = APIRouter(tags=["Health"])
 
+# Last overall status seen by a full health check
+_last_overall_status = None
+
+
+def _publish_status_transition(system_health):
+    """Tell subscribers when the overall status changes (not on every check)"""
+    global _last_overall_status
+    status = system_health.overall_status.value
+    if status != _last_overall_status:
+        publish_change(EventType.SYSTEM_HEALTH_CHANGED, "health_api", previous=_last_overall_status, status=status)
+        _last_overall_status = status
+
 
 @router.get("/")
 @router.get("")
@@ -37,10 +52,42 @@ async def basic_health():
         "service": "convergio-backend",
         "version": settings.app_version,
         "build": settings.build_number,
-        "environment": settings.environment
+        "environment": settings.environment,
+        "ready": get_startup_report().is_ready()
     }
 
 
+@router.get("/ready")
+async def readiness():
+    """
+    🚦 Readiness gate
+    
+    503 until startup has finished, including background agent
+    initialization in LAZY_STARTUP mode
+    """
+    report = get_startup_report()
+    ready = report.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "starting",
+            "pending": report.pending(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    )
+
+
+@router.get("/startup")
+async def startup_report():
+    """
+    ⏱️ Startup timing report
+    
+    Per-phase durations for imports, lifespan steps, background tasks and
+    lazily loaded routers
+    """
+    return get_startup_report().to_dict()
+
+
 @router.get("/detailed")
 async def detailed_health():
     """
@@ -49,6 +96,7 @@ async def detailed_health():
     Comprehensive system health including all dependencies using enhanced monitoring
     """
     system_health = await health_checker.check_all_health()
+    _publish_status_transition(system_health)
     return health_checker.get_health_summary(system_health)
 
 
@@ -60,6 +108,7 @@ async def comprehensive_health():
     Full system health check with detailed component information
     """
     system_health = await health_checker.check_all_health()
+    _publish_status_transition(system_health)
     
     # Convert to serializable format
     return {
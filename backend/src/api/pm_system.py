@@ -12,6 +12,7 @@ from uuid import UUID
 import json
 
 from ..core.database import get_db
+from ..core.pagination import CursorPaginator, PaginationParams
 from ..models.project import (
     Project, Epic, Task, Resource, TaskConversation, ProjectAnalytics,
     ProjectStatus, TaskStatus, TaskPriority, ResourceType,
@@ -93,40 +94,53 @@ async def create_project(
     }
 
 
-@router.get("/projects", response_model=List[Dict])
+@router.get("/projects", response_model=Dict)
 async def list_projects(
     status: Optional[ProjectStatus] = None,
-    limit: int = Query(100, le=1000),
-    offset: int = 0,
+    limit: int = Query(100, ge=1, le=200),
+    cursor: Optional[str] = None,
+    direction: str = Query("next", pattern="^(next|prev)$"),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all projects with optional filtering"""
+    """List all projects (newest first) with optional filtering, keyset-paginated"""
     query = select(Project)
     
     if status:
         query = query.where(Project.status == status)
     
-    query = query.offset(offset).limit(limit)
+    pagination = PaginationParams(limit=limit, cursor=cursor, direction=direction)
+    query = CursorPaginator.paginate_select(query, pagination, [Project.created_at, Project.id])
     result = await db.execute(query)
     projects = result.scalars().all()
     
-    return [
-        {
-            "id": str(p.id),
-            "name": p.name,
-            "description": p.description,
-            "status": p.status,
-            "priority": p.priority,
-            "progress_percentage": p.progress_percentage,
-            "health_score": p.health_score,
-            "start_date": p.start_date,
-            "end_date": p.end_date,
-            "budget": p.budget,
-            "actual_cost": p.actual_cost,
-            "created_at": p.created_at
-        }
-        for p in projects
-    ]
+    page = CursorPaginator.create_response(
+        [
+            {
+                "id": str(p.id),
+                "name": p.name,
+                "description": p.description,
+                "status": p.status,
+                "priority": p.priority,
+                "progress_percentage": p.progress_percentage,
+                "health_score": p.health_score,
+                "start_date": p.start_date,
+                "end_date": p.end_date,
+                "budget": p.budget,
+                "actual_cost": p.actual_cost,
+                "created_at": p.created_at
+            }
+            for p in projects
+        ],
+        pagination,
+        key_fields=["created_at", "id"]
+    )
+    
+    return {
+        "projects": page["items"],
+        "next_cursor": page["next_cursor"],
+        "prev_cursor": page["prev_cursor"],
+        "has_more": page["has_more"]
+    }
 
 
 # ===================== Task Endpoints =====================
@@ -16,8 +16,15 @@ from sqlalchemy.future import select
 from sqlalchemy import func, insert, select as sa_select, update, text
 
 from src.core.database import get_db_session
+from src.core.pagination import (
+    CursorPaginator,
+    PaginationParams,
+    cached_total_count,
+    estimate_total_count,
+)
 from src.models.engagement import Engagement
 from src.models.activity import Activity
+from src.agents.services.event_bus import EventType, publish_change
 
 router = APIRouter(tags=["projects"])
 
@@ -81,10 +88,11 @@ class ActivityResponse(BaseModel):
 
 class ActivitiesListResponse(BaseModel):
     activities: List[ActivityResponse]
-    total: int
-    skip: int
+    total: Optional[int] = None
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 class ActivityCreate(BaseModel):
@@ -112,17 +120,21 @@ class ActivitiesBatchUpdateRequest(BaseModel):
 # API Endpoints
 @router.get("/engagements", response_model=dict)
 async def get_engagements(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = fastapi.Query(100, ge=1, le=200),
+    cursor: Optional[str] = None,
+    direction: str = fastapi.Query("next", pattern="^(next|prev)$"),
     status_filter: Optional[str] = None,
     search: Optional[str] = None,
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db_session)
 ):
     """
     📋 Get all engagements/projects
     
-    Retrieves a paginated list of engagements with optional filtering
-    by status and search terms.
+    Retrieves a keyset-paginated list of engagements (newest first) with
+    optional filtering by status and search terms. Pass ``next_cursor``
+    back as ``cursor`` to fetch the following page. ``total`` is only
+    computed when ``include_total`` is set.
     """
     try:
         # Build query based on filters
@@ -134,28 +146,35 @@ async def get_engagements(
         if search:
             query = query.where(Engagement.title.ilike(f"%{search}%"))
         
-        # Add pagination and ordering
-        query = query.offset(skip).limit(limit).order_by(Engagement.created_at.desc())
-        
-        result = await db.execute(query)
-        engagements = result.scalars().all()
-        
-        # Get total count for pagination
-        count_query = select(func.count(Engagement.id))
-        if status_filter:
-            count_query = count_query.where(Engagement.status == status_filter)
-        if search:
-            count_query = count_query.where(Engagement.title.ilike(f"%{search}%"))
+        pagination = PaginationParams(limit=limit, cursor=cursor, direction=direction)
+        paged_query = CursorPaginator.paginate_select(
+            query, pagination, [Engagement.created_at, Engagement.id]
+        )
         
-        total_result = await db.execute(count_query)
-        total_count = total_result.scalar() or 0
+        result = await db.execute(paged_query)
+        engagements = [engagement.to_dict() for engagement in result.scalars().all()]
+        
+        total_count = None
+        if include_total:
+            if status_filter or search:
+                count_query = select(func.count()).select_from(query.subquery())
+                total_count = await cached_total_count(
+                    db, count_query, f"engagements:{status_filter}:{search}"
+                )
+            else:
+                total_count = await estimate_total_count(db, Engagement.__tablename__)
+        
+        page = CursorPaginator.create_response(
+            engagements, pagination, key_fields=["created_at", "id"], total_count=total_count
+        )
         
         return {
-            "engagements": [engagement.to_dict() for engagement in engagements],
-            "total": total_count,
-            "skip": skip,
+            "engagements": page["items"],
+            "total": page["total_count"],
             "limit": limit,
-            "has_more": skip + limit < total_count
+            "has_more": page["has_more"],
+            "next_cursor": page["next_cursor"],
+            "prev_cursor": page["prev_cursor"],
         }
         
     except Exception as e:
@@ -276,6 +295,7 @@ async def create_engagement(
         db.add(new_engagement)
         await db.commit()
         await db.refresh(new_engagement)
+        publish_change(EventType.PROJECT_CHANGED, "projects_api", engagement_id=new_engagement.id, change="created")
         
         return new_engagement.to_dict()
         
@@ -318,6 +338,7 @@ async def update_engagement(
         
         await db.commit()
         await db.refresh(engagement)
+        publish_change(EventType.PROJECT_CHANGED, "projects_api", engagement_id=engagement_id, change="updated")
         
         return engagement.to_dict()
         
@@ -351,6 +372,7 @@ async def delete_engagement(
         
         await db.delete(engagement)
         await db.commit()
+        publish_change(EventType.PROJECT_CHANGED, "projects_api", engagement_id=engagement_id, change="deleted")
         
         return {"message": f"Engagement {engagement_id} deleted successfully"}
         
@@ -477,15 +499,18 @@ async def get_clients(
 
 @router.get("/activities", response_model=ActivitiesListResponse, summary="List activities (optionally filtered by engagement)")
 async def get_activities(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = fastapi.Query(100, ge=1, le=200),
+    cursor: Optional[str] = None,
+    direction: str = fastapi.Query("next", pattern="^(next|prev)$"),
     engagement_id: Optional[int] = None,
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db_session)
 ):
     """
     📋 Get all activities
     
-    Returns activities, optionally filtered by engagement.
+    Returns keyset-paginated activities (newest first), optionally filtered
+    by engagement.
     """
     try:
         # Build query
@@ -494,26 +519,33 @@ async def get_activities(
         if engagement_id:
             query = query.where(Activity.engagement_id == engagement_id)
         
-        # Add pagination and ordering
-        query = query.offset(skip).limit(limit).order_by(Activity.created_at.desc())
+        pagination = PaginationParams(limit=limit, cursor=cursor, direction=direction)
+        paged_query = CursorPaginator.paginate_select(
+            query, pagination, [Activity.created_at, Activity.id]
+        )
         
-        result = await db.execute(query)
-        activities = result.scalars().all()
+        result = await db.execute(paged_query)
+        activities = [activity.to_dict() for activity in result.scalars().all()]
         
-        # Get total count
-        count_query = select(func.count(Activity.id))
-        if engagement_id:
-            count_query = count_query.where(Activity.engagement_id == engagement_id)
+        total_count = None
+        if include_total:
+            if engagement_id:
+                count_query = select(func.count(Activity.id)).where(Activity.engagement_id == engagement_id)
+                total_count = await cached_total_count(db, count_query, f"activities:{engagement_id}")
+            else:
+                total_count = await estimate_total_count(db, Activity.__tablename__)
         
-        total_result = await db.execute(count_query)
-        total_count = total_result.scalar() or 0
+        page = CursorPaginator.create_response(
+            activities, pagination, key_fields=["created_at", "id"], total_count=total_count
+        )
         
         return {
-            "activities": [activity.to_dict() for activity in activities],
-            "total": total_count,
-            "skip": skip,
+            "activities": page["items"],
+            "total": page["total_count"],
             "limit": limit,
-            "has_more": skip + limit < total_count,
+            "has_more": page["has_more"],
+            "next_cursor": page["next_cursor"],
+            "prev_cursor": page["prev_cursor"],
         }
         
     except Exception as e:
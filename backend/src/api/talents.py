@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.database import get_db_session
 from ..models.talent import Talent
+from ..agents.services.event_bus import EventType, publish_change
 
 logger = structlog.get_logger()
 router = APIRouter(tags=["Talent Management"])
@@ -170,6 +171,7 @@ async def create_talent(
         talent = await Talent.create(db, **request.dict())
         
         logger.info("✅ Talent created", talent_id=talent.id, username=request.username)
+        publish_change(EventType.TALENT_CHANGED, "talents_api", talent_id=talent.id, change="created")
         
         return TalentResponse(
             id=talent.id,
@@ -221,6 +223,7 @@ async def update_talent(
         await talent.update(db, request.dict(exclude_unset=True))
         
         logger.info("✅ Talent updated", talent_id=talent_id)
+        publish_change(EventType.TALENT_CHANGED, "talents_api", talent_id=talent_id, change="updated")
         
         return TalentResponse(
             id=talent.id,
@@ -272,6 +275,7 @@ async def delete_talent(
         await talent.save(db)
         
         logger.info("✅ Talent deactivated", talent_id=talent_id)
+        publish_change(EventType.TALENT_CHANGED, "talents_api", talent_id=talent_id, change="deactivated")
         
         return {"message": "Talent deactivated successfully"}
         
@@ -384,6 +388,7 @@ async def update_manager(
         await talent.save(db)
         
         logger.info("✅ Manager updated", talent_id=talent_id, manager_id=manager_id)
+        publish_change(EventType.TALENT_CHANGED, "talents_api", talent_id=talent_id, change="manager")
         
         return {"message": "Manager updated successfully"}
         
@@ -18,7 +18,9 @@ router = APIRouter(prefix="/api/v1/telemetry", tags=["telemetry"])
 async def get_telemetry_events(
     conversation_id: Optional[str] = Query(None, description="Filter by conversation ID"),
     user_id: Optional[str] = Query(None, description="Filter by user ID"),
+    agent_name: Optional[str] = Query(None, description="Filter by agent name"),
     event_type: Optional[str] = Query(None, description="Filter by event type"),
+    status: Optional[str] = Query(None, pattern="^(ok|error)$", description="Filter result events by outcome (e.g. failed tool calls)"),
     start_time: Optional[datetime] = Query(None, description="Start time for filtering"),
     end_time: Optional[datetime] = Query(None, description="End time for filtering"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of events to return")
@@ -38,8 +40,12 @@ async def get_telemetry_events(
             filters["conversation_id"] = conversation_id
         if user_id:
             filters["user_id"] = user_id
+        if agent_name:
+            filters["agent_name"] = agent_name
         if event_type:
             filters["event_type"] = event_type
+        if status:
+            filters["status"] = status
         if start_time:
             filters["start_time"] = start_time
         if end_time:
@@ -63,6 +69,7 @@ async def get_telemetry_events(
                 "user_id": event.get("user_id"),
                 "agent_name": event.get("agent_name"),
                 "turn_number": event.get("turn_number"),
+                "status": event.get("status"),
                 "data": event.get("data", {}),
                 "metadata": event.get("metadata", {})
             }
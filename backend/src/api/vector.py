@@ -17,6 +17,8 @@ import os
 
 from ..core.database import get_db_session
 from ..core.config import get_settings
+from ..core.pagination import CursorPaginator, PaginationParams, estimate_total_count
+from ..core.text_chunker import chunk_text_async, diff_chunks
 from ..models.document import Document, DocumentEmbedding
 from ..api.user_keys import get_user_api_key
 
@@ -57,16 +59,20 @@ class EmbeddingResponse(BaseModel):
 
 class DocumentIndexRequest(BaseModel):
     title: str
+    # Stable key of the source document; re-indexing it only re-embeds changed chunks
+    external_id: Optional[str] = None
     content: str
     metadata: Optional[Dict[str, Any]] = None
-    chunk_size: int = 1000
-    chunk_overlap: int = 200
+    chunk_tokens: int = 400
+    chunk_overlap_tokens: int = 50
 
 
 class DocumentIndexResponse(BaseModel):
     document_id: int
     chunks_created: int
     embeddings_generated: int
+    chunks_unchanged: int = 0
+    chunks_deleted: int = 0
     status: str
 
 
@@ -165,69 +171,80 @@ async def index_document(
     """
     
     try:
-        # Create document record
-        document = await Document.create(
-            db,
-            title=request.title,
-            content=request.content,
-            doc_metadata=request.metadata or {},
+        # Split document into chunks on its structure (off the event loop when large)
+        chunks = await chunk_text_async(
+            request.content,
+            target_tokens=request.chunk_tokens,
+            overlap_tokens=request.chunk_overlap_tokens
         )
         
-        # Split document into chunks
-        chunks = _split_text(
-            request.content, 
-            chunk_size=request.chunk_size,
-            chunk_overlap=request.chunk_overlap
-        )
+        # Re-indexing a known external_id updates the document in place
+        document = None
+        if request.external_id:
+            document = await Document.get_by_external_id(db, request.external_id)
+        
+        if document is None:
+            document = await Document.create(
+                db,
+                external_id=request.external_id,
+                title=request.title,
+                content=request.content,
+                doc_metadata=request.metadata or {},
+            )
+            stored = []
+        else:
+            document.title = request.title
+            document.content = request.content
+            document.doc_metadata = request.metadata or {}
+            await document.save(db)
+            stored = await DocumentEmbedding.get_stored_chunks(db, document.id)
         
-        embeddings_created = 0
+        # Only new or changed chunks need an embedding
+        plan = diff_chunks(stored, chunks)
+        embeddings = await _embed_texts([chunk.text for chunk in plan.embed], http_request)
         
-        # Generate embeddings for each chunk using real OpenAI
-        for i, chunk in enumerate(chunks):
-            try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        f"{OPENAI_API_URL}/embeddings",
-                        headers=_openai_headers(http_request),
-                        json={
-                            "input": chunk,
-                            "model": "text-embedding-ada-002"
-                        },
-                        timeout=30.0
-                    )
-                    
-                    if response.status_code != 200:
-                        raise Exception(f"OpenAI API error: {response.status_code}")
-                    
-                    data = response.json()
-                    embedding = data['data'][0]['embedding']
-                
-                # Store embedding in database
-                await DocumentEmbedding.create(
-                    db,
-                    document_id=document.id,
-                    chunk_index=i,
-                    chunk_text=chunk,
-                    embedding=embedding,
-                    embed_metadata={"chunk_size": len(chunk)}
-                )
-                
-                embeddings_created += 1
-                
-            except Exception as e:
-                logger.warning("⚠️ Failed to create embedding for chunk", 
-                             chunk_index=i, error=str(e))
+        embeddings_created = 0
+        for chunk, embedding in zip(plan.embed, embeddings):
+            if embedding is None:
+                continue  # missing chunks are embedded on the next re-index
+            await DocumentEmbedding.create(
+                db,
+                document_id=document.id,
+                chunk_index=chunk.index,
+                chunk_text=chunk.text,
+                content_hash=chunk.content_hash,
+                embedding=embedding,
+                embed_metadata={"chunk_size": len(chunk.text), **chunk.metadata()}
+            )
+            embeddings_created += 1
+        
+        # Unchanged chunks keep their vectors; only their position may have moved
+        await DocumentEmbedding.update_many(db, [
+            {
+                "id": row.id,
+                "chunk_index": chunk.index,
+                "embed_metadata": {"chunk_size": len(chunk.text), **chunk.metadata()},
+            }
+            for row, chunk in plan.keep
+        ])
+        # Superseded chunks leave the vector index
+        await DocumentEmbedding.delete_many(db, plan.delete)
         
         logger.info("✅ Document indexed", 
                    document_id=document.id,
+                   external_id=request.external_id,
                    chunks=len(chunks),
-                   embeddings=embeddings_created)
+                   embeddings=embeddings_created,
+                   unchanged=len(plan.keep),
+                   deleted=len(plan.delete))
         
         return DocumentIndexResponse(
             document_id=document.id,
             chunks_created=len(chunks),
             embeddings_generated=embeddings_created,
-            status="completed"
+            chunks_unchanged=len(plan.keep),
+            chunks_deleted=len(plan.delete),
+            status="completed" if embeddings_created == len(plan.embed) else "partial"
         )
         
     except Exception as e:
@@ -338,22 +355,25 @@ async def similarity_search(
 
 @router.get("/documents")
 async def list_documents(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
+    limit: int = Query(100, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Pagination cursor"),
+    direction: str = Query("next", pattern="^(next|prev)$"),
+    include_total: bool = Query(False, description="Include an approximate total count"),
     db: AsyncSession = Depends(get_db_session)
 ):
     """
     📚 List indexed documents
     
-    Returns paginated list of documents indexed by the user
+    Returns keyset-paginated list of documents, newest first
     """
     
     try:
-        documents = await Document.get_all(db, skip=skip, limit=limit)
-        total_count = await Document.count_total(db)
+        pagination = PaginationParams(limit=limit, cursor=cursor, direction=direction)
+        documents = await Document.get_page(db, pagination)
+        total_count = await estimate_total_count(db, Document.__tablename__) if include_total else None
         
-        return {
-            "documents": [
+        page = CursorPaginator.create_response(
+            [
                 {
                     "id": doc.id,
                     "title": doc.title,
@@ -364,9 +384,18 @@ async def list_documents(
                 }
                 for doc in documents
             ],
-            "total": total_count,
-            "skip": skip,
-            "limit": limit
+            pagination,
+            key_fields=["created_at", "id"],
+            total_count=total_count
+        )
+        
+        return {
+            "documents": page["items"],
+            "total": page["total_count"],
+            "limit": limit,
+            "has_more": page["has_more"],
+            "next_cursor": page["next_cursor"],
+            "prev_cursor": page["prev_cursor"]
         }
         
     except Exception as e:
@@ -484,51 +513,34 @@ async def get_vector_stats(
 
 
 # Helper functions
-def _split_text(
-    text: str, 
-    chunk_size: int = 1000, 
-    chunk_overlap: int = 200
-) -> List[str]:
-    """Split text into overlapping chunks"""
-    
-    if len(text) <= chunk_size:
-        return [text]
+async def _embed_texts(
+    texts: List[str],
+    http_request: Optional[Request],
+    model: str = "text-embedding-ada-002",
+    batch_size: int = 100
+) -> List[Optional[List[float]]]:
+    """Embed texts in batched requests; a failed batch leaves None for its texts"""
     
-    chunks = []
-    start = 0
+    embeddings: List[Optional[List[float]]] = [None] * len(texts)
+    if not texts:
+        return embeddings
     
-    while start < len(text):
-        # Find the end of the chunk
-        end = start + chunk_size
-        
-        if end >= len(text):
-            # Last chunk
-            chunks.append(text[start:])
-            break
-        
-        # Try to break at a sentence or word boundary
-        chunk = text[start:end]
-        
-        # Look for sentence boundaries
-        last_sentence = max(
-            chunk.rfind('. '),
-            chunk.rfind('! '),
-            chunk.rfind('? ')
-        )
-        
-        if last_sentence > chunk_size * 0.5:  # At least 50% of chunk size
-            end = start + last_sentence + 2
-        else:
-            # Look for word boundaries
-            last_space = chunk.rfind(' ')
-            if last_space > chunk_size * 0.5:
-                end = start + last_space
-        
-        chunks.append(text[start:end])
-        
-        # Move start position with overlap
-        start = end - chunk_overlap
-        if start < 0:
-            start = 0
+    async with httpx.AsyncClient() as client:
+        for offset in range(0, len(texts), batch_size):
+            batch = texts[offset:offset + batch_size]
+            try:
+                response = await client.post(
+                    f"{OPENAI_API_URL}/embeddings",
+                    headers=_openai_headers(http_request),
+                    json={"input": batch, "model": model},
+                    timeout=60.0
+                )
+                if response.status_code != 200:
+                    raise Exception(f"OpenAI API error: {response.status_code}")
+                for item in response.json()["data"]:
+                    embeddings[offset + item["index"]] = item["embedding"]
+            except Exception as e:
+                logger.warning("⚠️ Failed to create embeddings for chunk batch",
+                             first_chunk=offset, chunks=len(batch), error=str(e))
     
-    return chunks
\ No newline at end of file
+    return embeddings
@@ -4,8 +4,6 @@ Provides efficient access to AI models with proper headers, batch operations, ca
 """
 
 import os
-import json
-import hashlib
 import asyncio
 import logging
 from typing import List, Dict, Any, Optional, Union, AsyncGenerator, Tuple
@@ -23,14 +21,26 @@ from tenacity import (
 
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 
+try:
+    from .embedding_cache import EmbeddingCache
+except ImportError:  # imported as a top-level module alongside vector_utils
+    from embedding_cache import EmbeddingCache
+
 logger = structlog.get_logger()
 
+# Output dimension per embedding model; part of the embedding cache key
+EMBEDDING_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
 
 class AIClientManager:
     """
     Centralized manager for all AI client operations with:
     - Batch embedding support (100 texts per API call)
-    - Redis caching with 1-hour TTL
+    - Packed-vector Redis caching (1-hour TTL) behind an in-process LRU
     - Retry logic with exponential backoff
     - Connection pooling
     - Cost tracking
@@ -39,8 +49,10 @@ class AIClientManager:
     def __init__(self):
         self._clients = {}
         self._redis_client = None
+        self._embedding_redis_client = None
         self._http_client = None
         self._embedding_cache_ttl = 3600  # 1 hour
+        self._embedding_caches: Dict[str, EmbeddingCache] = {}
         self._initialize_clients()
         self._initialize_redis()
         self._cost_tracker = {
@@ -107,10 +119,17 @@ class AIClientManager:
                 decode_responses=True,
                 max_connections=50
             )
+            # Embedding vectors are stored as packed bytes, so they need a raw client
+            self._embedding_redis_client = redis.from_url(
+                redis_url,
+                decode_responses=False,
+                max_connections=50
+            )
             logger.info("✅ Redis cache initialized")
         except Exception as e:
             logger.warning(f"Redis initialization failed, caching disabled: {e}")
             self._redis_client = None
+            self._embedding_redis_client = None
     
     async def _get_http_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client with connection pooling"""
@@ -121,42 +140,30 @@ class AIClientManager:
             )
         return self._http_client
     
-    def _get_cache_key(self, text: str, model: str) -> str:
-        """Generate cache key for embedding"""
-        return f"embed:{model}:{hashlib.md5(text.encode()).hexdigest()}"
+    def _get_embedding_cache(self, model: str) -> EmbeddingCache:
+        """Get the embedding cache for a model (keys carry model and dimension)"""
+        cache = self._embedding_caches.get(model)
+        if cache is None:
+            cache = EmbeddingCache(
+                redis_client=self._embedding_redis_client,
+                model=model,
+                dimension=EMBEDDING_DIMENSIONS.get(model),
+                ttl=self._embedding_cache_ttl,
+            )
+            self._embedding_caches[model] = cache
+        return cache
     
-    async def _get_cached_embedding(self, text: str, model: str) -> Optional[List[float]]:
-        """Get embedding from cache if available"""
-        if not self._redis_client:
-            return None
-        
-        try:
-            key = self._get_cache_key(text, model)
-            cached = await self._redis_client.get(key)
-            if cached:
-                self._cost_tracker["cache_hits"] += 1
-                return json.loads(cached)
-            else:
-                self._cost_tracker["cache_misses"] += 1
-        except Exception as e:
-            logger.debug(f"Cache get failed: {e}")
-        
-        return None
+    async def _get_cached_embeddings(self, texts: List[str], model: str) -> List[Optional[List[float]]]:
+        """Look up a batch of embeddings with one LRU pass and one MGET"""
+        cached = await self._get_embedding_cache(model).get_many(texts)
+        hits = sum(1 for vector in cached if vector is not None)
+        self._cost_tracker["cache_hits"] += hits
+        self._cost_tracker["cache_misses"] += len(texts) - hits
+        return cached
     
-    async def _cache_embedding(self, text: str, model: str, embedding: List[float]):
-        """Cache embedding with TTL"""
-        if not self._redis_client:
-            return
-        
-        try:
-            key = self._get_cache_key(text, model)
-            await self._redis_client.setex(
-                key, 
-                self._embedding_cache_ttl,
-                json.dumps(embedding)
-            )
-        except Exception as e:
-            logger.debug(f"Cache set failed: {e}")
+    async def _cache_embeddings(self, texts: List[str], model: str, embeddings: List[List[float]]):
+        """Cache a batch of embeddings with a single pipeline"""
+        await self._get_embedding_cache(model).set_many(texts, embeddings)
     
     @retry(
         stop=stop_after_attempt(3),
@@ -241,11 +248,7 @@ class AIClientManager:
         
         # Step 1: Check cache for all texts
         if use_cache:
-            cache_tasks = [
-                self._get_cached_embedding(text, model) 
-                for text in texts
-            ]
-            cached_results = await asyncio.gather(*cache_tasks)
+            cached_results = await self._get_cached_embeddings(texts, model)
             
             for i, cached in enumerate(cached_results):
                 if cached:
@@ -277,23 +280,12 @@ class AIClientManager:
                     )
                     
                     # Store results and cache them
-                    cache_tasks = []
                     for i, embedding in enumerate(batch_embeddings):
-                        original_index = batch_indices[i]
-                        embeddings[original_index] = embedding
-                        
-                        if use_cache:
-                            cache_tasks.append(
-                                self._cache_embedding(
-                                    texts[original_index], 
-                                    model, 
-                                    embedding
-                                )
-                            )
+                        embeddings[batch_indices[i]] = embedding
                     
                     # Cache all embeddings from this batch
-                    if cache_tasks:
-                        await asyncio.gather(*cache_tasks)
+                    if use_cache:
+                        await self._cache_embeddings(batch_texts, model, batch_embeddings)
                     
                     # Small delay between batches to avoid rate limits
                     if batch_end < len(uncached_texts):
@@ -304,7 +296,7 @@ class AIClientManager:
                     # Fill with zeros as fallback
                     for idx in batch_indices:
                         if embeddings[idx] is None:
-                            embeddings[idx] = [0.0] * 1536  # Default dimension
+                            embeddings[idx] = [0.0] * EMBEDDING_DIMENSIONS.get(model, 1536)
         
         logger.info(
             f"✅ Embeddings complete - "
@@ -526,6 +518,8 @@ class AIClientManager:
             await self._http_client.aclose()
         if self._redis_client:
             await self._redis_client.close()
+        if self._embedding_redis_client:
+            await self._embedding_redis_client.close()
 
 
 # Singleton instance
@@ -295,6 +295,25 @@ class Settings(BaseSettings):
     # Max allowed cost per conversation in USD (test-friendly default)
     MAX_CONVERSATION_COST: float = Field(default=5.0, description="Maximum allowed cost per conversation (USD)")
     
+    # ================================
+    # 🏊 AGENT EXECUTION
+    # ================================
+    
+    RAG_LATENCY_BUDGET_MS: int = Field(default=1500, description="Milliseconds RAG context may take before a request proceeds without it")
+    
+    AGENT_TEAM_POOL_SIZE: int = Field(default=4, description="Maximum concurrent multi-agent team runs")
+    AGENT_TEAM_POOL_WARM: int = Field(default=1, description="Team instances pre-built at startup")
+    AGENT_INSTANCE_POOL_SIZE: int = Field(default=4, description="Maximum concurrent runs per single agent")
+    AGENT_POOL_ACQUIRE_TIMEOUT: float = Field(default=30.0, description="Seconds a request waits for a pooled team/agent")
+    
+    SEMANTIC_CACHE_THRESHOLD: float = Field(default=0.92, description="Default cosine similarity for a semantic cache hit")
+    SEMANTIC_CACHE_MAX_ENTRIES: int = Field(default=2000, description="Semantic cache entries kept per agent")
+    SEMANTIC_CACHE_TTL: int = Field(default=900, description="Seconds a semantic cache entry stays valid")
+    
+    EMBEDDING_MAX_BATCH_SIZE: int = Field(default=64, description="Maximum texts per local embedding encode call")
+    EMBEDDING_MAX_WAIT_MS: float = Field(default=5.0, description="Milliseconds an embedding request waits for batch-mates")
+    EMBEDDING_WORKERS: int = Field(default=1, description="Threads dedicated to the local embedding model")
+    
     # ================================
     # �🔧 FEATURE FLAGS
     # ================================
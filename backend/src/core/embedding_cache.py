@@ -0,0 +1,189 @@
+"""
+Unified Embedding Cache
+Packed float vectors in Redis (one MGET per lookup batch, one pipeline per
+write batch) behind a small in-process LRU for hot texts
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+_DTYPES = {"float32": np.float32, "float16": np.float16}
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache shared by API and local embedding providers.
+
+    Vectors are stored as raw little-endian float32 (or float16) bytes, about
+    a quarter of the size of their JSON text. Keys include the model name,
+    dimension and dtype, so switching models can never return a vector of the
+    wrong shape. The Redis client must be created with
+    ``decode_responses=False``.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        model: str = "default",
+        dimension: Optional[int] = None,
+        ttl: int = 3600,
+        dtype: str = "float32",
+        lru_size: int = 2048,
+        prefix: str = "embed:v2",
+    ):
+        """
+        Args:
+            redis_client: Async Redis client returning bytes, or None for LRU only
+            model: Embedding model name (part of the key)
+            dimension: Vector dimension (part of the key, checked on read)
+            ttl: Redis TTL in seconds
+            dtype: Storage precision, "float32" or "float16"
+            lru_size: Entries kept in the in-process tier (0 disables it)
+            prefix: Redis key prefix
+        """
+        if dtype not in _DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        self.redis = redis_client
+        self.model = model
+        self.dimension = dimension
+        self.ttl = ttl
+        self.dtype = dtype
+        self._np_dtype = np.dtype(_DTYPES[dtype]).newbyteorder("<")
+        self.lru_size = lru_size
+        self.prefix = prefix
+        self._lru: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "lru_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "errors": 0,
+        }
+
+    def key_for(self, text: str) -> str:
+        """Redis key for a text under this cache's model/dimension/dtype"""
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        return f"{self.prefix}:{self.model}:{self.dimension or 'auto'}:{self.dtype}:{digest}"
+
+    def pack(self, embedding: Sequence[float]) -> bytes:
+        """Serialize a vector to packed bytes"""
+        return np.asarray(embedding, dtype=self._np_dtype).tobytes()
+
+    def unpack(self, payload: bytes) -> Optional[List[float]]:
+        """Deserialize packed bytes; None if the payload has the wrong size"""
+        if not isinstance(payload, (bytes, bytearray, memoryview)):
+            return None
+        if len(payload) % self._np_dtype.itemsize:
+            return None
+        vector = np.frombuffer(payload, dtype=self._np_dtype)
+        if self.dimension and vector.shape[0] != self.dimension:
+            return None
+        return vector.astype(np.float32).tolist()
+
+    async def get(self, text: str) -> Optional[List[float]]:
+        """Look up a single text"""
+        return (await self.get_many([text]))[0]
+
+    async def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Look up texts in order: LRU first, then one MGET for the rest"""
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        keys = [self.key_for(text) for text in texts]
+
+        missing: List[Tuple[int, str]] = []
+        for i, key in enumerate(keys):
+            cached = self._lru_get(key)
+            if cached is not None:
+                results[i] = cached
+                self.stats["lru_hits"] += 1
+            else:
+                missing.append((i, key))
+
+        if missing and self.redis is not None:
+            try:
+                payloads = await self.redis.mget([key for _, key in missing])
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.debug(f"Embedding cache MGET failed: {e}")
+                payloads = [None] * len(missing)
+
+            still_missing = []
+            for (i, key), payload in zip(missing, payloads):
+                vector = self.unpack(payload) if payload is not None else None
+                if vector is None:
+                    still_missing.append((i, key))
+                    continue
+                results[i] = vector
+                self._lru_put(key, vector)
+                self.stats["redis_hits"] += 1
+            missing = still_missing
+
+        self.stats["misses"] += len(missing)
+        return results
+
+    async def set(self, text: str, embedding: Sequence[float]) -> None:
+        """Store a single vector"""
+        await self.set_many([text], [embedding])
+
+    async def set_many(self, texts: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """Store vectors in the LRU and in Redis with a single pipeline"""
+        if not texts:
+            return
+
+        entries = []
+        for text, embedding in zip(texts, embeddings):
+            if embedding is None:
+                continue
+            key = self.key_for(text)
+            self._lru_put(key, embedding)
+            entries.append((key, self.pack(embedding)))
+
+        if not entries or self.redis is None:
+            return
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, payload in entries:
+                pipe.setex(key, self.ttl, payload)
+            await pipe.execute()
+            self.stats["writes"] += len(entries)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.debug(f"Embedding cache pipeline write failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for both tiers"""
+        lookups = self.stats["lru_hits"] + self.stats["redis_hits"] + self.stats["misses"]
+        hits = self.stats["lru_hits"] + self.stats["redis_hits"]
+        return {
+            **self.stats,
+            "lru_entries": len(self._lru),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def clear_local(self) -> None:
+        """Drop the in-process tier"""
+        self._lru.clear()
+
+    def _lru_get(self, key: str) -> Optional[List[float]]:
+        if not self.lru_size:
+            return None
+        vector = self._lru.get(key)
+        if vector is None:
+            return None
+        self._lru.move_to_end(key)
+        # Callers own the returned list; keep the cached copy immutable
+        return list(vector)
+
+    def _lru_put(self, key: str, vector: List[float]) -> None:
+        if not self.lru_size:
+            return
+        self._lru[key] = list(vector)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
@@ -0,0 +1,273 @@
+"""
+Shared Micro-batching Embedding Service
+One local sentence-transformers model, one dedicated worker pool, and a
+batcher that merges concurrent embedding requests into a single encode call
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class _PendingEmbedding:
+    """A single text waiting to be encoded"""
+    text: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class EmbeddingService:
+    """
+    Micro-batching front end for the local embedding model.
+
+    Callers await ``embed``/``embed_many``; requests that arrive within
+    ``max_wait_ms`` of each other (up to ``max_batch_size`` texts) are encoded
+    together on a dedicated thread pool, so the event loop never runs the
+    model and concurrent chats share batches instead of queueing one by one.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        max_workers: int = 1,
+        model_loader=None,
+    ):
+        """
+        Args:
+            max_batch_size: Maximum texts per encode call
+            max_wait_ms: Maximum time a request waits for batch-mates
+            max_workers: Threads dedicated to running the model
+            model_loader: Callable returning a model with ``encode``;
+                defaults to the shared local sentence-transformers model
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_workers = max_workers
+        self._model_loader = model_loader
+        self.model = None
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque[_PendingEmbedding] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._batcher_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._inflight_batches = 0
+
+        self.stats: Dict[str, Any] = {
+            "requests": 0,
+            "texts": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "max_batch_size_seen": 0,
+            "max_queue_depth": 0,
+            "total_queue_wait_ms": 0.0,
+            "total_encode_ms": 0.0,
+            "batch_size_histogram": {},
+        }
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed a single text, sharing an encode batch with concurrent callers"""
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in order; large inputs are split across batches"""
+        if not texts:
+            return []
+
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+
+        futures = []
+        for text in texts:
+            pending = _PendingEmbedding(text=text, future=loop.create_future())
+            self._pending.append(pending)
+            futures.append(pending.future)
+
+        self.stats["requests"] += 1
+        self.stats["texts"] += len(texts)
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(self._pending))
+        self._wakeup.set()
+
+        return list(await asyncio.gather(*futures))
+
+    def get_model(self):
+        """Load (once) and return the shared model"""
+        if self.model is None:
+            loader = self._model_loader
+            if loader is None:
+                from .local_embeddings import get_local_model
+                loader = get_local_model
+            self.model = loader()
+            if self.model is None:
+                raise RuntimeError("Local embedding model is unavailable")
+        return self.model
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth and batching metrics"""
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "batch_size_histogram": dict(self.stats["batch_size_histogram"]),
+            "queue_depth": len(self._pending),
+            "inflight_batches": self._inflight_batches,
+            "avg_batch_size": self.stats["texts"] / batches if batches else 0.0,
+            "avg_queue_wait_ms": self.stats["total_queue_wait_ms"] / self.stats["texts"] if self.stats["texts"] else 0.0,
+            "avg_encode_ms": self.stats["total_encode_ms"] / batches if batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "workers": self.max_workers,
+        }
+
+    async def shutdown(self):
+        """Stop the batcher, let in-flight batches finish and release the worker pool"""
+        if self._batcher_task and not self._batcher_task.done():
+            self._batcher_task.cancel()
+            try:
+                await self._batcher_task
+            except asyncio.CancelledError:
+                pass
+        self._batcher_task = None
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        while self._pending:
+            pending = self._pending.popleft()
+            if not pending.future.done():
+                pending.future.cancel()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # ------------------------------------------------------------------ #
+    # Batching internals
+    # ------------------------------------------------------------------ #
+
+    def _ensure_started(self):
+        """Start the batcher on the running loop (restarted if the loop changed)"""
+        loop = asyncio.get_running_loop()
+        if self._batcher_task is not None and not self._batcher_task.done() and self._loop is loop:
+            return
+
+        if self._loop is not loop:
+            # Futures and tasks from a previous (closed) loop can never be resolved
+            self._pending.clear()
+            self._batch_tasks.clear()
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="embedding-worker",
+            )
+        self._batcher_task = loop.create_task(self._run_batcher())
+
+    async def _run_batcher(self):
+        """Collect pending texts into batches and dispatch them to the pool"""
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            # Give concurrent callers a few ms to join the batch
+            deadline = self._pending[0].enqueued_at + self.max_wait
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [
+                self._pending.popleft()
+                for _ in range(min(self.max_batch_size, len(self._pending)))
+            ]
+            # Drop requests whose caller has gone away
+            batch = [item for item in batch if not item.future.done()]
+            if batch:
+                # Keep a reference so the task is not collected mid-batch and shutdown can await it
+                task = asyncio.get_running_loop().create_task(self._encode_batch(batch))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+
+    async def _encode_batch(self, batch: List[_PendingEmbedding]):
+        """Encode one batch on the worker pool and resolve its futures"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        size = len(batch)
+        texts = [item.text for item in batch]
+
+        self._inflight_batches += 1
+        try:
+            vectors = await loop.run_in_executor(self._executor, self._encode_sync, texts)
+        except Exception as e:
+            self.stats["failed_batches"] += 1
+            logger.error(f"Embedding batch failed: {e}", batch_size=size)
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+        finally:
+            self._inflight_batches -= 1
+
+        finished = time.perf_counter()
+        self.stats["batches"] += 1
+        self.stats["max_batch_size_seen"] = max(self.stats["max_batch_size_seen"], size)
+        self.stats["total_encode_ms"] += (finished - started) * 1000.0
+        self.stats["total_queue_wait_ms"] += sum((started - item.enqueued_at) * 1000.0 for item in batch)
+        histogram = self.stats["batch_size_histogram"]
+        bucket = self._histogram_bucket(size)
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+
+        for item, vector in zip(batch, vectors):
+            if not item.future.done():
+                item.future.set_result(vector)
+
+    def _encode_sync(self, texts: List[str]) -> List[List[float]]:
+        """Run the model; executes on the dedicated worker pool"""
+        model = self.get_model()
+        return model.encode(texts, normalize_embeddings=True, batch_size=len(texts)).tolist()
+
+    @staticmethod
+    def _histogram_bucket(size: int) -> str:
+        """Power-of-two bucket label for batch sizes"""
+        upper = 1
+        while upper < size:
+            upper *= 2
+        return f"<={upper}"
+
+
+# Singleton instance
+_embedding_service: Optional[EmbeddingService] = None
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get or create the process-wide embedding service"""
+    global _embedding_service
+
+    if _embedding_service is None:
+        from .config import get_settings
+
+        settings = get_settings()
+        _embedding_service = EmbeddingService(
+            max_batch_size=settings.EMBEDDING_MAX_BATCH_SIZE,
+            max_wait_ms=settings.EMBEDDING_MAX_WAIT_MS,
+            max_workers=settings.EMBEDDING_WORKERS,
+        )
+
+    return _embedding_service
@@ -3,13 +3,17 @@ Local Embeddings with Sentence Transformers
 Provides fallback when OpenAI API is unavailable
 """
 
-import asyncio
-import hashlib
-import json
-from typing import List, Optional, Dict, Any
+from typing import List, Dict, Any
 import structlog
 import numpy as np
 
+try:
+    from .embedding_cache import EmbeddingCache
+    from .embedding_service import get_embedding_service
+except ImportError:  # imported as a top-level module alongside vector_utils
+    from embedding_cache import EmbeddingCache
+    from embedding_service import get_embedding_service
+
 logger = structlog.get_logger()
 
 # Lazy import to avoid loading model until needed
@@ -62,7 +66,8 @@ def get_local_model():
 class LocalEmbeddingProvider:
     """
     Local embedding provider using sentence-transformers
-    Serves as fallback when API providers are unavailable
+    Serves as fallback when API providers are unavailable.
+    Encoding is delegated to the shared micro-batching EmbeddingService.
     """
     
     def __init__(self, cache_client=None):
@@ -70,52 +75,23 @@ class LocalEmbeddingProvider:
         Initialize local embedding provider
         
         Args:
-            cache_client: Optional Redis client for caching
+            cache_client: Optional Redis client for caching (decode_responses=False)
         """
         self.cache_client = cache_client
         self.model = None
+        self.embedding_service = get_embedding_service()
+        self.model_name = "sentence-transformers/all-MiniLM-L6-v2"
         self.embedding_dim = 384  # For all-MiniLM-L6-v2
-        self._cache_prefix = "local_embed:"
-        
-    def _get_cache_key(self, text: str) -> str:
-        """Generate cache key for text"""
-        text_hash = hashlib.md5(text.encode()).hexdigest()
-        return f"{self._cache_prefix}{text_hash}"
-        
-    async def _get_from_cache(self, text: str) -> Optional[List[float]]:
-        """Get embedding from cache if available"""
-        if not self.cache_client:
-            return None
-            
-        try:
-            key = self._get_cache_key(text)
-            cached = await self.cache_client.get(key)
-            if cached:
-                return json.loads(cached)
-        except Exception as e:
-            logger.warning(f"Cache retrieval failed: {e}")
-        
-        return None
+        self.cache = EmbeddingCache(
+            redis_client=cache_client,
+            model=self.model_name,
+            dimension=self.embedding_dim,
+        )
         
-    async def _save_to_cache(self, text: str, embedding: List[float], ttl: int = 3600):
-        """Save embedding to cache"""
-        if not self.cache_client:
-            return
-            
-        try:
-            key = self._get_cache_key(text)
-            await self.cache_client.setex(
-                key,
-                ttl,
-                json.dumps(embedding)
-            )
-        except Exception as e:
-            logger.warning(f"Cache save failed: {e}")
-            
     def _ensure_model_loaded(self):
         """Ensure model is loaded"""
         if self.model is None:
-            self.model = get_local_model()
+            self.model = self.embedding_service.get_model()
             
     async def create_embedding(
         self,
@@ -134,26 +110,19 @@ class LocalEmbeddingProvider:
         """
         # Check cache first
         if use_cache:
-            cached = await self._get_from_cache(text)
+            cached = await self.cache.get(text)
             if cached:
                 logger.debug("Cache hit for local embedding")
                 return cached
                 
-        # Ensure model is loaded
-        self._ensure_model_loaded()
-        
         # Generate embedding
         try:
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            embedding = await loop.run_in_executor(
-                None,
-                lambda: self.model.encode(text, normalize_embeddings=True).tolist()
-            )
+            # Shares an encode batch with concurrent callers
+            embedding = await self.embedding_service.embed(text)
             
             # Cache the result
             if use_cache:
-                await self._save_to_cache(text, embedding)
+                await self.cache.set(text, embedding)
                 
             return embedding
             
@@ -172,7 +141,7 @@ class LocalEmbeddingProvider:
         
         Args:
             texts: List of texts to embed
-            batch_size: Batch size for processing
+            batch_size: Unused; batching is handled by the embedding service
             use_cache: Whether to use cache
             
         Returns:
@@ -181,28 +150,16 @@ class LocalEmbeddingProvider:
         if not texts:
             return []
             
-        # Ensure model is loaded
-        self._ensure_model_loaded()
-        
-        embeddings = []
-        
-        # Check cache for each text
-        texts_to_compute = []
-        cached_indices = []
-        
+        # One LRU/MGET pass for the whole batch
         if use_cache:
-            for i, text in enumerate(texts):
-                cached = await self._get_from_cache(text)
-                if cached:
-                    embeddings.append(cached)
-                    cached_indices.append(i)
-                else:
-                    texts_to_compute.append((i, text))
+            results = await self.cache.get_many(texts)
         else:
-            texts_to_compute = [(i, text) for i, text in enumerate(texts)]
+            results = [None] * len(texts)
+        
+        texts_to_compute = [(i, text) for i, text in enumerate(texts) if results[i] is None]
             
         logger.info(
-            f"Local embeddings: {len(cached_indices)} cached, "
+            f"Local embeddings: {len(texts) - len(texts_to_compute)} cached, "
             f"{len(texts_to_compute)} to compute"
         )
         
@@ -211,50 +168,22 @@ class LocalEmbeddingProvider:
             # Extract just the texts for encoding
             texts_only = [text for _, text in texts_to_compute]
             
-            # Process in batches
-            all_new_embeddings = []
-            for i in range(0, len(texts_only), batch_size):
-                batch = texts_only[i:i + batch_size]
-                
-                try:
-                    # Run in thread pool to avoid blocking
-                    loop = asyncio.get_event_loop()
-                    batch_embeddings = await loop.run_in_executor(
-                        None,
-                        lambda b=batch: self.model.encode(
-                            b,
-                            normalize_embeddings=True,
-                            batch_size=len(b)
-                        ).tolist()
-                    )
-                    all_new_embeddings.extend(batch_embeddings)
-                    
-                except Exception as e:
-                    logger.error(f"Batch embedding failed: {e}")
-                    raise
+            # The embedding service splits into batches of at most its max batch size
+            try:
+                all_new_embeddings = await self.embedding_service.embed_many(texts_only)
+            except Exception as e:
+                logger.error(f"Batch embedding failed: {e}")
+                raise
                     
-            # Cache new embeddings
+            # Cache new embeddings with a single pipeline
             if use_cache:
-                cache_tasks = []
-                for (orig_idx, text), embedding in zip(texts_to_compute, all_new_embeddings):
-                    cache_tasks.append(self._save_to_cache(text, embedding))
-                    
-                await asyncio.gather(*cache_tasks, return_exceptions=True)
+                await self.cache.set_many(texts_only, all_new_embeddings)
                 
-            # Combine cached and new embeddings in original order
-            result = [None] * len(texts)
-            
-            # Place cached embeddings
-            for i, cached_idx in enumerate(cached_indices):
-                result[cached_idx] = embeddings[i]
-                
-            # Place new embeddings
+            # Place new embeddings in original order
             for (orig_idx, _), embedding in zip(texts_to_compute, all_new_embeddings):
-                result[orig_idx] = embedding
+                results[orig_idx] = embedding
                 
-            return result
-        else:
-            return embeddings
+        return results
             
     def compute_similarity(
         self,
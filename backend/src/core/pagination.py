@@ -3,12 +3,14 @@ Cursor-based Pagination for Scalable APIs
 Implements keyset pagination for efficient large dataset navigation
 """
 
-from typing import Dict, Any, List, Optional, Tuple, TypeVar, Generic
+from typing import Dict, Any, List, Optional, Sequence, Tuple, TypeVar, Generic
 from datetime import datetime
 import base64
 import json
+import re
 import structlog
 from pydantic import BaseModel, Field
+from sqlalchemy import and_, false, or_, text, tuple_
 
 logger = structlog.get_logger()
 
@@ -101,15 +103,23 @@ class CursorPaginator:
     def build_where_clause(
         cursor_data: Dict[str, Any],
         direction: str = "next",
-        order_field: str = "id"
+        order_field: str = "id",
+        order_desc: bool = False,
+        key_fields: Optional[List[str]] = None
     ) -> Tuple[str, Dict[str, Any]]:
         """
         Build SQL WHERE clause for cursor-based pagination.
         
+        Compound cursors use a row-value comparison, e.g.
+        ``(created_at, id) < (:cursor_created_at, :cursor_id)``, which a
+        matching composite index can satisfy with a single range scan.
+        
         Args:
             cursor_data: Decoded cursor data
             direction: Pagination direction (next/prev)
             order_field: Field to order by
+            order_desc: Whether the listing is ordered descending
+            key_fields: Tie-breaker fields following order_field
             
         Returns:
             Tuple of (where_clause, params)
@@ -120,31 +130,47 @@ class CursorPaginator:
         if order_field not in cursor_data:
             return "", {}
         
-        cursor_value = cursor_data[order_field]
-        
-        if direction == "next":
-            where_clause = f"WHERE {order_field} > :cursor_value"
-        else:
-            where_clause = f"WHERE {order_field} < :cursor_value"
+        fields = [order_field] + [
+            field for field in (key_fields or list(cursor_data.keys()))
+            if field != order_field and field in cursor_data
+        ]
         
-        params = {"cursor_value": cursor_value}
+        # Walking backwards flips the comparison
+        descending = order_desc != (direction == "prev")
+        operator = "<" if descending else ">"
         
-        # Add compound cursor support for multiple fields
-        compound_fields = [f for f in cursor_data.keys() if f != order_field]
-        if compound_fields:
-            for field in compound_fields:
-                where_clause += f" AND {field} = :{field}"
-                params[field] = cursor_data[field]
+        if len(fields) == 1:
+            where_clause = f"WHERE {order_field} {operator} :cursor_value"
+            params = {"cursor_value": CursorPaginator._coerce_sql_value(order_field, cursor_data[order_field])}
+        else:
+            columns = ", ".join(fields)
+            placeholders = ", ".join(f":cursor_{field}" for field in fields)
+            where_clause = f"WHERE ({columns}) {operator} ({placeholders})"
+            params = {
+                f"cursor_{field}": CursorPaginator._coerce_sql_value(field, cursor_data[field])
+                for field in fields
+            }
         
         return where_clause, params
     
+    @staticmethod
+    def _coerce_sql_value(field: str, value: Any) -> Any:
+        """Restore timestamps that were serialized to strings in the cursor"""
+        if isinstance(value, str) and (field.endswith("_at") or field == "timestamp"):
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                return value
+        return value
+    
     @staticmethod
     def paginate_query(
         query: str,
         params: Dict[str, Any],
         pagination: PaginationParams,
         order_field: str = "id",
-        order_desc: bool = False
+        order_desc: bool = False,
+        key_fields: Optional[List[str]] = None
     ) -> Tuple[str, Dict[str, Any]]:
         """
         Apply pagination to a SQL query.
@@ -155,6 +181,7 @@ class CursorPaginator:
             pagination: Pagination parameters
             order_field: Field to order by
             order_desc: Whether to order descending
+            key_fields: Tie-breaker fields following order_field
             
         Returns:
             Tuple of (paginated_query, updated_params)
@@ -168,7 +195,9 @@ class CursorPaginator:
         where_clause, cursor_params = CursorPaginator.build_where_clause(
             cursor_data,
             pagination.direction,
-            order_field
+            order_field,
+            order_desc,
+            key_fields
         )
         
         # Merge parameters
@@ -177,23 +206,24 @@ class CursorPaginator:
         # Add WHERE clause to query
         if where_clause:
             # Check if query already has WHERE
-            if "WHERE" in query.upper():
-                query = query.replace("WHERE", f"{where_clause} AND", 1)
+            if re.search(r"\bWHERE\b", query, re.IGNORECASE):
+                query = re.sub(r"\bWHERE\b", f"{where_clause} AND", query, count=1, flags=re.IGNORECASE)
             else:
                 # Find insertion point (before ORDER BY if exists)
-                if "ORDER BY" in query.upper():
-                    parts = query.upper().split("ORDER BY")
+                parts = re.split(r"\bORDER\s+BY\b", query, maxsplit=1, flags=re.IGNORECASE)
+                if len(parts) == 2:
                     query = f"{parts[0]} {where_clause} ORDER BY {parts[1]}"
                 else:
                     query = f"{query} {where_clause}"
         
         # Add ORDER BY if not present
-        if "ORDER BY" not in query.upper():
+        if not re.search(r"\bORDER\s+BY\b", query, re.IGNORECASE):
             order_dir = "DESC" if order_desc else "ASC"
             if pagination.direction == "prev":
                 # Reverse order for previous page
                 order_dir = "ASC" if order_desc else "DESC"
-            query = f"{query} ORDER BY {order_field} {order_dir}"
+            order_fields = [order_field] + [f for f in (key_fields or []) if f != order_field]
+            query = f"{query} ORDER BY " + ", ".join(f"{field} {order_dir}" for field in order_fields)
         
         # Add LIMIT
         query = f"{query} LIMIT :limit"
@@ -201,6 +231,86 @@ class CursorPaginator:
         
         return query, params
     
+    @staticmethod
+    def paginate_select(
+        query,
+        pagination: PaginationParams,
+        key_columns: Sequence[Any],
+        order_desc: bool = True
+    ):
+        """
+        Apply keyset pagination to a SQLAlchemy ``select``.
+        
+        Every page is a range scan on the composite index over
+        ``key_columns`` (e.g. ``(created_at, id)``), so page N costs the same
+        as page 1. The last column must be unique.
+        
+        Args:
+            query: Select statement with filters already applied
+            pagination: Pagination parameters
+            key_columns: Ordered key columns, unique tie-breaker last
+            order_desc: Whether to order descending
+            
+        Returns:
+            Paginated select fetching ``limit + 1`` rows
+        """
+        descending = order_desc != (pagination.direction == "prev")
+        
+        cursor_data = CursorPaginator.decode_cursor(pagination.cursor) if pagination.cursor else {}
+        if cursor_data and all(col.key in cursor_data for col in key_columns):
+            values = [
+                CursorPaginator._coerce_column_value(col, cursor_data[col.key])
+                for col in key_columns
+            ]
+            query = query.where(CursorPaginator._keyset_predicate(key_columns, values, descending))
+        
+        # Default NULL ordering keeps both directions servable by one plain index
+        ordering = [col.desc() if descending else col.asc() for col in key_columns]
+        
+        return query.order_by(*ordering).limit(pagination.limit + 1)
+    
+    @staticmethod
+    def _keyset_predicate(key_columns: Sequence[Any], values: List[Any], descending: bool):
+        """Build the "rows after cursor" condition for paginate_select"""
+        head_col, tail_cols = key_columns[0], list(key_columns[1:])
+        head_val, tail_vals = values[0], values[1:]
+        
+        def _after(cols, vals):
+            if len(cols) == 1:
+                return cols[0] < vals[0] if descending else cols[0] > vals[0]
+            return tuple_(*cols) < tuple_(*vals) if descending else tuple_(*cols) > tuple_(*vals)
+        
+        nullable = getattr(getattr(head_col, "expression", head_col), "nullable", False)
+        
+        # PostgreSQL sorts NULL above every value: first when descending, last when ascending
+        if head_val is None:
+            # Cursor sits inside the NULL block of a nullable leading key
+            in_null_block = and_(head_col.is_(None), _after(tail_cols, tail_vals)) if tail_cols else false()
+            return or_(in_null_block, head_col.isnot(None)) if descending else in_null_block
+        
+        predicate = _after(list(key_columns), values)
+        if nullable and not descending:
+            predicate = or_(predicate, head_col.is_(None))
+        return predicate
+    
+    @staticmethod
+    def _coerce_column_value(column: Any, value: Any) -> Any:
+        """Convert a JSON cursor value back to the column's Python type"""
+        if value is None:
+            return None
+        try:
+            python_type = column.type.python_type
+        except (AttributeError, NotImplementedError):
+            return value
+        if isinstance(value, python_type):
+            return value
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        try:
+            return python_type(value)
+        except (TypeError, ValueError):
+            return value
+    
     @staticmethod
     def create_response(
         items: List[Dict[str, Any]],
@@ -226,6 +336,10 @@ class CursorPaginator:
         if has_more:
             items = items[:pagination.limit]
         
+        # Backward pages are fetched in reverse order
+        if pagination.direction == "prev":
+            items = list(reversed(items))
+        
         # Create cursors
         next_cursor = None
         prev_cursor = None
@@ -254,6 +368,68 @@ class CursorPaginator:
         }
 
 
+async def estimate_total_count(db, table_name: str) -> Optional[int]:
+    """
+    Approximate row count from planner statistics (``pg_class.reltuples``).
+    
+    Constant-time alternative to ``COUNT(*)`` for unfiltered listings.
+    Returns None when the table has never been analyzed or the database
+    is not PostgreSQL.
+    
+    Args:
+        db: Async database session
+        table_name: Table to estimate
+        
+    Returns:
+        Estimated row count or None
+    """
+    try:
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": table_name}
+        )
+        estimate = result.scalar()
+    except Exception as e:
+        logger.warning(f"Failed to estimate row count for {table_name}: {e}")
+        return None
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+async def cached_total_count(db, count_query, cache_key: str, ttl: int = 60) -> int:
+    """
+    Exact ``COUNT(*)`` for filtered listings, cached so it is paid once per ttl.
+    
+    Args:
+        db: Async database session
+        count_query: Select statement returning a single count
+        cache_key: Redis key identifying the filter combination
+        ttl: Cache lifetime in seconds
+        
+    Returns:
+        Row count
+    """
+    from .redis import cache_get, cache_set
+    
+    key = f"pagination:count:{cache_key}"
+    try:
+        cached = await cache_get(key)
+        if cached is not None:
+            return int(cached)
+    except Exception:
+        cached = None
+    
+    result = await db.execute(count_query)
+    total = result.scalar() or 0
+    
+    try:
+        await cache_set(key, total, ttl=ttl)
+    except Exception:
+        pass
+    return total
+
+
 class OffsetPaginator:
     """
     Traditional offset-based pagination.
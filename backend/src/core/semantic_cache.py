@@ -0,0 +1,407 @@
+"""
+Semantic Response Cache
+Agent responses looked up by nearest-neighbour similarity of the query
+embedding, shared across processes through Redis and invalidated by
+data-freshness tags
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+# Syncs re-read this many seconds of the log to tolerate clock skew between writers
+_SYNC_OVERLAP = 5.0
+
+
+@dataclass
+class _CachedResponse:
+    entry_id: str
+    message: str
+    response: str
+    tags: Dict[str, int]  # freshness tag -> version when the response was cached
+    created: float
+    last_used: float
+
+
+class _AgentIndex:
+    """One agent's cached responses with their unit vectors in a growable matrix"""
+
+    def __init__(self):
+        self.vectors: Optional[np.ndarray] = None
+        self.entries: List[_CachedResponse] = []
+        self.rows: Dict[str, int] = {}
+        self.synced_at = float("-inf")
+        self.sync_score = 0.0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, entry: _CachedResponse, vector: np.ndarray):
+        if entry.entry_id in self.rows:
+            return
+        if self.vectors is None or self.vectors.shape[1] != vector.shape[0]:
+            # First entry, or the embedding model changed
+            self.vectors = np.zeros((64, vector.shape[0]), dtype=np.float32)
+            self.entries, self.rows = [], {}
+        elif len(self.entries) == self.vectors.shape[0]:
+            grown = np.zeros((self.vectors.shape[0] * 2, self.vectors.shape[1]), dtype=np.float32)
+            grown[:len(self.entries)] = self.vectors
+            self.vectors = grown
+        self.vectors[len(self.entries)] = vector
+        self.rows[entry.entry_id] = len(self.entries)
+        self.entries.append(entry)
+
+    def remove(self, entry_id: str):
+        row = self.rows.pop(entry_id, None)
+        if row is None:
+            return
+        last = len(self.entries) - 1
+        if row != last:
+            # Move the last entry into the freed row
+            moved = self.entries[last]
+            self.entries[row] = moved
+            self.vectors[row] = self.vectors[last]
+            self.rows[moved.entry_id] = row
+        self.entries.pop()
+
+    def search(self, vector: np.ndarray, threshold: float, limit: int = 4) -> List[tuple]:
+        """(similarity, entry) pairs at or above the threshold, most similar first"""
+        if not self.entries or self.vectors.shape[1] != vector.shape[0]:
+            return []
+        similarities = self.vectors[:len(self.entries)] @ vector
+        rows = np.flatnonzero(similarities >= threshold)
+        rows = rows[np.argsort(-similarities[rows])[:limit]]
+        return [(float(similarities[row]), self.entries[row]) for row in rows]
+
+    def least_recently_used(self) -> _CachedResponse:
+        return min(self.entries, key=lambda entry: entry.last_used)
+
+
+def _unit(vector: Iterable[float]) -> Optional[np.ndarray]:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array)) if array.size else 0.0
+    return array / norm if norm else None
+
+
+class SemanticResponseCache:
+    """
+    Nearest-neighbour response cache, one index per agent.
+
+    Each process searches an in-memory matrix of unit vectors; entries
+    written by other processes are pulled from Redis at most every
+    ``sync_interval`` seconds (one ZRANGEBYSCORE on the agent's log plus one
+    pipeline for the new entries). Entries carry the versions of their
+    freshness tags; ``invalidate(tag)`` bumps the version, so a hit whose
+    tags moved on is discarded. Each agent keeps at most ``max_entries``,
+    evicting the least recently used. The Redis client must be created with
+    ``decode_responses=False``.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        embed: Optional[Callable[[str], Awaitable[List[float]]]] = None,
+        default_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        agent_thresholds: Optional[Dict[str, float]] = None,
+        max_entries: int = 2000,
+        ttl: int = 900,
+        sync_interval: float = 1.0,
+        embedding_timeout_ms: float = 200.0,
+        prefix: str = "semcache:v1",
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            redis_client: Async Redis client returning bytes, or None for a process-local cache
+            embed: Coroutine function embedding a text; defaults to the shared embedding service
+            default_threshold: Minimum cosine similarity for a hit
+            agent_thresholds: Per-agent overrides of the threshold
+            max_entries: Entries kept per agent
+            ttl: Seconds a response stays valid
+            sync_interval: Minimum seconds between pulls of other processes' entries
+            embedding_timeout_ms: Lookups give up (miss) when embedding takes longer
+            prefix: Redis key prefix
+        """
+        self.redis = redis_client
+        self._embed = embed
+        self.default_threshold = default_threshold
+        self.agent_thresholds = dict(agent_thresholds or {})
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self.embedding_timeout = embedding_timeout_ms / 1000.0
+        self.prefix = prefix
+        self.clock = clock
+        self._indexes: Dict[str, _AgentIndex] = {}
+        self._local_tag_versions: Dict[str, int] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self.errors = 0
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def threshold_for(self, agent_id: str) -> float:
+        return self.agent_thresholds.get(agent_id, self.default_threshold)
+
+    def set_threshold(self, agent_id: str, threshold: float):
+        self.agent_thresholds[agent_id] = threshold
+
+    async def get(self, message: str, agent_id: str) -> Optional[str]:
+        """Cached response to a sufficiently similar message, or None"""
+        stats = self._agent_stats(agent_id)
+        stats["lookups"] += 1
+
+        vector = await self._embed_text(message)
+        if vector is None:
+            stats["misses"] += 1
+            return None
+
+        await self._sync(agent_id)
+        index = self._index(agent_id)
+        now = self.clock()
+        for similarity, entry in index.search(vector, self.threshold_for(agent_id)):
+            if now - entry.created > self.ttl:
+                index.remove(entry.entry_id)
+                continue
+            if entry.tags:
+                current = await self._tag_versions(entry.tags)
+                if current is None:
+                    continue  # freshness cannot be confirmed
+                if current != entry.tags:
+                    stats["stale"] += 1
+                    await self._discard(agent_id, entry.entry_id)
+                    continue
+
+            entry.last_used = now
+            stats["hits"] += 1
+            stats["similarity_total"] += similarity
+            logger.info("🎯 Semantic cache hit", agent=agent_id, similarity=round(similarity, 3),
+                        message_preview=message[:50])
+            return entry.response
+
+        stats["misses"] += 1
+        return None
+
+    async def put(self, message: str, agent_id: str, response: str, tags: Iterable[str] = ()):
+        """Cache a response, tagged with the data it depends on"""
+        vector = await self._embed_text(message)
+        if vector is None:
+            return
+
+        tag_versions = await self._tag_versions(sorted(set(tags)))
+        if tag_versions is None:
+            return
+        now = self.clock()
+        entry = _CachedResponse(
+            entry_id=uuid.uuid4().hex,
+            message=message,
+            response=response,
+            tags=tag_versions,
+            created=now,
+            last_used=now,
+        )
+        self._add(agent_id, entry, vector)
+        self._agent_stats(agent_id)["writes"] += 1
+
+        if self.redis is None:
+            return
+        key = self._entry_key(agent_id, entry.entry_id)
+        log_key = self._log_key(agent_id)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hset(key, mapping={
+                "message": message,
+                "response": response,
+                "embedding": vector.astype("<f4").tobytes(),
+                "tags": json.dumps(entry.tags),
+                "created": repr(now),
+            })
+            pipe.expire(key, self.ttl)
+            pipe.zadd(log_key, {entry.entry_id: now})
+            pipe.zremrangebyscore(log_key, "-inf", now - self.ttl)
+            pipe.zremrangebyrank(log_key, 0, -(self.max_entries + 1))
+            pipe.expire(log_key, self.ttl)
+            await pipe.execute()
+        except Exception as e:
+            self.errors += 1
+            logger.debug(f"Semantic cache write failed: {e}")
+
+    async def invalidate(self, tag: str):
+        """Mark every response cached under ``tag`` as stale"""
+        self._local_tag_versions[tag] = self._local_tag_versions.get(tag, 0) + 1
+        if self.redis is not None:
+            try:
+                await self.redis.incr(self._tag_key(tag))
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Semantic cache invalidation failed", tag=tag, error=str(e))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rates and entry counts per agent"""
+        agents = {}
+        for agent_id, stats in self.stats.items():
+            lookups = stats["lookups"]
+            agents[agent_id] = {
+                **{name: int(value) for name, value in stats.items() if name != "similarity_total"},
+                "entries": len(self._indexes.get(agent_id, ())),
+                "threshold": self.threshold_for(agent_id),
+                "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+                "avg_hit_similarity": stats["similarity_total"] / stats["hits"] if stats["hits"] else None,
+            }
+        return {"agents": agents, "errors": self.errors, "shared": self.redis is not None}
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _entry_key(self, agent_id: str, entry_id: str) -> str:
+        return f"{self.prefix}:{agent_id}:entry:{entry_id}"
+
+    def _log_key(self, agent_id: str) -> str:
+        return f"{self.prefix}:{agent_id}:log"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    def _index(self, agent_id: str) -> _AgentIndex:
+        index = self._indexes.get(agent_id)
+        if index is None:
+            index = self._indexes[agent_id] = _AgentIndex()
+        return index
+
+    def _agent_stats(self, agent_id: str) -> Dict[str, float]:
+        stats = self.stats.get(agent_id)
+        if stats is None:
+            stats = self.stats[agent_id] = {
+                "lookups": 0, "hits": 0, "misses": 0, "stale": 0, "writes": 0, "evictions": 0,
+                "similarity_total": 0.0,
+            }
+        return stats
+
+    def _add(self, agent_id: str, entry: _CachedResponse, vector: np.ndarray):
+        index = self._index(agent_id)
+        index.add(entry, vector)
+        while len(index) > self.max_entries:
+            index.remove(index.least_recently_used().entry_id)
+            self._agent_stats(agent_id)["evictions"] += 1
+
+    async def _embed_text(self, text: str) -> Optional[np.ndarray]:
+        embed = self._embed
+        if embed is None:
+            from .embedding_service import get_embedding_service
+            embed = get_embedding_service().embed
+        try:
+            return _unit(await asyncio.wait_for(embed(text.strip()), timeout=self.embedding_timeout))
+        except Exception as e:
+            logger.debug("Semantic cache embedding unavailable", error=str(e))
+            return None
+
+    async def _tag_versions(self, tags: Iterable[str]) -> Optional[Dict[str, int]]:
+        """Current versions of the given tags; None if Redis cannot be read"""
+        names = list(tags)
+        if not names:
+            return {}
+        if self.redis is None:
+            return {tag: self._local_tag_versions.get(tag, 0) for tag in names}
+        try:
+            values = await self.redis.mget([self._tag_key(tag) for tag in names])
+        except Exception as e:
+            self.errors += 1
+            logger.debug(f"Semantic cache tag lookup failed: {e}")
+            return None
+        return {tag: int(value) if value is not None else 0 for tag, value in zip(names, values)}
+
+    async def _discard(self, agent_id: str, entry_id: str):
+        self._index(agent_id).remove(entry_id)
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.delete(self._entry_key(agent_id, entry_id))
+                pipe.zrem(self._log_key(agent_id), entry_id)
+                await pipe.execute()
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Semantic cache discard failed: {e}")
+
+    async def _sync(self, agent_id: str):
+        """Pull entries other processes cached since the last sync"""
+        index = self._index(agent_id)
+        now = self.clock()
+        if self.redis is None or now - index.synced_at < self.sync_interval:
+            return
+        index.synced_at = now
+
+        try:
+            logged = await self.redis.zrangebyscore(
+                self._log_key(agent_id), max(index.sync_score, now - self.ttl), "+inf", withscores=True
+            )
+            logged = [(member.decode() if isinstance(member, bytes) else member, score) for member, score in logged]
+            if logged:
+                index.sync_score = max(score for _, score in logged) - _SYNC_OVERLAP
+            new = [(entry_id, score) for entry_id, score in logged if entry_id not in index.rows]
+            if not new:
+                return
+            pipe = self.redis.pipeline(transaction=False)
+            for entry_id, _ in new:
+                pipe.hgetall(self._entry_key(agent_id, entry_id))
+            payloads = await pipe.execute()
+        except Exception as e:
+            self.errors += 1
+            logger.debug(f"Semantic cache sync failed: {e}")
+            return
+
+        for (entry_id, _), payload in zip(new, payloads):
+            if not payload:
+                continue  # expired or discarded since it was logged
+            payload = {(k.decode() if isinstance(k, bytes) else k): v for k, v in payload.items()}
+            vector = np.frombuffer(payload["embedding"], dtype="<f4").astype(np.float32)
+            created = float(payload["created"])
+            self._add(agent_id, _CachedResponse(
+                entry_id=entry_id,
+                message=payload["message"].decode("utf-8"),
+                response=payload["response"].decode("utf-8"),
+                tags=json.loads(payload["tags"]),
+                created=created,
+                last_used=created,
+            ), vector)
+
+
+# Singleton instance
+_semantic_cache: Optional[SemanticResponseCache] = None
+
+
+def get_semantic_cache() -> SemanticResponseCache:
+    """Get or create the process-wide semantic response cache"""
+    global _semantic_cache
+
+    if _semantic_cache is None:
+        from .config import get_settings
+
+        settings = get_settings()
+        redis_client = None
+        try:
+            import redis.asyncio as redis
+            redis_client = redis.from_url(settings.REDIS_URL, decode_responses=False)
+        except Exception as e:
+            logger.warning(f"Semantic cache running without Redis: {e}")
+        _semantic_cache = SemanticResponseCache(
+            redis_client=redis_client,
+            default_threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+            ttl=settings.SEMANTIC_CACHE_TTL,
+        )
+
+    return _semantic_cache
+
+
+__all__ = ["DEFAULT_SIMILARITY_THRESHOLD", "SemanticResponseCache", "get_semantic_cache"]
@@ -0,0 +1,309 @@
+"""
+Startup Timing & Readiness
+Per-phase startup timing report, background initialization tasks with a
+readiness gate, and lazy API router loading for fast cold starts
+"""
+
+import asyncio
+import importlib
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Captured as early as possible: main.py imports this module before any router
+_PROCESS_STARTED = time.perf_counter()
+
+
+def lazy_startup_enabled() -> bool:
+    """Whether LAZY_STARTUP mode (deferred routers, background agents) is on"""
+    return os.getenv("LAZY_STARTUP", "false").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class StartupPhase:
+    """A timed startup step"""
+    name: str
+    started_ms: float
+    duration_ms: Optional[float] = None
+    status: str = "running"
+    background: bool = False
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "started_ms": round(self.started_ms, 2),
+            "duration_ms": round(self.duration_ms, 2) if self.duration_ms is not None else None,
+            "status": self.status,
+            "background": self.background,
+            "error": self.error,
+        }
+
+
+class StartupReport:
+    """
+    Records how long each startup phase took and which background
+    components must finish before the instance reports ready.
+
+    Phase offsets are measured from process import time, so the report shows
+    both the module import cost and the lifespan steps.
+    """
+
+    def __init__(self):
+        self.phases: List[StartupPhase] = []
+        self._required: Dict[str, StartupPhase] = {}
+        self._tasks: List[asyncio.Task] = []
+        self.serving_at_ms: Optional[float] = None
+        self.ready_at_ms: Optional[float] = None
+
+    @staticmethod
+    def now_ms() -> float:
+        """Milliseconds since the startup clock started"""
+        return (time.perf_counter() - _PROCESS_STARTED) * 1000.0
+
+    def record(self, name: str, started_ms: float, status: str = "ok", error: Optional[str] = None) -> StartupPhase:
+        """Record an already completed phase"""
+        phase = StartupPhase(name=name, started_ms=started_ms)
+        phase.duration_ms = self.now_ms() - started_ms
+        phase.status = status
+        phase.error = error
+        self.phases.append(phase)
+        return phase
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a synchronous or awaited block; failures are recorded and re-raised"""
+        phase = StartupPhase(name=name, started_ms=self.now_ms())
+        self.phases.append(phase)
+        try:
+            yield phase
+        except BaseException as e:
+            phase.status = "failed"
+            phase.error = str(e)
+            raise
+        else:
+            if phase.status == "running":
+                phase.status = "ok"
+        finally:
+            phase.duration_ms = self.now_ms() - phase.started_ms
+
+    def run_in_background(
+        self,
+        name: str,
+        factory: Callable[[], Awaitable[Any]],
+        required: bool = True,
+    ) -> asyncio.Task:
+        """Run a startup step as a task; required steps gate readiness"""
+        phase = StartupPhase(name=name, started_ms=self.now_ms(), background=True)
+        self.phases.append(phase)
+        if required:
+            self._required[name] = phase
+
+        async def runner():
+            try:
+                await factory()
+                phase.status = "ok"
+            except asyncio.CancelledError:
+                phase.status = "cancelled"
+                raise
+            except Exception as e:
+                phase.status = "failed"
+                phase.error = str(e)
+                logger.warning(f"⚠️ Background startup step '{name}' failed: {e}")
+            finally:
+                phase.duration_ms = self.now_ms() - phase.started_ms
+                self._check_ready()
+
+        task = asyncio.get_running_loop().create_task(runner(), name=f"startup:{name}")
+        self._tasks.append(task)
+        return task
+
+    def mark_serving(self) -> None:
+        """Lifespan startup finished; the server accepts requests from now on"""
+        self.serving_at_ms = self.now_ms()
+        self._check_ready()
+
+    def is_ready(self) -> bool:
+        """Serving and every required background step has settled"""
+        return self.serving_at_ms is not None and all(
+            phase.status != "running" for phase in self._required.values()
+        )
+
+    def _check_ready(self) -> None:
+        if self.ready_at_ms is None and self.is_ready():
+            self.ready_at_ms = self.now_ms()
+            logger.info("✅ Instance ready", ready_ms=round(self.ready_at_ms, 1))
+
+    def pending(self) -> List[str]:
+        """Required background steps that are still running"""
+        return [name for name, phase in self._required.items() if phase.status == "running"]
+
+    async def shutdown(self) -> None:
+        """Cancel background steps that are still running"""
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.is_ready(),
+            "pending": self.pending(),
+            "serving_ms": round(self.serving_at_ms, 2) if self.serving_at_ms is not None else None,
+            "ready_ms": round(self.ready_at_ms, 2) if self.ready_at_ms is not None else None,
+            "lazy_startup": lazy_startup_enabled(),
+            "phases": [phase.to_dict() for phase in self.phases],
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+
+@dataclass
+class _DeferredRouter:
+    """An API router registered by module path, imported on first use"""
+    module: str
+    prefix: str
+    tags: List[str]
+    route_prefix: str
+    loaded: bool = False
+    error: Optional[str] = None
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+class LazyRouterLoader:
+    """
+    Registers API routers by module path and includes them on demand.
+
+    In eager mode every router is imported and included immediately, in the
+    order registered. In lazy mode a router is imported the first time a
+    request hits its URL prefix (or the OpenAPI schema is requested), and a
+    background warm-up imports the rest off the event loop after startup.
+    Routers sharing a prefix are always included together, in registration
+    order, so route precedence matches eager mode.
+    """
+
+    def __init__(self, app, package: str, lazy: bool, report: Optional[StartupReport] = None):
+        self.app = app
+        self.package = package
+        self.lazy = lazy
+        self.report = report
+        self._routers: List[_DeferredRouter] = []
+        self._lock: Optional[asyncio.Lock] = None
+
+    def register(
+        self,
+        module: str,
+        prefix: str = "",
+        tags: Optional[List[str]] = None,
+        route_prefix: Optional[str] = None,
+        eager: bool = False,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            module: Module path relative to the app package (e.g. ".api.talents")
+            prefix: Prefix passed to include_router
+            tags: OpenAPI tags
+            route_prefix: URL prefix that triggers loading; defaults to
+                ``prefix`` (set it when the router declares its own prefix)
+            eager: Import immediately even in lazy mode
+        """
+        entry = _DeferredRouter(
+            module=module,
+            prefix=prefix,
+            tags=tags or [],
+            route_prefix=(route_prefix if route_prefix is not None else prefix).rstrip("/"),
+            kwargs=kwargs,
+        )
+        self._routers.append(entry)
+        if eager or not self.lazy:
+            self._include(entry, importlib.import_module(module, self.package))
+
+    def _include(self, entry: _DeferredRouter, module) -> None:
+        started_ms = self.report.now_ms() if self.report else 0.0
+        self.app.include_router(module.router, prefix=entry.prefix, tags=entry.tags, **entry.kwargs)
+        entry.loaded = True
+        # FastAPI caches the schema on first build
+        self.app.openapi_schema = None
+        if self.report and self.lazy:
+            self.report.record(f"router:{entry.module}", started_ms)
+
+    def _matches(self, entry: _DeferredRouter, path: str) -> bool:
+        prefix = entry.route_prefix
+        return bool(prefix) and (path == prefix or path.startswith(prefix + "/"))
+
+    def pending_for(self, path: str) -> List[_DeferredRouter]:
+        """Unloaded routers whose URL prefix matches the path"""
+        prefixes = {entry.route_prefix for entry in self._routers if self._matches(entry, path)}
+        return [
+            entry for entry in self._routers
+            if entry.route_prefix in prefixes and not entry.loaded and entry.error is None
+        ]
+
+    def pending(self) -> List[_DeferredRouter]:
+        return [entry for entry in self._routers if not entry.loaded and entry.error is None]
+
+    async def load(self, entries: List[_DeferredRouter]) -> None:
+        """Import modules off the event loop, then include them in registration order"""
+        if not entries:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            for entry in entries:
+                if entry.loaded or entry.error is not None:
+                    continue
+                started_ms = self.report.now_ms() if self.report else 0.0
+                try:
+                    module = await asyncio.to_thread(importlib.import_module, entry.module, self.package)
+                except Exception as e:
+                    entry.error = str(e)
+                    logger.error(f"❌ Failed to load router {entry.module}: {e}")
+                    if self.report:
+                        self.report.record(f"router:{entry.module}", started_ms, status="failed", error=str(e))
+                    continue
+                self._include(entry, module)
+
+    async def load_all(self) -> None:
+        await self.load(self.pending())
+
+    def middleware(self, openapi_url: Optional[str]):
+        """ASGI middleware class that loads routers before dispatching to them"""
+        loader = self
+
+        class LazyRouterMiddleware:
+            def __init__(self, app):
+                self.app = app
+
+            async def __call__(self, scope, receive, send):
+                if scope["type"] in ("http", "websocket") and loader.pending():
+                    path = scope.get("path", "")
+                    if openapi_url and path == openapi_url:
+                        await loader.load_all()
+                    else:
+                        await loader.load(loader.pending_for(path))
+                await self.app(scope, receive, send)
+
+        return LazyRouterMiddleware
+
+
+# Singleton instance
+_startup_report: Optional[StartupReport] = None
+
+
+def get_startup_report() -> StartupReport:
+    """Get or create the process-wide startup report"""
+    global _startup_report
+
+    if _startup_report is None:
+        _startup_report = StartupReport()
+
+    return _startup_report
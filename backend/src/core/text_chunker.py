@@ -0,0 +1,278 @@
+"""
+Structure-aware Text Chunking
+Documents are segmented on headings, paragraphs, fenced code, tables and
+sentences, then packed into chunks of a target token size with token-level
+overlap; every chunk carries its byte span and a content hash, so
+re-indexing can diff chunks against the stored ones
+"""
+
+import asyncio
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .token_counter import TokenCounter, get_token_counter
+
+# Documents longer than this are chunked in a worker thread
+THREAD_THRESHOLD_CHARS = 20_000
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_TABLE_ROW = re.compile(r"^\s*\|")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=\S)")
+_WORD_END = re.compile(r"\s+(?=\S)")
+
+# Block kinds split on line boundaries rather than sentences
+_LINE_BLOCKS = ("code", "table")
+
+
+@dataclass
+class Chunk:
+    """A span of the source document"""
+    index: int
+    text: str
+    byte_start: int
+    byte_end: int
+    token_count: int
+    content_hash: str
+    heading: Optional[str] = None
+
+    def metadata(self) -> dict:
+        return {
+            "byte_start": self.byte_start,
+            "byte_end": self.byte_end,
+            "token_count": self.token_count,
+            "content_hash": self.content_hash,
+            "heading": self.heading,
+        }
+
+
+@dataclass
+class _Unit:
+    start: int
+    end: int
+    tokens: int
+    heading: bool = False
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _blocks(text: str) -> List[Tuple[str, int, int]]:
+    """(kind, start, end) character spans of headings, paragraphs, code and tables"""
+    blocks = []
+    lines = text.splitlines(keepends=True)
+    pos = 0
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        start = pos
+        if not line.strip():
+            pos += len(line)
+            i += 1
+            continue
+
+        if _HEADING.match(line):
+            kind, count = "heading", 1
+        elif _FENCE.match(line):
+            fence = _FENCE.match(line).group(1)
+            count = 1
+            while i + count < len(lines):
+                count += 1
+                if lines[i + count - 1].strip().startswith(fence):
+                    break
+            kind = "code"
+        else:
+            is_row = bool(_TABLE_ROW.match(line))
+            count = 1
+            while i + count < len(lines):
+                following = lines[i + count]
+                if (not following.strip() or _HEADING.match(following) or _FENCE.match(following)
+                        or bool(_TABLE_ROW.match(following)) != is_row):
+                    break
+                count += 1
+            kind = "table" if is_row else "paragraph"
+
+        for line in lines[i:i + count]:
+            pos += len(line)
+        i += count
+        blocks.append((kind, start, len(text[start:pos].rstrip()) + start))
+    return blocks
+
+
+def _pieces(text: str, start: int, end: int, pattern) -> List[Tuple[int, int]]:
+    """Split a span after each match of ``pattern``, keeping the separators out"""
+    pieces = []
+    piece_start = start
+    for match in pattern.finditer(text, start, end):
+        pieces.append((piece_start, match.start()))
+        piece_start = match.end()
+    pieces.append((piece_start, end))
+    return [(a, b) for a, b in pieces if b > a]
+
+
+def _line_pieces(text: str, start: int, end: int) -> List[Tuple[int, int]]:
+    pieces = []
+    for match in re.finditer(r"[^\n]*\n?", text[start:end]):
+        if match.group().strip():
+            pieces.append((start + match.start(), start + match.end()))
+    return pieces
+
+
+def _units(text: str, counter: TokenCounter, max_tokens: int) -> List[_Unit]:
+    """Blocks, broken into sentences/lines (then words) only where they exceed ``max_tokens``"""
+    units = []
+    for kind, start, end in _blocks(text):
+        tokens = counter.count(text[start:end])
+        if tokens <= max_tokens:
+            units.append(_Unit(start, end, tokens, heading=kind == "heading"))
+            continue
+
+        if kind in _LINE_BLOCKS:
+            pieces = _line_pieces(text, start, end)
+        else:
+            pieces = _pieces(text, start, end, _SENTENCE_END)
+        for piece_start, piece_end in pieces:
+            piece_tokens = counter.count(text[piece_start:piece_end])
+            if piece_tokens <= max_tokens:
+                units.append(_Unit(piece_start, piece_end, piece_tokens))
+                continue
+            for word_start, word_end in _pieces(text, piece_start, piece_end, _WORD_END):
+                units.append(_Unit(word_start, word_end, counter.count(text[word_start:word_end])))
+    return units
+
+
+def chunk_text(
+    text: str,
+    target_tokens: int = 400,
+    overlap_tokens: int = 50,
+    counter: Optional[TokenCounter] = None,
+) -> List[Chunk]:
+    """
+    Split ``text`` into chunks of about ``target_tokens``.
+
+    Headings, paragraphs, fenced code blocks and tables are kept whole when
+    they fit; larger blocks break at sentences (code and tables at lines).
+    A chunk never continues past a heading, so an edit re-chunks only its
+    own section and the other chunks keep their hashes. Consecutive chunks
+    in a section share up to ``overlap_tokens`` of whole trailing units.
+    """
+    counter = counter or get_token_counter()
+    if not text.strip():
+        return []
+
+    units = _units(text, counter, target_tokens)
+    chunks: List[Chunk] = []
+    heading: Optional[str] = None
+    cursor = (0, 0)  # (char, byte) position of the last chunk start
+
+    def emit(members: List[_Unit]):
+        nonlocal cursor
+        start, end = members[0].start, members[-1].end
+        char, byte = cursor
+        byte_start = byte + len(text[char:start].encode("utf-8"))
+        cursor = (start, byte_start)
+        body = text[start:end]
+        chunks.append(Chunk(
+            index=len(chunks),
+            text=body,
+            byte_start=byte_start,
+            byte_end=byte_start + len(body.encode("utf-8")),
+            token_count=counter.count(body),
+            content_hash=content_hash(body),
+            heading=heading,
+        ))
+
+    current: List[_Unit] = []
+    current_tokens = 0
+    for unit in units:
+        if unit.heading:
+            # Consecutive headings stay together with the section they introduce
+            if current and not all(u.heading for u in current):
+                emit(current)
+                current, current_tokens = [], 0
+            heading = _HEADING.match(text[unit.start:unit.end]).group(2)
+        elif current and current_tokens + unit.tokens > target_tokens and not all(u.heading for u in current):
+            emit(current)
+            # Carry whole trailing units into the next chunk as overlap
+            carried, carried_tokens = [], 0
+            for previous in reversed(current):
+                if previous.heading or carried_tokens + previous.tokens > overlap_tokens:
+                    break
+                carried.insert(0, previous)
+                carried_tokens += previous.tokens
+            if carried_tokens + unit.tokens > target_tokens:
+                carried, carried_tokens = [], 0
+            current, current_tokens = carried, carried_tokens
+        current.append(unit)
+        current_tokens += unit.tokens
+    if current:
+        emit(current)
+    return chunks
+
+
+async def chunk_text_async(
+    text: str,
+    target_tokens: int = 400,
+    overlap_tokens: int = 50,
+    counter: Optional[TokenCounter] = None,
+) -> List[Chunk]:
+    """``chunk_text`` that moves large documents off the event loop"""
+    if len(text) < THREAD_THRESHOLD_CHARS:
+        return chunk_text(text, target_tokens, overlap_tokens, counter)
+    return await asyncio.to_thread(chunk_text, text, target_tokens, overlap_tokens, counter)
+
+
+@dataclass
+class StoredChunk:
+    """An already embedded chunk, as read back for diffing"""
+    id: int
+    chunk_index: int
+    content_hash: Optional[str]
+
+
+@dataclass
+class ReindexPlan:
+    """What re-indexing a document has to do"""
+    keep: List[Tuple[StoredChunk, Chunk]]  # unchanged content, possibly at a new position
+    embed: List[Chunk]  # new or changed content
+    delete: List[int]  # ids of stored chunks no longer in the document
+
+
+def diff_chunks(stored: Sequence[StoredChunk], chunks: Sequence[Chunk]) -> ReindexPlan:
+    """
+    Match new chunks to stored ones by content hash.
+
+    Repeated content (e.g. boilerplate paragraphs) matches stored rows one
+    for one, so a duplicated chunk is embedded once more only when the
+    document gained a copy.
+    """
+    by_hash: Dict[str, List[StoredChunk]] = {}
+    for row in sorted(stored, key=lambda row: row.chunk_index):
+        if row.content_hash:
+            by_hash.setdefault(row.content_hash, []).append(row)
+
+    keep, embed = [], []
+    for chunk in chunks:
+        rows = by_hash.get(chunk.content_hash)
+        if rows:
+            keep.append((rows.pop(0), chunk))
+        else:
+            embed.append(chunk)
+
+    kept = {row.id for row, _ in keep}
+    return ReindexPlan(keep=keep, embed=embed, delete=[row.id for row in stored if row.id not in kept])
+
+
+__all__ = [
+    "Chunk",
+    "ReindexPlan",
+    "StoredChunk",
+    "THREAD_THRESHOLD_CHARS",
+    "chunk_text",
+    "chunk_text_async",
+    "content_hash",
+    "diff_chunks",
+]
@@ -0,0 +1,189 @@
+"""
+Token Counting with the model's BPE vocabulary
+tiktoken encodings loaded from a local vocabulary file (never downloaded at
+runtime), an LRU of counts by content hash, and incremental stream counting
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import structlog
+
+try:
+    import tiktoken
+    from tiktoken.load import load_tiktoken_bpe
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+# Populated by scripts/fetch_tokenizer.py (setup, CI and the image build)
+DEFAULT_VOCAB_DIR = Path(__file__).resolve().parents[2] / "data" / "tokenizers"
+
+# Definitions of the encodings we ship; matches tiktoken_ext.openai_public
+_ENCODINGS = {
+    "cl100k_base": {
+        "sha256": "223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7",
+        "pat_str": r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+| ?[^\s\p{L}\p{N}]++[\r\n]*+|\s++$|\s*[\r\n]|\s+(?!\S)|\s""",
+        "special_tokens": {
+            "<|endoftext|>": 100257,
+            "<|fim_prefix|>": 100258,
+            "<|fim_middle|>": 100259,
+            "<|fim_suffix|>": 100260,
+            "<|endofprompt|>": 100276,
+        },
+    },
+}
+
+# Claude models have no public vocabulary; cl100k_base is the closest available
+MODEL_ENCODINGS = {
+    "gpt-4": "cl100k_base",
+    "gpt-4-turbo": "cl100k_base",
+    "gpt-3.5-turbo": "cl100k_base",
+    "claude": "cl100k_base",
+}
+
+# Texts shorter than this are encoded directly; hashing them saves nothing
+_MIN_CACHED_CHARS = 64
+# An unbroken stream tail (no whitespace) is committed once it gets this long
+_MAX_STREAM_TAIL = 2048
+
+
+def encoding_for_model(model: str) -> str:
+    for prefix, encoding in MODEL_ENCODINGS.items():
+        if model.startswith(prefix):
+            return encoding
+    return "cl100k_base"
+
+
+class TokenCounter:
+    """
+    Counts tokens for one encoding.
+
+    Counts of repeated texts (system prompts, RAG blocks) are served from an
+    LRU keyed by a BLAKE2 digest of the text. When the vocabulary file is
+    missing, counts fall back to the 4-characters-per-token estimate and
+    ``exact`` is False.
+    """
+
+    def __init__(self, encoding_name: str = "cl100k_base", vocab_dir: Optional[str] = None, cache_size: int = 4096):
+        self.encoding_name = encoding_name
+        self.vocab_dir = Path(vocab_dir or os.getenv("TOKENIZER_VOCAB_DIR", DEFAULT_VOCAB_DIR))
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"counts": 0, "cache_hits": 0}
+        self.encoding = self._load_encoding()
+
+    @property
+    def exact(self) -> bool:
+        return self.encoding is not None
+
+    def _load_encoding(self):
+        spec = _ENCODINGS.get(self.encoding_name)
+        path = self.vocab_dir / f"{self.encoding_name}.tiktoken"
+        if not TIKTOKEN_AVAILABLE or spec is None or not path.exists():
+            logger.warning("Tokenizer vocabulary unavailable, estimating token counts",
+                           encoding=self.encoding_name, path=str(path))
+            return None
+
+        return tiktoken.Encoding(
+            name=self.encoding_name,
+            pat_str=spec["pat_str"],
+            mergeable_ranks=load_tiktoken_bpe(str(path), expected_hash=spec["sha256"]),
+            special_tokens=spec["special_tokens"],
+        )
+
+    def _encode_count(self, text: str) -> int:
+        if self.encoding is None:
+            return len(text) // 4
+        # Special-token strings in user content are counted as plain text
+        return len(self.encoding.encode_ordinary(text))
+
+    def count(self, text: str) -> int:
+        """Number of tokens in ``text``"""
+        self.stats["counts"] += 1
+        if len(text) < _MIN_CACHED_CHARS:
+            return self._encode_count(text)
+
+        key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return cached
+
+        tokens = self._encode_count(text)
+        with self._lock:
+            self._cache[key] = tokens
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def stream(self) -> "StreamTokenCounter":
+        """Counter for text arriving in chunks"""
+        return StreamTokenCounter(self)
+
+    def get_stats(self):
+        return {**self.stats, "encoding": self.encoding_name, "exact": self.exact, "cached_texts": len(self._cache)}
+
+
+class StreamTokenCounter:
+    """
+    Incremental count of a streamed text.
+
+    Tokens never span a whitespace run that follows a non-whitespace
+    character, except that punctuation absorbs the line breaks after it
+    ('.\n' is one token). Everything before the last safe boundary is
+    counted once and only the tail after it is re-encoded as chunks arrive.
+    """
+
+    def __init__(self, counter: TokenCounter):
+        self.counter = counter
+        self.committed_tokens = 0
+        self.tail = ""
+
+    def feed(self, chunk: str) -> int:
+        """Add a chunk; returns the running total"""
+        self.tail += chunk
+        cut = self._last_boundary(self.tail)
+        if cut == 0 and len(self.tail) > _MAX_STREAM_TAIL:
+            cut = len(self.tail)
+        if cut:
+            self.committed_tokens += self.counter._encode_count(self.tail[:cut])
+            self.tail = self.tail[cut:]
+        return self.total
+
+    @property
+    def total(self) -> int:
+        return self.committed_tokens + (self.counter._encode_count(self.tail) if self.tail else 0)
+
+    @staticmethod
+    def _last_boundary(text: str) -> int:
+        for i in range(len(text) - 1, 0, -1):
+            if text[i].isspace() and not text[i - 1].isspace():
+                if text[i] in "\r\n" and not text[i - 1].isalnum():
+                    continue
+                return i
+        return 0
+
+
+_token_counters = {}
+
+
+def get_token_counter(model: str = "gpt-4") -> TokenCounter:
+    """Shared counter for the model's encoding"""
+    encoding = encoding_for_model(model)
+    if encoding not in _token_counters:
+        _token_counters[encoding] = TokenCounter(encoding)
+    return _token_counters[encoding]
+
+
+__all__ = ["StreamTokenCounter", "TIKTOKEN_AVAILABLE", "TokenCounter", "encoding_for_model", "get_token_counter"]
@@ -15,6 +15,9 @@ import os
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+# Imported first: the startup report clock starts when this module loads
+from .core.startup import get_startup_report, lazy_startup_enabled, LazyRouterLoader
+
 import structlog
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -36,163 +39,252 @@ from .core.error_handling_enhanced import error_handler, handle_startup_validati
 from .core.security_config import initialize_secure_defaults, validate_security_config
 from .core.config_validator import ConfigValidator
 
-# Import routers
-from .api.talents import router as talents_router
-from .api.agents import router as agents_router
-from .api.vector import router as vector_router
-from .api.health import router as health_router
-from .api.user_keys import router as user_keys_router
-from .api.ali_intelligence import router as ali_intelligence_router
-from .api.cost_management import router as cost_management_router
-from .api.analytics import router as analytics_router
-from .api.workflows import router as workflows_router
-from .api.agent_signatures import router as agent_signatures_router
-from .api.component_serialization import router as serialization_router
-from .api.agent_management import router as agent_management_router
-from .api.swarm_coordination import router as swarm_coordination_router
-from .api.agents_ecosystem import router as agents_ecosystem_router
-from .api.admin import router as admin_router
-from .api.approvals import router as approvals_router
-from .api.projects import router as projects_router
-from .api.system_status import router as system_status_router
-from .api.telemetry import router as telemetry_router
-from .api.governance import router as governance_router
-from .api.pm_orchestration import router as pm_orchestration_router
-from .api.realtime_endpoints import router as realtime_router
-
 # Setup non-blocking structured logging for asyncio
 setup_async_logging()
 logger = structlog.get_logger()
 
+get_startup_report().record("imports", 0.0)
+
+# API routers in registration order: (module, include prefix, tags, URL prefix
+# when the router declares its own). Imported at app creation, or on first use
+# in LAZY_STARTUP mode.
+API_ROUTERS = [
+    # Health checks (public)
+    (".api.health", "/health", ["Health"], None),
+    # Business logic APIs (no auth required)
+    (".api.talents", "/api/v1/talents", ["Talents"], None),
+    # AI orchestration APIs (no auth required)
+    (".api.agents", "/api/v1/agents", ["AI Agents"], None),
+    # Ali Intelligence API (single registration)
+    (".api.ali_intelligence", "/api/v1/agents", ["Ali Intelligence"], None),
+    # Agent ecosystem health monitoring
+    (".api.agents_ecosystem", "", ["Agent Ecosystem"], "/api/v1/agents"),
+    # Admin endpoints for database maintenance
+    (".api.admin", "", ["Admin"], "/api/v1/admin"),
+    # System status endpoints
+    (".api.system_status", "", ["System"], "/api/v1/system"),
+    # Vector search APIs (no auth required)
+    (".api.vector", "/api/v1/vector", ["Vector Search"], None),
+    # User API Keys management (no auth required)
+    (".api.user_keys", "/api/v1", ["User Keys"], "/api/v1/user-keys"),
+    # Cost Management & Monitoring (no auth required for real-time data)
+    (".api.cost_management", "/api/v1/cost-management", ["Cost Management"], None),
+    # Analytics & Dashboard (CEO Dashboard Supreme support)
+    (".api.analytics", "/api/v1/analytics", ["Analytics"], None),
+    # Approvals system
+    (".api.approvals", "/api/v1/approvals", ["Approvals"], None),
+    # Projects & Clients (Real database data)
+    (".api.projects", "/api/v1/projects", ["Projects & Clients"], None),
+    # Workflows & Business Process Automation (GraphFlow)
+    (".api.workflows", "/api/v1/workflows", ["Workflows"], None),
+    # Agent Digital Signatures & Validation
+    (".api.agent_signatures", "/api/v1/agent-signatures", ["Agent Signatures"], None),
+    # Component Serialization & State Management
+    (".api.component_serialization", "/api/v1/serialization", ["Component Serialization"], None),
+    # Agent Management System (CRUD operations for agents)
+    (".api.agent_management", "/api/v1/agent-management", ["Agent Management"], None),
+    # Swarm Coordination System (Advanced agent coordination with swarm intelligence)
+    (".api.swarm_coordination", "/api/v1/swarm", ["Swarm Coordination"], None),
+    # Telemetry System (Operational UX data for M4)
+    (".api.telemetry", "", ["Telemetry"], "/api/v1/telemetry"),
+    # Governance System (Rate limiting, SLO monitoring, Runbooks for M5)
+    (".api.governance", "/api/v1/governance", ["Governance"], None),
+    # PM Orchestration System (AI-orchestrated project management)
+    (".api.pm_orchestration", "", ["PM Orchestration"], "/api/v1/pm/orchestration"),
+    # Real-time Streaming System (WebSocket and SSE for orchestration updates)
+    (".api.realtime_endpoints", "", ["Real-time Streaming"], "/api/v1/pm/realtime"),
+]
+
+# Health must answer probes immediately, even in LAZY_STARTUP mode
+EAGER_ROUTERS = {".api.health"}
+
 # Rate limiting
 # limiter = Limiter(key_func=get_remote_address)
 
+async def _initialize_agent_system() -> None:
+    """Build the agent ecosystem and the streaming orchestrator"""
+    report = get_startup_report()
+
+    # Initialize AI agent system
+    with report.phase("agents") as phase:
+        logger.info("🤖 Initializing AI agent orchestration system...")
+        try:
+            from .agents.orchestrator import initialize_agents
+            await initialize_agents()
+            logger.info("✅ AI Agent System initialized successfully")
+        except Exception as agent_error:
+            phase.status = "degraded"
+            phase.error = str(agent_error)
+            logger.warning(f"⚠️ AI agents partially initialized: {agent_error}")
+            logger.info("📈 Backend operational, agent system will retry on next startup")
+
+    # Initialize streaming orchestrator system
+    with report.phase("streaming_orchestrator") as phase:
+        logger.info("🌊 Initializing streaming orchestrator system...")
+        try:
+            from .agents.services.streaming_orchestrator import get_streaming_orchestrator
+            streaming_orchestrator = get_streaming_orchestrator()
+            await streaming_orchestrator.initialize()
+            logger.info("✅ Streaming Orchestrator initialized successfully")
+        except Exception as streaming_error:
+            phase.status = "degraded"
+            phase.error = str(streaming_error)
+            logger.warning(f"⚠️ Streaming orchestrator initialization failed: {streaming_error}")
+            logger.info("📈 Backend operational, streaming system will retry on demand")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator:
     """Application lifespan management - startup and shutdown events"""
     
+    report = get_startup_report()
+    lazy = lazy_startup_enabled()
+    
     # 🚀 STARTUP
     # Initialize secure defaults before configuration
-    try:
-        logger.info("🔐 Initializing secure defaults...")
-        initialize_secure_defaults()
-        logger.info("✅ Secure defaults initialized")
-    except Exception as e:
-        logger.warning(f"⚠️ Secure defaults initialization skipped: {e}")
+    with report.phase("secure_defaults"):
+        try:
+            logger.info("🔐 Initializing secure defaults...")
+            initialize_secure_defaults()
+            logger.info("✅ Secure defaults initialized")
+        except Exception as e:
+            logger.warning(f"⚠️ Secure defaults initialization skipped: {e}")
     
     # Initialize configuration with fail-fast behavior
-    settings = initialize_configuration()
-    logger.info("🚀 Starting Convergio Unified Backend", version=settings.PROJECT_VERSION)
-    
-    # Comprehensive configuration validation
-    config_validator = ConfigValidator()
-    if not config_validator.validate_startup():
-        logger.error("❌ Configuration validation failed - terminating startup")
-        raise RuntimeError("Configuration validation failed")
+    with report.phase("configuration"):
+        settings = initialize_configuration()
+        logger.info("🚀 Starting Convergio Unified Backend", version=settings.PROJECT_VERSION, lazy_startup=lazy)
+        
+        # Comprehensive configuration validation
+        config_validator = ConfigValidator()
+        if not config_validator.validate_startup():
+            logger.error("❌ Configuration validation failed - terminating startup")
+            raise RuntimeError("Configuration validation failed")
     
     # Validate security configuration
-    try:
-        config_dict = {
-            "JWT_SECRET": settings.JWT_SECRET,
-            "CORS_ALLOWED_ORIGINS": ",".join(settings.cors_origins_list),
-            "BASE_URL": settings.BASE_URL if hasattr(settings, 'BASE_URL') else "",
-            "POSTGRES_HOST": settings.POSTGRES_HOST,
-            "REDIS_HOST": settings.REDIS_HOST,
-        }
-        validate_security_config(config_dict, settings.ENVIRONMENT)
-        logger.info("✅ Security configuration validated")
-    except Exception as e:
-        logger.warning(f"⚠️ Security configuration validation: {e}")
-    
-    # Validate required services configuration
-    handle_startup_validation(["database", "redis", "ai_apis"])
+    with report.phase("security_validation"):
+        try:
+            config_dict = {
+                "JWT_SECRET": settings.JWT_SECRET,
+                "CORS_ALLOWED_ORIGINS": ",".join(settings.cors_origins_list),
+                "BASE_URL": settings.BASE_URL if hasattr(settings, 'BASE_URL') else "",
+                "POSTGRES_HOST": settings.POSTGRES_HOST,
+                "REDIS_HOST": settings.REDIS_HOST,
+            }
+            validate_security_config(config_dict, settings.ENVIRONMENT)
+            logger.info("✅ Security configuration validated")
+        except Exception as e:
+            logger.warning(f"⚠️ Security configuration validation: {e}")
+        
+        # Validate required services configuration
+        handle_startup_validation(["database", "redis", "ai_apis"])
     
     try:
         # Initialize database
-        logger.info("📊 Initializing database connection pool...")
-        async with error_handler.error_context("database", "initialization") as ctx:
-            await init_db()
-            logger.info("✅ Database connection pool initialized")
+        with report.phase("database"):
+            logger.info("📊 Initializing database connection pool...")
+            async with error_handler.error_context("database", "initialization") as ctx:
+                await init_db()
+                logger.info("✅ Database connection pool initialized")
         # Auto-create tables in development for smoother E2E/dev experience
-        try:
-            if settings.ENVIRONMENT == "development" and not os.getenv("SKIP_AUTO_MIGRATIONS", "false").lower() in ("true", "1", "yes"):
-                from sqlalchemy import text as _sql_text
-                from .core.database import async_engine
-                async with async_engine.begin() as conn:
-                    # Create tables if not exist
-                    from .core.database import Base
-                    await conn.run_sync(Base.metadata.create_all)
-                logger.info("🧱 Database tables ensured (development mode)")
-                # Ensure specific dev schema consistency (lightweight auto-migrations)
-                from .core.database import ensure_dev_schema
-                await ensure_dev_schema()
-            else:
-                logger.info("⏭️ Auto-migrations skipped (SKIP_AUTO_MIGRATIONS=true)")
-        except Exception as _e:
-            logger.warning(f"⚠️ Table auto-create skipped/failed: {_e}")
+        with report.phase("schema"):
+            try:
+                if settings.ENVIRONMENT == "development" and not os.getenv("SKIP_AUTO_MIGRATIONS", "false").lower() in ("true", "1", "yes"):
+                    from sqlalchemy import text as _sql_text
+                    from .core.database import async_engine
+                    async with async_engine.begin() as conn:
+                        # Create tables if not exist
+                        from .core.database import Base
+                        await conn.run_sync(Base.metadata.create_all)
+                    logger.info("🧱 Database tables ensured (development mode)")
+                    # Ensure specific dev schema consistency (lightweight auto-migrations)
+                    from .core.database import ensure_dev_schema
+                    await ensure_dev_schema()
+                else:
+                    logger.info("⏭️ Auto-migrations skipped (SKIP_AUTO_MIGRATIONS=true)")
+            except Exception as _e:
+                logger.warning(f"⚠️ Table auto-create skipped/failed: {_e}")
         
         # Initialize Redis with enhanced error handling
-        logger.info("🚀 Initializing Redis connection pool...")  
-        async with error_handler.error_context("redis", "initialization") as ctx:
-            await init_redis()
-            logger.info("✅ Redis connection pool initialized")
+        with report.phase("redis"):
+            logger.info("🚀 Initializing Redis connection pool...")  
+            async with error_handler.error_context("redis", "initialization") as ctx:
+                await init_redis()
+                logger.info("✅ Redis connection pool initialized")
         
         # Initialize enhanced rate limiting system
-        logger.info("🚦 Initializing enhanced rate limiting...")
-        try:
-            from .core.redis import get_redis_client
-            redis_client = await get_redis_client()
-            
-            rate_engine, rate_middleware = create_enhanced_rate_limiter(
-                redis_client, 
-                enabled=settings.RATE_LIMITING_ENABLED
-            )
-            
-            # Configure endpoint-specific limits  
-            await rate_engine.configure_endpoint_limits(settings.RATE_LIMITS)
-            logger.info("✅ Enhanced rate limiting initialized")
-        except Exception as e:
-            logger.error("❌ Rate limiting initialization failed", error=str(e))
-            if settings.ENVIRONMENT == "production":
-                raise
-        
-        # Initialize AI agent system
-        logger.info("🤖 Initializing AI agent orchestration system...")
-        try:
-            from .agents.orchestrator import initialize_agents
-            await initialize_agents()
-            logger.info("✅ AI Agent System initialized successfully")
-        except Exception as agent_error:
-            logger.warning(f"⚠️ AI agents partially initialized: {agent_error}")
-            logger.info("📈 Backend operational, agent system will retry on next startup")
+        with report.phase("rate_limiting"):
+            logger.info("🚦 Initializing enhanced rate limiting...")
+            try:
+                from .core.redis import get_redis_client
+                redis_client = await get_redis_client()
+                
+                rate_engine, rate_middleware = create_enhanced_rate_limiter(
+                    redis_client, 
+                    enabled=settings.RATE_LIMITING_ENABLED
+                )
+                
+                # Configure endpoint-specific limits  
+                await rate_engine.configure_endpoint_limits(settings.RATE_LIMITS)
+                logger.info("✅ Enhanced rate limiting initialized")
+            except Exception as e:
+                logger.error("❌ Rate limiting initialization failed", error=str(e))
+                if settings.ENVIRONMENT == "production":
+                    raise
         
-        # Initialize streaming orchestrator system
-        logger.info("🌊 Initializing streaming orchestrator system...")
-        try:
-            from .agents.services.streaming_orchestrator import get_streaming_orchestrator
-            streaming_orchestrator = get_streaming_orchestrator()
-            await streaming_orchestrator.initialize()
-            logger.info("✅ Streaming Orchestrator initialized successfully")
-        except Exception as streaming_error:
-            logger.warning(f"⚠️ Streaming orchestrator initialization failed: {streaming_error}")
-            logger.info("📈 Backend operational, streaming system will retry on demand")
+        # Agents + streaming orchestrator: in LAZY_STARTUP mode they are built in
+        # the background and /health/ready reports 503 until they settle
+        if lazy:
+            logger.info("⏳ Agent system initializing in background (LAZY_STARTUP)")
+            report.run_in_background("agent_system", _initialize_agent_system)
+        else:
+            await _initialize_agent_system()
         
         # Vector search integrated in API
         logger.info("🔍 Vector search engine ready")
         
         # Initialize database maintenance scheduler
-        logger.info("🔧 Initializing database maintenance scheduler...")
-        try:
-            from .core.db_maintenance import get_db_maintenance
-            db_maintenance = get_db_maintenance()
-            # Schedule VACUUM ANALYZE at 3:00 AM UTC daily
-            db_maintenance.schedule_maintenance(vacuum_hour=3, vacuum_minute=0)
-            logger.info("✅ Database maintenance scheduler started (VACUUM at 03:00 UTC)")
-        except Exception as maintenance_error:
-            logger.warning(f"⚠️ Database maintenance scheduler failed: {maintenance_error}")
-            logger.info("📈 Backend operational, maintenance can be scheduled manually")
+        with report.phase("db_maintenance"):
+            logger.info("🔧 Initializing database maintenance scheduler...")
+            try:
+                from .core.db_maintenance import get_db_maintenance
+                db_maintenance = get_db_maintenance()
+                # Schedule VACUUM ANALYZE at 3:00 AM UTC daily
+                db_maintenance.schedule_maintenance(vacuum_hour=3, vacuum_minute=0)
+                logger.info("✅ Database maintenance scheduler started (VACUUM at 03:00 UTC)")
+            except Exception as maintenance_error:
+                logger.warning(f"⚠️ Database maintenance scheduler failed: {maintenance_error}")
+                logger.info("📈 Backend operational, maintenance can be scheduled manually")
+        
+        # Compact billing usage counters into the aggregate table periodically
+        with report.phase("usage_metering"):
+            try:
+                from .services.usage_metering import get_usage_meter
+                get_usage_meter().start_compaction()
+                logger.info("✅ Usage metering compaction started")
+            except Exception as metering_error:
+                logger.warning(f"⚠️ Usage metering compaction failed to start: {metering_error}")
         
-        logger.info("✅ Convergio backend startup completed successfully")
+        # Fire HITL approval and pause deadlines from startup, including ones left by a restart
+        with report.phase("hitl_deadlines"):
+            try:
+                from .api.approvals import start_approval_deadlines
+                if await start_approval_deadlines():
+                    logger.info("✅ HITL deadline worker started")
+            except Exception as deadline_error:
+                logger.warning(f"⚠️ HITL deadline worker failed to start: {deadline_error}")
+        
+        # Import the remaining routers off the event loop once we are serving
+        router_loader = getattr(app.state, "router_loader", None)
+        if router_loader is not None and router_loader.pending():
+            report.run_in_background("router_warmup", router_loader.load_all)
+        
+        report.mark_serving()
+        logger.info(
+            "✅ Convergio backend startup completed successfully",
+            serving_ms=round(report.serving_at_ms, 1),
+            pending=report.pending(),
+        )
         
     except Exception as e:
         logger.error("❌ Failed to start Convergio backend", error=str(e))
@@ -204,6 +296,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     logger.info("🛑 Shutting down Convergio backend...")
     
     try:
+        # Stop background startup steps that are still running
+        await report.shutdown()
+        
         # Stop database maintenance scheduler
         try:
             from .core.db_maintenance import get_db_maintenance
@@ -213,6 +308,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         except Exception as e:
             logger.warning(f"⚠️ Error stopping maintenance scheduler: {e}")
         
+        # Flush usage counters before Redis and the database go away
+        try:
+            from .services.usage_metering import get_usage_meter
+            await get_usage_meter().stop_compaction()
+        except Exception as e:
+            logger.warning(f"⚠️ Error stopping usage metering: {e}")
+        
+        try:
+            from .api.approvals import stop_approval_deadlines
+            await stop_approval_deadlines()
+        except Exception as e:
+            logger.warning(f"⚠️ Error stopping HITL deadline worker: {e}")
+        
         await close_redis()
         await close_db()
         logger.info("✅ Convergio backend shutdown completed")
@@ -222,6 +330,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
 def create_app() -> FastAPI:
     """Create and configure FastAPI application"""
     
+    app_started_ms = get_startup_report().now_ms()
     settings = initialize_configuration()
     
     # Create FastAPI app with lifespan management
@@ -323,73 +432,21 @@ def create_app() -> FastAPI:
     # 🛣️ API ROUTES REGISTRATION
     # ================================
     
-    # Health checks (public)
-    app.include_router(health_router, prefix="/health", tags=["Health"])
-    
-    # Business logic APIs (no auth required)
-    app.include_router(talents_router, prefix="/api/v1/talents", tags=["Talents"])
-    
-    # AI orchestration APIs (no auth required)
-    app.include_router(agents_router, prefix="/api/v1/agents", tags=["AI Agents"])
-    
-    # Ali Intelligence API (single registration)
-    app.include_router(ali_intelligence_router, prefix="/api/v1/agents", tags=["Ali Intelligence"])
-    
-    # Agent ecosystem health monitoring
-    app.include_router(agents_ecosystem_router, tags=["Agent Ecosystem"])
-    
-    # Admin endpoints for database maintenance
-    app.include_router(admin_router, tags=["Admin"])
-    
-    # System status endpoints
-    app.include_router(system_status_router, tags=["System"])
-    
-    # Vector search APIs (no auth required)
-    app.include_router(vector_router, prefix="/api/v1/vector", tags=["Vector Search"])
-    
-    # User API Keys management (no auth required)
-    app.include_router(user_keys_router, prefix="/api/v1", tags=["User Keys"])
-    
-    # (Removed duplicate Ali Intelligence router registration)
-    
-    # Cost Management & Monitoring (no auth required for real-time data)
-    app.include_router(cost_management_router, prefix="/api/v1/cost-management", tags=["Cost Management"])
-    
-    # Analytics & Dashboard (CEO Dashboard Supreme support)
-    app.include_router(analytics_router, prefix="/api/v1/analytics", tags=["Analytics"])
-    
-    # Approvals system 
-    app.include_router(approvals_router, prefix="/api/v1/approvals", tags=["Approvals"])
-    
-    # Projects & Clients (Real database data)
-    app.include_router(projects_router, prefix="/api/v1/projects", tags=["Projects & Clients"])
-    
-    # Workflows & Business Process Automation (GraphFlow) - FIX: Add proper prefix
-    app.include_router(workflows_router, prefix="/api/v1/workflows", tags=["Workflows"])
-    
-    # Agent Digital Signatures & Validation - FIX: Add proper prefix
-    app.include_router(agent_signatures_router, prefix="/api/v1/agent-signatures", tags=["Agent Signatures"])
-    
-    # Component Serialization & State Management - FIX: Add proper prefix  
-    app.include_router(serialization_router, prefix="/api/v1/serialization", tags=["Component Serialization"])
-    
-    # Agent Management System (CRUD operations for agents)
-    app.include_router(agent_management_router, prefix="/api/v1/agent-management", tags=["Agent Management"])
-    
-    # Swarm Coordination System (Advanced agent coordination with swarm intelligence)
-    app.include_router(swarm_coordination_router, prefix="/api/v1/swarm", tags=["Swarm Coordination"])
-    
-    # Telemetry System (Operational UX data for M4)
-    app.include_router(telemetry_router, tags=["Telemetry"])
-    
-    # Governance System (Rate limiting, SLO monitoring, Runbooks for M5)
-    app.include_router(governance_router, prefix="/api/v1/governance", tags=["Governance"])
-    
-    # PM Orchestration System (AI-orchestrated project management)
-    app.include_router(pm_orchestration_router, tags=["PM Orchestration"])
-    
-    # Real-time Streaming System (WebSocket and SSE for orchestration updates)
-    app.include_router(realtime_router, tags=["Real-time Streaming"])
+    # Heavy routers (autogen, numpy, OTEL, ...) are imported on first use in
+    # LAZY_STARTUP mode; see API_ROUTERS for the registration order
+    lazy = lazy_startup_enabled()
+    router_loader = LazyRouterLoader(app, package=__package__, lazy=lazy, report=get_startup_report())
+    for module, prefix, tags, route_prefix in API_ROUTERS:
+        router_loader.register(
+            module,
+            prefix=prefix,
+            tags=tags,
+            route_prefix=route_prefix,
+            eager=module in EAGER_ROUTERS,
+        )
+    app.state.router_loader = router_loader
+    if lazy:
+        app.add_middleware(router_loader.middleware(app.openapi_url))
     
     # ================================
     # 🔄 GLOBAL EXCEPTION HANDLERS
@@ -450,6 +507,7 @@ def create_app() -> FastAPI:
             "docs": "/docs" if settings.ENVIRONMENT != "production" else None
         }
     
+    get_startup_report().record("create_app", app_started_ms)
     logger.info("✅ FastAPI application configured successfully")
     return app
 
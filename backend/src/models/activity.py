@@ -6,7 +6,7 @@ SQLAlchemy 2.0 Activity model matching existing database schema
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
-from sqlalchemy import Integer, String, DateTime, func, Text, BigInteger, ForeignKey
+from sqlalchemy import Integer, String, DateTime, func, Text, BigInteger, ForeignKey, Index
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -18,6 +18,12 @@ class Activity(Base):
     """Activity model matching the existing Convergio database schema"""
     
     __tablename__ = "activities"
+    __table_args__ = (
+        # Keyset pagination, globally and per engagement
+        Index("idx_activities_created_at_id", "created_at", "id"),
+        Index("idx_activities_engagement_created_at_id", "engagement_id", "created_at", "id"),
+        {'extend_existing': True},
+    )
     
     # Primary key
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, index=True)
@@ -6,24 +6,32 @@ SQLAlchemy 2.0 models for vector search functionality - no user authentication r
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Integer, String, Text, JSON, Boolean, DateTime, func, text, ForeignKey
+from sqlalchemy import Integer, String, Text, JSON, Boolean, DateTime, func, text, ForeignKey, Index, delete, update
 from pgvector.sqlalchemy import Vector
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
 
 from src.core.database import Base
+from src.core.text_chunker import StoredChunk
 
 
 class Document(Base):
     """Document model for vector search indexing - no user auth required"""
     
     __tablename__ = "documents"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("idx_documents_created_at_id", "created_at", "id"),
+        {'extend_existing': True},
+    )
     
     # Primary key with auto-increment
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     
+    # Stable caller-supplied key; re-indexing the same external_id updates this document
+    external_id: Mapped[Optional[str]] = mapped_column(String(255), unique=True)
+    
     # Document fields
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
@@ -67,6 +75,12 @@ class Document(Base):
         )
         return result.scalar_one_or_none()
     
+    @classmethod
+    async def get_by_external_id(cls, db: AsyncSession, external_id: str) -> Optional["Document"]:
+        """Get document by its caller-supplied key"""
+        result = await db.execute(select(cls).where(cls.external_id == external_id))
+        return result.scalar_one_or_none()
+    
     @classmethod
     async def get_all(
         cls, 
@@ -84,6 +98,19 @@ class Document(Base):
         )
         return result.scalars().all()
     
+    @classmethod
+    async def get_page(cls, db: AsyncSession, pagination) -> List["Document"]:
+        """Get one keyset page of documents, newest first (limit + 1 rows)"""
+        from src.core.pagination import CursorPaginator
+        
+        query = CursorPaginator.paginate_select(
+            select(cls).options(selectinload(cls.embeddings)),
+            pagination,
+            [cls.created_at, cls.id]
+        )
+        result = await db.execute(query)
+        return result.scalars().all()
+    
     @classmethod
     async def create(cls, db: AsyncSession, **kwargs) -> "Document":
         """Create new document"""
@@ -175,6 +202,7 @@ class Document(Base):
         """Convert document to dictionary"""
         return {
             "id": self.id,
+            "external_id": self.external_id,
             "title": self.title,
             "content": self.content,
             "metadata": self.doc_metadata,
@@ -202,6 +230,8 @@ class DocumentEmbedding(Base):
     # Chunk information
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
     chunk_text: Mapped[str] = mapped_column(Text, nullable=False)
+    # sha256 of chunk_text; unchanged chunks are not re-embedded on re-index
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64))
     
     # Vector embedding (pgvector) - default 1536 dims for text-embedding-ada-002
     embedding: Mapped[List[float]] = mapped_column(Vector, nullable=False)
@@ -291,6 +321,26 @@ class DocumentEmbedding(Base):
         results.sort(key=lambda x: getattr(x, 'similarity_score', 0), reverse=True)
         return results[:top_k]
     
+    @classmethod
+    async def get_stored_chunks(cls, db: AsyncSession, document_id: int) -> List[StoredChunk]:
+        """Positions and hashes of a document's chunks, without loading the vectors"""
+        result = await db.execute(
+            select(cls.id, cls.chunk_index, cls.content_hash).where(cls.document_id == document_id)
+        )
+        return [StoredChunk(id=row.id, chunk_index=row.chunk_index, content_hash=row.content_hash) for row in result]
+    
+    @classmethod
+    async def delete_many(cls, db: AsyncSession, ids: List[int]) -> None:
+        """Delete embeddings by id"""
+        if ids:
+            await db.execute(delete(cls).where(cls.id.in_(ids)))
+    
+    @classmethod
+    async def update_many(cls, db: AsyncSession, values: List[Dict[str, Any]]) -> None:
+        """Bulk update by primary key; each dict holds ``id`` and the columns to set"""
+        if values:
+            await db.execute(update(cls), values)
+    
     @classmethod
     async def get_by_document(cls, db: AsyncSession, document_id: int) -> List["DocumentEmbedding"]:
         """Get all embeddings for a document"""
@@ -308,6 +358,7 @@ class DocumentEmbedding(Base):
             "document_id": self.document_id,
             "chunk_index": self.chunk_index,
             "chunk_text": self.chunk_text,
+            "content_hash": self.content_hash,
             "metadata": self.embed_metadata,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "similarity_score": getattr(self, "similarity_score", None)
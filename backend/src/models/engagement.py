@@ -8,7 +8,7 @@ This model represents projects/engagements in the Convergio system.
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
-from sqlalchemy import Integer, String, DateTime, func, Text, Float
+from sqlalchemy import Integer, String, DateTime, func, Text, Float, Index
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -27,6 +27,11 @@ class Engagement(Base):
     """
     
     __tablename__ = "engagements"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("idx_engagements_created_at_id", "created_at", "id"),
+        {'extend_existing': True},
+    )
     
     # Primary key
     id: Mapped[int] = mapped_column(Integer, primary_key=True)#, index=True)
@@ -130,6 +130,7 @@ class Project(Base):
         Index('idx_project_status', 'status'),
         Index('idx_project_owner', 'owner_id'),
         Index('idx_project_dates', 'start_date', 'end_date'),
+        Index('idx_project_created_at_id', 'created_at', 'id'),
     )
 
 
@@ -14,6 +14,8 @@ from pydantic import BaseModel, Field
 import asyncio
 from enum import Enum
 
+from .usage_metering import UsageMeter, get_usage_meter
+
 logger = structlog.get_logger()
 
 # Configure Stripe
@@ -107,9 +109,9 @@ class Invoice(BaseModel):
 class BillingService:
     """Service for managing billing and subscriptions"""
     
-    def __init__(self):
+    def __init__(self, usage_meter: Optional[UsageMeter] = None):
         self.plans = self._load_plan_configs()
-        self.usage_cache = {}  # In-memory cache for usage data
+        self.usage_meter = usage_meter or get_usage_meter()
         
     def _load_plan_configs(self) -> Dict[str, PlanConfig]:
         """Load billing plan configurations"""
@@ -343,23 +345,11 @@ class BillingService:
         quantity: int,
         metadata: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Record usage for billing purposes"""
-        
-        record = UsageRecord(
-            tenant_id=tenant_id,
-            metric=metric,
-            quantity=quantity,
-            timestamp=datetime.utcnow(),
-            metadata=metadata or {}
-        )
+        """Record usage for billing purposes (aggregated per tenant, metric and day)"""
         
-        # Store in cache (in production, use database)
-        cache_key = f"{tenant_id}:{metric.value}:{record.timestamp.date()}"
-        if cache_key not in self.usage_cache:
-            self.usage_cache[cache_key] = []
-        self.usage_cache[cache_key].append(record)
+        await self.usage_meter.record(tenant_id, metric.value, quantity)
         
-        logger.info(f"Recorded usage: {tenant_id} - {metric.value}: {quantity}")
+        logger.debug(f"Recorded usage: {tenant_id} - {metric.value}: {quantity}", metadata=metadata)
     
     async def get_usage_summary(
         self,
@@ -376,16 +366,10 @@ class BillingService:
             "metrics": {}
         }
         
-        # Aggregate usage from cache
+        # One aggregate row per metric and day, whatever the call volume
+        totals = await self.usage_meter.summary(tenant_id, start_date.date(), end_date.date())
         for metric in UsageMetric:
-            total = 0
-            for date in self._daterange(start_date, end_date):
-                cache_key = f"{tenant_id}:{metric.value}:{date}"
-                if cache_key in self.usage_cache:
-                    for record in self.usage_cache[cache_key]:
-                        total += record.quantity
-            
-            summary["metrics"][metric.value] = total
+            summary["metrics"][metric.value] = totals.get(metric.value, 0)
         
         return summary
     
@@ -561,11 +545,6 @@ class BillingService:
             subscription_id = event_data["id"]
             logger.info(f"Subscription cancelled: {subscription_id}")
     
-    def _daterange(self, start_date: datetime, end_date: datetime):
-        """Generate dates between start and end"""
-        for n in range(int((end_date.date() - start_date.date()).days) + 1):
-            yield start_date.date() + timedelta(n)
-    
     async def get_billing_portal_url(self, stripe_customer_id: str) -> str:
         """Get Stripe billing portal URL for customer self-service"""
         
@@ -1,52 +1,95 @@
 """
-Export Service - CSV and JSON export functionality
+Export Service - CSV, NDJSON, JSON and Excel export functionality
 For analytics, reports, and data portability
 """
 
 import csv
 import json
 import io
-from typing import List, Dict, Any, Optional
+import tempfile
+from typing import List, Dict, Any, Optional, Iterable, AsyncIterator, AsyncIterable, Union
 from datetime import datetime
-import pandas as pd
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
 
+Rows = Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Rows buffered before a write-only sheet is opened; used to size columns
+XLSX_WIDTH_SAMPLE_ROWS = 100
+# Read size when streaming the finished workbook back to the client
+XLSX_CHUNK_SIZE = 64 * 1024
+# Workbooks smaller than this never touch the disk
+XLSX_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
 class ExportService:
-    """Service for exporting data in various formats"""
+    """Service for exporting data in various formats.
+
+    Every exporter accepts either an in-memory list or a (async) row iterator,
+    e.g. ``stream_query_rows``. Rows are encoded and sent one at a time, so
+    memory stays flat and the first byte leaves before the query finishes.
+    """
     
     @staticmethod
-    def export_to_csv(data: List[Dict[str, Any]], filename: str = "export.csv") -> StreamingResponse:
+    async def stream_query_rows(
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield rows of a raw SQL query from a server-side cursor.
+
+        Opens its own read session so the cursor outlives the request
+        dependency while the response body is being streamed.
+        """
+        from sqlalchemy import text
+        from ..core.database import get_async_read_session
+
+        async with get_async_read_session() as session:
+            result = await session.stream(
+                text(query).execution_options(yield_per=batch_size),
+                params or {},
+            )
+            async for row in result.mappings():
+                yield dict(row)
+    
+    @staticmethod
+    def export_to_csv(
+        data: Rows,
+        filename: str = "export.csv",
+        fieldnames: Optional[List[str]] = None,
+    ) -> StreamingResponse:
         """Export data to CSV format"""
-        if not data:
-            raise HTTPException(status_code=400, detail="No data to export")
-        
-        output = io.StringIO()
-        
-        # Get all unique keys from data
-        fieldnames = set()
-        for item in data:
-            fieldnames.update(item.keys())
-        fieldnames = sorted(list(fieldnames))
-        
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for item in data:
-            # Flatten nested objects
-            flat_item = ExportService._flatten_dict(item)
-            writer.writerow(flat_item)
-        
-        output.seek(0)
+        if isinstance(data, list):
+            if not data:
+                raise HTTPException(status_code=400, detail="No data to export")
+            if fieldnames is None:
+                # Get all unique keys from data
+                keys = set()
+                for item in data:
+                    keys.update(ExportService._flatten_dict(item).keys())
+                fieldnames = sorted(keys)
         
         return StreamingResponse(
-            io.BytesIO(output.getvalue().encode()),
+            ExportService._iter_csv(data, fieldnames),
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
             }
         )
     
+    @staticmethod
+    def export_to_ndjson(data: Rows, filename: str = "export.ndjson") -> StreamingResponse:
+        """Export data as newline-delimited JSON, one object per row"""
+        return StreamingResponse(
+            ExportService._iter_ndjson(data),
+            media_type="application/x-ndjson",
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}"
+            }
+        )
+    
     @staticmethod
     def export_to_json(data: Any, filename: str = "export.json") -> StreamingResponse:
         """Export data to JSON format"""
@@ -61,36 +104,152 @@ class ExportService:
         )
     
     @staticmethod
-    def export_to_excel(data: List[Dict[str, Any]], filename: str = "export.xlsx") -> StreamingResponse:
-        """Export data to Excel format"""
-        if not data:
+    def export_to_excel(
+        data: Rows,
+        filename: str = "export.xlsx",
+        fieldnames: Optional[List[str]] = None,
+    ) -> StreamingResponse:
+        """Export data to Excel format using openpyxl write-only mode"""
+        if isinstance(data, list) and not data:
             raise HTTPException(status_code=400, detail="No data to export")
         
-        # Create DataFrame
-        df = pd.DataFrame(data)
-        
-        # Create Excel file in memory
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Data')
-            
-            # Auto-adjust column width
-            worksheet = writer.sheets['Data']
-            for column in df:
-                column_width = max(df[column].astype(str).map(len).max(), len(column))
-                col_idx = df.columns.get_loc(column)
-                worksheet.column_dimensions[chr(65 + col_idx)].width = min(column_width + 2, 50)
+        return ExportService.export_sheets_to_excel({"Data": data}, filename, {"Data": fieldnames})
+    
+    @staticmethod
+    def export_sheets_to_excel(
+        sheets: Dict[str, Rows],
+        filename: str = "export.xlsx",
+        fieldnames: Optional[Dict[str, Optional[List[str]]]] = None,
+    ) -> StreamingResponse:
+        """Export one sheet per entry of ``sheets`` into a single workbook"""
+        workbook_cls = ExportService._get_write_only_workbook()
+        fieldnames = fieldnames or {}
         
-        output.seek(0)
+        async def _generate():
+            # A zip archive is only complete once the workbook is closed, so rows
+            # are spooled (memory first, then disk) and streamed back in chunks.
+            with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_SIZE) as spool:
+                wb = workbook_cls(write_only=True)
+                for title, rows in sheets.items():
+                    await ExportService._write_sheet(wb, title, rows, fieldnames.get(title))
+                if not wb.worksheets:
+                    wb.create_sheet(title="Data")
+                wb.save(spool)
+                spool.seek(0)
+                while True:
+                    chunk = spool.read(XLSX_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
         
         return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            _generate(),
+            media_type=XLSX_MEDIA_TYPE,
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
             }
         )
     
+    @staticmethod
+    def _get_write_only_workbook():
+        """Import openpyxl lazily; it is an optional dependency"""
+        try:
+            from openpyxl import Workbook  # type: ignore
+        except ImportError:
+            raise HTTPException(status_code=501, detail="XLSX export requires openpyxl; not installed")
+        return Workbook
+    
+    @staticmethod
+    async def _write_sheet(wb, title: str, rows: Rows, fieldnames: Optional[List[str]] = None) -> None:
+        """Append rows to a new write-only sheet.
+
+        Column widths must be set before the first row is written, so they are
+        sized from the header and a small sample of leading rows.
+        """
+        from openpyxl.utils import get_column_letter  # type: ignore
+        
+        iterator = ExportService._aiter(rows)
+        sample: List[Dict[str, Any]] = []
+        async for item in iterator:
+            sample.append(ExportService._flatten_dict(item))
+            if len(sample) >= XLSX_WIDTH_SAMPLE_ROWS:
+                break
+        if not sample and fieldnames is None:
+            return
+        
+        if fieldnames is None:
+            fieldnames = list(sample[0].keys())
+            for item in sample[1:]:
+                fieldnames.extend(k for k in item.keys() if k not in fieldnames)
+        
+        ws = wb.create_sheet(title=str(title)[:31] or "Sheet")
+        for col_idx, name in enumerate(fieldnames, start=1):
+            width = max([len(str(name))] + [len(str(item.get(name, ""))) for item in sample])
+            ws.column_dimensions[get_column_letter(col_idx)].width = min(width + 2, 50)
+        
+        ws.append(fieldnames)
+        for item in sample:
+            ws.append([ExportService._cell_value(item.get(name)) for name in fieldnames])
+        async for item in iterator:
+            flat_item = ExportService._flatten_dict(item)
+            ws.append([ExportService._cell_value(flat_item.get(name)) for name in fieldnames])
+    
+    @staticmethod
+    def _cell_value(value: Any) -> Any:
+        """Coerce values openpyxl cannot store natively into strings"""
+        if value is None or isinstance(value, (str, int, float, bool, datetime)):
+            return value
+        return str(value)
+    
+    @staticmethod
+    async def _iter_csv(rows: Rows, fieldnames: Optional[List[str]] = None) -> AsyncIterator[bytes]:
+        """Encode rows as CSV one line at a time.
+
+        Without explicit ``fieldnames`` the header comes from the first row;
+        keys absent from it are dropped for later rows.
+        """
+        buffer = io.StringIO()
+        writer = None
+        
+        def _drain() -> bytes:
+            value = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            return value.encode()
+        
+        async for item in ExportService._aiter(rows):
+            # Flatten nested objects
+            flat_item = ExportService._flatten_dict(item)
+            if writer is None:
+                writer = csv.DictWriter(
+                    buffer,
+                    fieldnames=fieldnames or list(flat_item.keys()),
+                    extrasaction="ignore",
+                )
+                writer.writeheader()
+            writer.writerow(flat_item)
+            yield _drain()
+        
+        if writer is None and fieldnames:
+            csv.DictWriter(buffer, fieldnames=fieldnames).writeheader()
+            yield _drain()
+    
+    @staticmethod
+    async def _iter_ndjson(rows: Rows) -> AsyncIterator[bytes]:
+        """Encode rows as newline-delimited JSON"""
+        async for item in ExportService._aiter(rows):
+            yield (json.dumps(item, default=str) + "\n").encode()
+    
+    @staticmethod
+    async def _aiter(rows: Rows) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate sync and async row sources uniformly"""
+        if hasattr(rows, "__aiter__"):
+            async for item in rows:
+                yield item
+        else:
+            for item in rows:
+                yield item
+    
     @staticmethod
     def export_project_analytics(project_data: Dict[str, Any], format: str = "json") -> StreamingResponse:
         """Export project analytics in specified format"""
@@ -144,31 +303,13 @@ class ExportService:
         
         elif format == "excel":
             # Create multi-sheet Excel
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                # Metrics sheet
-                metrics_df = pd.DataFrame([analytics_data["metrics"]])
-                metrics_df.to_excel(writer, sheet_name='Metrics', index=False)
-                
-                # Tasks sheet
-                if analytics_data["tasks"]:
-                    tasks_df = pd.DataFrame(analytics_data["tasks"])
-                    tasks_df.to_excel(writer, sheet_name='Tasks', index=False)
-                
-                # Resources sheet
-                if analytics_data["resources"]:
-                    resources_df = pd.DataFrame(analytics_data["resources"])
-                    resources_df.to_excel(writer, sheet_name='Resources', index=False)
-            
-            output.seek(0)
+            sheets = {"Metrics": [analytics_data["metrics"]]}
+            if analytics_data["tasks"]:
+                sheets["Tasks"] = analytics_data["tasks"]
+            if analytics_data["resources"]:
+                sheets["Resources"] = analytics_data["resources"]
             
-            return StreamingResponse(
-                output,
-                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                headers={
-                    "Content-Disposition": f"attachment; filename={filename_base}.xlsx"
-                }
-            )
+            return ExportService.export_sheets_to_excel(sheets, f"{filename_base}.xlsx")
         
         else:  # JSON
             return ExportService.export_to_json(analytics_data, f"{filename_base}.json")
@@ -23,6 +23,7 @@ from src.agents.utils.config import get_settings
 from sqlalchemy import and_, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.agents.services.event_bus import EventType, publish_change
 from src.agents.services.redis_state_manager import RedisStateManager
 from src.core.database import get_async_session, get_async_read_session
 from src.models.cost_tracking import (
@@ -218,6 +219,10 @@ class UnifiedCostTracker:
             
             # Update cache totals
             await self._update_cache_totals(cost_breakdown.total_cost_usd, session_id)
+            publish_change(
+                EventType.COST_RECORDED, "cost_tracker",
+                provider=provider, model=model, cost_usd=float(cost_breakdown.total_cost_usd)
+            )
             
             # Get session and daily totals
             session_total = await self._get_session_total(session_id)
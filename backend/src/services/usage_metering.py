@@ -0,0 +1,256 @@
+"""
+Usage Metering - pre-aggregated usage counters for billing
+Atomic per-tenant, per-metric, per-day counters in Redis, compacted
+periodically into the usage_aggregates table
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+PERIOD_FORMAT = "%Y-%m-%d"
+
+
+def iter_periods(start: date, end: date) -> Iterator[str]:
+    """Daily period labels between start and end, inclusive"""
+    for n in range((end - start).days + 1):
+        yield (start + timedelta(n)).strftime(PERIOD_FORMAT)
+
+
+class UsageMeter:
+    """
+    Usage counters whose size depends on tenants x metrics x days, not calls.
+
+    ``record`` is one HINCRBY on the tenant's hash for the day, plus marking
+    the hash dirty. ``compact`` copies dirty hashes into usage_aggregates;
+    counters hold running totals, so compaction is an idempotent upsert and
+    can run on any worker. Summaries read one row set and one hash per day.
+    Without Redis the counters are kept in process.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        session_factory=None,
+        key_prefix: str = "billing:usage:",
+        counter_ttl_seconds: int = 86400 * 35,
+        compaction_interval: float = 300.0
+    ):
+        self._redis = redis_client
+        self._session_factory = session_factory
+        self.key_prefix = key_prefix
+        self.dirty_key = f"{key_prefix}dirty"
+        self.counter_ttl_seconds = counter_ttl_seconds
+        self.compaction_interval = compaction_interval
+
+        self._local: Dict[str, Dict[str, int]] = {}
+        self._local_dirty: Set[str] = set()
+        self._compaction_task: Optional[asyncio.Task] = None
+        self.stats = {"increments": 0, "compactions": 0, "rows_compacted": 0, "compaction_errors": 0}
+
+    def _get_redis(self):
+        if self._redis is None:
+            try:
+                from ..core.redis import get_redis_client
+                client = get_redis_client()
+            except (ImportError, RuntimeError):
+                return None
+            # The test no-op client has no hash commands
+            if not hasattr(client, "hincrby"):
+                return None
+            self._redis = client
+        return self._redis
+
+    def _get_session_factory(self):
+        if self._session_factory is None:
+            try:
+                from ..core.database import get_async_session_factory
+                self._session_factory = get_async_session_factory()
+            except (ImportError, RuntimeError):
+                return None
+        return self._session_factory
+
+    def _counter_key(self, tenant_id: str, period: str) -> str:
+        return f"{self.key_prefix}{tenant_id}:{period}"
+
+    def _parse_key(self, key: str) -> Tuple[str, str]:
+        tenant_id, period = key[len(self.key_prefix):].rsplit(":", 1)
+        return tenant_id, period
+
+    async def record(self, tenant_id: str, metric: str, quantity: int, at: Optional[datetime] = None):
+        """Add ``quantity`` to the tenant's counter for the metric and day"""
+        key = self._counter_key(tenant_id, (at or datetime.utcnow()).strftime(PERIOD_FORMAT))
+        self.stats["increments"] += 1
+
+        redis = self._get_redis()
+        if redis is None:
+            counters = self._local.setdefault(key, {})
+            counters[metric] = counters.get(metric, 0) + quantity
+            self._local_dirty.add(key)
+            return
+
+        pipe = redis.pipeline(transaction=True)
+        pipe.hincrby(key, metric, quantity)
+        pipe.expire(key, self.counter_ttl_seconds)
+        pipe.sadd(self.dirty_key, key)
+        await pipe.execute()
+
+    async def _read_counters(self, keys: List[str]) -> List[Dict[str, int]]:
+        redis = self._get_redis()
+        if redis is None:
+            return [dict(self._local.get(key, {})) for key in keys]
+
+        pipe = redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        return [
+            {(k.decode() if isinstance(k, bytes) else k): int(v) for k, v in (counters or {}).items()}
+            for counters in await pipe.execute()
+        ]
+
+    async def _take_dirty(self) -> List[str]:
+        """Claim dirty counters; increments from now on mark them dirty again"""
+        redis = self._get_redis()
+        if redis is None:
+            keys, self._local_dirty = list(self._local_dirty), set()
+            return keys
+
+        keys = [k.decode() if isinstance(k, bytes) else k for k in await redis.smembers(self.dirty_key)]
+        if keys:
+            await redis.srem(self.dirty_key, *keys)
+        return keys
+
+    async def _return_dirty(self, keys: List[str]):
+        redis = self._get_redis()
+        if redis is None:
+            self._local_dirty.update(keys)
+        elif keys:
+            await redis.sadd(self.dirty_key, *keys)
+
+    async def compact(self) -> int:
+        """Upsert dirty counters into usage_aggregates; returns rows written"""
+        session_factory = self._get_session_factory()
+        if session_factory is None:
+            return 0
+
+        keys = await self._take_dirty()
+        if not keys:
+            return 0
+
+        rows = []
+        for key, counters in zip(keys, await self._read_counters(keys)):
+            tenant_id, period = self._parse_key(key)
+            period_date = datetime.strptime(period, PERIOD_FORMAT).date()
+            rows.extend(
+                {"tenant_id": tenant_id, "metric": metric, "period_date": period_date, "quantity": quantity}
+                for metric, quantity in counters.items()
+            )
+
+        try:
+            if rows:
+                from sqlalchemy import text
+
+                async with session_factory() as session:
+                    # Counters are running totals; GREATEST keeps a lost Redis counter
+                    # from lowering an already compacted day
+                    await session.execute(
+                        text("""
+                            INSERT INTO usage_aggregates (tenant_id, metric, period_date, quantity, updated_at)
+                            VALUES (:tenant_id, :metric, :period_date, :quantity, NOW())
+                            ON CONFLICT (tenant_id, metric, period_date) DO UPDATE
+                            SET quantity = GREATEST(usage_aggregates.quantity, EXCLUDED.quantity),
+                                updated_at = NOW()
+                        """),
+                        rows
+                    )
+                    await session.commit()
+        except Exception:
+            self.stats["compaction_errors"] += 1
+            await self._return_dirty(keys)
+            raise
+
+        self.stats["compactions"] += 1
+        self.stats["rows_compacted"] += len(rows)
+        logger.debug("Compacted usage counters", counters=len(keys), rows=len(rows))
+        return len(rows)
+
+    async def _read_aggregates(self, tenant_id: str, start: date, end: date) -> Dict[str, Dict[str, int]]:
+        session_factory = self._get_session_factory()
+        if session_factory is None:
+            return {}
+
+        from sqlalchemy import text
+
+        async with session_factory() as session:
+            result = await session.execute(
+                text("""
+                    SELECT period_date, metric, quantity FROM usage_aggregates
+                    WHERE tenant_id = :tenant_id AND period_date BETWEEN :start AND :end
+                """),
+                {"tenant_id": tenant_id, "start": start, "end": end}
+            )
+            rows = result.all()
+
+        by_period: Dict[str, Dict[str, int]] = {}
+        for period_date, metric, quantity in rows:
+            by_period.setdefault(period_date.strftime(PERIOD_FORMAT), {})[metric] = int(quantity)
+        return by_period
+
+    async def summary(self, tenant_id: str, start: date, end: date) -> Dict[str, int]:
+        """Total per metric between start and end (inclusive days)"""
+        periods = list(iter_periods(start, end))
+        by_period = await self._read_aggregates(tenant_id, start, end)
+        live = await self._read_counters([self._counter_key(tenant_id, period) for period in periods])
+
+        totals: Dict[str, int] = {}
+        for period, counters in zip(periods, live):
+            # Live counters are at least as recent as the compacted row
+            merged = dict(by_period.get(period, {}))
+            for metric, quantity in counters.items():
+                merged[metric] = max(merged.get(metric, 0), quantity)
+            for metric, quantity in merged.items():
+                totals[metric] = totals.get(metric, 0) + quantity
+        return totals
+
+    async def _compaction_loop(self):
+        while True:
+            await asyncio.sleep(self.compaction_interval)
+            try:
+                await self.compact()
+            except Exception as e:
+                logger.warning("Usage compaction failed", error=str(e))
+
+    def start_compaction(self):
+        """Start periodic compaction on the running loop"""
+        if self._compaction_task is None or self._compaction_task.done():
+            self._compaction_task = asyncio.create_task(self._compaction_loop())
+
+    async def stop_compaction(self):
+        """Stop periodic compaction and flush what is still dirty"""
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            self._compaction_task = None
+        try:
+            await self.compact()
+        except Exception as e:
+            logger.warning("Final usage compaction failed", error=str(e))
+
+    def get_stats(self) -> Dict[str, object]:
+        return {**self.stats, "backend": "redis" if self._get_redis() is not None else "memory"}
+
+
+# Singleton instance
+_usage_meter: Optional[UsageMeter] = None
+
+
+def get_usage_meter() -> UsageMeter:
+    """Get or create the process-wide usage meter"""
+    global _usage_meter
+
+    if _usage_meter is None:
+        _usage_meter = UsageMeter()
+    return _usage_meter
@@ -85,6 +85,9 @@ else
   pip install -r backend/requirements.txt
 fi
 
+# Vocabolario del tokenizer (verificato via SHA-256, scaricato solo se manca)
+python backend/scripts/fetch_tokenizer.py || echo "⚠️ Vocabolario del tokenizer non disponibile: i conteggi dei token saranno stimati"
+
 # Rimuovi eventuali vecchie virtualenv stray (.venv, venv) non più usate
 for d in .venv venv; do
   if [[ -d "$d" && "$d" != "backend/venv" ]]; then
@@ -147,6 +147,7 @@ else
   info "Installing backend deps with pip"
   pip install -r backend/requirements.txt
 fi
+python backend/scripts/fetch_tokenizer.py || warning "Tokenizer vocabulary unavailable; exact token count tests will be skipped"
 
 # -----------------------------
 # Backend: Unit Tests
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from agents.services.agent_loader import DynamicAgentLoader
+
+AGENT_TEMPLATE = """---
+name: {name}
+description: {description}
+tools: []
+---
+
+You are **{name}**, a specialist expert in {focus}, specializing in audits, reviews
+and helping teams deliver reliable outcomes every single day.
+More persona detail follows here.
+And one more line of persona.
+
+## Section
+"""
+
+
+def _write_agent(directory, name, description="Data analytics specialist", focus="analytics"):
+    (directory / f"{name}.md").write_text(
+        AGENT_TEMPLATE.format(name=name, description=description, focus=focus), encoding="utf-8"
+    )
+
+
+def _loader(tmp_path, **kwargs):
+    return DynamicAgentLoader(
+        str(tmp_path / "defs"), enable_hot_reload=False, cache_path=str(tmp_path / "cache.json"), **kwargs
+    )
+
+
+def test_cold_load_reuses_cached_metadata(tmp_path):
+    (tmp_path / "defs").mkdir()
+    for i in range(5):
+        _write_agent(tmp_path / "defs", f"agent-{i}")
+
+    first = _loader(tmp_path)
+    agents = first.scan_and_load_agents()
+    assert len(agents) == 5 and first.load_stats["parsed"] == 5
+
+    second = _loader(tmp_path)
+    assert second.scan_and_load_agents() == agents
+    assert second.load_stats["parsed"] == 0 and second.load_stats["cached"] == 5
+
+    _write_agent(tmp_path / "defs", "agent-3", description="Security architecture lead")
+    third = _loader(tmp_path)
+    reloaded = third.scan_and_load_agents()
+    assert third.load_stats["parsed"] == 1
+    assert reloaded["agent_3"].tier == "Technology & Engineering"
+
+
+@pytest.mark.asyncio
+async def test_bursts_of_edits_reload_once_per_file(tmp_path):
+    (tmp_path / "defs").mkdir()
+    _write_agent(tmp_path / "defs", "agent-a")
+    _write_agent(tmp_path / "defs", "agent-b")
+    loader = _loader(tmp_path, reload_debounce=0.05)
+    loader.scan_and_load_agents()
+
+    reloads = []
+    loader.register_reload_callback(lambda key, metadata: reloads.append((key, metadata.description)))
+    loader._reload_wakeup = asyncio.Event()
+    task = asyncio.create_task(loader._debounce_loop())
+    try:
+        for i in range(5):
+            _write_agent(tmp_path / "defs", "agent-a", description=f"Data analytics specialist v{i}")
+            loader._schedule_reload(tmp_path / "defs" / "agent-a.md")
+            loader._schedule_reload(tmp_path / "defs" / "agent-b.md")
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)
+    finally:
+        task.cancel()
+
+    # agent-b did not change, agent-a is reloaded once with its final content
+    assert reloads == [("agent_a", "Data analytics specialist v4")]
+    assert loader.agent_metadata["agent_a"].description.endswith("v4")
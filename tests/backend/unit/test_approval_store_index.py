@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from agents.services.hitl.approval_store_redis import (
+    ApprovalRequest,
+    ApprovalStatus,
+    RedisApprovalStore,
+    RiskLevel,
+)
+
+from fake_redis import FakeRedis
+
+
+async def _add(store, approval_id, user_id, conversation_id, created_at):
+    approval = ApprovalRequest(
+        approval_id=approval_id,
+        conversation_id=conversation_id,
+        user_id=user_id,
+        agent_id="agent",
+        status=ApprovalStatus.PENDING,
+        risk_level=RiskLevel.HIGH,
+        action_type="delete",
+        action_description="",
+        payload={},
+        metadata={},
+        created_at=created_at,
+        updated_at=created_at,
+        expires_at=None,
+    )
+    await store._store_approval(approval)
+    await store._index_approval(approval)
+    return approval
+
+
+@pytest.mark.asyncio
+async def test_list_returns_newest_first_across_filters():
+    redis = FakeRedis()
+    store = RedisApprovalStore(redis)
+    base = datetime(2025, 1, 1)
+    for i in range(30):
+        await _add(store, f"a{i:02d}", "alice" if i % 2 else "bob", "c1", base + timedelta(minutes=i))
+
+    page = await store.list_approvals(status=ApprovalStatus.PENDING, user_id="alice", limit=3)
+    assert [a.approval_id for a in page] == ["a29", "a27", "a25"]
+
+    page = await store.list_approvals(status=ApprovalStatus.PENDING, user_id="alice", limit=3, offset=3)
+    assert [a.approval_id for a in page] == ["a23", "a21", "a19"]
+
+    newest = await store.list_approvals(limit=2)
+    assert [a.approval_id for a in newest] == ["a29", "a28"]
+    # Temporary intersection keys are cleaned up
+    assert not [key for key in redis.zsets if ":tmp:" in key]
+
+
+@pytest.mark.asyncio
+async def test_page_fetch_is_batched_and_prunes_expired_payloads():
+    redis = FakeRedis()
+    store = RedisApprovalStore(redis)
+    base = datetime(2025, 1, 1)
+    for i in range(5):
+        await _add(store, f"a{i}", "alice", "c1", base + timedelta(minutes=i))
+    # Payload expired while the index entry survived
+    del redis.strings["approval:a3"]
+
+    redis.round_trips = 0
+    page = await store.list_approvals(user_id="alice", limit=3)
+
+    assert [a.approval_id for a in page] == ["a4", "a2", "a1"]
+    assert "a3" not in redis.zsets["approval_zindex:user:alice"]
+    # range + mget, prune, range + mget
+    assert redis.round_trips == 5
+
+
+@pytest.mark.asyncio
+async def test_status_change_moves_index_and_counts():
+    redis = FakeRedis()
+    store = RedisApprovalStore(redis)
+    approval = await _add(store, "a1", "alice", "c1", datetime(2025, 1, 1))
+
+    approval.status = ApprovalStatus.APPROVED
+    await store._update_indexes(approval)
+
+    assert await store.count_approvals(ApprovalStatus.PENDING) == 0
+    assert await store.count_approvals(ApprovalStatus.APPROVED) == 1
+
+
+@pytest.mark.asyncio
+async def test_legacy_set_index_is_migrated_once():
+    redis = FakeRedis()
+    store = RedisApprovalStore(redis)
+    base = datetime(2025, 1, 1)
+    for i in range(3):
+        await _add(store, f"a{i}", "alice", "c1", base + timedelta(minutes=i))
+    redis.zsets.clear()  # indexed before the sorted sets existed
+    redis.sets = {
+        "approval_index:user:alice": {"a0", "a1", "a2", "gone"},
+        "approval_index:conversation:c1": {"a0", "a1", "a2"},
+        "approval_index:status:pending": {"a0", "a1", "a2", "gone"},
+    }
+
+    await store.initialize()
+
+    assert [a.approval_id for a in await store.list_approvals(user_id="alice")] == ["a2", "a1", "a0"]
+    assert await store.count_approvals(ApprovalStatus.PENDING) == 3
+    assert redis.sets == {}
+    redis.sets["approval_index:user:bob"] = {"a0"}
+    assert await store.migrate_legacy_index() == 0
@@ -0,0 +1,79 @@
+import pytest
+
+from src.agents.serialization.blob_store import ComponentBlobStore, compress, decompress
+from src.agents.serialization.component_serializer import ComponentSerializer
+
+from fake_redis import FakeRedis
+
+
+def test_codec_round_trip_and_compression():
+    payload = b'{"messages":' + b'"hello world",' * 500 + b'"end"}'
+    blob = compress(payload)
+    assert len(blob) < len(payload) / 10
+    assert decompress(blob) == payload
+
+
+@pytest.mark.asyncio
+async def test_identical_payloads_are_stored_once():
+    redis = FakeRedis(decode_responses=False)
+    store = ComponentBlobStore(redis)
+
+    first = await store.put_many([b"agent-a", b"agent-b", b"agent-a"])
+    assert [is_new for _, _, is_new in first] == [True, True, False]
+    assert first[0][0] == first[2][0]
+
+    again = await store.put(b"agent-a")
+    assert again[2] is False
+    assert len(redis.strings) == 2
+
+    fetched = [item async for item in store.iter_many([first[1][0], first[0][0], "missing"], batch_size=2)]
+    assert fetched == [(first[1][0], b"agent-b"), (first[0][0], b"agent-a"), ("missing", None)]
+    assert redis.calls["mget"] == 2
+
+
+@pytest.mark.asyncio
+async def test_snapshots_reference_unchanged_components():
+    serializer = ComponentSerializer()
+    # c0 is serialized twice without changes
+    for conversation_id in ("c0", "c0", "c1"):
+        await serializer.serialize_conversation_context(conversation_id, "amy", [{"role": "user", "content": "x" * 2000}])
+    await serializer.serialize_workflow_state("w1", {"type": "pipeline", "steps": list(range(100))})
+
+    first = await serializer.create_system_snapshot("one", include_agents=False)
+    second = await serializer.create_system_snapshot("two", include_agents=False)
+
+    # Identical payloads share one blob
+    assert first.system_metadata["unique_payloads"] == 3
+    assert second.system_metadata["new_bytes_stored"] == 0
+
+    await serializer.serialize_conversation_context("c9", "amy", [{"role": "user", "content": "new"}])
+    third = await serializer.create_system_snapshot("three", include_agents=False)
+    assert third.system_metadata["total_components"] == 5
+    assert third.system_metadata["new_bytes_stored"] == 0  # stored when serialized
+
+    restored = [component async for component, data in serializer._iter_snapshot_components(third.components)
+                if not isinstance(data, Exception)]
+    assert len(restored) == 5
+
+    workflow = next(c for c in third.components if c.component_type == "workflow")
+    data = await serializer.deserialize_component(workflow.component_id)
+    assert data["workflow_data"]["steps"] == list(range(100))
+    assert "serialized_at" in data
+
+
+@pytest.mark.asyncio
+async def test_snapshots_keep_referenced_blobs_alive():
+    redis = FakeRedis(decode_responses=False)
+    serializer = ComponentSerializer()
+    serializer.blob_store = ComponentBlobStore(redis)
+    await serializer.serialize_conversation_context("c0", "amy", [{"role": "user", "content": "hi"}])
+    await serializer.serialize_workflow_state("w1", {"type": "pipeline"})
+
+    redis.calls.clear()
+    await serializer.create_system_snapshot("one", include_agents=False)
+    assert redis.calls["expire"] == 2  # both blobs refreshed, nothing rewritten
+    assert redis.calls["set"] == 0
+
+    digest = next(iter(serializer.serialized_components.values())).content_hash
+    redis.strings.pop(f"component_blob:{digest}")
+    assert await serializer.blob_store.touch_many([digest, digest]) == [digest]
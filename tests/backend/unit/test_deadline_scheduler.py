@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import pytest
+
+from agents.services.hitl.deadline_scheduler import DeadlineScheduler
+
+from fake_redis import FakeRedis
+
+
+@pytest.mark.asyncio
+async def test_fires_at_deadline_not_on_poll_interval():
+    scheduler = DeadlineScheduler(max_sleep=30.0)
+    fired = asyncio.Event()
+    fired_at = {}
+
+    async def handler(item_id):
+        fired_at[item_id] = time.time()
+        fired.set()
+
+    scheduler.register_handler("approval_timeout", handler)
+    await scheduler.start()
+    try:
+        due = time.time() + 0.05
+        await scheduler.schedule("approval_timeout", "a1", due)
+        await asyncio.wait_for(fired.wait(), timeout=2)
+    finally:
+        await scheduler.stop()
+
+    assert fired_at["a1"] - due < 0.5
+
+
+@pytest.mark.asyncio
+async def test_due_items_are_claimed_by_exactly_one_worker():
+    redis = FakeRedis()
+    handled = []
+
+    async def handler(item_id):
+        handled.append(item_id)
+
+    workers = [DeadlineScheduler(redis) for _ in range(2)]
+    for worker in workers:
+        worker.register_handler("pause_timeout", handler)
+
+    now = time.time()
+    for i in range(10):
+        await workers[0].schedule("pause_timeout", f"c{i}", now - 1)
+    await workers[0].schedule("pause_timeout", "later", now + 3600)
+
+    await asyncio.gather(*(worker.process_due() for worker in workers))
+
+    assert sorted(handled) == sorted(f"c{i}" for i in range(10))
+    assert await workers[1].next_deadline() == pytest.approx(now + 3600)
+
+
+@pytest.mark.asyncio
+async def test_failed_handler_is_rescheduled():
+    redis = FakeRedis()
+    scheduler = DeadlineScheduler(redis, retry_delay=60)
+
+    async def handler(item_id):
+        raise RuntimeError("boom")
+
+    scheduler.register_handler("approval_timeout", handler)
+    await scheduler.schedule("approval_timeout", "a1", time.time() - 1)
+
+    assert await scheduler.process_due() == 1
+    assert await scheduler.next_deadline() > time.time() + 30
+    assert await scheduler.cancel("approval_timeout", "a1")
+
+
+@pytest.mark.asyncio
+async def test_lease_of_a_crashed_worker_expires_instead_of_losing_the_deadline():
+    redis = FakeRedis()
+    crashed = DeadlineScheduler(redis, lease_seconds=30)
+    survivor = DeadlineScheduler(redis, lease_seconds=30)
+
+    async def handler(item_id):
+        pass
+
+    survivor.register_handler("approval_timeout", handler)
+    now = time.time()
+    await crashed.schedule("approval_timeout", "a1", now - 1)
+
+    # The first worker claims the item and dies before its handler runs
+    assert await crashed.claim_due("approval_timeout", now) == [("a1", pytest.approx(now - 1))]
+    assert await survivor.claim_due("approval_timeout", now) == []
+    assert await survivor.next_deadline() == pytest.approx(now + 30)
+
+    redis.strings.pop("hitl:deadlines:approval_timeout:lease:a1")  # lease TTL runs out
+    assert await survivor.claim_due("approval_timeout", now + 31) == [("a1", pytest.approx(now + 30))]
+    await survivor.complete("approval_timeout", "a1")
+    assert await survivor.next_deadline() is None
+    assert redis.strings == {}
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from src.agents.services.decision_memory import (
+    FEATURE_DIM,
+    DecisionRecord,
+    InMemoryDecisionStore,
+    build_feature_vector,
+    rank_similar,
+)
+from src.agents.services.enhanced_decision_engine import AutonomousDecisionEngine, DecisionContext
+
+
+def _record(decision_id, domain, decision_type, agents, outcome=None):
+    return DecisionRecord(
+        decision_id=decision_id,
+        business_domain=domain,
+        decision_type=decision_type,
+        agents=agents,
+        features=build_feature_vector(domain, decision_type, agents, []),
+        summary={},
+        outcome_score=outcome,
+    )
+
+
+def test_feature_vectors_are_unit_length_and_weighted():
+    same = build_feature_vector("finance", "agent_selection", ["amy", "baccio"], [])
+    other_agents = build_feature_vector("finance", "agent_selection", ["luca"], [])
+    other_domain = build_feature_vector("security", "escalation", ["luca"], [])
+
+    assert len(same) == FEATURE_DIM
+    assert np.isclose(np.linalg.norm(same), 1.0)
+    assert np.dot(same, same) > np.dot(same, other_agents) > np.dot(same, other_domain)
+
+
+@pytest.mark.asyncio
+async def test_search_spans_full_history_and_ranks_by_outcome():
+    store = InMemoryDecisionStore(max_records=2000)
+    for i in range(1500):
+        await store.add(_record(f"noise-{i}", f"domain-{i % 7}", "escalation", [f"agent-{i % 11}"]))
+    await store.add(_record("failed", "finance", "agent_selection", ["amy", "baccio"], outcome=0.0))
+    await store.add(_record("succeeded", "finance", "agent_selection", ["amy", "baccio"]))
+    assert await store.record_outcome("succeeded", 0.9)
+
+    query = build_feature_vector("finance", "agent_selection", ["amy", "baccio"], [])
+    candidates = await store.search(query, 20)
+    assert {record.decision_id for record, _ in candidates[:2]} == {"failed", "succeeded"}
+
+    ranked = rank_similar(candidates, top_k=2)
+    assert ranked[0].record.decision_id == "succeeded"
+    assert ranked[0].score > ranked[1].score
+
+
+@pytest.mark.asyncio
+async def test_store_evicts_oldest_when_full():
+    store = InMemoryDecisionStore(max_records=10)
+    for i in range(25):
+        await store.add(_record(f"d{i}", "finance", "escalation", ["amy"]))
+
+    assert await store.count() <= 10
+    assert not await store.record_outcome("d0", 1.0)
+    assert await store.record_outcome("d24", 1.0)
+
+
+@pytest.mark.asyncio
+async def test_engine_persists_decisions_and_outcomes(monkeypatch):
+    engine = AutonomousDecisionEngine()
+    engine.decision_memory = InMemoryDecisionStore()
+
+    async def no_embedding(query):
+        return []
+    monkeypatch.setattr(engine, "_query_embedding", no_embedding)
+    context = DecisionContext(
+        user_query="Which agents should review our Q3 budget?",
+        business_domain="finance",
+        urgency_level="medium",
+        available_agents=["business_analyst", "cost_optimizer", "data_scientist"],
+        system_resources={},
+        historical_performance={},
+        current_workload={},
+    )
+
+    plan = await engine.analyze_and_decide(context)
+    assert await engine.decision_memory.count() == 1
+
+    await engine._record_decision_outcome(type("Outcome", (), {
+        "decision_id": plan.decision_id, "execution_status": "completed", "quality_achieved": 0.9,
+    })())
+    similar = await engine._find_similar_historical_decisions(context, plan.decision_type, [])
+    assert similar and similar[0].record.decision_id == plan.decision_id
+    assert similar[0].record.outcome_score == 0.9
@@ -0,0 +1,78 @@
+import pytest
+
+from core.embedding_cache import EmbeddingCache
+
+
+class _FakePipeline:
+    def __init__(self, store):
+        self.store = store
+        self.ops = []
+
+    def setex(self, key, ttl, value):
+        self.ops.append((key, value))
+
+    async def execute(self):
+        self.store.calls.append(("pipeline", len(self.ops)))
+        for key, value in self.ops:
+            self.store.data[key] = value
+
+
+class _FakeRedis:
+    """Bytes-returning Redis stand-in that records round trips"""
+
+    def __init__(self):
+        self.data = {}
+        self.calls = []
+
+    async def mget(self, keys):
+        self.calls.append(("mget", len(keys)))
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+@pytest.mark.asyncio
+async def test_batch_lookup_and_write_use_one_round_trip_each():
+    redis = _FakeRedis()
+    cache = EmbeddingCache(redis, model="m", dimension=3, lru_size=0)
+
+    await cache.set_many(["a", "b"], [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    results = await cache.get_many(["a", "missing", "b"])
+
+    assert results == [[1.0, 2.0, 3.0], None, [4.0, 5.0, 6.0]]
+    assert redis.calls == [("pipeline", 2), ("mget", 3)]
+    # Packed float32: 4 bytes per component
+    assert all(len(value) == 12 for value in redis.data.values())
+
+
+@pytest.mark.asyncio
+async def test_lru_tier_serves_hot_texts_without_redis():
+    redis = _FakeRedis()
+    cache = EmbeddingCache(redis, model="m", dimension=2)
+
+    await cache.set("agent keywords", [0.5, 0.25])
+    redis.calls.clear()
+
+    assert await cache.get("agent keywords") == [0.5, 0.25]
+    assert redis.calls == []
+    assert cache.get_stats()["lru_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_by_model_and_dimension():
+    redis = _FakeRedis()
+    small = EmbeddingCache(redis, model="small", dimension=2, lru_size=0)
+    large = EmbeddingCache(redis, model="large", dimension=4, lru_size=0)
+
+    await small.set("text", [1.0, 2.0])
+
+    assert small.key_for("text") != large.key_for("text")
+    assert await large.get("text") is None
+
+
+def test_float16_roundtrip_halves_payload():
+    cache = EmbeddingCache(model="m", dimension=2, dtype="float16")
+    payload = cache.pack([0.5, -1.0])
+    assert len(payload) == 4
+    assert cache.unpack(payload) == [0.5, -1.0]
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from core.embedding_service import EmbeddingService
+
+
+class _FakeModel:
+    """Deterministic stand-in for SentenceTransformer.encode"""
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+
+    def encode(self, texts, normalize_embeddings=True, batch_size=None):
+        self.calls.append(list(texts))
+        self.threads.add(threading.current_thread().name)
+        return np.array([[float(len(t)), 1.0] for t in texts])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch():
+    model = _FakeModel()
+    service = EmbeddingService(max_batch_size=16, max_wait_ms=20, model_loader=lambda: model)
+    try:
+        results = await asyncio.gather(*(service.embed("x" * i) for i in range(1, 6)))
+    finally:
+        await service.shutdown()
+
+    assert [r[0] for r in results] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert len(model.calls) == 1
+    assert all(name.startswith("embedding-worker") for name in model.threads)
+    metrics = service.get_metrics()
+    assert metrics["batches"] == 1
+    assert metrics["max_batch_size_seen"] == 5
+    assert metrics["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_large_input_is_split_at_max_batch_size():
+    model = _FakeModel()
+    service = EmbeddingService(max_batch_size=4, max_wait_ms=1, model_loader=lambda: model)
+    try:
+        results = await service.embed_many([str(i) for i in range(10)])
+    finally:
+        await service.shutdown()
+
+    assert len(results) == 10
+    assert max(len(call) for call in model.calls) <= 4
+
+
+@pytest.mark.asyncio
+async def test_model_failure_propagates_to_callers():
+    class _Broken:
+        def encode(self, *args, **kwargs):
+            raise ValueError("boom")
+
+    service = EmbeddingService(max_wait_ms=1, model_loader=_Broken)
+    try:
+        with pytest.raises(ValueError):
+            await service.embed("hello")
+    finally:
+        await service.shutdown()
+    assert service.get_metrics()["failed_batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_shutdown_waits_for_in_flight_batches():
+    release = threading.Event()
+
+    class _Slow(_FakeModel):
+        def encode(self, texts, **kwargs):
+            release.wait(2)
+            return super().encode(texts, **kwargs)
+
+    service = EmbeddingService(max_wait_ms=1, model_loader=_Slow)
+    pending = asyncio.ensure_future(service.embed("abc"))
+    while not service.get_metrics()["inflight_batches"]:
+        await asyncio.sleep(0.005)
+
+    stopping = asyncio.ensure_future(service.shutdown())
+    await asyncio.sleep(0.02)
+    assert not stopping.done()
+
+    release.set()
+    await stopping
+    assert (await pending)[0] == 3.0
+    assert not service._batch_tasks
@@ -0,0 +1,49 @@
+import pytest
+
+from services.export_service import ExportService
+
+
+async def _read_body(response) -> bytes:
+    chunks = []
+    async for chunk in response.body_iterator:
+        chunks.append(chunk if isinstance(chunk, bytes) else chunk.encode())
+    return b"".join(chunks)
+
+
+async def _rows(count):
+    for i in range(count):
+        yield {"id": i, "meta": {"score": i * 10}}
+
+
+@pytest.mark.asyncio
+async def test_csv_export_streams_async_rows_one_chunk_per_row():
+    response = ExportService.export_to_csv(_rows(3), fieldnames=["id", "meta_score"])
+    chunks = [chunk async for chunk in response.body_iterator]
+    # Header is emitted together with the first row, then one chunk per row
+    assert len(chunks) == 3
+    assert b"".join(chunks).decode().splitlines() == ["id,meta_score", "0,0", "1,10", "2,20"]
+
+
+@pytest.mark.asyncio
+async def test_csv_export_from_list_keeps_union_of_keys():
+    body = await _read_body(ExportService.export_to_csv([{"a": 1}, {"b": 2}]))
+    assert body.decode().splitlines() == ["a,b", "1,", ",2"]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_writes_one_object_per_line():
+    body = await _read_body(ExportService.export_to_ndjson(_rows(2)))
+    assert body.decode().splitlines() == [
+        '{"id": 0, "meta": {"score": 0}}',
+        '{"id": 1, "meta": {"score": 10}}',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_excel_export_uses_write_only_workbook():
+    openpyxl = pytest.importorskip("openpyxl")
+    import io
+
+    body = await _read_body(ExportService.export_to_excel(_rows(2)))
+    wb = openpyxl.load_workbook(io.BytesIO(body))
+    assert list(wb.active.iter_rows(values_only=True)) == [("id", "meta_score"), (0, 0), (1, 10)]
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from src.agents.services import insight_engine as insight_module
+from src.agents.services.event_bus import Event, EventBus, EventType
+from src.agents.services.insight_engine import Insight, InsightEngine, Rule, InsightType
+from src.agents.services.observability.telemetry import ObservabilityEvent
+
+
+def _rule(rule_id, inputs, evaluated, priority=5, condition=None):
+    def check(ctx):
+        evaluated.append(rule_id)
+        return condition(ctx) if condition else False
+
+    return Rule(
+        id=rule_id, name=rule_id, description="", type=InsightType.RECOMMENDATION,
+        condition=check, action=lambda ctx: Insight(title=rule_id),
+        priority=priority, inputs=inputs,
+    )
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(insight_module, "event_bus", EventBus())
+    engine = InsightEngine()
+    for rule_id in list(engine.rules):
+        engine.unregister_rule(rule_id)
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_only_rules_reading_changed_keys_run_in_priority_order(engine):
+    evaluated = []
+    for i in range(1000):
+        engine.register_rule(_rule(f"noise_{i}", (f"metric_{i}",), evaluated))
+    engine.register_rule(_rule("low", ("queue_depth",), evaluated, priority=1))
+    engine.register_rule(_rule("both", ("queue_depth", "error_rate"), evaluated, priority=9))
+    engine.register_rule(_rule("high", ("error_rate",), evaluated, priority=7,
+                               condition=lambda ctx: ctx["error_rate"] > 0.1))
+    await engine.start()
+
+    assert engine.update_context({"queue_depth": 3, "error_rate": 0.2}) == {"queue_depth", "error_rate"}
+    await asyncio.sleep(0.01)
+    assert evaluated == ["both", "high", "low"]
+    assert [insight.title for insight in engine.insights] == ["high"]
+
+    # Unchanged values do not re-run anything
+    evaluated.clear()
+    assert engine.update_context({"queue_depth": 3}) == set()
+    await asyncio.sleep(0.01)
+    assert evaluated == []
+
+    stats = {item["rule_id"]: item for item in engine.get_rule_stats()}
+    assert stats["high"]["evaluations"] == 1 and stats["high"]["triggered"] == 1
+    assert stats["noise_0"]["evaluations"] == 0
+    await engine.stop()
+
+
+@pytest.mark.asyncio
+async def test_event_and_telemetry_changes_trigger_the_rules_that_depend_on_them(engine):
+    evaluated = []
+    engine.register_rule(_rule("slow", ("telemetry",), evaluated,
+                               condition=lambda ctx: ctx["telemetry"].get("avg_response_time", 0) > 1000))
+    engine.register_rule(_rule("blocked", ("blocked_tasks",), evaluated))
+
+    engine.update_context({"blocked_tasks": 2})  # before start: evaluated once started
+    await engine.start()
+    await asyncio.sleep(0.01)
+    assert evaluated == ["blocked"]
+
+    engine._on_context_event(Event(type=EventType.TASK_BLOCKED, source="test", data={"context": {"blocked_tasks": 6}}))
+    engine._on_performance_event(ObservabilityEvent.PERFORMANCE_DEGRADATION, None,
+                                 {"performance.issue": "avg_response_time", "metric.value": 1500})
+    await asyncio.sleep(0.01)
+    assert sorted(evaluated) == ["blocked", "blocked", "slow"]
+    assert [insight.title for insight in engine.insights] == ["slow"]
+
+    engine.unregister_rule("slow")
+    engine.update_context({"telemetry": {"avg_response_time": 2000}})
+    await asyncio.sleep(0.01)
+    assert evaluated.count("slow") == 1
+    await engine.stop()
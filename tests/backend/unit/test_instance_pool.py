@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from agents.orchestrators.pool import InstancePool, PoolTimeoutError
+
+
+class _Team:
+    def __init__(self, number):
+        self.number = number
+        self.history = []
+        self.resets = 0
+
+
+def _factory():
+    built = []
+
+    def build():
+        team = _Team(len(built))
+        built.append(team)
+        return team
+
+    return build, built
+
+
+async def _reset(team):
+    team.history.clear()
+    team.resets += 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checkouts_get_distinct_clean_instances():
+    build, built = _factory()
+    pool = InstancePool("team", build, max_size=3, reset=_reset)
+    assert await pool.warm(1) == 1
+
+    seen = []
+
+    async def run(message):
+        async with pool.checkout() as team:
+            assert team.history == []
+            team.history.append(message)
+            seen.append(team)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(run(i) for i in range(3)))
+
+    assert len({id(team) for team in seen}) == 3
+    assert len(built) == 3
+    assert all(team.history == [] and team.resets == 1 for team in built)
+    metrics = pool.get_metrics()
+    assert metrics["checkouts"] == 3 and metrics["idle"] == 3 and metrics["in_use"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_times_out_when_pool_is_exhausted():
+    build, _ = _factory()
+    pool = InstancePool("team", build, max_size=1, acquire_timeout=0.05)
+    release = asyncio.Event()
+
+    async def hold():
+        async with pool.checkout():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    with pytest.raises(PoolTimeoutError):
+        async with pool.checkout():
+            pass
+    release.set()
+    await holder
+
+    metrics = pool.get_metrics()
+    assert metrics["timeouts"] == 1
+    assert metrics["max_wait_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_failed_run_discards_instance():
+    build, built = _factory()
+    pool = InstancePool("agent:ali", build, max_size=1, reset=_reset)
+
+    with pytest.raises(RuntimeError):
+        async with pool.checkout() as team:
+            raise RuntimeError("model error")
+
+    async with pool.checkout() as team:
+        assert team is built[1]
+    assert pool.get_metrics()["discarded"] == 1
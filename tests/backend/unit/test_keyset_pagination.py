@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, select
+from sqlalchemy.dialects import postgresql
+
+from core.pagination import CursorPaginator, PaginationParams
+
+
+_engagements = Table(
+    "engagements",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("created_at", DateTime, nullable=False),
+)
+
+
+def _compile(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_compound_cursor_uses_row_value_comparison():
+    cursor = CursorPaginator.encode_cursor({"created_at": "2024-05-01T10:00:00", "id": 42})
+    query, params = CursorPaginator.paginate_query(
+        "SELECT id, created_at FROM activities",
+        {},
+        PaginationParams(limit=10, cursor=cursor),
+        order_field="created_at",
+        order_desc=True,
+        key_fields=["created_at", "id"],
+    )
+    assert "(created_at, id) < (:cursor_created_at, :cursor_id)" in query
+    assert query.endswith("ORDER BY created_at DESC, id DESC LIMIT :limit")
+    assert params["cursor_created_at"] == datetime(2024, 5, 1, 10, 0)
+    assert params["limit"] == 11
+
+
+def test_paginate_select_seeks_past_cursor_without_offset():
+    cursor = CursorPaginator.create_cursor_from_item(
+        {"created_at": "2024-05-01T10:00:00", "id": 7}, ["created_at", "id"]
+    )
+    query = CursorPaginator.paginate_select(
+        select(_engagements.c.id),
+        PaginationParams(limit=5, cursor=cursor),
+        [_engagements.c.created_at, _engagements.c.id],
+    )
+    sql = _compile(query)
+    assert "(engagements.created_at, engagements.id) < ('2024-05-01 10:00:00', 7)" in sql
+    assert "OFFSET" not in sql
+    assert "LIMIT 6" in sql
+
+
+def test_prev_page_is_returned_in_listing_order():
+    items = [{"created_at": f"2024-05-0{i}", "id": i} for i in (1, 2, 3)]
+    pagination = PaginationParams(limit=2, cursor="x", direction="prev")
+    page = CursorPaginator.create_response(items, pagination, key_fields=["created_at", "id"])
+    assert [item["id"] for item in page["items"]] == [2, 1]
+    assert page["has_more"] is True
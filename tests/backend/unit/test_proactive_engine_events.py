@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from src.agents.services import ali_proactive_engine as proactive_engine
+from src.agents.services.ali_proactive_engine import AliProactiveEngine
+from src.agents.services.event_bus import Event, EventBus, EventType
+
+
+def _engine(calls):
+    engine = AliProactiveEngine()
+    engine.debounce_seconds = {signal: 0.05 for signal in engine.debounce_seconds}
+
+    def refresher(signal):
+        async def refresh():
+            calls.append(signal)
+            await asyncio.sleep(0.05)
+        return refresh
+
+    engine._refreshers = {signal: refresher(signal) for signal in engine._refreshers}
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_bursts_of_changes_coalesce_into_one_refresh():
+    calls = []
+    engine = _engine(calls)
+
+    for _ in range(20):
+        engine._on_change_event(Event(type=EventType.TALENT_CHANGED, source="test"))
+    await asyncio.sleep(0.2)
+
+    assert sorted(calls) == ["business", "team"]
+    assert engine.refresh_stats["team"] == {
+        "events": 20, "refreshes": 1, "errors": 0, "last_refresh": engine.refresh_stats["team"]["last_refresh"]
+    }
+    assert engine._refresh_tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_changes_during_a_refresh_trigger_another_pass():
+    calls = []
+    engine = _engine(calls)
+
+    engine.notify_change("financial")
+    await asyncio.sleep(0.07)  # first refresh is running
+    engine.notify_change("financial")
+    await asyncio.sleep(0.25)
+
+    assert calls == ["financial", "financial"]
+    with pytest.raises(ValueError):
+        engine.notify_change("weather")
+
+
+@pytest.mark.asyncio
+async def test_engine_idles_until_the_bus_delivers_a_change(monkeypatch):
+    calls = []
+    engine = _engine(calls)
+    bus = EventBus()
+    monkeypatch.setattr(proactive_engine, "event_bus", bus)
+
+    monitor = asyncio.create_task(engine.start_continuous_monitoring())
+    await asyncio.sleep(0.3)
+    assert sorted(calls) == sorted(engine._refreshers)  # start-up reconciliation only
+
+    calls.clear()
+    bus.publish_nowait(Event(type=EventType.COST_RECORDED, source="test"))
+    await asyncio.sleep(0.2)
+    assert calls == ["financial"]
+
+    await engine.stop_monitoring()
+    await asyncio.wait_for(monitor, 1)
+    await bus.stop()
+
+    assert not bus.publish_nowait(Event(type=EventType.COST_RECORDED, source="test"))
+    assert bus.metrics["dropped_events"] == 1
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from agents.orchestrators.coalescing import CoalescePolicy, RequestCoalescer
+
+
+def _coalescer():
+    return RequestCoalescer({
+        "chat": CoalescePolicy(scope="user", context_keys=("target_agent",)),
+        "dashboard": CoalescePolicy(scope="global", cache_ttl_seconds=60.0),
+    })
+
+
+def test_keys_follow_route_rules():
+    coalescer = _coalescer()
+    key = coalescer.key_for("chat", "What is  our revenue?", "amy", {}, "u1", "c1")
+
+    assert key == coalescer.key_for("chat", "what is our revenue?", "Amy", {"other": 1}, "u1", "c1")
+    assert key != coalescer.key_for("chat", "What is our revenue?", "amy", {}, "u2", "c1")
+    assert coalescer.key_for("unknown", "What is our revenue?") is None
+    assert coalescer.key_for("chat", "hi", context={"test_mode": True}, user_id="u1") is None
+    assert coalescer.key_for("dashboard", "kpis", conversation_id="c1") is None
+    assert coalescer.key_for("dashboard", "kpis", user_id="u1") == coalescer.key_for("dashboard", "kpis", user_id="u2")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_one_execution_and_cache():
+    coalescer = _coalescer()
+    calls = 0
+
+    async def run_model():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return {"response": "42", "agents_used": ["amy"]}
+
+    key = coalescer.key_for("dashboard", "kpis")
+    results = await asyncio.gather(*(coalescer.run(key, run_model) for _ in range(5)))
+
+    assert calls == 1
+    assert all(result["response"] == "42" for result in results)
+    assert sum(result.get("coalesced") == "in_flight" for result in results) == 4
+
+    results[0]["response"] = "mutated"
+    cached = await coalescer.run(key, run_model)
+    assert calls == 1
+    assert cached["response"] == "42" and cached["coalesced"] == "cache"
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_but_not_cached():
+    coalescer = _coalescer()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("model down")
+
+    key = coalescer.key_for("dashboard", "kpis")
+    results = await asyncio.gather(*(coalescer.run(key, failing) for _ in range(3)), return_exceptions=True)
+    assert calls == 1 and all(isinstance(result, RuntimeError) for result in results)
+
+    with pytest.raises(RuntimeError):
+        await coalescer.run(key, failing)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_streams_are_shared_between_subscribers():
+    coalescer = _coalescer()
+    runs = 0
+
+    async def produce():
+        nonlocal runs
+        runs += 1
+        for chunk in ("a", "b", "c"):
+            await asyncio.sleep(0.01)
+            yield chunk
+
+    async def consume():
+        return [chunk async for chunk in coalescer.stream(key, produce)]
+
+    key = coalescer.key_for("chat", "tell me", user_id="u1")
+    first, second = await asyncio.gather(consume(), consume())
+
+    assert runs == 1
+    assert first == second == ["a", "b", "c"]
+
+    # Finished producers are released, whatever their keys
+    for i in range(20):
+        other = coalescer.key_for("chat", f"tell me {i}", user_id="u1")
+        assert [chunk async for chunk in coalescer.stream(other, produce)] == ["a", "b", "c"]
+    await asyncio.sleep(0)
+    assert coalescer.get_stats()["active_streams"] == 0
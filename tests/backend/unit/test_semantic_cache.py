@@ -0,0 +1,60 @@
+import re
+
+import pytest
+
+from src.core.semantic_cache import SemanticResponseCache
+
+from fake_redis import FakeRedis
+
+VOCABULARY = ["q3", "q4", "burn", "revenue", "hiring"]
+
+
+async def _embed(text):
+    """Bag of known keywords, so paraphrases land on the same vector"""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return [float(words.count(term)) for term in VOCABULARY]
+
+
+@pytest.mark.asyncio
+async def test_paraphrases_hit_within_the_agents_threshold():
+    cache = SemanticResponseCache(embed=_embed, default_threshold=0.9, agent_thresholds={"amy": 0.4})
+    await cache.put("What's our Q3 burn?", "ali", "Q3 burn was $1.2M")
+    await cache.put("What's our Q3 burn?", "amy", "Q3 burn was $1.2M")
+
+    assert await cache.get("Q3 burn rate?", "ali") == "Q3 burn was $1.2M"
+    assert await cache.get("Q4 burn?", "ali") is None
+    assert await cache.get("Q4 burn?", "amy") == "Q3 burn was $1.2M"
+    assert await cache.get("Q3 burn rate?", "baccio") is None
+
+    stats = cache.get_stats()["agents"]
+    assert stats["ali"]["hits"] == 1 and stats["ali"]["hit_rate"] == pytest.approx(0.5)
+    assert stats["amy"]["threshold"] == 0.4
+
+
+@pytest.mark.asyncio
+async def test_entries_are_shared_and_invalidated_by_tag():
+    redis = FakeRedis(decode_responses=False)
+    writer = SemanticResponseCache(redis_client=redis, embed=_embed)
+    reader = SemanticResponseCache(redis_client=redis, embed=_embed)
+
+    await writer.put("Q3 burn?", "ali", "Q3 burn was $1.2M", tags=["finance:q3"])
+    await writer.put("Hiring plan?", "ali", "Two engineers", tags=["hr"])
+    assert await reader.get("what is the q3 burn", "ali") == "Q3 burn was $1.2M"
+
+    await writer.invalidate("finance:q3")
+    assert await reader.get("what is the q3 burn", "ali") is None
+    assert reader.get_stats()["agents"]["ali"]["stale"] == 1
+    assert await reader.get("hiring plan", "ali") == "Two engineers"
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_are_evicted():
+    cache = SemanticResponseCache(embed=_embed, max_entries=2, clock=iter(range(1, 100)).__next__)
+    await cache.put("Q3 burn", "ali", "burn")
+    await cache.put("Q3 revenue", "ali", "revenue")
+    assert await cache.get("Q3 burn", "ali") == "burn"
+
+    await cache.put("hiring", "ali", "hiring")
+    assert await cache.get("Q3 revenue", "ali") is None
+    assert await cache.get("Q3 burn", "ali") == "burn"
+    assert cache.get_stats()["agents"]["ali"]["evictions"] == 1
@@ -0,0 +1,70 @@
+import pytest
+
+from src.agents.services.observability import slo_dashboard
+from src.agents.services.observability.slo_dashboard import RollingWindow, SLODashboard
+
+
+class _Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def dashboard(monkeypatch):
+    monkeypatch.setattr(slo_dashboard, "get_settings", lambda: None)
+    clock = _Clock()
+    return SLODashboard(bucket_seconds=30, clock=clock), clock
+
+
+def test_rolling_window_expires_old_buckets():
+    window = RollingWindow(bucket_seconds=10, retention_seconds=60)
+    for i in range(1000):
+        window.record(100.0 + i * 0.01, 99.0, good=True)
+    window.record(105.0, 50.0, good=False)
+
+    totals = window.totals(109.0, 10)
+    assert totals["count"] == 1001 and totals["bad"] == 1
+    assert window.totals(150.0, 30)["count"] == 0
+    # A bucket reused after wrapping around starts empty
+    window.record(100.0 + 10 * window.size, 99.0, good=True)
+    assert window.totals(100.0 + 10 * window.size, 10)["count"] == 1
+
+
+def test_status_is_averaged_over_the_measurement_window(dashboard):
+    dashboard, clock = dashboard
+    for value in (100.0, 90.0, 80.0):
+        dashboard.record_measurement("response_time_p95", value)
+
+    status = dashboard.get_slo_status("response_time_p95")
+    assert status["measurement_count"] == 3
+    assert status["current_value"] == pytest.approx(90.0)
+
+    clock.now += 600
+    assert dashboard.get_slo_status("response_time_p95")["current_value"] is None
+
+
+def test_burn_rate_alerts_are_deduplicated_and_resolve(dashboard):
+    dashboard, clock = dashboard
+    # Half of the samples miss a 95% target with a 5% budget: 10x burn
+    for _ in range(40):
+        for value in (99.0, 50.0):
+            dashboard.record_measurement("decision_accuracy", value)
+        clock.now += 15
+
+    alerts = dashboard.get_alerts()
+    assert [alert["rule"] for alert in alerts] == ["slow_burn"]
+    assert alerts[0]["occurrences"] > 1 and alerts[0]["resolved_at"] is None
+
+    # Single bad samples at a low rate do not alert
+    dashboard.record_measurement("rag_context_hit_rate", 10.0)
+    assert len(dashboard.get_alerts()) == 1
+
+    # Recovery in the short window resolves the alert
+    for _ in range(150):
+        dashboard.record_measurement("decision_accuracy", 99.0)
+        clock.now += 15
+    assert alerts[0]["resolved_at"] is not None
+    assert dashboard.get_all_slo_status()["active_alerts"] == 0
@@ -0,0 +1,96 @@
+import asyncio
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.startup import LazyRouterLoader, StartupReport
+
+
+ROUTER_MODULE = """
+from fastapi import APIRouter
+router = APIRouter()
+
+@router.get("/ping")
+async def ping():
+    return {{"router": "{name}"}}
+"""
+
+
+@pytest.fixture
+def router_package(tmp_path, monkeypatch):
+    package = tmp_path / "lazy_routes_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    for name in ("alpha", "beta"):
+        (package / f"{name}.py").write_text(ROUTER_MODULE.format(name=name))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_routes_pkg"
+    for module in [m for m in sys.modules if m.startswith("lazy_routes_pkg")]:
+        sys.modules.pop(module)
+
+
+@pytest.mark.asyncio
+async def test_background_step_gates_readiness():
+    report = StartupReport()
+    release = asyncio.Event()
+
+    async def slow_init():
+        await release.wait()
+
+    report.run_in_background("agents", slow_init)
+    report.mark_serving()
+    assert not report.is_ready()
+    assert report.pending() == ["agents"]
+
+    release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert report.is_ready()
+    phases = {phase["name"]: phase for phase in report.to_dict()["phases"]}
+    assert phases["agents"]["status"] == "ok"
+    assert phases["agents"]["background"] is True
+
+
+@pytest.mark.asyncio
+async def test_failed_background_step_does_not_block_readiness():
+    report = StartupReport()
+
+    async def broken():
+        raise RuntimeError("no agents")
+
+    await report.run_in_background("agents", broken)
+    report.mark_serving()
+    assert report.is_ready()
+    assert report.phases[0].status == "failed"
+
+
+def test_lazy_router_loads_on_first_request(router_package):
+    app = FastAPI()
+    loader = LazyRouterLoader(app, package=router_package, lazy=True, report=StartupReport())
+    loader.register(".alpha", prefix="/alpha")
+    loader.register(".beta", prefix="/beta")
+    app.add_middleware(loader.middleware(app.openapi_url))
+
+    assert f"{router_package}.alpha" not in sys.modules
+    client = TestClient(app)
+    response = client.get("/alpha/ping")
+
+    assert response.json() == {"router": "alpha"}
+    assert f"{router_package}.alpha" in sys.modules
+    assert f"{router_package}.beta" not in sys.modules
+    assert [entry.module for entry in loader.pending()] == [".beta"]
+
+
+def test_openapi_loads_every_router(router_package):
+    app = FastAPI()
+    loader = LazyRouterLoader(app, package=router_package, lazy=True)
+    loader.register(".alpha", prefix="/alpha")
+    loader.register(".beta", prefix="/beta")
+    app.add_middleware(loader.middleware(app.openapi_url))
+
+    paths = TestClient(app).get("/openapi.json").json()["paths"]
+
+    assert set(paths) == {"/alpha/ping", "/beta/ping"}
+    assert loader.pending() == []
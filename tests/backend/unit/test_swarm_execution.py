@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+
+from agents.services.swarm_coordinator import SwarmCoordinator
+from agents.services.swarm_execution import SwarmExecutionEngine
+
+
+def _mock_model(delays, fail=()):
+    """Deterministic stand-in for a model-backed agent"""
+    calls = []
+
+    async def executor(agent_key, prompt):
+        calls.append((agent_key, prompt))
+        await asyncio.sleep(delays.get(agent_key, 0.01))
+        if agent_key in fail:
+            raise RuntimeError("model error")
+        return f"{agent_key} answer"
+
+    return executor, calls
+
+
+def _coordinator(executor, keys, **kwargs):
+    coordinator = SwarmCoordinator(executor=executor, **kwargs)
+    for key in keys:
+        coordinator.register_agent({"key": key, "name": key, "expertise_areas": ["data"]})
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_parallel_latency_tracks_slowest_member():
+    delays = {f"a{i}": 0.1 for i in range(4)}
+    executor, calls = _mock_model(delays)
+    coordinator = _coordinator(executor, delays)
+    task = await coordinator.create_swarm_task("comprehensive data review")
+    task.assigned_agents = list(delays)
+    task.coordination_pattern = "parallel"
+
+    started = time.perf_counter()
+    result = await coordinator.execute_swarm_task(task.task_id)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.3
+    assert [r["output"] for r in result["results"]] == [f"a{i} answer" for i in range(4)]
+    assert all("comprehensive data review" in prompt for _, prompt in calls)
+
+
+@pytest.mark.asyncio
+async def test_quorum_stops_early_and_timeouts_are_reported():
+    executor, _ = _mock_model({"fast1": 0.01, "fast2": 0.02, "slow": 5.0})
+    engine = SwarmExecutionEngine(executor, agent_timeout=10.0)
+
+    started = time.perf_counter()
+    runs = await engine.run_round(["fast1", "slow", "fast2"], lambda key: "task", quorum=2)
+    assert time.perf_counter() - started < 1.0
+    assert [run["success"] for run in runs] == [True, False, True]
+    assert runs[1]["cancelled"]
+    assert engine.stats["early_terminations"] == 1
+
+    engine = SwarmExecutionEngine(executor, agent_timeout=0.05)
+    runs = await engine.run_round(["fast1", "slow"], lambda key: "task")
+    assert runs[1]["error"].startswith("timed out")
+    assert engine.stats["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_and_failures_do_not_fail_round():
+    running = 0
+    peak = 0
+
+    async def executor(agent_key, prompt):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        if agent_key == "a2":
+            raise RuntimeError("model error")
+        return "ok"
+
+    engine = SwarmExecutionEngine(executor, max_concurrency=2)
+    runs = await engine.run_round([f"a{i}" for i in range(6)], lambda key: "task")
+
+    assert peak == 2
+    assert [run["success"] for run in runs] == [True, True, False, True, True, True]
+    assert runs[2]["error"] == "model error"
@@ -0,0 +1,104 @@
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import Status, StatusCode
+
+from src.agents.observability.tail_sampling import TailSamplingConfig, TailSamplingSpanProcessor, ratio_selected
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _pipeline(config):
+    exporter = InMemorySpanExporter()
+    clock = _Clock()
+    processor = TailSamplingSpanProcessor(SimpleSpanProcessor(exporter), config, clock=clock)
+    provider = TracerProvider(sampler=config.sampler())
+    provider.add_span_processor(processor)
+    return provider.get_tracer("test"), processor, exporter, clock
+
+
+def _exported_traces(exporter):
+    return {span.context.trace_id for span in exporter.get_finished_spans()}
+
+
+def test_interesting_traces_are_kept_whole():
+    tracer, processor, exporter, _ = _pipeline(TailSamplingConfig(healthy_ratio=0.0, latency_threshold_ms=500))
+
+    with tracer.start_as_current_span("healthy"):
+        with tracer.start_as_current_span("turn.1"):
+            pass
+    assert exporter.get_finished_spans() == ()
+
+    with tracer.start_as_current_span("conversation") as root:
+        with tracer.start_as_current_span("tool.search") as tool:
+            tool.set_status(Status(StatusCode.ERROR, "timeout"))
+        # Buffered until the root ends
+        assert exporter.get_finished_spans() == ()
+        with tracer.start_as_current_span("turn.2"):
+            pass
+    assert [span.name for span in exporter.get_finished_spans()] == ["tool.search", "turn.2", "conversation"]
+    assert _exported_traces(exporter) == {root.get_span_context().trace_id}
+
+    with tracer.start_as_current_span("budget") as span:
+        span.add_event("budget.warning")
+    slow = tracer.start_span("slow", start_time=1_000_000_000)
+    slow.end(end_time=1_600_000_000)
+
+    assert len(_exported_traces(exporter)) == 3
+    stats = processor.get_stats()
+    assert stats["kept_by"] == {"error": 1, "budget": 1, "latency": 1}
+    assert stats["traces_dropped"] == 1 and stats["spans_dropped"] == 2
+
+
+def test_healthy_traces_are_sampled_by_trace_id():
+    tracer, processor, exporter, _ = _pipeline(TailSamplingConfig(healthy_ratio=0.25))
+    trace_ids = []
+    for _ in range(2000):
+        with tracer.start_as_current_span("turn") as span:
+            trace_ids.append(span.get_span_context().trace_id)
+
+    kept = _exported_traces(exporter)
+    assert kept == {trace_id for trace_id in trace_ids if ratio_selected(trace_id, 0.25)}
+    assert 400 < len(kept) < 600
+
+
+def test_late_and_abandoned_spans_follow_the_decision():
+    tracer, processor, exporter, clock = _pipeline(TailSamplingConfig(healthy_ratio=0.0, decision_wait_seconds=30))
+
+    root = tracer.start_span("conversation")
+    child = tracer.start_span("agent.amy", context=trace.set_span_in_context(root))
+    root.set_status(Status(StatusCode.ERROR, "failed"))
+    root.end()
+    child.end()
+    assert [span.name for span in exporter.get_finished_spans()] == ["conversation", "agent.amy"]
+
+    # A trace whose root never ends is decided once it has waited long enough
+    orphan_root = tracer.start_span("conversation")
+    orphan = tracer.start_span("agent.amy", context=trace.set_span_in_context(orphan_root))
+    orphan.set_status(Status(StatusCode.ERROR, "failed"))
+    orphan.end()
+    clock.now += 31
+    with tracer.start_as_current_span("healthy"):
+        pass
+    assert [span.name for span in exporter.get_finished_spans()][-1] == "agent.amy"
+    assert processor.get_stats()["pending_traces"] == 0
+
+
+def test_low_overhead_mode_strips_attributes_of_unselected_traces():
+    tracer, _, exporter, _ = _pipeline(TailSamplingConfig(healthy_ratio=0.0, low_overhead=True))
+
+    with tracer.start_as_current_span("turn.1", attributes={"conversation_id": "c1", "tokens": 120}) as span:
+        span.set_status(Status(StatusCode.ERROR, "failed"))
+    assert dict(exporter.get_finished_spans()[0].attributes) == {"conversation_id": "c1"}
+
+    tracer, _, exporter, _ = _pipeline(TailSamplingConfig(healthy_ratio=1.0, low_overhead=True))
+    with tracer.start_as_current_span("turn.1", attributes={"conversation_id": "c1", "tokens": 120}):
+        pass
+    assert dict(exporter.get_finished_spans()[0].attributes) == {"conversation_id": "c1", "tokens": 120}
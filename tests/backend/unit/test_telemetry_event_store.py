@@ -0,0 +1,78 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.agents.services.observability.event_store import InMemoryEventIndex, TelemetryEventStore
+
+
+def _event(seq, timestamp, conversation_id, event_type="tool.result", agent_name="amy"):
+    return {
+        "id": f"e{seq}", "timestamp": timestamp, "event_type": event_type, "conversation_id": conversation_id,
+        "user_id": "u1", "agent_name": agent_name, "turn_number": None, "data": {}, "metadata": {},
+    }
+
+
+def test_index_answers_filtered_time_range_queries():
+    index = InMemoryEventIndex(capacity=300_000)
+    start = datetime(2025, 1, 1)
+    for i in range(200_000):
+        index.add(_event(i, start + timedelta(seconds=i), f"c{i % 1000}",
+                         event_type="tool.result" if i % 3 else "agent.response"))
+
+    began = time.perf_counter()
+    window_start = start + timedelta(seconds=196_400)
+    events = index.query({"conversation_id": "c7", "event_type": "tool.result"}, window_start, None, 100)
+    elapsed_ms = (time.perf_counter() - began) * 1000
+
+    # e197007 is an agent.response
+    assert [event["id"] for event in events] == ["e199007", "e198007"]
+    assert elapsed_ms < 50
+
+    bounded = index.query({"agent_name": "amy"}, None, start + timedelta(seconds=10), 3)
+    assert [event["id"] for event in bounded] == ["e10", "e9", "e8"]
+
+
+def test_index_evicts_oldest_events():
+    index = InMemoryEventIndex(capacity=100)
+    start = datetime(2025, 1, 1)
+    for i in range(250):
+        index.add(_event(i, start + timedelta(seconds=i), "c1"))
+
+    assert len(index) <= 100
+    remaining = index.query({"conversation_id": "c1"}, None, None, 1000)
+    assert remaining[-1]["id"] == f"e{250 - len(index)}"
+
+
+@pytest.mark.asyncio
+async def test_recording_buffers_and_queries_without_database():
+    store = TelemetryEventStore(buffer_size=3)
+    store._get_session_factory = lambda: None
+
+    for i in range(5):
+        store.record("tool.result", conversation_id="c1", agent_name="amy", data={"tool.success": i % 2 == 0})
+    assert store.stats["dropped"] == 2
+
+    events = await store.query({"conversation_id": "c1", "start_time": datetime.utcnow() - timedelta(hours=1)})
+    assert len(events) == 3
+    assert events[0]["data"] == {"tool.success": True}
+    assert store.get_stats()["buffered"] == 0
+    assert await store.query({"conversation_id": "other"}) == []
+
+
+@pytest.mark.asyncio
+async def test_failed_tool_calls_are_queryable_by_status_and_agent():
+    store = TelemetryEventStore()
+    store._get_session_factory = lambda: None
+
+    for i, agent_name in enumerate(["amy", "ali", "amy", "amy"]):
+        store.record("tool.call", conversation_id="c1", agent_name=agent_name)
+        store.record("tool.result", conversation_id="c1", agent_name=agent_name,
+                     data={"tool.success": i != 2}, status="ok" if i != 2 else "error")
+
+    failures = await store.query({"conversation_id": "c1", "event_type": "tool.result", "status": "error"})
+    assert [(event["agent_name"], event["status"]) for event in failures] == [("amy", "error")]
+    assert failures[0]["data"] == {"tool.success": False}
+
+    assert len(await store.query({"agent_name": "ali"})) == 2
+    assert len(await store.query({"agent_name": "amy", "status": "ok"})) == 2
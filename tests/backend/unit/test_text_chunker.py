@@ -0,0 +1,86 @@
+import re
+
+from src.core.text_chunker import StoredChunk, chunk_text, diff_chunks
+from src.core.token_counter import TokenCounter
+
+
+def _counter(tmp_path):
+    # No vocabulary file: counts are the 4-characters-per-token estimate
+    return TokenCounter(vocab_dir=str(tmp_path))
+
+
+def _document():
+    intro = " ".join(f"Sentence {i} of the introduction explains the plan." for i in range(12))
+    code = "```python\n" + "\n".join(f"value_{i} = compute({i})" for i in range(8)) + "\n```"
+    return (
+        "# Overview\n\n" + intro + "\n\n"
+        "## Setup\n\nInstall the package.\n\n" + code + "\n\n"
+        "## Costs\n\n| item | usd |\n|------|-----|\n| gpu | 12 |\n\nThat is all. Café ☕ included."
+    )
+
+
+def test_chunks_follow_document_structure(tmp_path):
+    text = _document()
+    chunks = chunk_text(text, target_tokens=80, overlap_tokens=20, counter=_counter(tmp_path))
+
+    encoded = text.encode("utf-8")
+    for chunk in chunks:
+        assert encoded[chunk.byte_start:chunk.byte_end].decode("utf-8") == chunk.text
+        assert chunk.token_count <= 120
+
+    # Sentences are never cut, and consecutive intro chunks overlap by whole sentences
+    intro = [chunk for chunk in chunks if chunk.heading == "Overview"]
+    assert len(intro) > 1
+    for chunk in intro[1:]:
+        assert chunk.text.startswith("Sentence") and chunk.text.endswith("plan.")
+    assert intro[1].text.startswith(intro[0].text.split(". ")[-1])
+
+    # Chunks never cross a heading; the table stays whole with its section
+    assert [chunk.heading for chunk in chunks][-1] == "Costs"
+    assert "| gpu | 12 |" in chunks[-1].text and chunks[-1].text.startswith("## Costs")
+    assert [chunk.text.count("```") for chunk in chunks if "value_0 " in chunk.text] == [2]
+
+
+def test_edits_only_change_the_hashes_of_their_section(tmp_path):
+    counter = _counter(tmp_path)
+    text = _document()
+    before = chunk_text(text, target_tokens=80, overlap_tokens=20, counter=counter)
+    after = chunk_text(text.replace("Install the package.", "Install the package with pip."),
+                       target_tokens=80, overlap_tokens=20, counter=counter)
+
+    unchanged = {c.content_hash for c in before} & {c.content_hash for c in after}
+    assert {c.heading for c in after} == {"Overview", "Setup", "Costs"}
+    assert {c.heading for c in after if c.content_hash not in unchanged} == {"Setup"}
+
+
+def test_oversized_code_blocks_split_on_lines(tmp_path):
+    code = "```\n" + "\n".join(f"line_{i} = {i}" for i in range(200)) + "\n```"
+    chunks = chunk_text(code, target_tokens=50, overlap_tokens=0, counter=_counter(tmp_path))
+
+    assert len(chunks) > 1
+    lines = [line for chunk in chunks for line in chunk.text.splitlines()]
+    assert all(line == "```" or re.fullmatch(r"line_(\d+) = \1", line) for line in lines)
+    assert len([line for line in lines if line.startswith("line_")]) == 200
+
+
+def test_reindex_plan_only_embeds_changed_chunks(tmp_path):
+    counter = _counter(tmp_path)
+    text = _document() + "\n\n## Notes\n\nBoilerplate.\n\n## More\n\nBoilerplate."
+    old = chunk_text(text, target_tokens=80, overlap_tokens=20, counter=counter)
+    stored = [StoredChunk(id=100 + chunk.index, chunk_index=chunk.index, content_hash=chunk.content_hash)
+              for chunk in old]
+    stored.append(StoredChunk(id=999, chunk_index=len(old), content_hash=None))  # pre-hash row
+
+    new = chunk_text("Preface.\n\n" + text.replace("Install the package.", "Install it.").replace(
+        "## More\n\nBoilerplate.", ""), target_tokens=80, overlap_tokens=20, counter=counter)
+    plan = diff_chunks(stored, new)
+
+    assert [chunk.text for chunk in plan.embed] == [
+        "Preface.", next(chunk.text for chunk in new if chunk.heading == "Setup")
+    ]
+    assert {row.id for row, _ in plan.keep}.isdisjoint(plan.delete)
+    assert all(row.content_hash == chunk.content_hash for row, chunk in plan.keep)
+    assert len(plan.keep) == len(new) - 2
+    assert sorted(plan.delete) == sorted(
+        [100 + chunk.index for chunk in old if chunk.heading in ("Setup", "More")] + [999]
+    )
@@ -0,0 +1,59 @@
+import pytest
+import tiktoken
+
+from src.core.token_counter import _ENCODINGS, DEFAULT_VOCAB_DIR, TokenCounter
+
+
+def _toy_counter(tmp_path):
+    """Counter with the cl100k split pattern and a small byte-level vocabulary"""
+    counter = TokenCounter(vocab_dir=str(tmp_path))
+    assert not counter.exact  # no vocabulary file in tmp_path
+
+    ranks = {bytes([i]): i for i in range(256)}
+    for merged in (b"th", b"the", b" t", b" th", b" the", b"in", b"ing", b" c", b" co", b" cou", b" count", b".\n", b"}\n\n"):
+        ranks[merged] = len(ranks)
+    counter.encoding = tiktoken.Encoding(
+        name="toy", pat_str=_ENCODINGS["cl100k_base"]["pat_str"], mergeable_ranks=ranks, special_tokens={}
+    )
+    return counter
+
+
+def test_counts_are_cached_by_content(tmp_path):
+    counter = _toy_counter(tmp_path)
+    system_prompt = "the counting " * 20
+
+    first = counter.count(system_prompt)
+    assert first == len(counter.encoding.encode_ordinary(system_prompt))
+    assert counter.count(system_prompt) == first
+    assert counter.stats["cache_hits"] == 1
+
+
+def test_stream_counting_matches_full_encoding(tmp_path):
+    counter = _toy_counter(tmp_path)
+    texts = [
+        'the counting  of {"thing": [1, 2345]}\n\n  then\tcount the end   ',
+        # Punctuation merges with the line breaks that follow it
+        "end.\nnext line\nthe end.\n\nthe count",
+    ]
+
+    for text in texts:
+        for size in (1, 3, 7):
+            stream = counter.stream()
+            for start in range(0, len(text), size):
+                chunk_text = text[:start + size]
+                assert stream.feed(text[start:start + size]) == counter._encode_count(chunk_text)
+            assert len(stream.tail) < len(text)
+
+
+def test_missing_vocabulary_falls_back_to_estimate(tmp_path):
+    counter = TokenCounter(vocab_dir=str(tmp_path))
+    assert counter.count("x" * 400) == 100
+    assert counter.get_stats()["exact"] is False
+
+
+@pytest.mark.skipif(not (DEFAULT_VOCAB_DIR / "cl100k_base.tiktoken").exists(),
+                    reason="vocabulary not fetched (backend/scripts/fetch_tokenizer.py)")
+def test_fetched_vocabulary_counts_exactly():
+    counter = TokenCounter(vocab_dir=str(DEFAULT_VOCAB_DIR))
+    assert counter.exact
+    assert counter.count("hello world") == 2
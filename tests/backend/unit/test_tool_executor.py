@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from src.agents.services.groupchat import tool_executor
+from src.agents.services.groupchat.tool_executor import (
+    ConversationToolCache,
+    GroupChatToolExecutor,
+    ToolPolicy,
+    tool_cache_key,
+)
+
+
+def _call(name, arguments):
+    return {"function": {"name": name, "arguments": arguments}}
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setattr(tool_executor, "_tool_cache", ConversationToolCache())
+    return GroupChatToolExecutor(conversation_id="c1", user_id="u1")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_keep_order_and_share_duplicates(executor):
+    calls = []
+
+    async def search(args):
+        calls.append(args["query"])
+        await asyncio.sleep(0.05 if args["query"] == "slow" else 0.01)
+        return f"result:{args['query']}"
+
+    executor._execute_web_search = search
+    results = await executor.execute_tool_calls([
+        _call("web_search", '{"query": "slow"}'),
+        _call("web_search", '{"query": "fast"}'),
+        _call("web_search", '{"query": "  slow "}'),  # same call, different spacing
+        _call("unknown_tool", "{}"),
+    ])
+
+    assert results == ["result:slow", "result:fast", "result:slow", "Tool 'unknown_tool' not recognized"]
+    assert sorted(calls) == ["fast", "slow"]
+    assert executor.get_metrics()["total_calls"] == 4
+
+
+@pytest.mark.asyncio
+async def test_policy_limits_concurrency_and_times_out(executor, monkeypatch):
+    monkeypatch.setitem(tool_executor.TOOL_POLICIES, "business_intelligence",
+                        ToolPolicy(max_concurrency=2, timeout_seconds=0.05))
+    running = peak = 0
+
+    async def analyse(args):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            await asyncio.sleep(0.2 if args["focus_area"] == "stuck" else 0.01)
+        finally:
+            running -= 1
+        return args["focus_area"]
+
+    executor._execute_business_intelligence = analyse
+    results = await executor.execute_tool_calls(
+        [_call("business_intelligence", {"focus_area": f"area_{i}"}) for i in range(6)]
+        + [_call("business_intelligence", {"focus_area": "stuck"})]
+    )
+
+    assert results[:6] == [f"area_{i}" for i in range(6)]
+    assert results[6] == "Tool 'business_intelligence' timed out after 0.05s"
+    assert peak == 2
+    assert executor.timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_successful_results_are_memoized_and_errors_are_not(executor):
+    attempts = 0
+
+    async def query_talents(args):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("database unavailable")
+        return "42 talents"
+
+    executor._execute_talents_query = query_talents
+    call = [_call("query_talents", '{"query_type": "count"}')]
+
+    assert await executor.execute_tool_calls(call) == ["Talents query error: database unavailable"]
+    assert await executor.execute_tool_calls(call) == ["42 talents"]
+    assert await executor.execute_tool_calls(call) == ["42 talents"]
+    assert attempts == 2
+    assert executor.cache_hits == 1
+
+
+def test_cache_entries_expire_after_their_ttl():
+    now = [0.0]
+    cache = ConversationToolCache(clock=lambda: now[0])
+    key = tool_cache_key("web_search", {"query": "revenue"})
+
+    cache.set("c1", key, "cached", ttl_seconds=60)
+    cache.set("c1", "no-ttl", "never stored", ttl_seconds=0)
+    now[0] = 59
+    assert cache.get("c1", key) == "cached"
+    assert cache.get("c2", key) is None
+    assert cache.get("c1", "no-ttl") is None
+
+    now[0] = 61
+    assert cache.get("c1", key) is None
+    assert cache.stats == {"hits": 1, "misses": 3}
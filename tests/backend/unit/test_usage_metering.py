@@ -0,0 +1,84 @@
+from datetime import date, datetime
+
+import pytest
+
+from src.services.usage_metering import UsageMeter
+
+from fake_redis import FakeRedis
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class _FakeAggregateTable:
+    """Session factory storing upserted usage_aggregates rows"""
+
+    def __init__(self):
+        self.rows = {}
+        self.upserts = 0
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params):
+        if isinstance(params, list):
+            self.upserts += 1
+            for row in params:
+                key = (row["tenant_id"], row["metric"], row["period_date"])
+                self.rows[key] = max(self.rows.get(key, 0), row["quantity"])
+            return None
+        return _FakeResult([
+            (period_date, metric, quantity)
+            for (tenant_id, metric, period_date), quantity in self.rows.items()
+            if tenant_id == params["tenant_id"] and params["start"] <= period_date <= params["end"]
+        ])
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_counters_are_aggregated_per_tenant_metric_and_day():
+    redis = FakeRedis()
+    meter = UsageMeter(redis_client=redis)
+    for _ in range(1000):
+        await meter.record("t1", "api_calls", 1, at=datetime(2025, 3, 1, 12))
+    await meter.record("t1", "ai_tokens", 500, at=datetime(2025, 3, 2))
+    await meter.record("t2", "api_calls", 7, at=datetime(2025, 3, 1))
+
+    # Storage grows with tenants x days, not with calls
+    assert len(redis.hashes) == 3
+    assert await meter.summary("t1", date(2025, 3, 1), date(2025, 3, 31)) == {"api_calls": 1000, "ai_tokens": 500}
+    assert await meter.summary("t1", date(2025, 3, 2), date(2025, 3, 2)) == {"ai_tokens": 500}
+
+
+@pytest.mark.asyncio
+async def test_compaction_is_idempotent_and_summaries_merge_live_counters():
+    redis = FakeRedis()
+    table = _FakeAggregateTable()
+    meter = UsageMeter(redis_client=redis, session_factory=table)
+
+    await meter.record("t1", "api_calls", 10, at=datetime(2025, 3, 1))
+    await meter.record("t1", "api_calls", 5, at=datetime(2025, 3, 2))
+    assert await meter.compact() == 2
+    assert await meter.compact() == 0
+    assert table.rows[("t1", "api_calls", date(2025, 3, 1))] == 10
+
+    # Counters that expired from Redis are still summarized from the table
+    del redis.hashes["billing:usage:t1:2025-03-01"]
+    await meter.record("t1", "api_calls", 1, at=datetime(2025, 3, 2))
+    assert await meter.summary("t1", date(2025, 3, 1), date(2025, 3, 2)) == {"api_calls": 16}
+
+    assert await meter.compact() == 1
+    assert table.rows[("t1", "api_calls", date(2025, 3, 2))] == 6
@@ -0,0 +1,251 @@
+"""
+In-memory stand-in for the subset of ``redis.asyncio.Redis`` the backend uses.
+
+Unit tests import ``FakeRedis`` (tests/backend/conftest puts this directory on
+sys.path) instead of talking to a server. Values are kept as written and
+converted on the way out like a real client: ``str`` with
+``decode_responses=True`` (the default), ``bytes`` otherwise. ``round_trips``
+counts network round trips (one per direct command or pipeline execute) and
+``calls`` counts individual commands by name.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import functools
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set
+
+
+def _command(method):
+    @functools.wraps(method)
+    async def wrapper(self: "FakeRedis", *args, **kwargs):
+        self.calls[method.__name__] += 1
+        if not self._pipelined:
+            self.round_trips += 1
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _score(bound) -> float:
+    # float() already understands "-inf" / "+inf"
+    return float(bound.decode() if isinstance(bound, bytes) else bound)
+
+
+class FakePipeline:
+    """Queues commands and runs them against the fake in one round trip"""
+
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.ops: List[tuple] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> List[Any]:
+        self.redis.round_trips += 1
+        self.redis._pipelined = True
+        try:
+            return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.ops]
+        finally:
+            self.redis._pipelined = False
+            self.ops = []
+
+
+class FakeRedis:
+    """Strings, hashes, sets and sorted sets, keyed by ``str``"""
+
+    def __init__(self, decode_responses: bool = True) -> None:
+        self.decode_responses = decode_responses
+        self.strings: Dict[str, Any] = {}
+        self.hashes: Dict[str, Dict[str, Any]] = {}
+        self.sets: Dict[str, Set[Any]] = {}
+        self.zsets: Dict[str, Dict[Any, float]] = {}
+        self.round_trips = 0
+        self.calls: Counter = Counter()
+        self._pipelined = False
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def _out(self, value):
+        if value is None:
+            return None
+        if self.decode_responses:
+            return value.decode() if isinstance(value, bytes) else str(value)
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def _stores(self):
+        return (self.strings, self.hashes, self.sets, self.zsets)
+
+    def _sorted(self, key: str) -> List[tuple]:
+        return sorted(self.zsets.get(key, {}).items(), key=lambda kv: (kv[1], str(kv[0])))
+
+    # Keys
+
+    @_command
+    def exists(self, *keys: str) -> int:
+        return sum(1 for key in keys if any(key in store for store in self._stores()))
+
+    @_command
+    def delete(self, *keys: str) -> int:
+        return sum(1 for key in keys for store in self._stores() if store.pop(key, None) is not None)
+
+    @_command
+    def expire(self, key: str, ttl: int) -> bool:
+        return any(key in store for store in self._stores())
+
+    @_command
+    def scan(self, cursor: int, match: Optional[str] = None, count: Optional[int] = None):
+        keys = [key for store in self._stores() for key in store]
+        return 0, [key for key in keys if match is None or fnmatch.fnmatchcase(key, match)]
+
+    # Strings
+
+    @_command
+    def get(self, key: str):
+        return self._out(self.strings.get(key))
+
+    @_command
+    def mget(self, keys: List[str]) -> List[Any]:
+        return [self._out(self.strings.get(key)) for key in keys]
+
+    @_command
+    def set(self, key: str, value, ex: Optional[int] = None, nx: bool = False):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+    @_command
+    def setex(self, key: str, ttl: int, value) -> bool:
+        self.strings[key] = value
+        return True
+
+    @_command
+    def incr(self, key: str) -> int:
+        self.strings[key] = int(self.strings.get(key, 0)) + 1
+        return self.strings[key]
+
+    # Hashes
+
+    @_command
+    def hset(self, key: str, field: Optional[str] = None, value=None, mapping: Optional[Dict[str, Any]] = None) -> int:
+        fields = dict(mapping or {})
+        if field is not None:
+            fields[field] = value
+        hash_ = self.hashes.setdefault(key, {})
+        added = sum(1 for name in fields if name not in hash_)
+        hash_.update(fields)
+        return added
+
+    @_command
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        hash_ = self.hashes.setdefault(key, {})
+        hash_[field] = int(hash_.get(field, 0)) + amount
+        return hash_[field]
+
+    @_command
+    def hgetall(self, key: str) -> Dict[Any, Any]:
+        return {self._out(field): self._out(value) for field, value in self.hashes.get(key, {}).items()}
+
+    # Sets
+
+    @_command
+    def sadd(self, key: str, *members) -> int:
+        set_ = self.sets.setdefault(key, set())
+        added = len(set(members) - set_)
+        set_.update(members)
+        return added
+
+    @_command
+    def srem(self, key: str, *members) -> int:
+        set_ = self.sets.get(key, set())
+        removed = len(set_ & set(members))
+        set_.difference_update(members)
+        if not set_:
+            self.sets.pop(key, None)
+        return removed
+
+    @_command
+    def smembers(self, key: str) -> Set[Any]:
+        return {self._out(member) for member in self.sets.get(key, set())}
+
+    # Sorted sets
+
+    @_command
+    def zadd(self, key: str, mapping: Dict[Any, float], nx: bool = False, xx: bool = False, ch: bool = False) -> int:
+        zset = self.zsets.setdefault(key, {})
+        added = changed = 0
+        for member, score in mapping.items():
+            exists = member in zset
+            if (nx and exists) or (xx and not exists):
+                continue
+            added += not exists
+            changed += not exists or zset[member] != float(score)
+            zset[member] = float(score)
+        if not zset:
+            del self.zsets[key]
+        return changed if ch else added
+
+    @_command
+    def zrem(self, key: str, *members) -> int:
+        zset = self.zsets.get(key, {})
+        return sum(1 for member in members if zset.pop(member, None) is not None)
+
+    @_command
+    def zcard(self, key: str) -> int:
+        return len(self.zsets.get(key, {}))
+
+    @_command
+    def zrange(self, key: str, start: int, end: int, desc: bool = False, withscores: bool = False):
+        items = self._sorted(key)
+        if desc:
+            items.reverse()
+        items = items[start:end + 1 or None]
+        return self._members(items, withscores)
+
+    @_command
+    def zrangebyscore(self, key: str, low, high, start: Optional[int] = None, num: Optional[int] = None,
+                      withscores: bool = False):
+        low, high = _score(low), _score(high)
+        items = [(member, score) for member, score in self._sorted(key) if low <= score <= high]
+        if start is not None and num is not None:
+            items = items[start:start + num]
+        return self._members(items, withscores)
+
+    @_command
+    def zremrangebyscore(self, key: str, low, high) -> int:
+        low, high = _score(low), _score(high)
+        zset = self.zsets.get(key, {})
+        doomed = [member for member, score in zset.items() if low <= score <= high]
+        for member in doomed:
+            del zset[member]
+        return len(doomed)
+
+    @_command
+    def zremrangebyrank(self, key: str, start: int, stop: int) -> int:
+        ordered = [member for member, _ in self._sorted(key)]
+        doomed = ordered[start:stop + 1 or None]
+        for member in doomed:
+            del self.zsets[key][member]
+        return len(doomed)
+
+    @_command
+    def zinterstore(self, dest: str, keys: List[str], aggregate: Optional[str] = None) -> int:
+        members = set(self.zsets.get(keys[0], {}))
+        for key in keys[1:]:
+            members &= set(self.zsets.get(key, {}))
+        pick = min if (aggregate or "").upper() == "MIN" else max
+        self.zsets[dest] = {member: pick(self.zsets[key][member] for key in keys) for member in members}
+        return len(members)
+
+    def _members(self, items: List[tuple], withscores: bool) -> List[Any]:
+        if withscores:
+            return [(self._out(member), score) for member, score in items]
+        return [self._out(member) for member, _ in items]